@@ -4,6 +4,14 @@ Actions Library
 Shared utilities and libraries for GitHub Actions.
 """
 
-from actions.lib.acceptance_tracker import AcceptanceTracker
+from actions.lib.acceptance_tracker import AcceptanceTracker, migrate_json_to_ndjson
+from actions.lib.metric_cube import MetricCube, hash_prompt_template
+from actions.lib.sliding_window import SlidingWindowCounter
 
-__all__ = ["AcceptanceTracker"]
+__all__ = [
+    "AcceptanceTracker",
+    "MetricCube",
+    "SlidingWindowCounter",
+    "hash_prompt_template",
+    "migrate_json_to_ndjson",
+]
@@ -15,16 +15,539 @@ Usage:
     tracker.record_suggestion("made")
     tracker.record_suggestion("accepted")
     rate = tracker.get_acceptance_rate()
+
+Storage:
+    Metrics files ending in ".ndjson" or ".jsonl" are written append-only,
+    one export_metrics() record per line. Any other path keeps the legacy
+    JSON-array format. Readers accept both formats.
+
+    Writes take an exclusive advisory lock on a "<file>.lock" sidecar (POSIX
+    only), so several processes can save to the same file concurrently
+    without losing updates.
+
+    Loading an NDJSON file maintains a "<file>.checkpoint" sidecar with
+    per-action running totals and the byte offset they cover, so later loads
+    only parse entries appended since the last one.
+
+Partitions:
+    save_to_file() without a path appends to the date-partitioned layout
+    "metrics/acceptance/YYYY/MM/DD/<action>.ndjson", dated by the entry's own
+    timestamp, so readers can select time ranges from directory names alone.
+
+Sliding windows:
+    Outcomes are also counted in per-minute ring buffers, so rates over the
+    last 15 minutes, 1 hour and 24 hours are O(1) queries:
+
+    tracker.get_window_rates(15)["acceptance_rate"]
+
+Dimensions:
+    Outcomes can be tagged with repository, model, A/B variant and
+    prompt-template hash. Each tracker keeps a MetricCube of counters per
+    dimension combination, persisted with every entry, so slices are
+    answered without rescanning raw entries:
+
+    tracker = AcceptanceTracker("review-and-merge", {"model": "opus", "variant": "treatment"})
+    aggregate_metrics_by_action("metrics/review.ndjson", group_by=["model", "variant"])
 """
 
-from datetime import datetime
-from typing import Dict, Literal, Optional
+import atexit
+import hashlib
 import json
 import os
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Literal, NamedTuple
+
+from actions.lib.metric_cube import DIMENSIONS, MetricCube, validate_dimensions
+from actions.lib.sliding_window import SlidingWindowCounter
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows runners have no fcntl
+    fcntl = None
 
 
 SuggestionOutcome = Literal["made", "accepted", "rejected", "modified"]
 
+VALID_OUTCOMES = ("made", "accepted", "rejected", "modified")
+
+# Outcome -> metrics key, built once instead of formatting a key per call
+OUTCOME_METRIC_KEYS = {outcome: f"suggestions_{outcome}" for outcome in VALID_OUTCOMES}
+OUTCOME_INDEX = {outcome: i for i, outcome in enumerate(VALID_OUTCOMES)}
+
+# Sliding windows (in minutes) kept by every tracker
+WINDOW_MINUTES = (15, 60, 1440)
+WINDOW_BUCKET_SECONDS = 60
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+PARTITION_ROOT = os.path.join("metrics", "acceptance")
+LOCK_SUFFIX = ".lock"
+CHECKPOINT_SUFFIX = ".checkpoint"
+CHECKPOINT_VERSION = 3
+CHECKPOINT_WINDOW = 4096
+
+METRIC_KEYS = (
+    "suggestions_made",
+    "suggestions_accepted",
+    "suggestions_rejected",
+    "suggestions_modified",
+)
+
+
+@contextmanager
+def locked_metrics_file(filepath: str) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock for writing a metrics file.
+
+    The lock is taken on a "<filepath>.lock" sidecar rather than the file
+    itself, because JSON-array saves replace the file's inode. Where fcntl
+    is unavailable this is a no-op.
+
+    Args:
+        filepath: Path to the metrics file being written
+    """
+    if fcntl is None:
+        yield
+        return
+
+    fd = os.open(filepath + LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def partition_path(
+    action_name: str, when: datetime | None = None, root: str = PARTITION_ROOT
+) -> str:
+    """
+    Build the date-partitioned NDJSON path for an action's entries.
+
+    Args:
+        action_name: Name of the GitHub Action
+        when: Entry timestamp; defaults to now
+        root: Partition root directory
+
+    Returns:
+        Path of the form "<root>/YYYY/MM/DD/<action_name>.ndjson"
+    """
+    when = when or datetime.now()
+    return os.path.join(
+        root,
+        f"{when:%Y}",
+        f"{when:%m}",
+        f"{when:%d}",
+        action_name.replace(os.sep, "_") + ".ndjson",
+    )
+
+
+def is_ndjson_path(filepath: str) -> bool:
+    """
+    Check whether a metrics path uses the append-only NDJSON format.
+
+    Args:
+        filepath: Path to a metrics file
+
+    Returns:
+        True if the file extension selects NDJSON storage
+    """
+    return filepath.lower().endswith(NDJSON_SUFFIXES)
+
+
+def iter_ndjson_entries(lines: Iterable[str | bytes]) -> Iterator[dict]:
+    """
+    Lazily parse newline-delimited JSON metric entries.
+
+    Blank lines, lines that fail to parse (e.g. a torn final write) and
+    values that are not objects are skipped.
+
+    Args:
+        lines: NDJSON lines, e.g. an open file
+
+    Yields:
+        Metric entry dictionaries
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if isinstance(entry, dict):
+            yield entry
+
+
+def parse_metrics_text(text: str) -> list[dict]:
+    """
+    Parse metrics file contents in either JSON-array or NDJSON format.
+
+    A JSON array or a single JSON object is returned as a list of entries.
+    Otherwise the text is treated as NDJSON; blank lines and lines that fail
+    to parse (e.g. a torn final write) are skipped.
+
+    Args:
+        text: Raw file contents
+
+    Returns:
+        List of metric entry dictionaries
+    """
+    stripped = text.strip()
+    if not stripped:
+        return []
+
+    try:
+        data = json.loads(stripped)
+    except json.JSONDecodeError:
+        data = None
+    else:
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict):
+            return [data]
+        return []
+
+    return list(iter_ndjson_entries(stripped.splitlines()))
+
+
+def read_metrics_entries(filepath: str) -> list[dict]:
+    """
+    Read all metric entries from a JSON-array or NDJSON metrics file.
+
+    Args:
+        filepath: Path to the metrics file
+
+    Returns:
+        List of metric entries, empty if the file does not exist
+    """
+    if not os.path.exists(filepath):
+        return []
+    with open(filepath) as f:
+        return parse_metrics_text(f.read())
+
+
+def append_ndjson_record(filepath: str, record: dict) -> None:
+    """
+    Append a single record to an NDJSON file.
+
+    The line is written with one write() call on an O_APPEND descriptor and
+    then fsync'ed, so existing content is never rewritten.
+
+    Args:
+        filepath: Path to the NDJSON file
+        record: JSON-serializable record to append
+    """
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+    with locked_metrics_file(filepath):
+        fd = os.open(filepath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class ActionState(NamedTuple):
+    """Per-action state folded from a metrics file."""
+
+    totals: dict[str, dict[str, int]]
+    windows: dict[str, SlidingWindowCounter]
+    cube: MetricCube
+
+
+def summarize_counts(counts: Sequence[int]) -> dict[str, float]:
+    """
+    Turn a [made, accepted, rejected, modified] vector into counters and rates.
+
+    Args:
+        counts: Counter vector in VALID_OUTCOMES order
+
+    Returns:
+        Dictionary of suggestion counters plus acceptance/rejection/
+        modification rates (0.0 when no suggestions were made)
+
+    Raises:
+        ValueError: If counts does not have one entry per outcome
+    """
+    summary = {
+        OUTCOME_METRIC_KEYS[outcome]: count
+        for outcome, count in zip(VALID_OUTCOMES, counts, strict=True)
+    }
+    total = summary["suggestions_made"]
+    for outcome, rate_key in (
+        ("accepted", "acceptance_rate"),
+        ("rejected", "rejection_rate"),
+        ("modified", "modification_rate"),
+    ):
+        summary[rate_key] = (
+            summary[OUTCOME_METRIC_KEYS[outcome]] / total * 100 if total else 0.0
+        )
+    return summary
+
+
+def new_window_counter() -> SlidingWindowCounter:
+    """Create the per-minute outcome counter used by AcceptanceTracker."""
+    return SlidingWindowCounter(
+        width=len(VALID_OUTCOMES),
+        windows=WINDOW_MINUTES,
+        bucket_seconds=WINDOW_BUCKET_SECONDS,
+    )
+
+
+def _fold_entry(state: ActionState, entry: dict) -> None:
+    """Add one export_metrics() entry into per-action totals, windows and cube."""
+    totals, windows, cube = state
+    action = entry.get("action", "unknown")
+    action_totals = totals.setdefault(action, dict.fromkeys(METRIC_KEYS, 0))
+    for key, value in entry.get("metrics", {}).items():
+        if key in action_totals:
+            action_totals[key] += value
+
+    if isinstance(entry.get("cube"), list):
+        cube.merge_rows(entry["cube"])
+    else:
+        # Entries written before dimensions existed land in one cell
+        dimensions = entry.get("dimensions")
+        dimensions = dict(dimensions) if isinstance(dimensions, dict) else {}
+        dimensions["action"] = action
+        cube.add(
+            dimensions,
+            [entry.get("metrics", {}).get(key, 0) for key in METRIC_KEYS],
+        )
+
+    entry_windows = entry.get("windows")
+    if (
+        isinstance(entry_windows, dict)
+        and entry_windows.get("bucket_seconds") == WINDOW_BUCKET_SECONDS
+        and entry_windows.get("buckets")
+    ):
+        if action not in windows:
+            windows[action] = new_window_counter()
+        windows[action].merge_buckets(entry_windows["buckets"])
+
+
+def _rows_by_key(rows: Iterable[Sequence], key_size: int) -> dict[tuple, list[int]]:
+    """Index persisted window or cube rows by their key columns."""
+    return {tuple(row[:key_size]): list(row[key_size:]) for row in rows}
+
+
+def _rows_since(
+    rows: list[list], baseline: dict[tuple, list[int]], key_size: int
+) -> list[list]:
+    """Subtract baseline counts from rows with the same key, dropping rows left empty."""
+    if not baseline:
+        return rows
+    result = []
+    for row in rows:
+        loaded = baseline.get(tuple(row[:key_size]))
+        if loaded is not None:
+            counts = [
+                count - old for count, old in zip(row[key_size:], loaded, strict=True)
+            ]
+            if not any(counts):
+                continue
+            row = [*row[:key_size], *counts]
+        result.append(row)
+    return result
+
+
+def build_metric_cube(entries: Iterable[dict]) -> MetricCube:
+    """
+    Fold metric entries into a metric cube.
+
+    Args:
+        entries: Entries from export_metrics()
+
+    Returns:
+        MetricCube with every entry's cells (legacy entries count as one cell)
+    """
+    state = ActionState({}, {}, MetricCube(len(METRIC_KEYS)))
+    for entry in entries:
+        _fold_entry(state, entry)
+    return state.cube
+
+
+def _covered_fingerprint(filepath: str, offset: int) -> str:
+    """Hash the last CHECKPOINT_WINDOW bytes before offset."""
+    start = max(0, offset - CHECKPOINT_WINDOW)
+    with open(filepath, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _read_checkpoint(filepath: str) -> dict | None:
+    """
+    Read the checkpoint for an NDJSON file if it still matches the file.
+
+    A checkpoint is discarded when the file was replaced (different inode),
+    truncated below the covered offset, or rewritten so the bytes just before
+    the offset no longer hash to the stored fingerprint.
+    """
+    try:
+        with open(filepath + CHECKPOINT_SUFFIX) as f:
+            checkpoint = json.load(f)
+        stat = os.stat(filepath)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if not isinstance(checkpoint, dict) or checkpoint.get("version") != CHECKPOINT_VERSION:
+        return None
+    offset = checkpoint.get("offset")
+    if not isinstance(offset, int) or offset > stat.st_size:
+        return None
+    if checkpoint.get("inode") != stat.st_ino:
+        return None
+    if checkpoint.get("fingerprint") != _covered_fingerprint(filepath, offset):
+        return None
+    return checkpoint
+
+
+def _write_checkpoint(
+    filepath: str, offset: int, entries: int, state: ActionState
+) -> None:
+    """Atomically write the checkpoint sidecar; failures are ignored."""
+    checkpoint_path = filepath + CHECKPOINT_SUFFIX
+    tmp_path = f"{checkpoint_path}.{os.getpid()}.tmp"
+    try:
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "inode": os.stat(filepath).st_ino,
+            "offset": offset,
+            "fingerprint": _covered_fingerprint(filepath, offset),
+            "entries": entries,
+            "totals": state.totals,
+            "windows": {
+                action: counter.to_buckets() for action, counter in state.windows.items()
+            },
+            "cube": state.cube.to_rows(),
+        }
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, checkpoint_path)
+    except OSError:
+        # A read-only metrics directory just means no checkpoint
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def load_action_state(filepath: str) -> ActionState:
+    """
+    Fold persisted metrics into per-action totals, window buckets and cube.
+
+    For NDJSON files the state is resumed from the checkpoint sidecar and
+    only complete lines after its offset are parsed; the checkpoint is then
+    advanced. JSON-array files are rewritten on every save, so they are
+    always read in full.
+
+    Args:
+        filepath: Path to a JSON-array or NDJSON metrics file
+
+    Returns:
+        ActionState of (action -> summed suggestion counters,
+        action -> SlidingWindowCounter, MetricCube over all dimensions)
+    """
+    state = ActionState({}, {}, MetricCube(len(METRIC_KEYS)))
+
+    if not is_ndjson_path(filepath):
+        for entry in read_metrics_entries(filepath):
+            _fold_entry(state, entry)
+        return state
+
+    if not os.path.exists(filepath):
+        return state
+
+    checkpoint = _read_checkpoint(filepath)
+    offset, entries = 0, 0
+    if checkpoint is not None:
+        offset = checkpoint["offset"]
+        entries = checkpoint.get("entries", 0)
+        state.totals.update(checkpoint.get("totals", {}))
+        for action, rows in checkpoint.get("windows", {}).items():
+            state.windows[action] = new_window_counter()
+            state.windows[action].merge_buckets(rows)
+        state.cube.merge_rows(checkpoint.get("cube", []))
+
+    with open(filepath, "rb") as f:
+        f.seek(offset)
+        tail = f.read()
+
+    # Only fold complete lines; a torn final write is picked up next time
+    complete = tail.rfind(b"\n") + 1
+    for entry in iter_ndjson_entries(tail[:complete].splitlines()):
+        _fold_entry(state, entry)
+        entries += 1
+
+    if checkpoint is None or complete:
+        _write_checkpoint(filepath, offset + complete, entries, state)
+
+    return state
+
+
+def load_action_totals(filepath: str) -> dict[str, dict[str, int]]:
+    """
+    Sum persisted metrics per action.
+
+    See load_action_state() for how NDJSON checkpoints are used.
+
+    Args:
+        filepath: Path to a JSON-array or NDJSON metrics file
+
+    Returns:
+        Mapping of action name to summed suggestion counters
+    """
+    return load_action_state(filepath).totals
+
+
+def load_metric_cube(filepath: str) -> MetricCube:
+    """
+    Load the dimension cube for a metrics file.
+
+    See load_action_state() for how NDJSON checkpoints are used.
+
+    Args:
+        filepath: Path to a JSON-array or NDJSON metrics file
+
+    Returns:
+        MetricCube with counters per dimension combination
+    """
+    return load_action_state(filepath).cube
+
+
+def migrate_json_to_ndjson(src_path: str, dest_path: str | None = None) -> int:
+    """
+    Convert a legacy JSON-array metrics file to NDJSON.
+
+    Args:
+        src_path: Path to the existing JSON-array file
+        dest_path: Output path; defaults to src_path with an ".ndjson" suffix
+
+    Returns:
+        Number of entries written
+
+    Raises:
+        FileExistsError: If dest_path already exists
+    """
+    if dest_path is None:
+        dest_path = os.path.splitext(src_path)[0] + ".ndjson"
+    if os.path.exists(dest_path):
+        raise FileExistsError(f"Destination already exists: {dest_path}")
+
+    entries = read_metrics_entries(src_path)
+    tmp_path = dest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, dest_path)
+    return len(entries)
+
 
 class AcceptanceTracker:
     """
@@ -33,41 +556,196 @@ class AcceptanceTracker:
     Attributes:
         action_name: Name of the GitHub Action being tracked
         metrics: Dictionary tracking suggestion outcomes
+        windows: Per-minute outcome buckets for sliding-window rates
+        dimensions: Default dimension tags applied to recorded outcomes
+        cube: Counters per dimension combination
     """
 
-    def __init__(self, action_name: str):
+    __slots__ = (
+        "action_name",
+        "metrics",
+        "windows",
+        "dimensions",
+        "cube",
+        "_default_cell",
+        "_loaded_metrics",
+        "_loaded_buckets",
+        "_loaded_cells",
+    )
+
+    def __init__(
+        self, action_name: str, dimensions: Mapping[str, str] | None = None
+    ):
         """
         Initialize the acceptance tracker for a specific action.
 
         Args:
             action_name: Name of the GitHub Action (e.g., "review-and-merge")
+            dimensions: Optional default tags, any of "repository", "model"
+                (the claude-model input), "variant" (A/B variant from
+                ab_test_config.yml) and "prompt_hash" (see hash_prompt_template)
+
+        Raises:
+            ValueError: If a dimension name is unknown
         """
         self.action_name = action_name
+        self.dimensions = dict(dimensions or {})
+        self.dimensions.pop("action", None)
+        validate_dimensions(self.dimensions)
+        self.cube = MetricCube(len(METRIC_KEYS))
+        self._default_cell = self.cube.cell(self._cell_dimensions())
         self.metrics = {
             "suggestions_made": 0,
             "suggestions_accepted": 0,
             "suggestions_rejected": 0,
             "suggestions_modified": 0,
         }
+        self.windows = new_window_counter()
+        # Counters, window buckets and cube cells loaded by from_file(), which
+        # export_metrics() leaves out so a re-saved tracker does not repeat them
+        self._loaded_metrics = dict.fromkeys(METRIC_KEYS, 0)
+        self._loaded_buckets: dict[tuple, list[int]] = {}
+        self._loaded_cells: dict[tuple, list[int]] = {}
+
+    def _cell_dimensions(
+        self, dimensions: Mapping[str, str] | None = None
+    ) -> dict[str, str]:
+        """Merge per-call tags over the defaults and add the action name."""
+        merged = dict(self.dimensions)
+        if dimensions:
+            validate_dimensions(dimensions)
+            merged.update(dimensions)
+        merged["action"] = self.action_name
+        return merged
 
-    def record_suggestion(self, outcome: SuggestionOutcome) -> None:
+    def record_suggestion(
+        self,
+        outcome: SuggestionOutcome,
+        dimensions: Mapping[str, str] | None = None,
+    ) -> None:
         """
         Record a suggestion outcome.
 
         Args:
             outcome: The outcome of the suggestion ("made", "accepted", "rejected", "modified")
+            dimensions: Optional tags overriding the tracker's defaults for this outcome
 
         Raises:
-            ValueError: If outcome is not one of the valid options
+            ValueError: If outcome is not one of the valid options, or a
+                dimension name is unknown
         """
-        valid_outcomes = ["made", "accepted", "rejected", "modified"]
-        if outcome not in valid_outcomes:
+        metric_key = OUTCOME_METRIC_KEYS.get(outcome)
+        if metric_key is None:
             raise ValueError(
-                f"Invalid outcome '{outcome}'. Must be one of: {valid_outcomes}"
+                f"Invalid outcome '{outcome}'. Must be one of: {list(VALID_OUTCOMES)}"
             )
 
-        metric_key = f"suggestions_{outcome}"
+        index = OUTCOME_INDEX[outcome]
+        cell = (
+            self.cube.cell(self._cell_dimensions(dimensions))
+            if dimensions
+            else self._default_cell
+        )
         self.metrics[metric_key] += 1
+        # Bucketed now, so the outcome counts toward the minute it happened in;
+        # recording into the current minute is one list increment
+        self.windows.increment(index)
+        cell[index] += 1
+
+    def record_many(
+        self,
+        outcomes: Iterable[SuggestionOutcome],
+        dimensions: Mapping[str, str] | None = None,
+    ) -> None:
+        """
+        Record many suggestion outcomes at once.
+
+        Outcomes are counted first and validated per distinct value, so an
+        invalid outcome leaves the metrics unchanged.
+
+        Args:
+            outcomes: Iterable of outcomes ("made", "accepted", "rejected", "modified")
+            dimensions: Optional tags overriding the tracker's defaults for this batch
+
+        Raises:
+            ValueError: If any outcome is not one of the valid options, or a
+                dimension name is unknown
+        """
+        counts = Counter(outcomes)
+        for outcome in counts:
+            if outcome not in OUTCOME_METRIC_KEYS:
+                raise ValueError(
+                    f"Invalid outcome '{outcome}'. Must be one of: {list(VALID_OUTCOMES)}"
+                )
+        cell = (
+            self.cube.cell(self._cell_dimensions(dimensions))
+            if dimensions
+            else self._default_cell
+        )
+
+        for outcome, count in counts.items():
+            self.metrics[OUTCOME_METRIC_KEYS[outcome]] += count
+        if counts:
+            vector = [counts[outcome] for outcome in VALID_OUTCOMES]
+            self.windows.add(vector)
+            for i, count in enumerate(vector):
+                cell[i] += count
+
+    def flush(self, filepath: str | None = None) -> bool:
+        """
+        Save recorded metrics as one entry and reset the counters.
+
+        Nothing is written if no outcomes were recorded since the last flush
+        (or, for a loaded tracker, since the load).
+
+        Args:
+            filepath: Path to the JSON or NDJSON metrics file; defaults to
+                today's partition (see partition_path)
+
+        Returns:
+            True if an entry was written
+        """
+        if not any(self._unsaved_counts()):
+            return False
+        self.save_to_file(filepath)
+        self.reset_metrics()
+        return True
+
+    @contextmanager
+    def buffered(self, filepath: str | None = None) -> Iterator["AcceptanceTracker"]:
+        """
+        Buffer recorded outcomes in memory and flush them once.
+
+        The flush happens when the block exits (including on exceptions);
+        an atexit hook covers interpreter shutdown while the block is open.
+
+        Usage:
+            with tracker.buffered() as t:
+                t.record_many(outcomes)
+
+        Args:
+            filepath: Path to the JSON or NDJSON metrics file; defaults to
+                the partition for the flush time
+        """
+        def flush_on_shutdown() -> None:
+            self.flush(filepath)
+
+        atexit.register(flush_on_shutdown)
+        try:
+            yield self
+        finally:
+            atexit.unregister(flush_on_shutdown)
+            self.flush(filepath)
+
+    def flush_at_exit(self, filepath: str | None = None) -> None:
+        """
+        Flush recorded outcomes to filepath when the interpreter exits.
+
+        Args:
+            filepath: Path to the JSON or NDJSON metrics file; defaults to
+                the partition for the exit time
+        """
+        atexit.register(self.flush, filepath)
 
     def get_acceptance_rate(self) -> float:
         """
@@ -108,7 +786,47 @@ class AcceptanceTracker:
             return 0.0
         return (self.metrics["suggestions_modified"] / total) * 100
 
-    def get_metrics(self) -> Dict[str, int]:
+    def get_window_rates(
+        self, window_minutes: int, now: float | None = None
+    ) -> dict[str, float]:
+        """
+        Get counters and rates over a trailing time window.
+
+        Windows listed in WINDOW_MINUTES are answered in O(1); any other
+        window up to the largest one is summed from the minute buckets.
+
+        Args:
+            window_minutes: Window length in minutes
+            now: End of the window as a Unix timestamp; defaults to now
+
+        Returns:
+            Dictionary with the window length, suggestion counters and
+            acceptance/rejection/modification rates (0.0 when no suggestions)
+
+        Raises:
+            ValueError: If window_minutes is outside 1..max(WINDOW_MINUTES)
+        """
+        result = {"window_minutes": window_minutes}
+        result.update(summarize_counts(self.windows.totals(window_minutes, now)))
+        return result
+
+    def get_window_acceptance_rate(
+        self, window_minutes: int, now: float | None = None
+    ) -> float:
+        """
+        Calculate the acceptance rate over a trailing time window.
+
+        Args:
+            window_minutes: Window length in minutes
+            now: End of the window as a Unix timestamp; defaults to now
+
+        Returns:
+            Acceptance rate percentage (0.0 to 100.0)
+            Returns 0.0 if no suggestions were made in the window
+        """
+        return self.get_window_rates(window_minutes, now)["acceptance_rate"]
+
+    def get_metrics(self) -> dict[str, int]:
         """
         Get the current metrics dictionary.
 
@@ -117,101 +835,176 @@ class AcceptanceTracker:
         """
         return self.metrics.copy()
 
-    def export_metrics(self) -> Dict:
+    def _unsaved_counts(self) -> list[int]:
+        """Counters in METRIC_KEYS order, minus those loaded by from_file()."""
+        return [self.metrics[key] - self._loaded_metrics[key] for key in METRIC_KEYS]
+
+    def export_metrics(self) -> dict:
         """
         Export metrics for reporting and aggregation.
 
+        Counters, window buckets and cube cells loaded by from_file() are
+        left out, so saving a loaded tracker adds only what was recorded
+        since the load and the file's totals, cube and windows stay in step.
+
         Returns:
             Dictionary containing action name, timestamp, metrics, and calculated rates
         """
+        summary = summarize_counts(self._unsaved_counts())
         return {
             "action": self.action_name,
             "timestamp": datetime.now().isoformat(),
-            "metrics": self.metrics.copy(),
+            "metrics": {key: summary[key] for key in METRIC_KEYS},
             "rates": {
-                "acceptance_rate": self.get_acceptance_rate(),
-                "rejection_rate": self.get_rejection_rate(),
-                "modification_rate": self.get_modification_rate(),
+                "acceptance_rate": summary["acceptance_rate"],
+                "rejection_rate": summary["rejection_rate"],
+                "modification_rate": summary["modification_rate"],
+            },
+            "total_suggestions": summary["suggestions_made"],
+            "windows": {
+                "bucket_seconds": WINDOW_BUCKET_SECONDS,
+                "buckets": _rows_since(self.windows.to_buckets(), self._loaded_buckets, 1),
             },
-            "total_suggestions": self.metrics["suggestions_made"],
+            "dimensions": dict(self.dimensions),
+            "cube": _rows_since(self.cube.to_rows(), self._loaded_cells, len(DIMENSIONS)),
         }
 
-    def save_to_file(self, filepath: str) -> None:
+    def save_to_file(self, filepath: str | None = None) -> None:
         """
-        Save metrics to a JSON file for persistence.
+        Save metrics to a JSON or NDJSON file for persistence.
+
+        NDJSON paths (see NDJSON_SUFFIXES) are appended to in O(1); other
+        paths use the legacy read-modify-write JSON array. Both hold
+        locked_metrics_file() so concurrent writers do not lose updates.
 
         Args:
-            filepath: Path to the JSON file where metrics will be saved
+            filepath: Path to the file where metrics will be saved; defaults
+                to the date partition of the entry's timestamp
         """
         data = self.export_metrics()
 
-        # Load existing data if file exists
-        existing_data = []
-        if os.path.exists(filepath):
-            with open(filepath, "r") as f:
-                try:
-                    existing_data = json.load(f)
-                    if not isinstance(existing_data, list):
+        if filepath is None:
+            filepath = partition_path(
+                self.action_name, datetime.fromisoformat(data["timestamp"])
+            )
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        if is_ndjson_path(filepath):
+            append_ndjson_record(filepath, data)
+            return
+
+        with locked_metrics_file(filepath):
+            # Load existing data if file exists
+            existing_data = []
+            if os.path.exists(filepath):
+                with open(filepath) as f:
+                    try:
+                        existing_data = json.load(f)
+                        if not isinstance(existing_data, list):
+                            existing_data = []
+                    except json.JSONDecodeError:
                         existing_data = []
-                except json.JSONDecodeError:
-                    existing_data = []
 
-        # Append new data
-        existing_data.append(data)
+            # Append new data
+            existing_data.append(data)
 
-        # Write back to file
-        with open(filepath, "w") as f:
-            json.dump(existing_data, f, indent=2)
+            # Write to a temp file and swap it in so readers never see a
+            # partially written array
+            tmp_path = f"{filepath}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(existing_data, f, indent=2)
+            os.replace(tmp_path, filepath)
 
     def reset_metrics(self) -> None:
-        """Reset all metrics to zero."""
+        """Reset all metrics, window buckets and cube cells to zero."""
         for key in self.metrics:
             self.metrics[key] = 0
+        self.windows.reset()
+        self.cube.reset()
+        self._default_cell = self.cube.cell(self._cell_dimensions())
+        self._loaded_metrics = dict.fromkeys(METRIC_KEYS, 0)
+        self._loaded_buckets = {}
+        self._loaded_cells = {}
 
     @classmethod
-    def from_file(cls, action_name: str, filepath: str) -> "AcceptanceTracker":
+    def from_file(
+        cls,
+        action_name: str,
+        filepath: str,
+        dimensions: Mapping[str, str] | None = None,
+    ) -> "AcceptanceTracker":
         """
-        Load or create a tracker from a JSON file.
+        Load or create a tracker from a JSON or NDJSON file.
 
         Args:
             action_name: Name of the GitHub Action
-            filepath: Path to the JSON file with persisted metrics
+            filepath: Path to the file with persisted metrics
+            dimensions: Optional default tags for outcomes recorded after
+                the load (see __init__)
 
         Returns:
             AcceptanceTracker instance with loaded metrics
+
+        Raises:
+            ValueError: If a dimension name is unknown
         """
-        tracker = cls(action_name)
-
-        if os.path.exists(filepath):
-            with open(filepath, "r") as f:
-                try:
-                    data = json.load(f)
-                    if isinstance(data, list) and data:
-                        # Sum up all metrics from the file
-                        for entry in data:
-                            if entry.get("action") == action_name:
-                                for key, value in entry["metrics"].items():
-                                    if key in tracker.metrics:
-                                        tracker.metrics[key] += value
-                except json.JSONDecodeError:
-                    pass
+        tracker = cls(action_name, dimensions)
+
+        # Sum up all metrics from the file (resumed from a checkpoint for NDJSON)
+        state = load_action_state(filepath)
+        for key, value in state.totals.get(action_name, {}).items():
+            if key in tracker.metrics:
+                tracker.metrics[key] += value
+        if action_name in state.windows:
+            tracker.windows = state.windows[action_name]
+        tracker.cube.merge_rows(
+            row for row in state.cube.to_rows() if row[0] == action_name
+        )
+        tracker._loaded_metrics = tracker.metrics.copy()
+        tracker._loaded_buckets = _rows_by_key(tracker.windows.to_buckets(), 1)
+        tracker._loaded_cells = _rows_by_key(tracker.cube.to_rows(), len(DIMENSIONS))
 
         return tracker
 
 
 def aggregate_metrics_by_action(
-    metrics_data: list, action_name: Optional[str] = None
-) -> Dict:
+    metrics_data: list | str | os.PathLike,
+    action_name: str | None = None,
+    group_by: Sequence[str] | None = None,
+) -> dict:
     """
     Aggregate metrics from multiple tracking entries.
 
     Args:
-        metrics_data: List of metric entries from export_metrics()
+        metrics_data: List of metric entries from export_metrics(), or a path
+            to a JSON-array/NDJSON metrics file
         action_name: Optional filter for specific action
+        group_by: Optional dimension names (see metric_cube.DIMENSIONS) to
+            slice by instead of action. The query runs over the metric cube,
+            which for NDJSON paths is resumed from the checkpoint.
 
     Returns:
-        Aggregated metrics dictionary
+        Aggregated metrics dictionary keyed by action, or by a tuple of
+        dimension values when group_by is given
+
+    Raises:
+        ValueError: If a group_by dimension is unknown
     """
+    if group_by is not None:
+        if isinstance(metrics_data, (str, os.PathLike)):
+            cube = load_metric_cube(os.fspath(metrics_data))
+        else:
+            cube = build_metric_cube(metrics_data)
+
+        filters = {"action": action_name} if action_name else None
+        return {
+            group: summarize_counts(counts)
+            for group, counts in cube.group_by(group_by, filters).items()
+        }
+
+    if isinstance(metrics_data, (str, os.PathLike)):
+        metrics_data = read_metrics_entries(os.fspath(metrics_data))
+
     aggregated = {}
 
     for entry in metrics_data:
@@ -231,7 +1024,7 @@ def aggregate_metrics_by_action(
         for key in aggregated[action]:
             if key == "entries":
                 aggregated[action][key] += 1
-            elif key in entry["metrics"]:
+            elif key in entry.get("metrics", {}):
                 aggregated[action][key] += entry["metrics"][key]
 
     # Calculate rates for each action
@@ -0,0 +1,228 @@
+"""
+Multi-Dimensional Metric Cube
+
+This module provides a pre-aggregated cube of suggestion counters keyed by
+every combination of dimension values (action, repository, model, A/B
+variant, prompt-template hash). Group-by queries and roll-ups scan the
+cube's cells rather than the raw history, so their cost is proportional to
+the number of distinct dimension combinations.
+
+Usage:
+    cube = MetricCube(width=4)
+    cube.add({"action": "review-and-merge", "variant": "treatment"}, [1, 1, 0, 0])
+    cube.group_by(["variant"])      # {("treatment",): [1, 1, 0, 0]}
+"""
+
+import hashlib
+from collections.abc import Iterable, Mapping, Sequence
+
+DIMENSIONS = ("action", "repository", "model", "variant", "prompt_hash")
+UNKNOWN = "unknown"
+ALL = "*"
+
+CellKey = tuple[str, ...]
+
+
+def hash_prompt_template(template: str) -> str:
+    """
+    Hash a prompt template for use as the "prompt_hash" dimension.
+
+    Args:
+        template: Prompt template text
+
+    Returns:
+        First 16 characters of the SHA-256 hash
+    """
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+
+def validate_dimensions(dimensions: Mapping[str, str]) -> None:
+    """
+    Check that all dimension names are known.
+
+    Args:
+        dimensions: Mapping of dimension name to value
+
+    Raises:
+        ValueError: If a dimension name is not in DIMENSIONS
+    """
+    unknown = [name for name in dimensions if name not in DIMENSIONS]
+    if unknown:
+        raise ValueError(
+            f"Unknown dimension(s) {unknown}. Must be among: {list(DIMENSIONS)}"
+        )
+
+
+class MetricCube:
+    """
+    Counter vectors per combination of dimension values.
+
+    Cells are keyed by a tuple of values in DIMENSIONS order; dimensions that
+    were not supplied are stored as UNKNOWN.
+
+    Attributes:
+        width: Number of counters per cell
+    """
+
+    __slots__ = ("width", "_cells")
+
+    def __init__(self, width: int):
+        """
+        Initialize an empty cube.
+
+        Args:
+            width: Number of counters per cell
+        """
+        self.width = width
+        self._cells: dict[CellKey, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    @staticmethod
+    def key_for(dimensions: Mapping[str, str]) -> CellKey:
+        """
+        Build a cell key from a dimension mapping.
+
+        Args:
+            dimensions: Mapping of dimension name to value
+
+        Returns:
+            Tuple of values in DIMENSIONS order
+        """
+        return tuple(str(dimensions.get(name) or UNKNOWN) for name in DIMENSIONS)
+
+    def reset(self) -> None:
+        """Drop all cells."""
+        self._cells = {}
+
+    def cell(self, dimensions: Mapping[str, str]) -> list[int]:
+        """
+        Get the mutable counter list for a dimension combination.
+
+        Callers on hot paths may keep the returned list and increment it
+        directly; it stays attached to the cube until reset().
+
+        Args:
+            dimensions: Mapping of dimension name to value
+
+        Returns:
+            List of `width` counters for the cell
+        """
+        key = self.key_for(dimensions)
+        counts = self._cells.get(key)
+        if counts is None:
+            counts = self._cells[key] = [0] * self.width
+        return counts
+
+    def add(self, dimensions: Mapping[str, str], counts: Sequence[int]) -> None:
+        """
+        Add a counter vector to a cell.
+
+        Args:
+            dimensions: Mapping of dimension name to value
+            counts: Sequence of `width` increments
+        """
+        cell = self.cell(dimensions)
+        for i, count in enumerate(counts):
+            cell[i] += count
+
+    def to_rows(self) -> list[list]:
+        """
+        Export non-empty cells for persistence.
+
+        Returns:
+            List of [*dimension values, *counts] rows, sorted by key
+        """
+        return [
+            [*key, *counts]
+            for key, counts in sorted(self._cells.items())
+            if any(counts)
+        ]
+
+    def merge_rows(self, rows: Iterable[Sequence]) -> None:
+        """
+        Add persisted rows (from to_rows()) into this cube.
+
+        Rows of the wrong length are ignored.
+
+        Args:
+            rows: Iterable of [*dimension values, *counts] rows
+        """
+        size = len(DIMENSIONS)
+        for row in rows:
+            if len(row) != size + self.width:
+                continue
+            key = tuple(str(value) for value in row[:size])
+            counts = self._cells.get(key)
+            if counts is None:
+                counts = self._cells[key] = [0] * self.width
+            for i, count in enumerate(row[size:]):
+                counts[i] += count
+
+    def merge(self, other: "MetricCube") -> None:
+        """
+        Add all cells of another cube into this one.
+
+        Args:
+            other: Cube with the same width
+        """
+        self.merge_rows(other.to_rows())
+
+    def group_by(
+        self,
+        dimensions: Sequence[str],
+        filters: Mapping[str, str] | None = None,
+    ) -> dict[CellKey, list[int]]:
+        """
+        Sum cells grouped by a subset of dimensions.
+
+        Runs in time proportional to the number of cells.
+
+        Args:
+            dimensions: Dimension names to group by (may be empty for a grand total)
+            filters: Optional mapping of dimension name to required value
+
+        Returns:
+            Mapping of grouped dimension values to summed counters
+
+        Raises:
+            ValueError: If a dimension or filter name is unknown
+        """
+        validate_dimensions(dict.fromkeys(dimensions, ""))
+        filters = dict(filters or {})
+        validate_dimensions(filters)
+
+        positions = [DIMENSIONS.index(name) for name in dimensions]
+        filter_positions = [
+            (DIMENSIONS.index(name), str(value)) for name, value in filters.items()
+        ]
+
+        grouped: dict[CellKey, list[int]] = {}
+        for key, counts in self._cells.items():
+            if any(key[pos] != value for pos, value in filter_positions):
+                continue
+            group = tuple(key[pos] for pos in positions)
+            summed = grouped.get(group)
+            if summed is None:
+                summed = grouped[group] = [0] * self.width
+            for i, count in enumerate(counts):
+                summed[i] += count
+        return grouped
+
+    def rollup(self, dimensions: Sequence[str]) -> "MetricCube":
+        """
+        Collapse every dimension not in `dimensions` to ALL.
+
+        Args:
+            dimensions: Dimension names to keep
+
+        Returns:
+            New cube whose cells are the roll-up over the other dimensions
+        """
+        rolled = MetricCube(self.width)
+        for group, counts in self.group_by(dimensions).items():
+            values = dict(zip(dimensions, group, strict=True))
+            key = tuple(values.get(name, ALL) for name in DIMENSIONS)
+            rolled._cells[key] = counts
+        return rolled
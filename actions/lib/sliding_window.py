@@ -0,0 +1,272 @@
+"""
+Sliding-Window Counters
+
+This module provides a fixed-size ring buffer of time buckets with running
+totals per window, so "how many in the last N buckets" is an O(1) query
+with bounded memory.
+
+Usage:
+    counter = SlidingWindowCounter(width=4, windows=(15, 60, 1440))
+    counter.increment(0)            # bucket for "now"
+    counter.totals(15)              # [made, accepted, rejected, modified]
+"""
+
+import time
+from collections.abc import Sequence
+
+DEFAULT_WINDOWS = (15, 60, 1440)
+DEFAULT_BUCKET_SECONDS = 60
+
+
+class SlidingWindowCounter:
+    """
+    Ring buffer of per-bucket counter vectors with O(1) window totals.
+
+    Each bucket holds `width` counters. The ring keeps as many buckets as the
+    largest window; older buckets are dropped as time advances. Running
+    totals of the closed (non-head) buckets are kept per configured window
+    and adjusted as the head moves, so querying a configured window does not
+    scan the ring and recording into the current bucket touches one counter.
+
+    Attributes:
+        width: Number of counters per bucket
+        windows: Configured window sizes, in buckets, ascending
+        bucket_seconds: Length of one bucket in seconds
+    """
+
+    __slots__ = (
+        "width",
+        "windows",
+        "bucket_seconds",
+        "_capacity",
+        "_slots",
+        "_slot_keys",
+        "_head",
+        "_window_totals",
+    )
+
+    def __init__(
+        self,
+        width: int,
+        windows: Sequence[int] = DEFAULT_WINDOWS,
+        bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+    ):
+        """
+        Initialize an empty counter.
+
+        Args:
+            width: Number of counters per bucket
+            windows: Window sizes in buckets (e.g. minutes for 60s buckets)
+            bucket_seconds: Length of one bucket in seconds
+
+        Raises:
+            ValueError: If width, a window size or bucket_seconds is not positive
+        """
+        if width <= 0 or bucket_seconds <= 0 or not windows or min(windows) <= 0:
+            raise ValueError("width, windows and bucket_seconds must be positive")
+
+        self.width = width
+        self.windows = tuple(sorted(set(windows)))
+        self.bucket_seconds = bucket_seconds
+        self._capacity = self.windows[-1]
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all buckets and window totals."""
+        self._slots: list[list[int]] = [[0] * self.width for _ in range(self._capacity)]
+        self._slot_keys: list[int | None] = [None] * self._capacity
+        self._head: int | None = None
+        self._window_totals: dict[int, list[int]] = {
+            window: [0] * self.width for window in self.windows
+        }
+
+    def bucket_for(self, timestamp: float | None = None) -> int:
+        """
+        Get the bucket key for a Unix timestamp.
+
+        Args:
+            timestamp: Seconds since the epoch; defaults to now
+
+        Returns:
+            Bucket key (timestamp // bucket_seconds)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        return int(timestamp // self.bucket_seconds)
+
+    def _advance(self, bucket: int) -> None:
+        """Move the head forward to bucket, expiring buckets that leave each window."""
+        if self._head is not None and bucket <= self._head:
+            return
+
+        if self._head is None or bucket - self._head >= self._capacity:
+            # First bucket, or everything currently held has expired
+            self.reset()
+            self._start_bucket(bucket)
+            self._head = bucket
+            return
+
+        for new in range(self._head + 1, bucket + 1):
+            closing = self._slots[(new - 1) % self._capacity]
+            closing_key = self._slot_keys[(new - 1) % self._capacity]
+            for window, totals in self._window_totals.items():
+                if window == 1:
+                    continue
+                # The previous head joins the closed buckets of this window...
+                if closing_key == new - 1:
+                    for i, count in enumerate(closing):
+                        totals[i] += count
+                # ...and the bucket `window` steps back leaves it
+                leaving = new - window
+                slot = leaving % self._capacity
+                if self._slot_keys[slot] == leaving:
+                    for i, count in enumerate(self._slots[slot]):
+                        totals[i] -= count
+            # The slot for `new` held new - capacity, which just left the
+            # largest window above
+            self._start_bucket(new)
+        self._head = bucket
+
+    def _start_bucket(self, bucket: int) -> None:
+        """Claim and zero the slot for bucket, which is about to become the head."""
+        slot = bucket % self._capacity
+        self._slots[slot] = [0] * self.width
+        self._slot_keys[slot] = bucket
+
+    def add(self, counts: Sequence[int], timestamp: float | None = None) -> bool:
+        """
+        Add a counter vector to the bucket containing timestamp.
+
+        Args:
+            counts: Sequence of `width` increments
+            timestamp: Seconds since the epoch; defaults to now
+
+        Returns:
+            False if the bucket is older than the largest window and was dropped
+        """
+        bucket = self.bucket_for(timestamp)
+        self._advance(bucket)
+        if bucket <= self._head - self._capacity:
+            return False
+
+        slot = bucket % self._capacity
+        if self._slot_keys[slot] != bucket:
+            self._slots[slot] = [0] * self.width
+            self._slot_keys[slot] = bucket
+
+        bucket_counts = self._slots[slot]
+        for i, count in enumerate(counts):
+            bucket_counts[i] += count
+        if bucket == self._head:
+            return True
+
+        for window, totals in self._window_totals.items():
+            if bucket > self._head - window:
+                for i, count in enumerate(counts):
+                    totals[i] += count
+        return True
+
+    def increment(
+        self, index: int, amount: int = 1, timestamp: float | None = None
+    ) -> bool:
+        """
+        Increment a single counter in the bucket containing timestamp.
+
+        Args:
+            index: Counter index (0 <= index < width)
+            amount: Increment
+            timestamp: Seconds since the epoch; defaults to now
+
+        Returns:
+            False if the bucket is older than the largest window and was dropped
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        head = self._head
+        if timestamp // self.bucket_seconds == head:
+            # Fast path: window totals exclude the head bucket
+            self._slots[head % self._capacity][index] += amount
+            return True
+
+        counts = [0] * self.width
+        counts[index] = amount
+        return self.add(counts, timestamp)
+
+    def totals(self, window: int, timestamp: float | None = None) -> list[int]:
+        """
+        Sum counters over the last `window` buckets ending at timestamp.
+
+        Configured windows are answered from running totals in O(width);
+        other windows up to the ring size are summed from the buckets.
+
+        Args:
+            window: Window size in buckets
+            timestamp: End of the window in seconds since the epoch; defaults to now
+
+        Returns:
+            List of `width` summed counters
+
+        Raises:
+            ValueError: If window is not positive or exceeds the ring size
+        """
+        if window <= 0 or window > self._capacity:
+            raise ValueError(
+                f"Window must be between 1 and {self._capacity} buckets, got {window}"
+            )
+
+        self._advance(self.bucket_for(timestamp))
+        if self._head is None:
+            return [0] * self.width
+
+        if window in self._window_totals:
+            head_counts = self._slots[self._head % self._capacity]
+            return [
+                closed + current
+                for closed, current in zip(
+                    self._window_totals[window], head_counts, strict=True
+                )
+            ]
+
+        summed = [0] * self.width
+        for key, counts in zip(self._slot_keys, self._slots, strict=True):
+            if key is not None and key > self._head - window:
+                for i, count in enumerate(counts):
+                    summed[i] += count
+        return summed
+
+    def to_buckets(self) -> list[list[int]]:
+        """
+        Export non-empty buckets for persistence.
+
+        Returns:
+            List of [bucket_key, *counts] rows, oldest first
+        """
+        rows = [
+            [key, *counts]
+            for key, counts in zip(self._slot_keys, self._slots, strict=True)
+            if key is not None and any(counts)
+        ]
+        rows.sort(key=lambda row: row[0])
+        return rows
+
+    def merge_buckets(self, rows: Sequence[Sequence[int]]) -> None:
+        """
+        Add persisted bucket rows (from to_buckets()) into this counter.
+
+        Rows older than the ring relative to the newest bucket are dropped.
+
+        Args:
+            rows: Iterable of [bucket_key, *counts] rows
+        """
+        parsed: list[tuple[int, Sequence[int]]] = []
+        for row in rows:
+            if len(row) != self.width + 1:
+                continue
+            parsed.append((int(row[0]), row[1:]))
+
+        if not parsed:
+            return
+        newest = max(key for key, _ in parsed)
+        self._advance(newest)
+        for key, counts in parsed:
+            self.add(counts, timestamp=key * self.bucket_seconds)
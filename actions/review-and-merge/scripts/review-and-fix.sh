@@ -17,6 +17,15 @@ COMMENT_TEMPLATE="${7}"
 ACTION_PATH="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 TEMPLATE_DIR="${ACTION_PATH}/templates"
 
+# Step spans for telemetry (no-ops when the helpers are not available)
+TELEMETRY_SH="${ACTION_PATH}/../../scripts/telemetry.sh"
+if [ -f "$TELEMETRY_SH" ]; then
+  source "$TELEMETRY_SH"
+else
+  span_begin() { :; }
+  span_end() { :; }
+fi
+
 # Security: Check Claude CLI availability
 if ! command -v claude &> /dev/null; then
   echo "::error::Claude CLI not found. Please install Claude Code CLI before using this action."
@@ -57,11 +66,14 @@ if [ "$AUTO_FIX" = "true" ]; then
 
   # Run Claude in review-only mode (no --dangerously-skip-permissions for security)
   # Claude will analyze the diff and suggest fixes but won't modify files directly
+  span_begin claude
   if claude --model "$MODEL" < /tmp/fix_prompt.txt > /tmp/claude_output.txt 2>&1; then
      echo "Claude fix analysis completed"
+     span_end claude success
   else
      claude_exit_code=$?
      echo "Claude execution failed with exit code: $claude_exit_code"
+     span_end claude failure "exit code $claude_exit_code"
      # Don't exit - allow review to proceed even if fix fails
   fi
 
@@ -90,6 +102,7 @@ if [ "$AUTO_FIX" = "true" ]; then
       retry_count=0
       push_success=false
 
+      span_begin git-push
       while [ $retry_count -lt $max_retries ] && [ "$push_success" = false ]; do
         # Use --force-with-lease for safer force push during concurrent operations
         if git push --force-with-lease; then
@@ -111,10 +124,12 @@ if [ "$AUTO_FIX" = "true" ]; then
             git reset --hard HEAD@{1}
             SUMMARY="Failed to apply auto-fixes due to git conflict."
             MADE_CHANGES="false"
+            span_end git-push failure "push failed after $max_retries attempts"
             exit 1
           fi
         fi
       done
+      span_end git-push success
     fi
   fi
 
@@ -156,11 +171,14 @@ else
   cat /tmp/pr_diff.patch >> /tmp/review_prompt.txt
 
   # Run Claude in review-only mode (no --dangerously-skip-permissions for security)
+  span_begin claude
   if claude --model "$MODEL" < /tmp/review_prompt.txt > /tmp/claude_response.json 2>&1; then
     echo "Claude review completed"
+    span_end claude success
   else
     claude_exit_code=$?
     echo "Claude review failed with exit code: $claude_exit_code"
+    span_end claude failure "exit code $claude_exit_code"
     echo '{"verdict":"REQUEST_CHANGES","confidence":1,"summary":"Claude CLI error - review failed"}' > /tmp/claude_response.json
   fi
 
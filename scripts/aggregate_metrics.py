@@ -3,33 +3,162 @@
 Aggregate Acceptance Rate Metrics
 
 This script collects and aggregates acceptance rate metrics from GitHub Actions
-workflow runs. It reads metrics stored in JSON files and generates summary reports.
+workflow runs. It reads metrics stored in JSON-array or append-only NDJSON
+(.ndjson/.jsonl) files and generates summary reports.
 
 Usage:
     python scripts/aggregate_metrics.py --since '7 days ago' --output metrics/acceptance_rate.json
+    python scripts/aggregate_metrics.py --group-by model,variant
+    python scripts/aggregate_metrics.py --state-file .metrics-cache/aggregate_state.json
+    python scripts/aggregate_metrics.py --workers 8
+    python scripts/aggregate_metrics.py --emit-partial partials/run-123.json
+
+Partial aggregates:
+    --emit-partial writes the run's PartialAggregate: per-action counters
+    (rate numerators and denominators), entry counts, first/last seen and
+    timestamp bounds. reduce_partial_aggregates.py merges any number of
+    them, in a tree, into the same output this script would produce from
+    the concatenated raw data.
+
+Partitions:
+    Files under YYYY/MM/DD directories (e.g. metrics/acceptance/2026/01/31/,
+    the AcceptanceTracker default) are selected for --since by directory
+    name: older partitions are pruned without being listed, and only the
+    partition for the --since day is filtered entry by entry. Files outside
+    partitions fall back to their modification time.
+
+Incremental mode:
+    With --state-file, a manifest of processed files (path, size, mtime,
+    content hash) and each file's partial aggregate is persisted. Later runs
+    only parse new or changed files and merge the cached partials; the
+    output is identical to a full recompute. --full-rebuild ignores the
+    existing state and rewrites it.
+
+Streaming:
+    Files are read one at a time (NDJSON line by line, JSON arrays element
+    by element) and each file's entries are folded into a small per-action
+    partial aggregate, so memory stays flat regardless of total history.
+
+Rollups:
+    With --rollup-file, hourly and daily counters per action are kept up to
+    date incrementally (see metrics_rollup.py) and --since is answered from
+    them per entry timestamp; raw entries are read only for the partial
+    hour at the start of the window.
+
+Parallel mode:
+    --workers N parses files in a process pool. Each worker returns a
+    per-action partial aggregate rather than raw entries, so only small
+    dictionaries cross process boundaries.
 """
 
 import argparse
+import hashlib
 import json
-from datetime import datetime, timedelta
+import os
+import re
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-def find_metrics_files(
+from metrics_rollup import RollupStore, normalize_timestamp  # noqa: E402
+
+from actions.lib.acceptance_tracker import (  # noqa: E402
+    METRIC_KEYS,
+    build_metric_cube,
+    iter_ndjson_entries,
+    load_metric_cube,
+    summarize_counts,
+)
+from actions.lib.metric_cube import DIMENSIONS, MetricCube  # noqa: E402
+
+METRICS_FILE_PATTERNS = ("*.json", "*.ndjson", "*.jsonl")
+METRICS_FILE_SUFFIXES = tuple(pattern[1:] for pattern in METRICS_FILE_PATTERNS)
+STATE_VERSION = 1
+PARTIAL_VERSION = 1
+PARTIAL_KEYS = frozenset(
+    METRIC_KEYS + ("entries", "first_seen", "last_seen", "min_timestamp", "max_timestamp")
+)
+ROLLUP_SCHEMA = "acceptance/1"
+JSON_READ_CHUNK = 1 << 16
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_PARTITION_PARTS = (re.compile(r"\d{4}"), re.compile(r"\d{2}"), re.compile(r"\d{2}"))
+
+
+def _partition_key(directory: str) -> tuple[int, ...]:
+    """
+    Get the (year[, month[, day]]) prefix a directory path names, if any.
+
+    Args:
+        directory: Directory path
+
+    Returns:
+        Tuple of up to three ints, empty if the path is not a date partition
+    """
+    parts = Path(directory).parts
+    for depth in (3, 2, 1):
+        tail = parts[-depth:]
+        if len(tail) == depth and all(
+            pattern.fullmatch(part) for pattern, part in zip(_PARTITION_PARTS, tail, strict=False)
+        ):
+            return tuple(int(part) for part in tail)
+    return ()
+
+
+def partition_date(file_path: str) -> date | None:
+    """
+    Get the date of the YYYY/MM/DD partition containing a metrics file.
+
+    Args:
+        file_path: Metrics file path
+
+    Returns:
+        Partition date, or None if the file is not in a day partition
+    """
+    key = _partition_key(os.path.dirname(file_path))
+    if len(key) != 3:
+        return None
+    try:
+        return date(*key)
+    except ValueError:
+        return None
+
+
+def boundary_cutoff(file_path: str, since: datetime | None) -> str | None:
+    """
+    Get the per-entry timestamp cutoff for a file, if it needs one.
+
+    Only the partition for the --since day straddles the cutoff; later
+    partitions are included whole and earlier ones are pruned by the scan.
+
+    Args:
+        file_path: Metrics file path
+        since: Start of the time range
+
+    Returns:
+        ISO timestamp entries must be at or after, or None for no filtering
+    """
+    if since is not None and partition_date(file_path) == since.date():
+        return since.isoformat()
+    return None
+
+
+def iter_metrics_files(
     root_dir: str = ".", since: datetime | None = None
-) -> list[str]:
+) -> Iterator[str]:
     """
-    Find all metrics JSON files in the repository.
+    Lazily yield metrics files in the repository.
 
     Args:
         root_dir: Root directory to search
         since: Only include files modified after this datetime
 
-    Returns:
-        List of file paths containing metrics
+    Yields:
+        Paths of files containing metrics
     """
-    metrics_files = []
-
     # Search in common locations where actions might store metrics
     search_paths = [
         Path(root_dir) / "metrics",
@@ -38,27 +167,192 @@ def find_metrics_files(
     ]
 
     for search_path in search_paths:
-        if not search_path.exists():
+        if not search_path.is_dir():
             continue
 
-        for file_path in search_path.rglob("*.json"):
-            # Filter by modification time if since is provided
-            if since:
-                mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
+        since_key = (since.year, since.month, since.day) if since else None
+        for entry in _scan_metrics_entries(str(search_path), since_key):
+            # Partitioned files were selected by directory name; filter
+            # the rest by modification time if since is provided
+            if since and partition_date(entry.path) is None:
+                mod_time = datetime.fromtimestamp(entry.stat().st_mtime)
                 if mod_time < since:
                     continue
 
-            metrics_files.append(str(file_path))
+            yield entry.path
 
-    return metrics_files
+
+def find_metrics_files(
+    root_dir: str = ".", since: datetime | None = None
+) -> list[str]:
+    """
+    Find all metrics JSON files in the repository.
+
+    Args:
+        root_dir: Root directory to search
+        since: Only include files modified after this datetime
+
+    Returns:
+        List of file paths containing metrics
+    """
+    return list(iter_metrics_files(root_dir, since))
+
+
+def _scan_metrics_entries(
+    directory: str, since_key: tuple[int, int, int] | None = None
+):
+    """
+    Recursively yield metrics files under directory using os.scandir.
+
+    Symlinked directories are not followed. Unreadable directories are skipped.
+
+    Args:
+        directory: Directory to scan
+        since_key: Optional (year, month, day); YYYY[/MM[/DD]] partition
+            directories entirely before it are not descended into
+
+    Yields:
+        os.DirEntry for each file with a metrics suffix
+    """
+    try:
+        with os.scandir(directory) as entries:
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(METRICS_FILE_SUFFIXES) and entry.is_file():
+                    yield entry
+    except OSError:
+        return
+
+    for subdir in subdirs:
+        if since_key is not None:
+            key = _partition_key(subdir)
+            if key and key < since_key[:len(key)]:
+                continue
+        yield from _scan_metrics_entries(subdir, since_key)
+
+
+def _iter_json_array(f, buffer: str, pos: int) -> Iterator:
+    """
+    Decode the elements of a JSON array one at a time.
+
+    Args:
+        f: Text file positioned after buffer
+        buffer: Text read so far
+        pos: Index in buffer just past the opening bracket
+
+    Yields:
+        Array elements
+
+    Raises:
+        json.JSONDecodeError: If the array is malformed or followed by extra data
+    """
+    decoder = json.JSONDecoder()
+    eof = False
+    expect_value = True
+    allow_close = True
+
+    def refill():
+        nonlocal buffer, pos, eof
+        chunk = f.read(JSON_READ_CHUNK)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            refill()
+            continue
+
+        char = buffer[pos]
+        if expect_value and not (char == "]" and allow_close):
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                refill()
+                continue
+            # A value ending at the buffer edge may be a truncated number
+            if end == len(buffer) and not eof:
+                refill()
+                continue
+            yield value
+            pos = end
+            expect_value = False
+        elif char == ",":
+            pos += 1
+            expect_value = True
+            allow_close = False
+        elif char == "]":
+            pos += 1
+            break
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer):
+            raise json.JSONDecodeError("Extra data", buffer, pos)
+        if eof:
+            return
+        refill()
+
+
+def iter_file_entries(file_path: str) -> Iterator:
+    """
+    Lazily read the entries of one metrics file.
+
+    NDJSON files are read line by line and JSON arrays are decoded element
+    by element, so memory does not grow with the file size. A JSON file
+    holding a single object yields that object.
+
+    Args:
+        file_path: Metrics file path
+
+    Yields:
+        Metric entries
+
+    Raises:
+        OSError: If the file cannot be read
+        json.JSONDecodeError: If a JSON file is malformed (possibly after
+            some of its entries were yielded)
+    """
+    with open(file_path) as f:
+        if file_path.endswith((".ndjson", ".jsonl")):
+            yield from iter_ndjson_entries(f)
+            return
+
+        buffer = ""
+        pos = 0
+        while pos == len(buffer):
+            chunk = f.read(JSON_READ_CHUNK)
+            if not chunk:
+                break
+            buffer += chunk
+            pos = _WHITESPACE.match(buffer).end()
+
+        if buffer[pos:pos + 1] == "[":
+            yield from _iter_json_array(f, buffer, pos + 1)
+            return
+
+        data = json.loads(buffer + f.read())
+        if isinstance(data, dict):
+            yield data
 
 
 def load_metrics_data(file_paths: list[str]) -> list[dict]:
     """
-    Load metrics data from multiple JSON files.
+    Load metrics data from multiple JSON or NDJSON files.
+
+    Prefer stream_aggregate() for aggregation: this materializes every entry.
 
     Args:
-        file_paths: List of JSON file paths to load
+        file_paths: List of metrics file paths to load
 
     Returns:
         List of metric entries
@@ -67,28 +361,24 @@ def load_metrics_data(file_paths: list[str]) -> list[dict]:
 
     for file_path in file_paths:
         try:
-            with open(file_path) as f:
-                data = json.load(f)
-
-                # Handle both list and single object formats
-                if isinstance(data, list):
-                    all_metrics.extend(data)
-                elif isinstance(data, dict):
-                    all_metrics.append(data)
+            # Collect per file so a malformed file contributes nothing
+            file_entries = list(iter_file_entries(file_path))
         except (OSError, json.JSONDecodeError) as e:
             print(f"Warning: Could not load {file_path}: {e}")
+            continue
+        all_metrics.extend(file_entries)
 
     return all_metrics
 
 
 def aggregate_metrics(
-    metrics_data: list[dict], action_name: str | None = None
+    metrics_data: Iterable[dict], action_name: str | None = None
 ) -> dict:
     """
     Aggregate metrics by action.
 
     Args:
-        metrics_data: List of metric entries
+        metrics_data: Metric entries (any iterable; consumed in one pass)
         action_name: Optional filter for specific action
 
     Returns:
@@ -129,7 +419,21 @@ def aggregate_metrics(
             if timestamp > aggregated[action]["last_seen"]:
                 aggregated[action]["last_seen"] = timestamp
 
-    # Calculate rates for each action
+    add_rates(aggregated)
+
+    return aggregated
+
+
+def add_rates(aggregated: dict) -> dict:
+    """
+    Calculate acceptance, rejection and modification rates in place.
+
+    Args:
+        aggregated: Aggregated metrics by action
+
+    Returns:
+        The same dictionary, with rate keys set for every action
+    """
     for action in aggregated:
         total = aggregated[action]["suggestions_made"]
         if total > 0:
@@ -150,6 +454,717 @@ def aggregate_metrics(
     return aggregated
 
 
+def build_partial_aggregate(metrics_data: Iterable[dict]) -> dict:
+    """
+    Build a mergeable per-action partial aggregate for one file's entries.
+
+    The partial holds the counters, entry count and first/last seen exactly
+    as aggregate_metrics() would produce for these entries alone, plus the
+    minimum and maximum non-empty timestamps so partials can be merged in
+    file order with the same result as aggregating the concatenated entries.
+
+    Args:
+        metrics_data: Metric entries from a single file (consumed in one pass)
+
+    Returns:
+        Partial aggregate keyed by action
+    """
+    partial = {}
+
+    for entry in metrics_data:
+        action = entry.get("action", "unknown")
+        part = partial.get(action)
+        if part is None:
+            part = partial[action] = {
+                "suggestions_made": 0,
+                "suggestions_accepted": 0,
+                "suggestions_rejected": 0,
+                "suggestions_modified": 0,
+                "entries": 0,
+                "first_seen": entry.get("timestamp"),
+                "last_seen": entry.get("timestamp"),
+                "min_timestamp": None,
+                "max_timestamp": None,
+            }
+
+        metrics = entry.get("metrics", {})
+        for key in METRIC_KEYS:
+            if key in metrics:
+                part[key] += metrics[key]
+        part["entries"] += 1
+
+        timestamp = entry.get("timestamp", "")
+        if timestamp:
+            if timestamp < part["first_seen"]:
+                part["first_seen"] = timestamp
+            if timestamp > part["last_seen"]:
+                part["last_seen"] = timestamp
+            if part["min_timestamp"] is None or timestamp < part["min_timestamp"]:
+                part["min_timestamp"] = timestamp
+            if part["max_timestamp"] is None or timestamp > part["max_timestamp"]:
+                part["max_timestamp"] = timestamp
+
+    return partial
+
+
+def merge_partial_into(
+    target: dict, partial: dict, action_name: str | None = None
+) -> dict:
+    """
+    Merge one partial aggregate into another, keeping the result mergeable.
+
+    Args:
+        target: Partial aggregate updated in place (earlier in file order)
+        partial: Partial aggregate from build_partial_aggregate()
+        action_name: Optional filter for specific action
+
+    Returns:
+        target
+    """
+    for action, part in partial.items():
+        if action_name and action != action_name:
+            continue
+
+        if action not in target:
+            target[action] = dict(part)
+            continue
+
+        merged = target[action]
+        for key in ["suggestions_made", "suggestions_accepted", "suggestions_rejected", "suggestions_modified", "entries"]:
+            merged[key] += part[key]
+        for timestamp in (part["min_timestamp"], part["max_timestamp"]):
+            if timestamp:
+                if timestamp < merged["first_seen"]:
+                    merged["first_seen"] = timestamp
+                if timestamp > merged["last_seen"]:
+                    merged["last_seen"] = timestamp
+                if merged["min_timestamp"] is None or timestamp < merged["min_timestamp"]:
+                    merged["min_timestamp"] = timestamp
+                if merged["max_timestamp"] is None or timestamp > merged["max_timestamp"]:
+                    merged["max_timestamp"] = timestamp
+
+    return target
+
+
+def finalize_partial_aggregate(partial: dict) -> dict:
+    """
+    Turn a partial aggregate into the final aggregate in place.
+
+    Args:
+        partial: Partial aggregate
+
+    Returns:
+        The same dictionary without timestamp bounds and with rates added
+    """
+    for action_metrics in partial.values():
+        action_metrics.pop("min_timestamp", None)
+        action_metrics.pop("max_timestamp", None)
+    return add_rates(partial)
+
+
+def merge_partial_aggregates(
+    partials: list[dict], action_name: str | None = None
+) -> dict:
+    """
+    Merge per-file partial aggregates, in file order, into the final aggregate.
+
+    Args:
+        partials: Partial aggregates from build_partial_aggregate()
+        action_name: Optional filter for specific action
+
+    Returns:
+        Aggregated metrics dictionary, identical to aggregate_metrics() over
+        the concatenated entries
+    """
+    aggregated = {}
+    for partial in partials:
+        merge_partial_into(aggregated, partial, action_name)
+    return finalize_partial_aggregate(aggregated)
+
+
+def fold_file(
+    file_path: str,
+    action_name: str | None = None,
+    since: datetime | None = None,
+) -> tuple[dict, int]:
+    """
+    Stream one file's entries through the filters into a partial aggregate.
+
+    Args:
+        file_path: Metrics file path
+        action_name: Optional filter for specific action
+        since: Optional start of the time range, applied to entries of the
+            boundary partition only (see boundary_cutoff)
+
+    Returns:
+        Tuple of (partial aggregate, entries kept by the time filter)
+
+    Raises:
+        OSError: If the file cannot be read
+        json.JSONDecodeError: If a JSON file is malformed
+    """
+    count = 0
+
+    def tally(entries):
+        nonlocal count
+        for entry in entries:
+            count += 1
+            yield entry
+
+    records = iter_file_entries(file_path)
+    cutoff = boundary_cutoff(file_path, since)
+    if cutoff is not None:
+        records = (
+            entry for entry in records
+            if not entry.get("timestamp") or entry["timestamp"] >= cutoff
+        )
+    records = tally(records)
+    if action_name:
+        records = (entry for entry in records if entry.get("action") == action_name)
+    return build_partial_aggregate(records), count
+
+
+def fold_files(
+    file_paths: Iterable[str],
+    action_name: str | None = None,
+    since: datetime | None = None,
+) -> tuple[dict, int]:
+    """
+    Fold files, in order, into a single partial aggregate.
+
+    Each file is folded on its own and merged only once it has been read
+    completely, so a malformed file contributes nothing (as with
+    load_metrics_data()). Only one entry is held in memory at a time.
+
+    Args:
+        file_paths: Metrics file paths (any iterable)
+        action_name: Optional filter for specific action
+        since: Optional start of the time range for boundary partitions
+
+    Returns:
+        Tuple of (partial aggregate, total entries loaded)
+    """
+    folded = {}
+    total = 0
+
+    for file_path in file_paths:
+        try:
+            partial, count = fold_file(file_path, action_name, since)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not load {file_path}: {e}")
+            continue
+        merge_partial_into(folded, partial)
+        total += count
+
+    return folded, total
+
+
+def stream_aggregate(
+    file_paths: Iterable[str],
+    action_name: str | None = None,
+    since: datetime | None = None,
+) -> tuple[dict, int]:
+    """
+    Aggregate metrics files in constant memory.
+
+    Equivalent to aggregate_metrics(load_metrics_data(file_paths), action_name)
+    without materializing the entries.
+
+    Args:
+        file_paths: Metrics file paths (any iterable)
+        action_name: Optional filter for specific action
+        since: Optional start of the time range for boundary partitions
+
+    Returns:
+        Tuple of (aggregated metrics dictionary, total entries loaded)
+    """
+    folded, total = fold_files(file_paths, action_name, since)
+    return finalize_partial_aggregate(folded), total
+
+
+class PartialAggregate:
+    """
+    Serializable, mergeable aggregate of metric entries.
+
+    Wraps a per-action partial aggregate (see build_partial_aggregate()):
+    the suggestion counters (suggestions_made is the denominator of every
+    rate, the accepted/rejected/modified counters its numerators), entry
+    counts, first/last seen, and the timestamp bounds that make merging
+    exact. Rates are only computed by finalize(), from the merged counters.
+
+    merge() is associative, so partials emitted by separate runners can be
+    reduced in any tree shape. Merge them in the order of their raw data:
+    as in aggregate_metrics(), an action's first entry seeds first/last
+    seen even when it has no timestamp.
+
+    Attributes:
+        actions: Partial aggregate keyed by action
+    """
+
+    __slots__ = ("actions",)
+
+    def __init__(self, actions: dict | None = None):
+        """
+        Initialize from a partial aggregate.
+
+        Args:
+            actions: Partial aggregate keyed by action (default: empty)
+        """
+        self.actions = actions if actions is not None else {}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PartialAggregate):
+            return NotImplemented
+        return self.actions == other.actions
+
+    @property
+    def entry_count(self) -> int:
+        """Number of metric entries folded in."""
+        return sum(part["entries"] for part in self.actions.values())
+
+    @classmethod
+    def from_entries(cls, metrics_data: Iterable[dict]) -> "PartialAggregate":
+        """
+        Fold metric entries into a partial aggregate.
+
+        Args:
+            metrics_data: Metric entries (consumed in one pass)
+
+        Returns:
+            PartialAggregate of the entries
+        """
+        return cls(build_partial_aggregate(metrics_data))
+
+    @classmethod
+    def from_partials(
+        cls, partials: Iterable[dict], action_name: str | None = None
+    ) -> "PartialAggregate":
+        """
+        Merge per-file partial aggregates, in file order.
+
+        Args:
+            partials: Partial aggregates from build_partial_aggregate()
+            action_name: Optional filter for specific action
+
+        Returns:
+            PartialAggregate of all partials
+        """
+        merged = {}
+        for partial in partials:
+            merge_partial_into(merged, partial, action_name)
+        return cls(merged)
+
+    @classmethod
+    def from_files(
+        cls,
+        file_paths: Iterable[str],
+        action_name: str | None = None,
+        since: datetime | None = None,
+    ) -> tuple["PartialAggregate", int]:
+        """
+        Stream metrics files into a partial aggregate (see fold_files()).
+
+        Args:
+            file_paths: Metrics file paths (any iterable)
+            action_name: Optional filter for specific action
+            since: Optional start of the time range for boundary partitions
+
+        Returns:
+            Tuple of (PartialAggregate, total entries loaded)
+        """
+        folded, total = fold_files(file_paths, action_name, since)
+        return cls(folded), total
+
+    def merge(self, other: "PartialAggregate") -> "PartialAggregate":
+        """
+        Combine with a partial aggregate of later entries.
+
+        Args:
+            other: PartialAggregate whose raw data follows this one's
+
+        Returns:
+            New PartialAggregate; neither operand is modified
+        """
+        merged = {action: dict(part) for action, part in self.actions.items()}
+        return PartialAggregate(merge_partial_into(merged, other.actions))
+
+    def finalize(self, action_name: str | None = None) -> dict:
+        """
+        Compute the final aggregate, with rates.
+
+        Args:
+            action_name: Optional filter for specific action
+
+        Returns:
+            Aggregated metrics dictionary, identical to aggregate_metrics()
+            over the raw entries
+        """
+        return merge_partial_aggregates([self.actions], action_name)
+
+    def to_dict(self) -> dict:
+        """
+        Serialize to a JSON-compatible dictionary.
+
+        Returns:
+            Dictionary with the format version and per-action partials
+        """
+        return {"version": PARTIAL_VERSION, "actions": self.actions}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PartialAggregate":
+        """
+        Deserialize a dictionary produced by to_dict().
+
+        Args:
+            data: Serialized partial aggregate
+
+        Returns:
+            PartialAggregate
+
+        Raises:
+            ValueError: If the data is not a partial aggregate of this version
+        """
+        if not isinstance(data, dict) or data.get("version") != PARTIAL_VERSION:
+            raise ValueError(f"Not a version {PARTIAL_VERSION} partial aggregate")
+        actions = data.get("actions")
+        if not isinstance(actions, dict) or not all(
+            isinstance(part, dict) and PARTIAL_KEYS <= part.keys()
+            for part in actions.values()
+        ):
+            raise ValueError("Malformed partial aggregate actions")
+        return cls({action: dict(part) for action, part in actions.items()})
+
+    def save(self, path: str) -> None:
+        """
+        Write the partial aggregate to path atomically.
+
+        Args:
+            path: Output file path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PartialAggregate":
+        """
+        Read a partial aggregate written by save().
+
+        Args:
+            path: Partial aggregate file path
+
+        Returns:
+            PartialAggregate
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid partial aggregate
+        """
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def _load_partial_chunk(
+    file_paths: list[str], since: datetime | None = None
+) -> tuple[dict, int]:
+    """Process-pool worker: stream a chunk of files into one partial aggregate."""
+    return fold_files(file_paths, since=since)
+
+
+def _chunk(items: list, workers: int) -> list[list]:
+    """Split items into contiguous chunks, a few per worker for load balancing."""
+    if not items:
+        return []
+    size = max(1, -(-len(items) // (workers * 4)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def load_partial_aggregates(
+    file_paths: list[str], workers: int = 1, since: datetime | None = None
+) -> tuple[list[dict], int]:
+    """
+    Parse files into per-chunk partial aggregates, optionally in parallel.
+
+    Files are split into contiguous chunks and each chunk is folded into one
+    partial aggregate, so merge_partial_aggregates() over the result (which
+    stays in file order) equals aggregate_metrics() over all entries.
+
+    Args:
+        file_paths: Metrics file paths to load
+        workers: Number of worker processes; 1 parses in this process
+        since: Optional start of the time range for boundary partitions
+
+    Returns:
+        Tuple of (partial aggregates in file order, total entries loaded)
+    """
+    if workers <= 1 or len(file_paths) <= 1:
+        results = [_load_partial_chunk(file_paths, since)] if file_paths else []
+    else:
+        chunks = _chunk(file_paths, workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_load_partial_chunk, chunks, [since] * len(chunks)))
+
+    partials = [partial for partial, _ in results]
+    return partials, sum(count for _, count in results)
+
+
+def _build_file_record(file_path: str, content_hash: str | None = None) -> dict:
+    """Process-pool worker: parse one file into its manifest record."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        stat = None
+    if content_hash is None:
+        content_hash = _safe_sha256(file_path)
+    partial, entry_count = fold_files([file_path])
+    return {
+        "size": stat.st_size if stat else None,
+        "mtime_ns": stat.st_mtime_ns if stat else None,
+        "sha256": content_hash,
+        "entry_count": entry_count,
+        "partial": partial,
+    }
+
+
+def _safe_sha256(file_path: str) -> str | None:
+    """Hash a file's contents, or return None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def load_aggregate_state(state_path: str) -> dict:
+    """
+    Load the incremental aggregation state.
+
+    Args:
+        state_path: Path to the state file
+
+    Returns:
+        State dictionary; empty if missing, unreadable or from another version
+    """
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"version": STATE_VERSION, "files": {}}
+
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return {"version": STATE_VERSION, "files": {}}
+    state.setdefault("files", {})
+    return state
+
+
+def save_aggregate_state(state_path: str, state: dict) -> None:
+    """
+    Atomically write the incremental aggregation state.
+
+    Args:
+        state_path: Path to the state file
+        state: State dictionary from update_aggregate_state()
+    """
+    path = Path(state_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def update_aggregate_state(
+    state: dict,
+    file_paths: list[str],
+    workers: int = 1,
+    since: datetime | None = None,
+) -> dict:
+    """
+    Bring the manifest up to date with the given files.
+
+    Files whose size and mtime match the manifest are reused without being
+    read. Otherwise the content hash is compared, and only new or changed
+    files are parsed. Manifest entries for files not in file_paths are
+    dropped. Files in the --since boundary partition are filtered per entry
+    and therefore always parsed and never cached.
+
+    Args:
+        state: State from load_aggregate_state(); updated in place
+        file_paths: Metrics files included in this run
+        workers: Number of worker processes used to parse changed files
+        since: Optional start of the time range for boundary partitions
+
+    Returns:
+        Dictionary with "partials" (in file_paths order), "entries" (total
+        entries loaded), "reused" and "parsed" file counts
+    """
+    previous = state.get("files", {})
+    files = {}
+    to_parse = []
+    boundary = {}
+
+    for file_path in file_paths:
+        if boundary_cutoff(file_path, since) is not None:
+            partial, entry_count = fold_files([file_path], since=since)
+            boundary[file_path] = {"entry_count": entry_count, "partial": partial}
+            continue
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            stat = None
+
+        cached = previous.get(file_path)
+        content_hash = None
+        if stat is not None and cached is not None:
+            if cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+                files[file_path] = cached
+                continue
+            content_hash = _safe_sha256(file_path)
+            if content_hash is not None and content_hash == cached["sha256"]:
+                files[file_path] = dict(cached, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                continue
+
+        to_parse.append((file_path, content_hash))
+
+    if workers > 1 and len(to_parse) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            records = list(executor.map(
+                _build_file_record,
+                [path for path, _ in to_parse],
+                [content_hash for _, content_hash in to_parse],
+                chunksize=max(1, len(to_parse) // (workers * 4)),
+            ))
+    else:
+        records = [_build_file_record(path, content_hash) for path, content_hash in to_parse]
+    for (file_path, _), record in zip(to_parse, records, strict=True):
+        files[file_path] = record
+
+    state["version"] = STATE_VERSION
+    state["files"] = {
+        file_path: files[file_path] for file_path in file_paths if file_path in files
+    }
+    ordered = [boundary.get(file_path) or files[file_path] for file_path in file_paths]
+    return {
+        "partials": [record["partial"] for record in ordered],
+        "entries": sum(record["entry_count"] for record in ordered),
+        "reused": len(file_paths) - len(to_parse) - len(boundary),
+        "parsed": len(to_parse) + len(boundary),
+    }
+
+
+def aggregate_by_dimensions(
+    file_paths: list[str],
+    group_by: list[str],
+    action_name: str | None = None,
+    since: datetime | None = None,
+) -> list[dict]:
+    """
+    Slice metrics by arbitrary dimensions using each file's metric cube.
+
+    NDJSON files resume their cube from the checkpoint sidecar, so the
+    query cost follows the number of dimension combinations rather than
+    the number of entries. Only the --since boundary partition is folded
+    entry by entry.
+
+    Args:
+        file_paths: Metrics file paths to include
+        group_by: Dimension names to group by (see metric_cube.DIMENSIONS)
+        action_name: Optional filter for specific action
+        since: Optional start of the time range for boundary partitions
+
+    Returns:
+        One row per group with its dimension values, counters and rates
+    """
+    cube = MetricCube(len(METRIC_KEYS))
+    for file_path in file_paths:
+        cutoff = boundary_cutoff(file_path, since)
+        if cutoff is None:
+            cube.merge(load_metric_cube(file_path))
+            continue
+        try:
+            cube.merge(build_metric_cube(
+                entry for entry in iter_file_entries(file_path)
+                if isinstance(entry, dict)
+                and (not entry.get("timestamp") or entry["timestamp"] >= cutoff)
+            ))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not load {file_path}: {e}")
+
+    filters = {"action": action_name} if action_name else None
+    rows = []
+    for group, counts in sorted(cube.group_by(group_by, filters).items()):
+        if not any(counts):
+            continue
+        row = dict(zip(group_by, group, strict=True))
+        row.update(summarize_counts(counts))
+        rows.append(row)
+    return rows
+
+
+def rollup_entry(entry) -> tuple | None:
+    """
+    Map a metric entry to its rollup (timestamp, group, counters).
+
+    Args:
+        entry: Metric entry
+
+    Returns:
+        Tuple for RollupStore, or None for non-dict entries
+    """
+    if not isinstance(entry, dict):
+        return None
+
+    timestamp = entry.get("timestamp")
+    try:
+        when = normalize_timestamp(timestamp) if timestamp else None
+    except (TypeError, ValueError):
+        when = None
+
+    metrics = entry.get("metrics", {})
+    counters = {key: metrics[key] for key in METRIC_KEYS if key in metrics}
+    counters["entries"] = 1
+    if timestamp:
+        counters["first_seen"] = counters["last_seen"] = timestamp
+    return when, (entry.get("action", "unknown"),), counters
+
+
+def aggregate_from_rollup(
+    store: RollupStore,
+    since: datetime | None = None,
+    action_name: str | None = None,
+) -> tuple[dict, int]:
+    """
+    Aggregate metrics by action from rollup cells.
+
+    Args:
+        store: Rollup store updated with the metrics files
+        since: Optional start of the time range, applied per entry timestamp
+        action_name: Optional filter for specific action
+
+    Returns:
+        Tuple of (aggregated metrics dictionary, entries in the window)
+    """
+    aggregated = {}
+    for (action,), cell in sorted(store.query(start=since).items()):
+        if action_name and action != action_name:
+            continue
+        aggregated[action] = {key: cell.get(key, 0) for key in METRIC_KEYS}
+        aggregated[action]["entries"] = cell.get("entries", 0)
+        aggregated[action]["first_seen"] = cell.get("first_seen")
+        aggregated[action]["last_seen"] = cell.get("last_seen")
+
+    entry_count = sum(action_metrics["entries"] for action_metrics in aggregated.values())
+    return add_rates(aggregated), entry_count
+
+
 def calculate_overall_metrics(aggregated: dict) -> dict:
     """
     Calculate overall metrics across all actions.
@@ -210,6 +1225,40 @@ def main():
         type=str,
         help="Filter metrics for a specific action",
     )
+    parser.add_argument(
+        "--group-by",
+        type=str,
+        help=f"Comma-separated dimensions to slice by ({', '.join(DIMENSIONS)})",
+    )
+    parser.add_argument(
+        "--state-file",
+        type=str,
+        help="Enable incremental mode, persisting the processed-file manifest here "
+        "(keep it outside the searched metrics directories)",
+    )
+    parser.add_argument(
+        "--rollup-file",
+        type=str,
+        help="Serve --since from hourly/daily rollups persisted here, updated "
+        "incrementally (keep it outside the searched metrics directories)",
+    )
+    parser.add_argument(
+        "--full-rebuild",
+        action="store_true",
+        help="Ignore the existing --state-file/--rollup-file and recompute from every file",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parse files in N worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--emit-partial",
+        type=str,
+        help="Also write the mergeable partial aggregate here, for "
+        "reduce_partial_aggregates.py (not supported with --rollup-file)",
+    )
     parser.add_argument(
         "--root-dir",
         type=str,
@@ -219,6 +1268,16 @@ def main():
 
     args = parser.parse_args()
 
+    if args.emit_partial and args.rollup_file:
+        parser.error("--emit-partial cannot be combined with --rollup-file")
+
+    group_by = None
+    if args.group_by:
+        group_by = [name.strip() for name in args.group_by.split(",") if name.strip()]
+        unknown = [name for name in group_by if name not in DIMENSIONS]
+        if unknown:
+            parser.error(f"Unknown dimension(s) for --group-by: {', '.join(unknown)}")
+
     # Parse time range
     since = None
     if args.since:
@@ -239,8 +1298,21 @@ def main():
     # Find and load metrics files
     print(f"Searching for metrics files in {args.root_dir}...")
     metrics_files = find_metrics_files(args.root_dir, since)
+    # Our own outputs are rewritten every run; the default --output sits under
+    # the searched root, and reading it back would count the report as metrics
+    cache_paths = tuple(
+        os.path.abspath(path)
+        for path in (args.output, args.state_file, args.rollup_file, args.emit_partial)
+        if path
+    )
+    metrics_files = [
+        path for path in metrics_files
+        if not os.path.abspath(path).startswith(cache_paths)
+    ]
     print(f"Found {len(metrics_files)} metrics file(s)")
 
+    partial = PartialAggregate()
+
     if not metrics_files:
         print("No metrics files found. This is expected for initial setup.")
         print("Metrics will be collected as actions are used.")
@@ -260,13 +1332,59 @@ def main():
             "note": "No metrics data available yet. Metrics will be collected as actions are used.",
         }
     else:
-        # Load and aggregate metrics
-        print("Loading metrics data...")
-        metrics_data = load_metrics_data(metrics_files)
-        print(f"Loaded {len(metrics_data)} metric entries")
+        if args.rollup_file:
+            store = RollupStore.load(args.rollup_file, ROLLUP_SCHEMA, rollup_entry)
+            if args.full_rebuild:
+                store.reset()
+            print("Updating rollups...")
+            # Rollups cover every file; the window is applied per entry
+            all_files = [
+                path for path in find_metrics_files(args.root_dir)
+                if not os.path.abspath(path).startswith(cache_paths)
+            ]
+            folded = store.update(all_files)
+            store.save()
+            print(f"Folded {folded} new metric entries into rollups")
 
-        print("Aggregating metrics...")
-        aggregated = aggregate_metrics(metrics_data, args.action)
+            print("Aggregating metrics...")
+            aggregated, entry_count = aggregate_from_rollup(store, since, args.action)
+            print(f"Loaded {entry_count} metric entries")
+        elif args.state_file:
+            state = (
+                {"version": STATE_VERSION, "files": {}}
+                if args.full_rebuild
+                else load_aggregate_state(args.state_file)
+            )
+            print("Loading metrics data incrementally...")
+            update = update_aggregate_state(state, metrics_files, args.workers, since)
+            print(
+                f"Parsed {update['parsed']} new/changed file(s), "
+                f"reused {update['reused']} unchanged file(s)"
+            )
+            print(f"Loaded {update['entries']} metric entries")
+
+            print("Aggregating metrics...")
+            partial = PartialAggregate.from_partials(update["partials"], args.action)
+            aggregated = partial.finalize()
+            save_aggregate_state(args.state_file, state)
+        elif args.workers > 1:
+            print(f"Loading metrics data with {args.workers} workers...")
+            partials, entry_count = load_partial_aggregates(
+                metrics_files, args.workers, since
+            )
+            print(f"Loaded {entry_count} metric entries")
+
+            print("Aggregating metrics...")
+            partial = PartialAggregate.from_partials(partials, args.action)
+            aggregated = partial.finalize()
+        else:
+            # Stream entries file by file into the aggregate
+            print("Loading and aggregating metrics data...")
+            partial, entry_count = PartialAggregate.from_files(
+                metrics_files, args.action, since
+            )
+            aggregated = partial.finalize()
+            print(f"Loaded {entry_count} metric entries")
         overall = calculate_overall_metrics(aggregated)
 
         output_data = {
@@ -276,6 +1394,17 @@ def main():
             "by_action": aggregated,
         }
 
+        if group_by is not None:
+            print(f"Slicing by {', '.join(group_by)}...")
+            output_data["group_by"] = group_by
+            output_data["by_group"] = aggregate_by_dimensions(
+                metrics_files, group_by, args.action, since
+            )
+
+    if args.emit_partial:
+        partial.save(args.emit_partial)
+        print(f"Partial aggregate saved to {args.emit_partial}")
+
     # Ensure output directory exists
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
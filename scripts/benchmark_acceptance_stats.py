@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the acceptance statistics kernels.
+
+Compares, on the same synthetic reviews, the previous multi-pass
+computation (filter_metrics_by_time() followed by separate passes for
+outcomes, suggestions, accepted counts and rejection reasons) with the
+single-pass accumulate_statistics() kernel over dicts and the columnar
+kernel over review_columns.ReviewColumns, and checks that all three
+produce identical statistics.
+
+Usage:
+    python scripts/benchmark_acceptance_stats.py --reviews 1000000
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+
+import calculate_acceptance_rate
+from benchmark_review_columns import make_synthetic_reviews
+from review_columns import ReviewColumns
+
+
+def multi_pass_statistics(metrics: list[dict], time_period: str = "7d") -> dict:
+    """
+    Compute statistics the way calculate_acceptance_rate() did before the
+    single-pass kernel: filter first, then one pass per statistic.
+
+    Args:
+        metrics: Review metric dicts
+        time_period: Time period to analyze
+
+    Returns:
+        Dictionary containing acceptance rate statistics
+    """
+    metrics = calculate_acceptance_rate.filter_metrics_by_time(metrics, time_period)
+
+    outcome_counts = defaultdict(int)
+    for metric in metrics:
+        outcome_counts[metric.get("outcome", "unknown")] += 1
+
+    suggestions_data = [m.get("suggestions_count", 0) for m in metrics if m.get("suggestions_count")]
+    accepted_data = [m.get("accepted_count", 0) for m in metrics if m.get("accepted_count") is not None]
+
+    rejection_reasons = []
+    for metric in metrics:
+        if metric.get("outcome") in ["rejected", "needs_work"]:
+            reasons = metric.get("rejection_reasons", [])
+            if isinstance(reasons, list):
+                rejection_reasons.extend(reasons)
+            elif reasons:
+                rejection_reasons.append(reasons)
+
+    return calculate_acceptance_rate.build_statistics(
+        outcome_counts,
+        sum(suggestions_data),
+        len(suggestions_data),
+        sum(accepted_data),
+        len(accepted_data),
+        calculate_acceptance_rate.get_common_items(rejection_reasons),
+    )
+
+
+def _best_of(repeats: int, func) -> tuple[float, object]:
+    """Run func `repeats` times; return the fastest time and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmark(count: int, time_period: str = "7d", repeats: int = 3) -> dict:
+    """
+    Time the three kernels on `count` synthetic reviews.
+
+    Args:
+        count: Number of reviews
+        time_period: Time period to analyze
+        repeats: Timing repetitions (the fastest is reported)
+
+    Returns:
+        Dict with reviews, multi_pass_seconds, single_pass_seconds,
+        columns_seconds and whether all results are identical
+    """
+    reviews = make_synthetic_reviews(count)
+    columns = ReviewColumns.from_reviews(reviews)
+
+    multi_pass_seconds, expected = _best_of(
+        repeats, lambda: multi_pass_statistics(reviews, time_period)
+    )
+    single_pass_seconds, single_pass = _best_of(
+        repeats,
+        lambda: calculate_acceptance_rate.calculate_acceptance_rate_for_period(reviews, time_period),
+    )
+    columns_seconds, from_columns = _best_of(
+        repeats,
+        lambda: calculate_acceptance_rate.calculate_acceptance_rate_from_columns(columns, time_period),
+    )
+
+    return {
+        "reviews": count,
+        "multi_pass_seconds": multi_pass_seconds,
+        "single_pass_seconds": single_pass_seconds,
+        "columns_seconds": columns_seconds,
+        "identical": single_pass == expected and from_columns == expected,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the acceptance statistics kernels"
+    )
+    parser.add_argument(
+        "--reviews", type=int, default=1_000_000, help="Number of reviews (default: 1000000)"
+    )
+    parser.add_argument(
+        "--time-period", default="7d", help="Time period to analyze (default: 7d)"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=3, help="Timing repetitions (default: 3)"
+    )
+
+    args = parser.parse_args()
+    print(f"Building {args.reviews} synthetic reviews...")
+    result = run_benchmark(args.reviews, args.time_period, args.repeats)
+
+    base = result["multi_pass_seconds"]
+    print("| Kernel | Seconds | Speedup |")
+    print("|--------|---------|---------|")
+    for label, key in [
+        ("multi-pass (previous)", "multi_pass_seconds"),
+        ("single-pass dicts", "single_pass_seconds"),
+        ("columns", "columns_seconds"),
+    ]:
+        print(f"| {label} | {result[key]:.3f} | {base / max(result[key], 1e-9):.1f}x |")
+    print(f"Identical statistics: {result['identical']}")
+    return 0 if result["identical"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for collect_metrics.py.
+
+collect_metrics.py is launched as a fresh interpreter on every action step,
+so its startup is on the critical path of every workflow. This benchmark
+records one event per run in a scratch directory and reports:
+
+    baseline_ms   median wall-clock time of `python <flags> -c pass`
+    startup_ms    median wall-clock time of recording one event
+    overhead_ms   startup_ms - baseline_ms
+    baseline_best_ms, startup_best_ms
+                  the fastest run of each, which is less sensitive to a
+                  busy machine than the median
+    import_ms     self time of the modules imported beyond the bare
+                  interpreter (from -X importtime)
+    imported      those modules
+
+Usage:
+    python scripts/benchmark_collect_metrics_startup.py --runs 30
+    python scripts/benchmark_collect_metrics_startup.py --zipapp dist/collect_metrics.pyz
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "collect_metrics.py")
+DEFAULT_FLAGS = ("-S", "-I")
+EVENT_ARGS = ["review-and-merge", "success", "1234"]
+
+
+def _environment() -> dict:
+    # A typical action step: repository set, defaults for everything else
+    env = {
+        key: value for key, value in os.environ.items()
+        if not key.startswith(("TELEMETRY_", "PYTHON")) and key != "DISABLE_TELEMETRY"
+    }
+    env["GITHUB_REPOSITORY"] = "acme-corp/main-project"
+    return env
+
+
+def _import_times(command: list[str], cwd: str, env: dict) -> dict[str, int]:
+    """Self import time in microseconds per module, from -X importtime."""
+    stderr = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    ).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def _times_ms(command: list[str], runs: int, cwd: str, env: dict) -> list[float]:
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, env=env, check=True)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def run_benchmark(runs: int = 20, flags: tuple = DEFAULT_FLAGS, zipapp: str | None = None) -> dict:
+    """
+    Time collect_metrics.py startup.
+
+    Args:
+        runs: Timed runs per command (the median and the best are reported)
+        flags: Interpreter flags for both the baseline and the script
+        zipapp: Benchmark this zipapp instead of the script
+
+    Returns:
+        Dict with baseline_ms, startup_ms, overhead_ms (medians),
+        baseline_best_ms, startup_best_ms (fastest runs), import_ms, imported
+        and logged (events written to telemetry.log)
+    """
+    env = _environment()
+    baseline = [sys.executable, *flags, "-c", "pass"]
+    command = [sys.executable, *flags, os.path.abspath(zipapp) if zipapp else SCRIPT, *EVENT_ARGS]
+
+    with tempfile.TemporaryDirectory() as cwd:
+        baseline_modules = _import_times(baseline, cwd, env)
+        modules = _import_times(command, cwd, env)
+        extra = {name: us for name, us in modules.items() if name not in baseline_modules}
+
+        baseline_times = _times_ms(baseline, runs, cwd, env)
+        startup_times = _times_ms(command, runs, cwd, env)
+
+        with open(os.path.join(cwd, "metrics", "telemetry", "telemetry.log"), "rb") as f:
+            logged = sum(1 for _ in f)
+
+    baseline_ms = statistics.median(baseline_times)
+    startup_ms = statistics.median(startup_times)
+    return {
+        "baseline_ms": baseline_ms,
+        "startup_ms": startup_ms,
+        "overhead_ms": startup_ms - baseline_ms,
+        "baseline_best_ms": min(baseline_times),
+        "startup_best_ms": min(startup_times),
+        "import_ms": sum(extra.values()) / 1000,
+        "imported": sorted(extra),
+        "logged": logged,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark collect_metrics.py startup")
+    parser.add_argument("--runs", type=int, default=30, help="Timed runs (default: 30)")
+    parser.add_argument(
+        "--flags",
+        default=" ".join(DEFAULT_FLAGS),
+        help=f"Interpreter flags (default: \"{' '.join(DEFAULT_FLAGS)}\")",
+    )
+    parser.add_argument("--zipapp", help="Benchmark a zipapp built by build_collect_metrics_zipapp.py")
+
+    args = parser.parse_args()
+    result = run_benchmark(args.runs, tuple(args.flags.split()), args.zipapp)
+
+    print(f"Interpreter baseline: {result['baseline_ms']:.1f} ms")
+    print(f"Record one event:     {result['startup_ms']:.1f} ms")
+    print(f"Overhead:             {result['overhead_ms']:.1f} ms")
+    print(f"Imports:              {result['import_ms']:.1f} ms ({', '.join(result['imported'])})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark for concurrent AcceptanceTracker writers.
+
+Spawns N processes that each save M records to the same metrics file, then
+verifies that every record survived and reports the write throughput.
+
+Usage:
+    python scripts/benchmark_concurrent_writers.py --processes 32 --records 10000
+    python scripts/benchmark_concurrent_writers.py --format json --records 200
+
+Exit status is 1 if any record was lost.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from actions.lib.acceptance_tracker import AcceptanceTracker, read_metrics_entries
+
+
+def _writer(filepath: str, writer_id: int, records: int) -> None:
+    """Save `records` single-suggestion entries under a per-writer action name."""
+    tracker = AcceptanceTracker(f"writer-{writer_id}")
+    for _ in range(records):
+        tracker.reset_metrics()
+        tracker.record_suggestion("made")
+        tracker.save_to_file(filepath)
+
+
+def run_benchmark(
+    filepath: str, processes: int = 32, records: int = 10000
+) -> dict:
+    """
+    Run concurrent writers against one metrics file and verify the result.
+
+    Args:
+        filepath: Metrics file to write (extension selects JSON or NDJSON)
+        processes: Number of concurrent writer processes
+        records: Records saved by each process
+
+    Returns:
+        Dictionary with expected/actual record counts, lost records,
+        per-writer shortfalls, elapsed seconds and writes per second
+    """
+    workers = [
+        multiprocessing.Process(target=_writer, args=(filepath, i, records))
+        for i in range(processes)
+    ]
+
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    entries = read_metrics_entries(filepath)
+    per_writer = Counter(entry.get("action") for entry in entries)
+    expected = processes * records
+    short_writers = {
+        f"writer-{i}": records - per_writer[f"writer-{i}"]
+        for i in range(processes)
+        if per_writer[f"writer-{i}"] != records
+    }
+
+    return {
+        "expected_records": expected,
+        "actual_records": len(entries),
+        "lost_records": expected - len(entries),
+        "short_writers": short_writers,
+        "elapsed_seconds": elapsed,
+        "writes_per_second": expected / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Stress-test concurrent AcceptanceTracker.save_to_file writers"
+    )
+    parser.add_argument("--processes", type=int, default=32, help="Writer processes (default: 32)")
+    parser.add_argument("--records", type=int, default=10000, help="Records per process (default: 10000)")
+    parser.add_argument(
+        "--format",
+        choices=["ndjson", "json"],
+        default="ndjson",
+        help="Storage format to exercise (json is O(N) per save; use small --records)",
+    )
+    parser.add_argument("--dir", type=str, help="Directory for the metrics file (default: temp dir)")
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmpdir:
+        filepath = os.path.join(tmpdir, f"bench-metrics.{args.format}")
+        result = run_benchmark(filepath, args.processes, args.records)
+
+    print(f"Writers: {args.processes} x {args.records} records ({args.format})")
+    print(f"Expected records: {result['expected_records']}")
+    print(f"Actual records: {result['actual_records']}")
+    print(f"Elapsed: {result['elapsed_seconds']:.2f}s")
+    print(f"Throughput: {result['writes_per_second']:.0f} writes/s")
+
+    if result["lost_records"] or result["short_writers"]:
+        print(f"FAIL: lost {result['lost_records']} record(s): {result['short_writers']}")
+        return 1
+
+    print("OK: no records lost")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for parallel metrics loading in aggregate_metrics.py.
+
+Generates N small synthetic metrics files, then times scanning, parsing and
+aggregating them with 1 to 16 worker processes. Every run is checked
+against the single-process aggregate.
+
+Usage:
+    python scripts/benchmark_parallel_aggregation.py --files 10000
+    python scripts/benchmark_parallel_aggregation.py --files 2000 --workers 1 4
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aggregate_metrics
+
+ACTIONS = ["review-and-merge", "spec-to-code", "action-fixer", "auto-refactor"]
+
+
+def write_synthetic_files(root_dir: str, count: int, entries_per_file: int = 5) -> None:
+    """
+    Write `count` JSON-array metrics files under root_dir/metrics/.
+
+    Args:
+        root_dir: Root directory (files go to metrics/run-XXXX/)
+        count: Number of files to create
+        entries_per_file: Tracker entries per file
+    """
+    rng = random.Random(42)
+    for i in range(count):
+        run_dir = Path(root_dir) / "metrics" / f"run-{i // 500:04d}"
+        run_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for j in range(entries_per_file):
+            made = rng.randint(1, 20)
+            accepted = rng.randint(0, made)
+            entries.append({
+                "action": rng.choice(ACTIONS),
+                "timestamp": f"2026-01-{1 + (i + j) % 28:02d}T00:00:00",
+                "metrics": {
+                    "suggestions_made": made,
+                    "suggestions_accepted": accepted,
+                    "suggestions_rejected": made - accepted,
+                    "suggestions_modified": 0,
+                },
+            })
+        (run_dir / f"metrics-{i}.json").write_text(json.dumps(entries))
+
+
+def run_benchmark(root_dir: str, worker_counts: list[int]) -> list[dict]:
+    """
+    Time scan + parse + aggregate for each worker count.
+
+    Args:
+        root_dir: Root directory containing synthetic metrics
+        worker_counts: Worker counts to measure
+
+    Returns:
+        One result dict per worker count with seconds and speedup vs 1 worker
+
+    Raises:
+        AssertionError: If a parallel aggregate differs from the sequential one
+    """
+    expected = None
+    baseline = None
+    results = []
+
+    for workers in worker_counts:
+        start = time.perf_counter()
+        files = aggregate_metrics.find_metrics_files(root_dir)
+        partials, _ = aggregate_metrics.load_partial_aggregates(files, workers)
+        aggregated = aggregate_metrics.merge_partial_aggregates(partials)
+        elapsed = time.perf_counter() - start
+
+        if expected is None:
+            expected = aggregate_metrics.aggregate_metrics(
+                aggregate_metrics.load_metrics_data(files)
+            )
+        if aggregated != expected:
+            raise AssertionError(f"Aggregate with {workers} workers differs from sequential")
+
+        if baseline is None:
+            baseline = elapsed
+        results.append({
+            "workers": workers,
+            "files": len(files),
+            "seconds": elapsed,
+            "speedup": baseline / elapsed if elapsed > 0 else 0.0,
+        })
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark aggregate_metrics.py --workers scaling"
+    )
+    parser.add_argument("--files", type=int, default=10000, help="Synthetic files (default: 10000)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8, 16],
+        help="Worker counts to measure (default: 1 2 4 8 16)",
+    )
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print(f"Writing {args.files} synthetic metrics files...")
+        write_synthetic_files(tmpdir, args.files)
+
+        print(f"CPUs available: {os.cpu_count()}")
+        print("| Workers | Seconds | Speedup |")
+        print("|---------|---------|---------|")
+        for result in run_benchmark(tmpdir, sorted(args.workers)):
+            print(f"| {result['workers']} | {result['seconds']:.2f} | {result['speedup']:.2f}x |")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for AcceptanceTracker recording paths.
+
+Compares recording N outcomes with the original per-call implementation,
+the current record_suggestion() and the bulk record_many().
+
+Usage:
+    python scripts/benchmark_record_suggestion.py --outcomes 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from actions.lib.acceptance_tracker import AcceptanceTracker
+
+
+def _legacy_record_suggestion(metrics: dict, outcome: str) -> None:
+    """Per-call path as originally implemented (list literal + f-string key)."""
+    valid_outcomes = ["made", "accepted", "rejected", "modified"]
+    if outcome not in valid_outcomes:
+        raise ValueError(
+            f"Invalid outcome '{outcome}'. Must be one of: {valid_outcomes}"
+        )
+    metric_key = f"suggestions_{outcome}"
+    metrics[metric_key] += 1
+
+
+def make_outcomes(count: int) -> list[str]:
+    """Build a realistic outcome stream: each suggestion is made, then resolved."""
+    resolutions = ("accepted", "accepted", "rejected", "modified")
+    outcomes = []
+    for i in range(count // 2):
+        outcomes.append("made")
+        outcomes.append(resolutions[i % len(resolutions)])
+    if count % 2:
+        outcomes.append("made")
+    return outcomes
+
+
+def run_benchmark(count: int = 1_000_000) -> dict:
+    """
+    Time each recording path over the same outcome stream.
+
+    Args:
+        count: Number of outcomes to record
+
+    Returns:
+        Dictionary mapping path name to elapsed seconds, plus the
+        speedup of record_many over the legacy per-call path
+    """
+    outcomes = make_outcomes(count)
+
+    legacy = AcceptanceTracker("bench-legacy")
+    start = time.perf_counter()
+    for outcome in outcomes:
+        _legacy_record_suggestion(legacy.metrics, outcome)
+    legacy_seconds = time.perf_counter() - start
+
+    per_call = AcceptanceTracker("bench-per-call")
+    start = time.perf_counter()
+    for outcome in outcomes:
+        per_call.record_suggestion(outcome)
+    per_call_seconds = time.perf_counter() - start
+
+    bulk = AcceptanceTracker("bench-bulk")
+    start = time.perf_counter()
+    bulk.record_many(outcomes)
+    bulk_seconds = time.perf_counter() - start
+
+    if not legacy.metrics == per_call.metrics == bulk.metrics:
+        raise AssertionError("Recording paths disagree on the resulting metrics")
+
+    return {
+        "outcomes": count,
+        "legacy_per_call_seconds": legacy_seconds,
+        "record_suggestion_seconds": per_call_seconds,
+        "record_many_seconds": bulk_seconds,
+        "speedup": legacy_seconds / bulk_seconds if bulk_seconds > 0 else float("inf"),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare AcceptanceTracker per-call and bulk recording"
+    )
+    parser.add_argument(
+        "--outcomes", type=int, default=1_000_000, help="Outcomes to record (default: 1000000)"
+    )
+
+    args = parser.parse_args()
+    result = run_benchmark(args.outcomes)
+
+    print(f"Outcomes: {result['outcomes']}")
+    print(f"Legacy per-call:      {result['legacy_per_call_seconds']:.3f}s")
+    print(f"record_suggestion():  {result['record_suggestion_seconds']:.3f}s")
+    print(f"record_many():        {result['record_many_seconds']:.3f}s")
+    print(f"Speedup (record_many vs legacy): {result['speedup']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
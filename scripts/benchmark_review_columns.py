@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Load-time benchmark for the review metrics columnar cache.
+
+Writes a synthetic review_metrics.json and compares parsing it with
+json.load() against mapping its warm columnar cache (review_columns.py),
+then checks that calculate_acceptance_rate.py gives identical statistics
+from both.
+
+Usage:
+    python scripts/benchmark_review_columns.py --reviews 1000000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import calculate_acceptance_rate
+import review_columns
+
+OUTCOMES = ["approved", "modified", "rejected", "needs_work"]
+REASONS = ["Too verbose", "Incorrect suggestion", "Out of scope", "Style only", "Missing tests"]
+
+
+def make_synthetic_reviews(count: int) -> list[dict]:
+    """
+    Build `count` synthetic reviews over the last 30 days.
+
+    Args:
+        count: Number of reviews
+
+    Returns:
+        List of review dicts
+    """
+    rng = random.Random(42)
+    now = datetime.now(UTC)
+    reviews = []
+    for i in range(count):
+        outcome = rng.choice(OUTCOMES)
+        suggestions = rng.randint(0, 8)
+        # 10-50 minutes past a whole hour before now, so results do not
+        # change while a benchmark runs against "last 7d" and similar windows
+        hours = rng.randrange(30 * 24)
+        reviews.append({
+            "pr_number": i,
+            "repo_id": f"repo-{rng.randrange(50)}",
+            "outcome": outcome,
+            "suggestions_count": suggestions,
+            "accepted_count": rng.randint(0, suggestions),
+            "timestamp": (now - timedelta(hours=hours, seconds=rng.randrange(600, 3000))).isoformat(),
+            "reviewer": "ai-reviewer",
+            "confidence_score": round(rng.random(), 2),
+            "rejection_reasons": rng.sample(REASONS, 2) if outcome == "rejected" else [],
+        })
+    return reviews
+
+
+def write_synthetic_reviews(filepath: str, count: int) -> None:
+    """
+    Write `count` synthetic reviews over the last 30 days to filepath.
+
+    Args:
+        filepath: Output file path
+        count: Number of reviews
+    """
+    with open(filepath, "w") as f:
+        json.dump(make_synthetic_reviews(count), f)
+
+
+def _best_of(repeats: int, func) -> tuple[float, object]:
+    """Run func `repeats` times; return the fastest time and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmark(filepath: str, repeats: int = 3) -> dict:
+    """
+    Time JSON parsing against loading the warm columnar cache.
+
+    Args:
+        filepath: review_metrics.json to load
+        repeats: Timing repetitions (the fastest is reported)
+
+    Returns:
+        Dict with reviews, json_seconds, columns_seconds, build_seconds,
+        and whether the statistics from both paths are identical
+    """
+    def load_json():
+        with open(filepath, encoding="utf-8") as f:
+            return json.load(f)
+
+    build_seconds, _ = _best_of(1, lambda: review_columns.load_review_columns(filepath))
+    json_seconds, reviews = _best_of(repeats, load_json)
+    columns_seconds, columns = _best_of(
+        repeats, lambda: review_columns.load_review_columns(filepath)
+    )
+
+    expected = calculate_acceptance_rate.calculate_acceptance_rate(
+        calculate_acceptance_rate.filter_metrics_by_time(reviews, "7d")
+    )
+    actual = calculate_acceptance_rate.calculate_acceptance_rate_from_columns(columns, "7d")
+    return {
+        "reviews": len(reviews),
+        "json_seconds": json_seconds,
+        "columns_seconds": columns_seconds,
+        "build_seconds": build_seconds,
+        "identical": actual == expected,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark loading review metrics from JSON vs the columnar cache"
+    )
+    parser.add_argument(
+        "--reviews", type=int, default=1_000_000, help="Number of reviews (default: 1000000)"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=3, help="Timing repetitions (default: 3)"
+    )
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = str(Path(tmpdir) / "review_metrics.json")
+        print(f"Writing {args.reviews} synthetic reviews...")
+        write_synthetic_reviews(filepath, args.reviews)
+        result = run_benchmark(filepath, args.repeats)
+
+    speedup = result["json_seconds"] / max(result["columns_seconds"], 1e-9)
+    print("| Reviews | json.load s | Cache build s | Cache load s | Speedup | Identical stats |")
+    print("|---------|-------------|---------------|--------------|---------|-----------------|")
+    print(
+        f"| {result['reviews']} | {result['json_seconds']:.3f} | {result['build_seconds']:.3f} "
+        f"| {result['columns_seconds']:.4f} | {speedup:.0f}x | {result['identical']} |"
+    )
+    return 0 if result["identical"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Per-event cost of recording telemetry from a bash step.
+
+Compares, in a scratch directory:
+
+    python   one `python scripts/collect_metrics.py ...` process per event,
+             as a bash step records an event today
+    spool    record_telemetry from scripts/telemetry.sh inside one bash
+             process, plus the amortized cost of importing the spooled
+             events with one flush_spool() call
+
+and checks that both paths log the same number of events.
+
+Usage:
+    python scripts/benchmark_spool_ingestion.py --events 200
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from telemetry_spool import flush_spool
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+EVENT_ARGS = ["review-and-merge", "success", "1234"]
+
+
+def _environment() -> dict:
+    env = {key: value for key, value in os.environ.items() if not key.startswith("TELEMETRY_")}
+    env.pop("DISABLE_TELEMETRY", None)
+    env["GITHUB_REPOSITORY"] = "acme-corp/main-project"
+    return env
+
+
+def _count_lines(path: str) -> int:
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def run_benchmark(events: int) -> dict:
+    """
+    Record `events` events through both paths.
+
+    Args:
+        events: Events per path
+
+    Returns:
+        Dict with events, python_us and spool_us (microseconds per event),
+        of which spool_write_us and spool_import_us, and the events each
+        path logged
+    """
+    env = _environment()
+
+    with tempfile.TemporaryDirectory() as cwd:
+        start = time.perf_counter()
+        for _ in range(events):
+            subprocess.run(
+                [sys.executable, os.path.join(SCRIPTS_DIR, "collect_metrics.py"), *EVENT_ARGS],
+                cwd=cwd, env=env, check=True,
+            )
+        python_seconds = time.perf_counter() - start
+        python_logged = _count_lines(os.path.join(cwd, "metrics", "telemetry", "telemetry.log"))
+
+    with tempfile.TemporaryDirectory() as cwd:
+        script = (
+            f'source "{os.path.join(SCRIPTS_DIR, "telemetry.sh")}"\n'
+            f'for ((i = 0; i < {events}; i++)); do record_telemetry {" ".join(EVENT_ARGS)}; done\n'
+        )
+        # Time the loop alone: the step's bash process exists anyway
+        timed = f'start=$EPOCHREALTIME\n{script}echo "$start $EPOCHREALTIME"\n'
+        output = subprocess.run(
+            ["bash", "-c", timed], cwd=cwd, env=env, check=True, capture_output=True, text=True
+        ).stdout.split()
+        write_seconds = float(output[1].replace(",", ".")) - float(output[0].replace(",", "."))
+
+        spool_dir = os.path.join(cwd, "metrics", "telemetry", "spool")
+        log_file = os.path.join(cwd, "metrics", "telemetry", "telemetry.log")
+        start = time.perf_counter()
+        flush_spool(spool_dir, log_file)
+        import_seconds = time.perf_counter() - start
+        spool_logged = _count_lines(log_file)
+
+    return {
+        "events": events,
+        "python_us": python_seconds / events * 1e6,
+        "spool_us": (write_seconds + import_seconds) / events * 1e6,
+        "spool_write_us": write_seconds / events * 1e6,
+        "spool_import_us": import_seconds / events * 1e6,
+        "python_logged": python_logged,
+        "spool_logged": spool_logged,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark recording telemetry from bash")
+    parser.add_argument("--events", type=int, default=200, help="Events per path (default: 200)")
+
+    args = parser.parse_args()
+    result = run_benchmark(args.events)
+
+    print("| Path | us/event | Logged |")
+    print("|------|----------|--------|")
+    print(f"| python process per event | {result['python_us']:.0f} | {result['python_logged']} |")
+    print(f"| bash spool + bulk import | {result['spool_us']:.0f} | {result['spool_logged']} |")
+    print(f"|   spool write (bash) | {result['spool_write_us']:.0f} | |")
+    print(f"|   bulk import (python) | {result['spool_import_us']:.0f} | |")
+    print(f"Speedup: {result['python_us'] / max(result['spool_us'], 1e-9):.1f}x")
+    return 0 if result["python_logged"] == result["spool_logged"] == args.events else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Peak-memory benchmark for the streaming pipeline in aggregate_metrics.py.
+
+Writes one synthetic NDJSON metrics file and streams it through
+stream_aggregate() enough times to reach the requested number of entries,
+measuring the tracemalloc peak. With streaming, the peak is set by the
+largest single entry and the number of distinct actions, not by the number
+of entries.
+
+Usage:
+    python scripts/benchmark_streaming_aggregation.py --entries 5000000
+    python scripts/benchmark_streaming_aggregation.py --entries 1000000 --file-entries 10000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import aggregate_metrics
+
+ACTIONS = ["review-and-merge", "spec-to-code", "action-fixer", "auto-refactor"]
+
+
+def write_synthetic_ndjson(filepath: str, count: int) -> None:
+    """
+    Write `count` NDJSON metrics entries to filepath.
+
+    Args:
+        filepath: Output file path
+        count: Number of entries
+    """
+    rng = random.Random(42)
+    with open(filepath, "w") as f:
+        for i in range(count):
+            made = rng.randint(1, 20)
+            accepted = rng.randint(0, made)
+            f.write(json.dumps({
+                "action": ACTIONS[i % len(ACTIONS)],
+                "timestamp": f"2026-01-{1 + i % 28:02d}T00:00:00",
+                "metrics": {
+                    "suggestions_made": made,
+                    "suggestions_accepted": accepted,
+                    "suggestions_rejected": made - accepted,
+                    "suggestions_modified": 0,
+                },
+            }) + "\n")
+
+
+def run_benchmark(filepath: str, repeats: int) -> dict:
+    """
+    Stream filepath `repeats` times through stream_aggregate() under tracemalloc.
+
+    Args:
+        filepath: NDJSON metrics file
+        repeats: Number of times the file is aggregated
+
+    Returns:
+        Dict with entries, seconds, peak_bytes and the aggregate
+    """
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        aggregated, entries = aggregate_metrics.stream_aggregate(
+            filepath for _ in range(repeats)
+        )
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "entries": entries,
+        "seconds": elapsed,
+        "peak_bytes": peak,
+        "aggregated": aggregated,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark peak memory of streaming metrics aggregation"
+    )
+    parser.add_argument(
+        "--entries", type=int, default=5_000_000, help="Total entries (default: 5000000)"
+    )
+    parser.add_argument(
+        "--file-entries",
+        type=int,
+        default=50_000,
+        help="Entries in the synthetic file that is streamed repeatedly (default: 50000)",
+    )
+
+    args = parser.parse_args()
+    repeats = max(1, args.entries // args.file_entries)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = str(Path(tmpdir) / "metrics.ndjson")
+        print(f"Writing {args.file_entries} synthetic entries...")
+        write_synthetic_ndjson(filepath, args.file_entries)
+
+        print("| Entries | Seconds | Peak KiB |")
+        print("|---------|---------|----------|")
+        for count in sorted({1, repeats}):
+            result = run_benchmark(filepath, count)
+            print(
+                f"| {result['entries']} | {result['seconds']:.2f} "
+                f"| {result['peak_bytes'] / 1024:.1f} |"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
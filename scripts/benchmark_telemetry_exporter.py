@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Load test for the HTTP telemetry path.
+
+Starts the reference collector (telemetry_collector.py) on a free local
+port, pushes synthetic events through TelemetryExporter at a target rate
+(or as fast as possible), and checks that every event reached the
+collector's log exactly once over a handful of keep-alive connections.
+
+Usage:
+    python scripts/benchmark_telemetry_exporter.py --events 100000 --rate 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from telemetry_collector import TelemetryCollector
+from telemetry_exporter import MAX_BATCH, MAX_LATENCY_SECONDS, TelemetryExporter
+
+ACTIONS = ["review-and-merge", "auto-refactor", "spec-to-code", "publish-pr"]
+
+
+def make_event(i: int) -> dict:
+    """Synthetic telemetry event shaped like collect_metrics() output."""
+    return {
+        "action_name": ACTIONS[i % len(ACTIONS)],
+        "timestamp": "2026-01-01T00:00:00Z",
+        "status": "failure" if i % 17 == 0 else "success",
+        "duration_ms": 500 + i % 3000,
+        "repository_anonymous_id": f"{i % 97:016x}",
+        "runner_os": "Linux",
+        "claude_cli_version": "1.0.0",
+    }
+
+
+def run_benchmark(
+    log_file: str,
+    events: int,
+    rate: float | None = None,
+    max_batch: int = MAX_BATCH,
+    max_latency: float = MAX_LATENCY_SECONDS,
+) -> dict:
+    """
+    Export `events` events to a local collector.
+
+    Args:
+        log_file: Log file for the collector
+        events: Number of events
+        rate: Target events per second (None: as fast as possible)
+        max_batch: Exporter batch size
+        max_latency: Exporter latency bound in seconds
+
+    Returns:
+        Dict with events, seconds, events_per_second, requests, connections,
+        logged (lines in the log) and lost (events exported but not logged)
+    """
+    with TelemetryCollector(("127.0.0.1", 0), log_file) as server:
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        try:
+            start = time.perf_counter()
+            with TelemetryExporter(server.url, max_batch, max_latency) as exporter:
+                for i in range(events):
+                    if rate and i % 100 == 0:
+                        # Pace in steps of 100 events to hit the target rate
+                        delay = start + i / rate - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                    exporter.export(make_event(i))
+            seconds = time.perf_counter() - start
+        finally:
+            server.shutdown()
+
+    with open(log_file, "rb") as f:
+        logged = sum(1 for _ in f)
+    return {
+        "events": events,
+        "seconds": seconds,
+        "events_per_second": events / max(seconds, 1e-9),
+        "requests": exporter.connection.requests,
+        "connections": exporter.connection.connections,
+        "logged": logged,
+        "lost": exporter.exported - logged + exporter.dropped,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the HTTP telemetry exporter")
+    parser.add_argument(
+        "--events", type=int, default=100_000, help="Number of events (default: 100000)"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=10_000, help="Target events per second; 0 for unthrottled (default: 10000)"
+    )
+    parser.add_argument(
+        "--max-batch", type=int, default=MAX_BATCH, help=f"Events per batch (default: {MAX_BATCH})"
+    )
+    parser.add_argument(
+        "--max-latency",
+        type=float,
+        default=MAX_LATENCY_SECONDS,
+        help=f"Seconds before a partial batch is sent (default: {MAX_LATENCY_SECONDS})",
+    )
+
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = run_benchmark(
+            os.path.join(tmpdir, "telemetry.log"),
+            args.events,
+            args.rate or None,
+            args.max_batch,
+            args.max_latency,
+        )
+
+    print(f"Events:      {result['events']}")
+    print(f"Seconds:     {result['seconds']:.2f}")
+    print(f"Events/s:    {result['events_per_second']:.0f}")
+    print(f"Requests:    {result['requests']} over {result['connections']} connection(s)")
+    print(f"Logged:      {result['logged']} (lost: {result['lost']})")
+    return 0 if result["lost"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
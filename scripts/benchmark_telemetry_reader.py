@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the mmap-backed telemetry.log reader.
+
+Writes a synthetic telemetry.log of the requested size and loads it, each
+loader in a fresh interpreter, with:
+
+    legacy          the text loader the reports used before telemetry_reader:
+                    strip() and json.loads() every line into a full dict
+    reader (json)   read_events() with the telemetry report's fields, orjson
+                    disabled (falls back to the text loader)
+    reader (orjson) read_events() with the telemetry report's fields (only
+                    when orjson is installed)
+
+and reports wall-clock seconds, events loaded and peak RSS of each child.
+Like the reports, every loader keeps all events in a list, so the peak RSS
+grows with the log; a loader that runs out of memory is reported as failed.
+
+Usage:
+    python scripts/benchmark_telemetry_reader.py --size-mb 5120
+    python scripts/benchmark_telemetry_reader.py --size-mb 200 --log /tmp/telemetry.log
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import telemetry_reader
+from generate_telemetry_report import REPORT_FIELDS
+
+ACTIONS = ["review-and-merge", "spec-to-code", "action-fixer", "auto-refactor", "pr-review"]
+ERRORS = ["timeout", "api_error", "merge_conflict"]
+# Distinct lines in the block that is written repeatedly
+BLOCK_EVENTS = 10_000
+
+LOADERS = ["legacy", "reader (json)", "reader (orjson)"]
+
+
+def write_synthetic_log(filepath: str, size_bytes: int) -> int:
+    """
+    Write a synthetic telemetry.log of at least size_bytes.
+
+    Args:
+        filepath: Output file path
+        size_bytes: Minimum file size
+
+    Returns:
+        Number of events written
+    """
+    rng = random.Random(42)
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    repositories = [f"{rng.getrandbits(64):016x}" for _ in range(200)]
+    lines = []
+    for i in range(BLOCK_EVENTS):
+        status = "success" if rng.random() < 0.9 else "failure"
+        event = {
+            "timestamp": (start + timedelta(seconds=i * 37)).isoformat().replace("+00:00", "Z"),
+            "action_name": ACTIONS[i % len(ACTIONS)],
+            "repository_anonymous_id": rng.choice(repositories),
+            "status": status,
+            "duration_ms": rng.randint(500, 600_000),
+            "runner_os": rng.choice(["Linux", "macOS", "Windows"]),
+            "claude_cli_version": rng.choice(["1.0.3", "1.1.0", "1.2.3"]),
+        }
+        if status == "failure":
+            event["error_type"] = rng.choice(ERRORS)
+        lines.append(json.dumps(event))
+    block = ("\n".join(lines) + "\n").encode()
+
+    repeats = max(1, -(-size_bytes // len(block)))
+    with open(filepath, "wb") as f:
+        for _ in range(repeats):
+            f.write(block)
+    return repeats * BLOCK_EVENTS
+
+
+def _legacy_load(filepath: str) -> list[dict]:
+    events = []
+    with open(filepath) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return events
+
+
+def _load(loader: str, filepath: str) -> dict:
+    """Run one loader in this process and measure it."""
+    if loader == "reader (json)":
+        telemetry_reader.orjson = None
+    start = time.perf_counter()
+    if loader == "legacy":
+        events = _legacy_load(filepath)
+    else:
+        events = list(telemetry_reader.read_events(filepath, REPORT_FIELDS))
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "events": len(events),
+        # Kilobytes on Linux
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_benchmark(filepath: str, loaders: list[str] | None = None) -> dict[str, dict | None]:
+    """
+    Load filepath with each loader in a child interpreter.
+
+    Args:
+        filepath: Synthetic telemetry.log
+        loaders: Loaders to run (default: all available)
+
+    Returns:
+        Dict mapping each loader to {"seconds", "events", "max_rss_kib"}, or
+        to None when the child failed (e.g. ran out of memory)
+    """
+    if loaders is None:
+        loaders = [name for name in LOADERS if name != "reader (orjson)" or telemetry_reader.orjson]
+
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.abspath(__file__))}
+    results = {}
+    for loader in loaders:
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", loader, filepath],
+            env=env, capture_output=True, text=True,
+        )
+        results[loader] = json.loads(child.stdout) if child.returncode == 0 else None
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark loading telemetry.log with and without telemetry_reader"
+    )
+    parser.add_argument(
+        "--size-mb", type=int, default=5120, help="Synthetic log size in MiB (default: 5120)"
+    )
+    parser.add_argument(
+        "--log", type=Path, help="Write the synthetic log here and keep it (default: a temporary file)"
+    )
+    parser.add_argument("--child", nargs=2, metavar=("LOADER", "PATH"), help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_load(*args.child)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = str(args.log or Path(tmpdir) / "telemetry.log")
+        print(f"Writing a {args.size_mb} MiB synthetic telemetry.log...")
+        events = write_synthetic_log(filepath, args.size_mb * 1024 * 1024)
+        size_mib = os.path.getsize(filepath) / 1024 / 1024
+        print(f"  {events} events, {size_mib:.0f} MiB")
+
+        results = run_benchmark(filepath)
+
+    print("| Loader | Seconds | MiB/s | Events | Peak RSS MiB |")
+    print("|--------|---------|-------|--------|--------------|")
+    for loader, result in results.items():
+        if result is None:
+            print(f"| {loader} | failed | - | - | - |")
+            continue
+        print(
+            f"| {loader} | {result['seconds']:.2f} | {size_mib / result['seconds']:.0f} "
+            f"| {result['events']} | {result['max_rss_kib'] / 1024:.0f} |"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
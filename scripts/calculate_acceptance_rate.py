@@ -4,15 +4,54 @@ Acceptance Rate Calculator for AI Review Quality Metrics
 
 This script calculates and analyzes acceptance rate metrics for the review-and-merge action,
 providing insights into AI review quality and effectiveness.
+
+--time-period also accepts a comma-separated list (e.g. 24h,7d,30d). The metrics file is
+then loaded once and every window is computed in the same scan, producing one combined
+JSON document, report or summary; the first period decides the exit status.
+
+Rejection reasons are counted in a bounded-memory top-k sketch (see heavy_hitters.py), by
+normalized text; --reason-capacity sets how many distinct reasons it monitors.
+
+With --intervals, the statistics also carry Wilson and bootstrap confidence intervals for the
+acceptance rate overall, per action, per week and per A/B variant (see rate_intervals.py),
+and the report flags week-over-week and variant changes only when the intervals separate.
+
+With --rollup-file, hourly/daily counters per outcome are kept up to date incrementally
+(see metrics_rollup.py) and the time period is served from them, reading raw reviews only
+for the partial hour at the start of the window.
+
+With --columnar-cache, reviews are read from a binary columnar copy of the metrics file
+(see review_columns.py) that is rebuilt only when the JSON changes.
 """
 
 import json
 import sys
-from collections import defaultdict
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from collections.abc import Iterable
 from datetime import UTC, datetime, timedelta
+from itertools import compress
 from typing import Any
 
 from env_config import is_telemetry_disabled
+from heavy_hitters import DEFAULT_CAPACITY, SpaceSavingCounter, normalize_reason
+from metrics_rollup import RollupStore, normalize_timestamp
+from rate_intervals import DEFAULT_CONFIDENCE, build_intervals
+from review_columns import (
+    HAS_ACCEPTED,
+    ReviewColumns,
+    epoch_us,
+    load_review_columns,
+    window_rows,
+)
+
+ROLLUP_SCHEMA = "reviews/2"
+# Reviews without an "action" field come from the review-and-merge action
+DEFAULT_ACTION = "review-and-merge"
+ACCEPTED_OUTCOMES = ("approved", "modified")
+REJECTED_OUTCOMES = ("rejected", "needs_work")
+# Maps a flags byte to 1 if it has HAS_ACCEPTED set, else 0
+_HAS_ACCEPTED_BYTES = bytes(1 if flags & HAS_ACCEPTED else 0 for flags in range(256))
 
 
 def calculate_acceptance_rate(metrics: list[dict[str, Any]]) -> dict[str, Any]:
@@ -25,7 +64,240 @@ def calculate_acceptance_rate(metrics: list[dict[str, Any]]) -> dict[str, Any]:
     Returns:
         Dictionary containing acceptance rate statistics
     """
-    if not metrics:
+    return accumulate_statistics(metrics)
+
+
+def calculate_acceptance_rate_for_period(
+    metrics: Iterable[dict[str, Any]],
+    time_period: str = "7d",
+    reason_capacity: int = DEFAULT_CAPACITY,
+) -> dict[str, Any]:
+    """
+    Calculate acceptance rate statistics for the reviews in a time period.
+
+    Args:
+        metrics: Review outcome metrics
+        time_period: Time period to analyze (e.g., 7d, 24h, 1w)
+        reason_capacity: Distinct rejection reasons tracked
+
+    Returns:
+        Same statistics as calculate_acceptance_rate(filter_metrics_by_time(...)),
+        computed in one pass
+    """
+    return accumulate_statistics(
+        metrics, datetime.now(UTC) - parse_time_period(time_period), reason_capacity
+    )
+
+
+def calculate_acceptance_rate_for_periods(
+    metrics: Iterable[dict[str, Any]],
+    time_periods: list[str],
+    reason_capacity: int = DEFAULT_CAPACITY,
+    interval_confidence: float | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Calculate acceptance rate statistics for several time periods in one scan.
+
+    Args:
+        metrics: Review outcome metrics
+        time_periods: Time periods to analyze (e.g., ["24h", "7d", "30d"])
+        reason_capacity: Distinct rejection reasons tracked per period
+        interval_confidence: If set, add confidence intervals at this level
+            (see accumulate_windows())
+
+    Returns:
+        Statistics per time period, in the order given
+    """
+    now = datetime.now(UTC)
+    results = accumulate_windows(
+        metrics,
+        [now - parse_time_period(p) for p in time_periods],
+        reason_capacity,
+        interval_confidence,
+    )
+    return dict(zip(time_periods, results, strict=True))
+
+
+class _WindowStatistics:
+    """Accumulators for the statistics of one time window."""
+
+    __slots__ = (
+        "outcome_counts", "suggestions_sum", "suggestions_n",
+        "accepted_sum", "accepted_n", "rejection_reasons",
+        "interval_confidence", "groups",
+    )
+
+    def __init__(self, reason_capacity: int, interval_confidence: float | None = None):
+        self.outcome_counts = {}
+        # Plain running totals in input order, as sum() over the list gave
+        self.suggestions_sum = 0
+        self.suggestions_n = 0
+        self.accepted_sum = 0
+        self.accepted_n = 0
+        self.rejection_reasons = SpaceSavingCounter(reason_capacity)
+        self.interval_confidence = interval_confidence
+        # {dimension: {group: [accepted reviews, reviews]}}
+        self.groups = defaultdict(dict)
+
+    def add_to_groups(self, group_keys, is_accepted: bool) -> None:
+        for dimension, group in group_keys:
+            counts = self.groups[dimension].setdefault(group, [0, 0])
+            counts[0] += is_accepted
+            counts[1] += 1
+
+    def add(self, outcome, suggestions, accepted, reasons) -> None:
+        self.outcome_counts[outcome] = self.outcome_counts.get(outcome, 0) + 1
+        if suggestions:
+            self.suggestions_sum += suggestions
+            self.suggestions_n += 1
+        if accepted is not None:
+            self.accepted_sum += accepted
+            self.accepted_n += 1
+        if reasons:
+            self.rejection_reasons.update(reasons)
+
+    def statistics(self) -> dict[str, Any]:
+        stats = build_statistics(
+            self.outcome_counts,
+            self.suggestions_sum,
+            self.suggestions_n,
+            self.accepted_sum,
+            self.accepted_n,
+            get_common_reasons(self.rejection_reasons),
+        )
+        if self.interval_confidence is not None:
+            stats["intervals"] = build_intervals(
+                sum(self.outcome_counts.get(outcome, 0) for outcome in ACCEPTED_OUTCOMES),
+                sum(self.outcome_counts.values()),
+                self.groups,
+                self.interval_confidence,
+            )
+        return stats
+
+
+def accumulate_statistics(
+    metrics: Iterable[dict[str, Any]],
+    cutoff: datetime | None = None,
+    reason_capacity: int = DEFAULT_CAPACITY,
+) -> dict[str, Any]:
+    """
+    Filter reviews and compute every statistic in a single traversal.
+
+    Args:
+        metrics: Review outcome metrics (consumed in one pass)
+        cutoff: Optional aware datetime; reviews with an earlier or invalid
+            timestamp are skipped, as in filter_metrics_by_time()
+        reason_capacity: Distinct rejection reasons tracked
+
+    Returns:
+        Dictionary containing acceptance rate statistics
+    """
+    return accumulate_windows(metrics, [cutoff], reason_capacity)[0]
+
+
+def accumulate_windows(
+    metrics: Iterable[dict[str, Any]],
+    cutoffs: list[datetime | None],
+    reason_capacity: int = DEFAULT_CAPACITY,
+    interval_confidence: float | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Compute the statistics of several time windows in a single traversal.
+
+    Each timestamp is parsed once and placed among the sorted cutoffs with
+    a bisect; since every window ends now, a review belongs to exactly the
+    windows whose cutoff is at or before it. Reviews are added to each of
+    their windows in file order, so every window's statistics equal
+    accumulate_statistics() with that cutoff alone.
+
+    Args:
+        metrics: Review outcome metrics (consumed in one pass)
+        cutoffs: Aware datetimes; None means unfiltered (timestamps are not
+            even parsed, as in calculate_acceptance_rate())
+        reason_capacity: Distinct rejection reasons tracked per window
+        interval_confidence: If set, each window's statistics get an
+            "intervals" entry (rate_intervals.build_intervals()) grouping
+            reviews by action (DEFAULT_ACTION when absent), by %Y-%W week
+            of their timestamp and by A/B "variant" (when present)
+
+    Returns:
+        One statistics dict per cutoff, in the order given
+    """
+    windows = [_WindowStatistics(reason_capacity, interval_confidence) for _ in cutoffs]
+    unfiltered = tuple(w for w, c in zip(windows, cutoffs, strict=True) if c is None)
+    timed = sorted(
+        ((c, w) for w, c in zip(windows, cutoffs, strict=True) if c is not None), key=lambda item: item[0]
+    )
+    bounds = [c for c, _ in timed]
+    # targets[k]: the windows of a review at or after the first k cutoffs
+    targets = [unfiltered + tuple(w for _, w in timed[:k]) for k in range(len(timed) + 1)]
+    untimed = targets[-1]
+    track_groups = interval_confidence is not None
+
+    for metric in metrics:
+        row_targets = untimed
+        timestamp = None
+        if bounds or track_groups:
+            timestamp_str = metric.get("timestamp")
+            if timestamp_str:
+                try:
+                    timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+                except (ValueError, AttributeError):
+                    # Invalid timestamps only count towards unfiltered windows
+                    row_targets = unfiltered
+                else:
+                    if bounds:
+                        row_targets = targets[bisect_right(bounds, timestamp)]
+                if not row_targets:
+                    continue
+
+        outcome = metric.get("outcome", "unknown")
+        reasons = None
+        if outcome in REJECTED_OUTCOMES:
+            reasons = metric.get("rejection_reasons", [])
+            if not isinstance(reasons, list):
+                reasons = [reasons] if reasons else None
+        suggestions = metric.get("suggestions_count")
+        accepted = metric.get("accepted_count")
+        for window in row_targets:
+            window.add(outcome, suggestions, accepted, reasons)
+
+        if track_groups:
+            group_keys = [("action", str(metric.get("action", DEFAULT_ACTION)))]
+            if timestamp is not None:
+                group_keys.append(("week", timestamp.strftime("%Y-%W")))
+            if metric.get("variant") is not None:
+                group_keys.append(("variant", str(metric["variant"])))
+            for window in row_targets:
+                window.add_to_groups(group_keys, outcome in ACCEPTED_OUTCOMES)
+
+    return [window.statistics() for window in windows]
+
+
+def build_statistics(
+    outcome_counts: dict[str, int],
+    suggestions_sum: float,
+    suggestions_n: int,
+    accepted_sum: float,
+    accepted_n: int,
+    common_rejections: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """
+    Build the acceptance rate statistics from pre-counted values.
+
+    Args:
+        outcome_counts: Number of reviews per outcome
+        suggestions_sum: Sum of non-zero suggestions_count values
+        suggestions_n: Number of reviews with a non-zero suggestions_count
+        accepted_sum: Sum of accepted_count values
+        accepted_n: Number of reviews with an accepted_count
+        common_rejections: Output of get_common_reasons() for rejection reasons
+
+    Returns:
+        Dictionary containing acceptance rate statistics
+    """
+    total = sum(outcome_counts.values())
+    if not total:
         return {
             "acceptance_rate": 0.0,
             "total_reviews": 0,
@@ -33,45 +305,15 @@ def calculate_acceptance_rate(metrics: list[dict[str, Any]]) -> dict[str, Any]:
             "interpretation": "No reviews to analyze"
         }
 
-    total = len(metrics)
-
-    # Count outcomes
-    outcome_counts = defaultdict(int)
-    for metric in metrics:
-        outcome = metric.get("outcome", "unknown")
-        outcome_counts[outcome] += 1
-
-    # Calculate acceptance rate
     # Accepted = approved + modified (human made changes but ultimately accepted)
     accepted_count = (
         outcome_counts.get("approved", 0) +
         outcome_counts.get("modified", 0)
     )
+    acceptance_rate = accepted_count / total * 100
 
-    acceptance_rate = (accepted_count / total * 100) if total > 0 else 0.0
-
-    # Calculate other statistics
-    avg_suggestions = 0.0
-    suggestions_data = [m.get("suggestions_count", 0) for m in metrics if m.get("suggestions_count")]
-    if suggestions_data:
-        avg_suggestions = sum(suggestions_data) / len(suggestions_data)
-
-    avg_accepted = 0.0
-    accepted_data = [m.get("accepted_count", 0) for m in metrics if m.get("accepted_count") is not None]
-    if accepted_data:
-        avg_accepted = sum(accepted_data) / len(accepted_data)
-
-    # Get common rejection reasons
-    rejection_reasons = []
-    for metric in metrics:
-        if metric.get("outcome") in ["rejected", "needs_work"]:
-            reasons = metric.get("rejection_reasons", [])
-            if isinstance(reasons, list):
-                rejection_reasons.extend(reasons)
-            elif reasons:
-                rejection_reasons.append(reasons)
-
-    common_rejections = get_common_items(rejection_reasons)
+    avg_suggestions = suggestions_sum / suggestions_n if suggestions_n else 0.0
+    avg_accepted = accepted_sum / accepted_n if accepted_n else 0.0
 
     return {
         "acceptance_rate": round(acceptance_rate, 2),
@@ -84,18 +326,33 @@ def calculate_acceptance_rate(metrics: list[dict[str, Any]]) -> dict[str, Any]:
     }
 
 
-def get_common_items(items: list[str], top_n: int = 5) -> list[dict[str, Any]]:
-    """Get most common items from a list."""
-    if not items:
-        return []
+def get_common_items(
+    items: Iterable[str], top_n: int = 5, capacity: int = DEFAULT_CAPACITY
+) -> list[dict[str, Any]]:
+    """Get most common items (normalized reasons) in bounded memory."""
+    counter = SpaceSavingCounter(capacity)
+    counter.update(items)
+    return get_common_reasons(counter, top_n)
+
 
-    from collections import Counter
-    counter = Counter(items)
+def get_common_reasons(counter: SpaceSavingCounter, top_n: int = 5) -> list[dict[str, Any]]:
+    """
+    Report the top reasons of a sketch.
+
+    Counts are exact while the sketch has seen no more distinct reasons than
+    its capacity; otherwise each item carries "max_overcount", the most its
+    count can exceed the true count.
+    """
+    if not counter.total:
+        return []
 
-    return [
-        {"reason": reason, "count": count, "percentage": round(count / len(items) * 100, 1)}
-        for reason, count in counter.most_common(top_n)
-    ]
+    common = []
+    for reason, count in counter.most_common(top_n):
+        item = {"reason": reason, "count": count, "percentage": round(count / counter.total * 100, 1)}
+        if error := counter.error(reason):
+            item["max_overcount"] = error
+        common.append(item)
+    return common
 
 
 def get_interpretation(acceptance_rate: float, total_reviews: int) -> str:
@@ -123,6 +380,157 @@ def load_metrics_from_file(filepath: str) -> list[dict[str, Any]]:
         return []
 
 
+def parse_time_period(time_period: str) -> timedelta:
+    """Parse a time period such as "7d", "24h" or "1w" (defaults to 7 days)."""
+    if time_period.endswith('d'):
+        return timedelta(days=int(time_period[:-1]))
+    elif time_period.endswith('h'):
+        return timedelta(hours=int(time_period[:-1]))
+    elif time_period.endswith('w'):
+        return timedelta(weeks=int(time_period[:-1]))
+    # Default to 7 days
+    return timedelta(days=7)
+
+
+def rollup_review(metric: dict[str, Any]) -> tuple | None:
+    """
+    Map a review metric to its rollup (timestamp, group, counters).
+
+    Reviews without a timestamp are untimed (always included); reviews with
+    an invalid timestamp are skipped, as in filter_metrics_by_time().
+    Rejection reasons go in one {normalized label: count} counter, which the
+    rollup cells keep bounded (see metrics_rollup.merge_top_counts).
+    """
+    if not isinstance(metric, dict):
+        return None
+
+    timestamp_str = metric.get("timestamp")
+    when = None
+    if timestamp_str:
+        try:
+            when = normalize_timestamp(timestamp_str)
+        except (ValueError, TypeError):
+            return None
+
+    counters = {"reviews": 1}
+    if metric.get("suggestions_count"):
+        counters["suggestions_sum"] = metric["suggestions_count"]
+        counters["suggestions_n"] = 1
+    if metric.get("accepted_count") is not None:
+        counters["accepted_sum"] = metric["accepted_count"]
+        counters["accepted_n"] = 1
+    if metric.get("outcome") in REJECTED_OUTCOMES:
+        reasons = metric.get("rejection_reasons", [])
+        if not isinstance(reasons, list):
+            reasons = [reasons] if reasons else []
+        if reasons:
+            counters["reasons"] = dict(Counter(normalize_reason(r)[1] for r in reasons))
+
+    return when, (metric.get("outcome", "unknown"),), counters
+
+
+def calculate_acceptance_rate_from_rollup(
+    store: RollupStore, time_period: str = "7d", reason_capacity: int = DEFAULT_CAPACITY
+) -> dict[str, Any]:
+    """
+    Calculate acceptance rate statistics from rollup cells.
+
+    Args:
+        store: Rollup store updated with the metrics file
+        time_period: Time period to analyze (e.g., 7d, 24h, 1w)
+        reason_capacity: Distinct rejection reasons tracked
+
+    Returns:
+        Same statistics as calculate_acceptance_rate(filter_metrics_by_time(...));
+        rejection reason counts are exact while no rollup cell has seen more
+        than metrics_rollup.TOP_COUNTS_CAPACITY distinct reasons
+    """
+    cells = store.query(start=datetime.now(UTC) - parse_time_period(time_period))
+
+    outcome_counts = {}
+    totals = defaultdict(int)
+    reasons = SpaceSavingCounter(reason_capacity)
+    for (outcome,), cell in cells.items():
+        outcome_counts[outcome] = cell["reviews"]
+        for field, value in cell.items():
+            if field == "reasons":
+                for reason, count in value.items():
+                    reasons.add(reason, count)
+            else:
+                totals[field] += value
+
+    return build_statistics(
+        outcome_counts,
+        totals["suggestions_sum"],
+        totals["suggestions_n"],
+        totals["accepted_sum"],
+        totals["accepted_n"],
+        get_common_reasons(reasons),
+    )
+
+
+def calculate_acceptance_rate_from_columns(
+    columns: ReviewColumns, time_period: str = "7d", reason_capacity: int = DEFAULT_CAPACITY
+) -> dict[str, Any]:
+    """
+    Calculate acceptance rate statistics from the columnar cache.
+
+    The window is found by bisecting the timestamp order, and every other
+    per-review step (outcome counts, sums, the rejected-review selection)
+    iterates the typed columns in C via compress(), map() and bytes
+    operations.
+
+    Args:
+        columns: Review columns from load_review_columns()
+        time_period: Time period to analyze (e.g., 7d, 24h, 1w)
+        reason_capacity: Distinct rejection reasons tracked
+
+    Returns:
+        Same statistics as calculate_acceptance_rate(filter_metrics_by_time(...))
+        while the distinct reasons fit in reason_capacity
+    """
+    cutoff = epoch_us(datetime.now(UTC) - parse_time_period(time_period))
+    # Untimed reviews sort after any cutoff and invalid ones before it
+    keep = bytearray(columns.rows)
+    for i in window_rows(columns, cutoff):
+        keep[i] = 1
+
+    kept_outcomes = list(compress(columns.outcome, keep))
+    outcome_counts = Counter(kept_outcomes)
+    kept_suggestions = list(compress(columns.suggestions, keep))
+    accepted_sum = sum(compress(columns.accepted, keep))
+    accepted_n = bytes(compress(columns.flags, keep)).translate(_HAS_ACCEPTED_BYTES).count(1)
+
+    # One byte per review: 1 if kept and rejected (ANDed as big integers)
+    rejected = bytes(
+        outcome in REJECTED_OUTCOMES for outcome in columns.outcomes
+    ).ljust(256, b"\0")
+    rejected_mask = (
+        int.from_bytes(keep) & int.from_bytes(columns.outcome.tobytes().translate(rejected))
+    ).to_bytes(columns.rows)
+    # Stream the kept reasons straight into the sketch, in review order
+    rejection_reasons = SpaceSavingCounter(reason_capacity)
+    rejection_reasons.update(map(
+        columns.reasons_text.__getitem__,
+        compress(columns.reasons, map(rejected_mask.__getitem__, columns.reason_row)),
+    ))
+
+    return build_statistics(
+        {columns.outcomes[code]: count for code, count in outcome_counts.items()},
+        sum(kept_suggestions),
+        len(kept_suggestions) - kept_suggestions.count(0),
+        accepted_sum,
+        accepted_n,
+        get_common_reasons(rejection_reasons),
+    )
+
+
+def parse_time_periods(value: str) -> list[str]:
+    """Split a comma-separated --time-period value ("24h,7d,30d"), dropping duplicates."""
+    periods = [p.strip() for p in value.split(",") if p.strip()]
+    return list(dict.fromkeys(periods)) or ["7d"]
+
+
 def filter_metrics_by_time(
     metrics: list[dict[str, Any]],
     time_period: str = "7d"
@@ -131,21 +539,7 @@ def filter_metrics_by_time(
     if not metrics:
         return []
 
-    # Parse time period (e.g., "7d", "24h", "1w")
-    now = datetime.now(UTC)
-
-    if time_period.endswith('d'):
-        days = int(time_period[:-1])
-        cutoff = now - timedelta(days=days)
-    elif time_period.endswith('h'):
-        hours = int(time_period[:-1])
-        cutoff = now - timedelta(hours=hours)
-    elif time_period.endswith('w'):
-        weeks = int(time_period[:-1])
-        cutoff = now - timedelta(weeks=weeks)
-    else:
-        # Default to 7 days
-        cutoff = now - timedelta(days=7)
+    cutoff = datetime.now(UTC) - parse_time_period(time_period)
 
     # Filter metrics by timestamp
     filtered = []
@@ -167,10 +561,14 @@ def filter_metrics_by_time(
     return filtered
 
 
-def generate_quality_report(metrics: list[dict[str, Any]], time_period: str = "7d") -> str:
-    """Generate a human-readable quality report."""
-    filtered = filter_metrics_by_time(metrics, time_period)
-    stats = calculate_acceptance_rate(filtered)
+def generate_quality_report(
+    metrics: list[dict[str, Any]],
+    time_period: str = "7d",
+    stats: dict[str, Any] | None = None,
+) -> str:
+    """Generate a human-readable quality report (from precomputed stats if given)."""
+    if stats is None:
+        stats = calculate_acceptance_rate_for_period(metrics, time_period)
 
     report = []
     report.append(f"# AI Review Quality Report (Last {time_period})")
@@ -194,7 +592,16 @@ def generate_quality_report(metrics: list[dict[str, Any]], time_period: str = "7
     report.append(f"| Avg Suggestions | {avg_suggestions} | N/A | - |")
 
     report.append("")
-    report.append("## Outcome Breakdown")
+    report.extend(_report_details(stats, "##"))
+
+    return "\n".join(report)
+
+
+def _report_details(stats: dict[str, Any], heading: str) -> list[str]:
+    """Outcome breakdown, rejection reasons and interpretation sections."""
+    total = stats["total_reviews"]
+    report = []
+    report.append(f"{heading} Outcome Breakdown")
 
     breakdown = stats.get("outcome_breakdown", {})
     if breakdown:
@@ -206,18 +613,87 @@ def generate_quality_report(metrics: list[dict[str, Any]], time_period: str = "7
 
     common_rejections = stats.get("common_rejection_reasons", [])
     if common_rejections:
-        report.append("## Common Rejection Reasons")
+        report.append(f"{heading} Common Rejection Reasons")
         report.append("")
         for item in common_rejections:
             report.append(f"{item['count']}. \"{item['reason']}\" ({item['percentage']}%)")
         report.append("")
 
+    intervals = stats.get("intervals")
+    if intervals:
+        report.extend(_interval_details(intervals, heading))
+
     interpretation = stats.get("interpretation", "")
-    report.append("## Interpretation")
+    report.append(f"{heading} Interpretation")
     report.append("")
     report.append(interpretation)
+    return report
 
-    return "\n".join(report)
+
+def _interval_details(intervals: dict[str, Any], heading: str) -> list[str]:
+    """Confidence interval table and the changes whose intervals separate."""
+    level = f"{intervals['confidence'] * 100:g}%"
+    report = []
+    report.append(f"{heading} Confidence Intervals ({level})")
+    report.append("")
+    report.append("| Group | Reviews | Acceptance Rate | Wilson | Bootstrap |")
+    report.append("|-------|---------|-----------------|--------|-----------|")
+    rows = [("Overall", intervals["overall"])]
+    for dimension in ("action", "week", "variant"):
+        rows.extend(
+            (f"{dimension.title()} {group}", interval)
+            for group, interval in intervals[f"by_{dimension}"].items()
+        )
+    for label, interval in rows:
+        if not interval["reviews"]:
+            continue
+        wilson = "–".join(f"{bound}%" for bound in interval["wilson"])
+        bootstrap = "–".join(f"{bound}%" for bound in interval["bootstrap"])
+        report.append(
+            f"| {label} | {interval['reviews']} | {interval['acceptance_rate']}% "
+            f"| {wilson} | {bootstrap} |"
+        )
+    report.append("")
+
+    if intervals["changes"]:
+        report.append("Changes with separated intervals:")
+        for change in intervals["changes"]:
+            report.append(
+                f"- {change['dimension'].title()} {change['from']} → {change['to']}: "
+                f"{change['direction']} from {change['from_rate']}% to {change['to_rate']}%"
+            )
+    else:
+        report.append("No week-over-week or variant change has separated intervals.")
+    report.append("")
+    return report
+
+
+def generate_multi_period_report(
+    stats_by_period: dict[str, dict[str, Any]], target: float = 70.0
+) -> str:
+    """Generate one quality report comparing several time periods."""
+    report = []
+    report.append(f"# AI Review Quality Report (Last {', '.join(stats_by_period)})")
+    report.append("")
+    report.append("## Summary")
+    report.append("")
+    report.append("| Period | Acceptance Rate | Total Reviews | Avg Suggestions | Status |")
+    report.append("|--------|-----------------|---------------|-----------------|--------|")
+    for period, stats in stats_by_period.items():
+        status = "✅" if stats["acceptance_rate"] >= target else "⚠️"
+        report.append(
+            f"| {period} | {stats['acceptance_rate']}% | {stats['total_reviews']} "
+            f"| {stats.get('average_suggestions', 0)} | {status} |"
+        )
+    report.append("")
+
+    for period, stats in stats_by_period.items():
+        report.append(f"## Last {period}")
+        report.append("")
+        report.extend(_report_details(stats, "###"))
+        report.append("")
+
+    return "\n".join(report).rstrip()
 
 
 def main():
@@ -235,7 +711,8 @@ def main():
     parser.add_argument(
         "--time-period",
         default="7d",
-        help="Time period to analyze (e.g., 7d, 24h, 1w)"
+        help="Time period to analyze (e.g., 7d, 24h, 1w), or a comma-separated "
+        "list (e.g., 24h,7d,30d) computed in one scan"
     )
     parser.add_argument(
         "--output",
@@ -243,6 +720,34 @@ def main():
         default="summary",
         help="Output format"
     )
+    parser.add_argument(
+        "--rollup-file",
+        help="Serve the time period from hourly/daily rollups persisted here"
+    )
+    parser.add_argument(
+        "--columnar-cache",
+        action="store_true",
+        help="Read reviews from a columnar cache next to the metrics file "
+        "(<metrics-file>.columns), rebuilt when the file changes"
+    )
+    parser.add_argument(
+        "--reason-capacity",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help=f"Distinct rejection reasons tracked for the top-5 report (default: {DEFAULT_CAPACITY})"
+    )
+    parser.add_argument(
+        "--intervals",
+        action="store_true",
+        help="Add Wilson and bootstrap confidence intervals overall, per action, "
+        "per week and per variant"
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=DEFAULT_CONFIDENCE,
+        help=f"Confidence level for --intervals (default: {DEFAULT_CONFIDENCE})"
+    )
     parser.add_argument(
         "--target-rate",
         type=float,
@@ -251,32 +756,76 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.reason_capacity < 1:
+        parser.error("--reason-capacity must be at least 1")
+    if not 0 < args.confidence < 1:
+        parser.error("--confidence must be between 0 and 1")
+    if args.intervals and (args.rollup_file or args.columnar_cache):
+        # Rollups and columns do not keep the per-review action and variant
+        parser.error("--intervals cannot be combined with --rollup-file or --columnar-cache")
 
     # Respect privacy settings - check if telemetry is disabled
     if is_telemetry_disabled():
         print("Quality metrics analysis is disabled via DISABLE_TELEMETRY environment variable.", file=sys.stderr)
         return 0
 
-    # Load metrics
-    metrics = load_metrics_from_file(args.metrics_file)
+    time_periods = parse_time_periods(args.time_period)
 
-    # Filter by time period
-    filtered = filter_metrics_by_time(metrics, args.time_period)
-
-    # Calculate statistics
-    stats = calculate_acceptance_rate(filtered)
+    if args.rollup_file:
+        # Fold reviews added since the last run, then query the rollups
+        store = RollupStore.load(args.rollup_file, ROLLUP_SCHEMA, rollup_review)
+        store.update([args.metrics_file])
+        store.save()
+        stats_by_period = {
+            period: calculate_acceptance_rate_from_rollup(store, period, args.reason_capacity)
+            for period in time_periods
+        }
+    elif args.columnar_cache and (columns := load_review_columns(args.metrics_file)) is not None:
+        # Each period is a bisect into the same time-sorted columns
+        stats_by_period = {
+            period: calculate_acceptance_rate_from_columns(columns, period, args.reason_capacity)
+            for period in time_periods
+        }
+    else:
+        # Load metrics once, then filter and calculate every period in one pass
+        metrics = load_metrics_from_file(args.metrics_file)
+        stats_by_period = calculate_acceptance_rate_for_periods(
+            metrics,
+            time_periods,
+            args.reason_capacity,
+            args.confidence if args.intervals else None,
+        )
 
     # Add target comparison
-    stats["target_acceptance_rate"] = args.target_rate
-    stats["meets_target"] = stats["acceptance_rate"] >= args.target_rate
+    for stats in stats_by_period.values():
+        stats["target_acceptance_rate"] = args.target_rate
+        stats["meets_target"] = stats["acceptance_rate"] >= args.target_rate
+    # The first period decides the exit status, as a single --time-period does
+    stats = stats_by_period[time_periods[0]]
 
     # Output results
-    if args.output == "json":
+    if len(time_periods) > 1:
+        if args.output == "json":
+            print(json.dumps({"time_periods": time_periods, "periods": stats_by_period}, indent=2))
+        elif args.output == "report":
+            print(generate_multi_period_report(stats_by_period, args.target_rate))
+        else:  # summary
+            print(f"Target: {args.target_rate}%")
+            for period, period_stats in stats_by_period.items():
+                status = '✅ PASS' if period_stats['meets_target'] else '⚠️  BELOW TARGET'
+                print(
+                    f"Last {period}: {period_stats['acceptance_rate']}% "
+                    f"({period_stats['total_reviews']} reviews) {status}"
+                )
+    elif args.output == "json":
         print(json.dumps(stats, indent=2))
     elif args.output == "report":
-        print(generate_quality_report(metrics, args.time_period))
+        print(generate_quality_report([], time_periods[0], stats))
     else:  # summary
         print(f"Acceptance Rate: {stats['acceptance_rate']}%")
+        if stats.get("intervals") and stats["intervals"]["overall"]["wilson"]:
+            low, high = stats["intervals"]["overall"]["wilson"]
+            print(f"{stats['intervals']['confidence'] * 100:g}% CI (Wilson): {low}%–{high}%")
         print(f"Total Reviews: {stats['total_reviews']}")
         print(f"Target: {args.target_rate}%")
         print(f"Status: {'✅ PASS' if stats['meets_target'] else '⚠️  BELOW TARGET'}")
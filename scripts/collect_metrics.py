@@ -13,25 +13,55 @@ Privacy Features:
 
 Usage:
     python scripts/collect_metrics.py <action_name> <status> <duration_ms> [error_type]
+    python scripts/collect_metrics.py --flush
 
 Environment Variables:
     DISABLE_TELEMETRY: Set to "true" to disable metrics collection
     GITHUB_REPOSITORY: Automatically set in GitHub Actions (hashed for privacy)
+    TELEMETRY_ENDPOINT: Optional collector URL that flushed batches are POSTed to
+    TELEMETRY_FLUSH_THRESHOLD: Spooled events that trigger a flush (default: 1)
+    TELEMETRY_SPOOL_DIR: Spool directory (default: metrics/telemetry/spool)
+
+Startup:
+    This script runs as a fresh interpreter on every action step, so only
+    os, sys, time and env_config are imported up front. hashlib is imported
+    when a repository is hashed, and json, the spool and the HTTP exporter
+    only when an event cannot simply be appended to telemetry.log. It also
+    runs under `python -S -I` and from the zipapp built by
+    build_collect_metrics_zipapp.py.
 """
 
-import hashlib
-import json
+import os
 import sys
-from datetime import UTC, datetime
-from pathlib import Path
+import time
 
-from env_config import (
+# -I (-P) does not put the script's directory on sys.path
+_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+
+from env_config import (  # noqa: E402
     get_claude_cli_version,
     get_github_repository,
     get_runner_os,
+    get_telemetry_endpoint,
+    get_telemetry_flush_threshold,
+    get_telemetry_spool_dir,
     is_telemetry_disabled,
 )
 
+TELEMETRY_DIR = "metrics/telemetry"
+VALID_STATUSES = ["success", "failure", "error"]
+# Must match telemetry_spool.SPOOL_SUFFIX and telemetry_line_protocol.LINE_SUFFIX
+_SPOOL_SUFFIXES = (".json", ".evt")
+
+# JSON escapes for the characters json.dumps() escapes in ASCII strings
+_JSON_ESCAPES = {i: f"\\u{i:04x}" for i in range(0x20)}
+_JSON_ESCAPES.update({
+    ord('"'): '\\"', ord("\\"): "\\\\", ord("\n"): "\\n", ord("\r"): "\\r",
+    ord("\t"): "\\t", ord("\b"): "\\b", ord("\f"): "\\f", 0x7f: "\\u007f",
+})
+
 
 def anonymize_repository(repo: str) -> str:
     """
@@ -46,6 +76,8 @@ def anonymize_repository(repo: str) -> str:
     if repo == "unknown":
         return repo
 
+    import hashlib
+
     hash_obj = hashlib.sha256(repo.encode('utf-8'))
     return hash_obj.hexdigest()[:16]
 
@@ -72,24 +104,54 @@ def collect_metrics(
     if is_telemetry_disabled():
         return {"status": "skipped", "reason": "telemetry_disabled"}
 
-    # Get repository context (anonymous)
-    repo = get_github_repository()
-    repo_id = anonymize_repository(repo)
+    return build_event(
+        action_name,
+        status,
+        duration_ms,
+        error_type,
+        repository=get_github_repository(),
+        runner_os=get_runner_os(),
+        claude_cli_version=get_claude_cli_version(),
+    )
+
+
+def build_event(
+    action_name: str,
+    status: str,
+    duration_ms: int,
+    error_type: str | None,
+    repository: str,
+    runner_os: str,
+    claude_cli_version: str,
+    epoch_ns: int | None = None,
+) -> dict:
+    """
+    Build a telemetry event from its raw fields.
 
-    # Get runner OS
-    runner_os = get_runner_os()
+    Shared by collect_metrics() and the spool line-protocol importer, so
+    events look the same whichever way they were recorded.
 
-    # Get Claude CLI version (if available)
-    claude_version = get_claude_cli_version()
+    Args:
+        action_name: Name of the Action
+        status: Execution status
+        duration_ms: Execution duration in milliseconds
+        error_type: Optional error type or message
+        repository: Repository name (anonymized here)
+        runner_os: Runner operating system
+        claude_cli_version: Claude CLI version
+        epoch_ns: Event time in nanoseconds since the epoch (default: now)
 
+    Returns:
+        Dictionary containing collected metrics
+    """
     metrics = {
         "action_name": action_name,
-        "timestamp": datetime.now(UTC).isoformat().replace('+00:00', 'Z'),
+        "timestamp": _utc_timestamp(epoch_ns),
         "status": status,
         "duration_ms": duration_ms,
-        "repository_anonymous_id": repo_id,
+        "repository_anonymous_id": anonymize_repository(repository),
         "runner_os": runner_os,
-        "claude_cli_version": claude_version,
+        "claude_cli_version": claude_cli_version,
     }
 
     if error_type:
@@ -98,16 +160,87 @@ def collect_metrics(
     return metrics
 
 
+def _utc_timestamp(epoch_ns: int | None = None) -> str:
+    """UTC time (default: now) formatted like datetime.isoformat(), with a "Z" suffix."""
+    if epoch_ns is None:
+        epoch_ns = time.time_ns()
+    seconds, nanoseconds = divmod(epoch_ns, 1_000_000_000)
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+    microseconds = nanoseconds // 1000
+    return f"{stamp}.{microseconds:06d}Z" if microseconds else f"{stamp}Z"
+
+
+def encode_event(metrics: dict) -> str:
+    """
+    Encode an event as one NDJSON line, exactly as json.dumps() would.
+
+    Flat events of ASCII strings, integers, booleans and None are encoded
+    here without importing json; anything else falls back to json.dumps().
+
+    Args:
+        metrics: Event dictionary
+
+    Returns:
+        JSON text followed by a newline
+    """
+    parts = []
+    for key, value in metrics.items():
+        if not isinstance(key, str) or not key.isascii():
+            break
+        if value is None:
+            encoded = "null"
+        elif value is True or value is False:
+            encoded = "true" if value else "false"
+        elif type(value) is int:
+            encoded = str(value)
+        elif type(value) is str and value.isascii():
+            encoded = f'"{value.translate(_JSON_ESCAPES)}"'
+        else:
+            break
+        parts.append(f'"{key.translate(_JSON_ESCAPES)}": {encoded}')
+    else:
+        return "{" + ", ".join(parts) + "}\n"
+
+    import json
+
+    return json.dumps(metrics) + "\n"
+
+
+def _spool_dir() -> str:
+    return get_telemetry_spool_dir() or os.path.join(TELEMETRY_DIR, "spool")
+
+
+def _has_spooled_events(spool_dir: str) -> bool:
+    try:
+        with os.scandir(spool_dir) as entries:
+            return any(entry.name.endswith(_SPOOL_SUFFIXES) for entry in entries)
+    except FileNotFoundError:
+        return False
+
+
+def _append_line(log_file: str, line: str) -> None:
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    # Unbuffered, so the line is appended by a single write()
+    with open(log_file, "ab", buffering=0) as f:
+        f.write(line.encode("utf-8"))
+        os.fsync(f.fileno())
+
+
 def send_metrics(metrics: dict) -> bool:
     """
     Send metrics to collection endpoint.
 
-    Currently, this is a placeholder implementation. In production, you would:
-    1. Send to a metrics collection service (e.g., Google Analytics, self-hosted)
-    2. Queue for batch sending to reduce overhead
-    3. Handle network errors gracefully
+    The event is first written to the spool directory as its own small file
+    (see telemetry_spool), which is cheap and safe against concurrent steps.
+    Once TELEMETRY_FLUSH_THRESHOLD events are spooled (1 by default, since
+    runners are ephemeral), the spool is flushed: events are appended to
+    telemetry.log in one write per batch and, if TELEMETRY_ENDPOINT is set,
+    POSTed to the collector with retries. Run `--flush` at the end of a job
+    when using a higher threshold.
 
-    For now, metrics are logged to a file for manual inspection.
+    With the default threshold, no endpoint and an empty spool, spooling and
+    flushing would just append the event to telemetry.log, so the line is
+    appended directly and the spool module is never imported.
 
     Args:
         metrics: Dictionary containing metrics to send
@@ -119,14 +252,20 @@ def send_metrics(metrics: dict) -> bool:
         return True
 
     try:
-        # Create metrics directory if it doesn't exist
-        metrics_dir = Path("metrics/telemetry")
-        metrics_dir.mkdir(parents=True, exist_ok=True)
+        spool_dir = _spool_dir()
+        log_file = os.path.join(TELEMETRY_DIR, "telemetry.log")
+        endpoint = get_telemetry_endpoint()
+        threshold = get_telemetry_flush_threshold()
+
+        if endpoint is None and threshold == 1 and not _has_spooled_events(spool_dir):
+            _append_line(log_file, encode_event(metrics))
+            return True
 
-        # Write metrics to log file (append mode)
-        log_file = metrics_dir / "telemetry.log"
-        with open(log_file, "a") as f:
-            f.write(json.dumps(metrics) + "\n")
+        from telemetry_spool import flush_spool, should_flush, spool_event
+
+        spool_event(metrics, spool_dir)
+        if should_flush(spool_dir, threshold):
+            flush_spool(spool_dir, log_file, endpoint)
 
         return True
 
@@ -136,11 +275,39 @@ def send_metrics(metrics: dict) -> bool:
         return False
 
 
+def flush_metrics() -> bool:
+    """
+    Flush every spooled event, regardless of the flush threshold.
+
+    Returns:
+        True if no events are left waiting for delivery, False otherwise
+    """
+    try:
+        from telemetry_spool import flush_spool
+
+        result = flush_spool(
+            _spool_dir(),
+            os.path.join(TELEMETRY_DIR, "telemetry.log"),
+            get_telemetry_endpoint(),
+        )
+    except Exception as e:
+        print(f"Warning: Failed to flush metrics: {e}", file=sys.stderr)
+        return False
+
+    print(f"Flushed {result.logged} events ({result.shipped} shipped, {result.pending} pending)")
+    return result.pending == 0
+
+
 def main():
     """Main entry point for command-line usage."""
+    if sys.argv[1:] == ["--flush"]:
+        flush_metrics()
+        # Always exit successfully to avoid breaking Actions
+        sys.exit(0)
+
     if len(sys.argv) < 4:
         print(
-            f"Usage: {sys.argv[0]} <action_name> <status> <duration_ms> [error_type]",
+            f"Usage: {sys.argv[0]} <action_name> <status> <duration_ms> [error_type] | --flush",
             file=sys.stderr
         )
         sys.exit(1)
@@ -157,9 +324,8 @@ def main():
     error_type = sys.argv[4] if len(sys.argv) > 4 else None
 
     # Validate status
-    valid_statuses = ["success", "failure", "error"]
-    if status not in valid_statuses:
-        print(f"Warning: Invalid status '{status}', must be one of {valid_statuses}", file=sys.stderr)
+    if status not in VALID_STATUSES:
+        print(f"Warning: Invalid status '{status}', must be one of {VALID_STATUSES}", file=sys.stderr)
         status = "error"
 
     # Collect and send metrics
@@ -89,3 +89,48 @@ def get_claude_cli_version() -> str:
         Version string, or "unknown" if not set
     """
     return os.getenv("CLAUDE_CLI_VERSION", "unknown")
+
+
+def get_telemetry_endpoint() -> str | None:
+    """
+    Get the HTTP collector that spooled telemetry batches are shipped to.
+
+    Returns:
+        Collector URL from TELEMETRY_ENDPOINT, or None if not set
+    """
+    return os.getenv("TELEMETRY_ENDPOINT") or None
+
+
+def get_otlp_endpoint() -> str | None:
+    """
+    Get the OpenTelemetry collector that OTLP/JSON exports are sent to.
+
+    Returns:
+        Base URL from OTEL_EXPORTER_OTLP_ENDPOINT (e.g. http://localhost:4318),
+        or None if not set
+    """
+    return os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or None
+
+
+def get_telemetry_spool_dir() -> str | None:
+    """
+    Get the spool directory shared with scripts/telemetry.sh.
+
+    Returns:
+        Directory from TELEMETRY_SPOOL_DIR, or None to use the default
+    """
+    return os.getenv("TELEMETRY_SPOOL_DIR") or None
+
+
+def get_telemetry_flush_threshold() -> int:
+    """
+    Get how many spooled telemetry events trigger a flush.
+
+    Returns:
+        TELEMETRY_FLUSH_THRESHOLD as a positive integer, or 1 (flush on every
+        event) if not set or invalid
+    """
+    try:
+        return max(1, int(os.getenv("TELEMETRY_FLUSH_THRESHOLD", "1")))
+    except ValueError:
+        return 1
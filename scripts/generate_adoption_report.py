@@ -15,19 +15,25 @@ Environment Variables:
 """
 
 import argparse
-import json
 import sys
 from collections import defaultdict
+from collections.abc import Iterable
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from telemetry_reader import read_events
 
-def load_telemetry_data(data_path: Path) -> list:
+# Event fields the report reads; the rest of each logged event is not kept
+REPORT_FIELDS = ("timestamp", "action_name", "status", "repository_anonymous_id")
+
+
+def load_telemetry_data(data_path: Path, fields: Iterable[str] | None = None) -> list:
     """
     Load telemetry data from log file.
 
     Args:
         data_path: Path to telemetry.log file
+        fields: Keep only these fields of each event (default: all)
 
     Returns:
         List of telemetry event dictionaries
@@ -35,20 +41,8 @@ def load_telemetry_data(data_path: Path) -> list:
     if not data_path.exists():
         return []
 
-    events = []
-    with open(data_path) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                event = json.loads(line)
-                events.append(event)
-            except json.JSONDecodeError:
-                # Skip malformed lines
-                continue
-
-    return events
+    # Malformed lines are skipped
+    return list(read_events(data_path, fields))
 
 
 def filter_events_by_period(events: list, days: int) -> list:
@@ -365,7 +359,7 @@ def main():
 
     # Load telemetry data
     print(f"Loading telemetry data from: {args.telemetry_data}")
-    all_events = load_telemetry_data(args.telemetry_data)
+    all_events = load_telemetry_data(args.telemetry_data, REPORT_FIELDS)
 
     if not all_events:
         print("⚠️  Warning: No telemetry data found. Report will show zeros.")
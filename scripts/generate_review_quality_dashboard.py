@@ -4,16 +4,37 @@ Generate AI Review Quality Dashboard
 
 This script analyzes review_metrics.json to generate a dashboard
 showing AI review quality trends and patterns.
+
+Rejection reasons are counted in a bounded-memory top-k sketch (see
+heavy_hitters.py), by normalized text; --reason-capacity sets how many
+distinct reasons it monitors.
+
+With --columnar-cache, the markdown dashboard is computed from a binary
+columnar copy of the metrics file (see review_columns.py) that is rebuilt
+only when the JSON changes.
 """
 
 import argparse
 import json
 import sys
-from collections import Counter, defaultdict
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from heavy_hitters import DEFAULT_CAPACITY, SpaceSavingCounter  # noqa: E402
+from review_columns import (  # noqa: E402
+    REASON_SCALAR,
+    TS_VALID,
+    ReviewColumns,
+    load_review_columns,
+    local_datetime,
+)
+
+_DAY_US = 86_400_000_000
+
 
 def load_metrics(metrics_file: Path) -> list[dict[str, Any]]:
     """Load review metrics from JSON file."""
@@ -53,13 +74,14 @@ def group_by_week(metrics: list[dict]) -> dict[str, list[dict]]:
     return dict(sorted(weekly.items()))
 
 
-def extract_rejection_reasons(metrics: list[dict]) -> Counter:
-    """Extract and count rejection reasons."""
-    reasons = Counter()
+def extract_rejection_reasons(
+    metrics: list[dict], capacity: int = DEFAULT_CAPACITY
+) -> SpaceSavingCounter:
+    """Extract and count rejection reasons (normalized, in bounded memory)."""
+    reasons = SpaceSavingCounter(capacity)
     for m in metrics:
         if m.get("outcome") in ["rejected", "modified"]:
-            for reason in m.get("rejection_reasons", []):
-                reasons[reason] += 1
+            reasons.update(m.get("rejection_reasons", []))
     return reasons
 
 
@@ -89,16 +111,116 @@ def calculate_confidence_correlation(metrics: list[dict]) -> dict[str, float]:
     }
 
 
+def summarize_metrics(metrics: list[dict], reason_capacity: int = DEFAULT_CAPACITY) -> dict[str, Any]:
+    """
+    Compute the statistics shown on the dashboard.
+
+    Args:
+        metrics: Review metric dicts
+        reason_capacity: Distinct rejection reasons tracked
+
+    Returns:
+        Dict with total_reviews, acceptance_rate, weekly ({week: (reviews,
+        acceptance rate)}), rejection_reasons and correlation
+    """
+    return {
+        "total_reviews": len(metrics),
+        "acceptance_rate": calculate_acceptance_rate(metrics),
+        "weekly": {
+            week: (len(week_metrics), calculate_acceptance_rate(week_metrics))
+            for week, week_metrics in group_by_week(metrics).items()
+        },
+        "rejection_reasons": extract_rejection_reasons(metrics, reason_capacity),
+        "correlation": calculate_confidence_correlation(metrics),
+    }
+
+
+def summarize_columns(
+    columns: ReviewColumns, reason_capacity: int = DEFAULT_CAPACITY
+) -> dict[str, Any]:
+    """
+    Compute the dashboard statistics from the columnar cache.
+
+    Args:
+        columns: Review columns from load_review_columns()
+        reason_capacity: Distinct rejection reasons tracked
+
+    Returns:
+        Same dict as summarize_metrics() over the reviews
+    """
+    codes = {outcome: code for code, outcome in enumerate(columns.outcomes)}
+    approved = codes.get("approved")
+    rejected = codes.get("rejected")
+    reason_outcomes = {codes[name] for name in ("rejected", "modified") if name in codes}
+    outcome_col = columns.outcome
+    ts_us = columns.ts_us
+    ts_offset = columns.ts_offset
+    flags = columns.flags
+    reason_start = columns.reason_start
+    reason_codes = columns.reasons
+    reasons_text = columns.reasons_text
+
+    total = columns.rows
+    weeks = {}
+    week_counts = defaultdict(lambda: [0, 0])
+    rejection_reasons = SpaceSavingCounter(reason_capacity)
+    for i, state in enumerate(columns.ts_state):
+        outcome = outcome_col[i]
+        if state == TS_VALID:
+            # Weeks follow each timestamp's own UTC offset, as in group_by_week()
+            day = (ts_us[i] + ts_offset[i] * 1_000_000) // _DAY_US
+            week = weeks.get(day)
+            if week is None:
+                week = weeks[day] = local_datetime(day * _DAY_US, 0).strftime("%Y-%W")
+            counts = week_counts[week]
+            counts[0] += 1
+            counts[1] += outcome == approved
+        if outcome in reason_outcomes:
+            for code in reason_codes[reason_start[i]:reason_start[i + 1]]:
+                if flags[i] & REASON_SCALAR:
+                    # A string is iterated per character, as in extract_rejection_reasons()
+                    rejection_reasons.update(reasons_text[code])
+                else:
+                    rejection_reasons.add(reasons_text[code])
+
+    outcomes = outcome_col.tolist()
+    confidence = columns.confidence
+    accepted_confidences = [confidence[i] for i, code in enumerate(outcomes) if code == approved]
+    rejected_confidences = [confidence[i] for i, code in enumerate(outcomes) if code == rejected]
+    return {
+        "total_reviews": total,
+        "acceptance_rate": outcomes.count(approved) / total * 100 if total else 0.0,
+        "weekly": {
+            week: (reviews, approved_count / reviews * 100)
+            for week, (reviews, approved_count) in sorted(week_counts.items())
+        },
+        "rejection_reasons": rejection_reasons,
+        "correlation": {
+            "average_confidence_accepted": (
+                sum(accepted_confidences) / len(accepted_confidences) if accepted_confidences else 0.0
+            ),
+            "average_confidence_rejected": (
+                sum(rejected_confidences) / len(rejected_confidences) if rejected_confidences else 0.0
+            ),
+        },
+    }
+
+
 def generate_markdown_dashboard(metrics: list[dict]) -> str:
     """Generate a markdown dashboard from metrics."""
-    if not metrics:
+    return render_markdown_dashboard(summarize_metrics(metrics))
+
+
+def render_markdown_dashboard(summary: dict[str, Any]) -> str:
+    """Render the markdown dashboard from summarize_metrics() output."""
+    total_reviews = summary["total_reviews"]
+    if not total_reviews:
         return "# AI Review Quality Dashboard\n\n**No data available**\n"
 
-    total_reviews = len(metrics)
-    acceptance_rate = calculate_acceptance_rate(metrics)
-    weekly_data = group_by_week(metrics)
-    rejection_reasons = extract_rejection_reasons(metrics)
-    correlation = calculate_confidence_correlation(metrics)
+    acceptance_rate = summary["acceptance_rate"]
+    weekly_data = summary["weekly"]
+    rejection_reasons = summary["rejection_reasons"]
+    correlation = summary["correlation"]
 
     md = "# AI Review Quality Dashboard\n\n"
     md += f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}\n"
@@ -109,9 +231,8 @@ def generate_markdown_dashboard(metrics: list[dict]) -> str:
     md += "## Acceptance Rate Trend\n\n"
     md += "| Week | Reviews | Acceptance Rate |\n"
     md += "|------|---------|----------------|\n"
-    for week, week_metrics in weekly_data.items():
-        week_rate = calculate_acceptance_rate(week_metrics)
-        md += f"| {week} | {len(week_metrics)} | {week_rate:.1f}% |\n"
+    for week, (week_reviews, week_rate) in weekly_data.items():
+        md += f"| {week} | {week_reviews} | {week_rate:.1f}% |\n"
     md += "\n"
 
     # Rejection reasons
@@ -141,7 +262,7 @@ def generate_markdown_dashboard(metrics: list[dict]) -> str:
         md += "❌ **Poor**: AI review quality needs significant improvement.\n"
 
     if weekly_data and len(weekly_data) > 1:
-        recent_rate = calculate_acceptance_rate(weekly_data[list(weekly_data.keys())[-1]])
+        recent_rate = weekly_data[list(weekly_data.keys())[-1]][1]
         if recent_rate > acceptance_rate:
             md += "\n📈 **Trend**: Acceptance rate is improving.\n"
         elif recent_rate < acceptance_rate:
@@ -186,18 +307,43 @@ def main():
         default="markdown",
         help="Output format",
     )
+    parser.add_argument(
+        "--columnar-cache",
+        action="store_true",
+        help="Read reviews from a columnar cache next to the metrics file "
+        "(<metrics>.columns), rebuilt when the file changes (markdown format only)",
+    )
+    parser.add_argument(
+        "--reason-capacity",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help=f"Distinct rejection reasons tracked for the top-5 list (default: {DEFAULT_CAPACITY})",
+    )
 
     args = parser.parse_args()
-
-    # Load metrics
-    metrics = load_metrics(args.metrics)
-    if not metrics:
+    if args.reason_capacity < 1:
+        parser.error("--reason-capacity must be at least 1")
+
+    # Load metrics (the JSON format re-emits the raw reviews, so it needs them)
+    columns = None
+    if args.columnar_cache and args.format == "markdown":
+        columns = load_review_columns(str(args.metrics))
+    if columns is not None:
+        metrics = []
+        summary = summarize_columns(columns, args.reason_capacity)
+    else:
+        metrics = load_metrics(args.metrics)
+        summary = None
+    total_reviews = summary["total_reviews"] if summary else len(metrics)
+    if not total_reviews:
         print(f"Warning: No metrics found in {args.metrics}", file=sys.stderr)
         # Still create an empty dashboard
 
     # Generate dashboard
     if args.format == "markdown":
-        output = generate_markdown_dashboard(metrics)
+        if summary is None:
+            summary = summarize_metrics(metrics, args.reason_capacity)
+        output = render_markdown_dashboard(summary)
     else:
         output = json.dumps(metrics, indent=2)
 
@@ -207,9 +353,9 @@ def main():
     print(f"Dashboard generated: {args.output}")
 
     # Print summary
-    if metrics:
-        rate = calculate_acceptance_rate(metrics)
-        print(f"Acceptance rate: {rate:.1f}% ({len(metrics)} reviews)")
+    if total_reviews:
+        rate = summary["acceptance_rate"] if summary else calculate_acceptance_rate(metrics)
+        print(f"Acceptance rate: {rate:.1f}% ({total_reviews} reviews)")
         if rate >= 70:
             print("✅ Target achieved (70%+)")
         else:
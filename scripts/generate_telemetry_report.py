@@ -3,15 +3,20 @@
 Generate telemetry report from collected metrics.
 
 This script reads telemetry.log and generates a weekly report showing
-usage patterns, success rates, and error trends.
+usage patterns, success rates, error trends and per-action latency
+percentiles (from duration_ms, with week-over-week regression flags).
 
 Usage:
     python scripts/generate_telemetry_report.py [--days N] [--input PATH] [--output PATH]
+        [--rollup-file PATH]
 
 Arguments:
     --days: Number of days to include (default: 7, use 0 for all-time)
     --input: Path to telemetry.log file (default: metrics/telemetry/telemetry.log)
     --output: Output report path (default: docs/telemetry_report.md)
+    --rollup-file: Keep hourly/daily counters per action here, updated incrementally,
+        and serve --days from them (raw events are read only for the partial hour
+        at the start of the window)
 
 Environment Variables:
     TELEMETRY_DATA_PATH: Override default input path
@@ -21,20 +26,36 @@ Data Source:
     Reads from metrics/telemetry/telemetry.log (newline-delimited JSON)
 """
 import argparse
-import json
+import math
 import os
 import sys
 from collections import defaultdict
+from collections.abc import Iterable
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
+from latency_sketch import LatencySketch
+from metrics_rollup import RollupStore, normalize_timestamp
+from telemetry_reader import read_events
 
-def load_telemetry_data(data_path: Path) -> list[dict]:
+ROLLUP_SCHEMA = "telemetry/2"
+
+LATENCY_QUANTILES = (0.5, 0.9, 0.99)
+# Flag an action when its p90 grew by more than this fraction week over week
+REGRESSION_THRESHOLD = 0.20
+# ... and both weeks have at least this many timed runs
+REGRESSION_MIN_RUNS = 20
+# Event fields the report reads; the rest of each logged event is not kept
+REPORT_FIELDS = ("action_name", "status", "error_type", "timestamp", "duration_ms")
+
+
+def load_telemetry_data(data_path: Path, fields: Iterable[str] | None = None) -> list[dict]:
     """
     Load telemetry data from log file.
 
     Args:
         data_path: Path to telemetry.log file
+        fields: Keep only these fields of each event (default: all)
 
     Returns:
         List of telemetry event dictionaries
@@ -43,31 +64,23 @@ def load_telemetry_data(data_path: Path) -> list[dict]:
         print(f"Warning: Telemetry data file not found: {data_path}")
         return []
 
-    events = []
     failed_lines = 0
 
-    try:
-        with open(data_path) as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    event = json.loads(line)
-                    events.append(event)
-                except json.JSONDecodeError as e:
-                    failed_lines += 1
-                    if failed_lines <= 5:  # Limit error output
-                        print(f"Warning: Failed to parse line {line_num}: {e}")
-                    continue
-
-        if failed_lines > 5:
-            print(f"Warning: {failed_lines} total lines failed to parse")
+    def report_error(line_num: int, e: ValueError) -> None:
+        nonlocal failed_lines
+        failed_lines += 1
+        if failed_lines <= 5:  # Limit error output
+            print(f"Warning: Failed to parse line {line_num}: {e}")
 
+    try:
+        events = list(read_events(data_path, fields, on_error=report_error))
     except OSError as e:
         print(f"Error: Could not read telemetry file: {e}")
         return []
 
+    if failed_lines > 5:
+        print(f"Warning: {failed_lines} total lines failed to parse")
+
     return events
 
 
@@ -103,6 +116,16 @@ def filter_events_by_period(events: list[dict], days: int) -> list[dict]:
     return filtered
 
 
+def event_duration(event: dict) -> float | None:
+    """Return an event's duration_ms, or None if it is missing or invalid."""
+    duration = event.get("duration_ms")
+    if isinstance(duration, bool) or not isinstance(duration, (int, float)):
+        return None
+    if not math.isfinite(duration) or duration < 0:
+        return None
+    return duration
+
+
 def aggregate_metrics(events: list[dict]) -> dict[str, dict]:
     """
     Aggregate metrics from telemetry events.
@@ -117,13 +140,18 @@ def aggregate_metrics(events: list[dict]) -> dict[str, dict]:
         "total_runs": 0,
         "successes": 0,
         "failures": 0,
-        "errors": []
+        "errors": [],
+        "durations": LatencySketch(),
     })
 
     for event in events:
         action_name = event.get("action_name", "unknown")
         metrics[action_name]["total_runs"] += 1
 
+        duration = event_duration(event)
+        if duration is not None:
+            metrics[action_name]["durations"].add(duration)
+
         if event.get("status") == "success":
             metrics[action_name]["successes"] += 1
         else:
@@ -134,13 +162,164 @@ def aggregate_metrics(events: list[dict]) -> dict[str, dict]:
     return dict(metrics)
 
 
-def generate_report(metrics: dict[str, dict], period_days: int) -> str:
+def rollup_event(event: dict) -> tuple | None:
+    """
+    Map a telemetry event to its rollup (timestamp, group, counters).
+
+    Events with a missing or invalid timestamp are untimed, so like in
+    filter_events_by_period() they are included in every period.
+    """
+    if not isinstance(event, dict):
+        return None
+
+    try:
+        when = normalize_timestamp(event.get("timestamp", ""))
+    except (TypeError, ValueError):
+        when = None
+
+    counters = {"total_runs": 1}
+    if event.get("status") == "success":
+        counters["successes"] = 1
+    else:
+        counters["failures"] = 1
+        if "error_type" in event:
+            counters[f"error:{event['error_type']}"] = 1
+
+    duration = event_duration(event)
+    if duration is not None:
+        sketch = LatencySketch()
+        sketch.add(duration)
+        counters.update(sketch.to_counters())
+
+    return when, (event.get("action_name", "unknown"),), counters
+
+
+def aggregate_metrics_from_rollup(store: RollupStore, days: int) -> dict[str, dict]:
+    """
+    Aggregate metrics from rollup cells.
+
+    Args:
+        store: Rollup store updated with the telemetry log
+        days: Number of days to look back (0 = all time)
+
+    Returns:
+        Same structure as aggregate_metrics(filter_events_by_period(...))
+    """
+    start = datetime.now(UTC) - timedelta(days=days) if days > 0 else None
+
+    metrics = {}
+    for (action_name,), cell in store.query(start=start).items():
+        errors = []
+        for field, count in cell.items():
+            if field.startswith("error:"):
+                errors.extend([field[len("error:"):]] * count)
+        metrics[action_name] = {
+            "total_runs": cell.get("total_runs", 0),
+            "successes": cell.get("successes", 0),
+            "failures": cell.get("failures", 0),
+            "errors": errors,
+            "durations": LatencySketch.from_counters(cell),
+        }
+
+    return metrics
+
+
+def weekly_latency(events: list[dict], now: datetime | None = None) -> dict[str, tuple]:
+    """
+    Build per-action latency sketches for this week and the week before.
+
+    This week is the last 7 days before `now` and the previous week the 7
+    days before that. Like filter_events_by_period(), events with an invalid
+    timestamp are included in every period, so they count in both weeks.
+
+    Args:
+        events: List of telemetry events (unfiltered)
+        now: End of this week (default: current time)
+
+    Returns:
+        Dictionary mapping action names to (this_week, previous_week) sketches
+    """
+    now = now or datetime.now(UTC)
+    this_week_start = normalize_timestamp(now - timedelta(days=7))
+    previous_week_start = normalize_timestamp(now - timedelta(days=14))
+
+    weeks = defaultdict(lambda: (LatencySketch(), LatencySketch()))
+    for event in events:
+        duration = event_duration(event)
+        if duration is None:
+            continue
+        try:
+            when = normalize_timestamp(event.get("timestamp", ""))
+        except (TypeError, ValueError):
+            when = None
+
+        this_week, previous_week = weeks[event.get("action_name", "unknown")]
+        if when is None or when >= this_week_start:
+            this_week.add(duration)
+        if when is None or previous_week_start <= when < this_week_start:
+            previous_week.add(duration)
+
+    return dict(weeks)
+
+
+def weekly_latency_from_rollup(store: RollupStore, now: datetime | None = None) -> dict[str, tuple]:
+    """
+    Build per-action latency sketches for this week and the week before from rollup cells.
+
+    Returns:
+        Same structure as weekly_latency()
+    """
+    now = now or datetime.now(UTC)
+    this_week = store.query(start=now - timedelta(days=7))
+    previous_week = store.query(start=now - timedelta(days=14), end=now - timedelta(days=7))
+
+    weeks = {}
+    for (action_name,) in this_week.keys() | previous_week.keys():
+        sketches = (
+            LatencySketch.from_counters(this_week.get((action_name,), {})),
+            LatencySketch.from_counters(previous_week.get((action_name,), {})),
+        )
+        if sketches[0].count or sketches[1].count:
+            weeks[action_name] = sketches
+
+    return weeks
+
+
+def latency_change(this_week: LatencySketch, previous_week: LatencySketch, q: float = 0.9) -> float | None:
+    """
+    Relative change of a latency quantile from the previous week to this one.
+
+    Returns:
+        Fractional change (0.25 for 25% slower), or None if either week has
+        fewer than REGRESSION_MIN_RUNS timed runs
+    """
+    if this_week.count < REGRESSION_MIN_RUNS or previous_week.count < REGRESSION_MIN_RUNS:
+        return None
+    before, after = previous_week.quantile(q), this_week.quantile(q)
+    if before == 0:
+        return None
+    return after / before - 1
+
+
+def format_duration(duration_ms: float) -> str:
+    """Format a duration in milliseconds for the report."""
+    if duration_ms < 1000:
+        return f"{duration_ms:.0f} ms"
+    if duration_ms < 60_000:
+        return f"{duration_ms / 1000:.1f} s"
+    return f"{duration_ms / 60_000:.1f} min"
+
+
+def generate_report(
+    metrics: dict[str, dict], period_days: int, weekly: dict[str, tuple] | None = None
+) -> str:
     """
     Generate markdown telemetry report.
 
     Args:
         metrics: Aggregated metrics by action
         period_days: Number of days included in report
+        weekly: Optional weekly_latency() result, for week-over-week p90 changes
 
     Returns:
         Markdown formatted report
@@ -234,6 +413,8 @@ To generate telemetry data, run any GitHub Action in this repository.
 
         report += "\n"
 
+    report += latency_section(metrics, weekly or {})
+
     # Add privacy notice
     report += """---
 
@@ -279,6 +460,62 @@ python scripts/generate_telemetry_report.py \\
     return report
 
 
+def latency_section(metrics: dict[str, dict], weekly: dict[str, tuple]) -> str:
+    """
+    Render the latency percentile table (empty if no run reported a duration).
+
+    Args:
+        metrics: Aggregated metrics by action (with "durations" sketches)
+        weekly: weekly_latency() result; may be empty
+
+    Returns:
+        Markdown section
+    """
+    timed = {
+        action_name: data["durations"]
+        for action_name, data in metrics.items()
+        if data.get("durations") is not None and data["durations"].count
+    }
+    if not timed:
+        return ""
+
+    section = """---
+
+## Latency
+
+Percentiles of `duration_ms` per action (estimates within 1%).
+
+| Action | Timed Runs | p50 | p90 | p99 | p90 vs Previous Week |
+|--------|------------|-----|-----|-----|----------------------|
+"""
+    regressions = []
+    for action_name, sketch in sorted(timed.items(), key=lambda x: (-x[1].count, x[0])):
+        percentiles = " | ".join(format_duration(sketch.quantile(q)) for q in LATENCY_QUANTILES)
+
+        change = latency_change(*weekly[action_name]) if action_name in weekly else None
+        if change is None:
+            trend = "n/a"
+        elif change > REGRESSION_THRESHOLD:
+            trend = f"{change:+.0%} 🔴"
+            regressions.append(action_name)
+        else:
+            trend = f"{change:+.0%}"
+
+        section += f"| {action_name} | {sketch.count} | {percentiles} | {trend} |\n"
+
+    section += "\n"
+    if regressions:
+        section += (
+            f"🔴 **Latency regressions** (p90 up more than {REGRESSION_THRESHOLD:.0%} week over week): "
+            f"{', '.join(regressions)}\n\n"
+        )
+    section += (
+        f"Week-over-week changes compare the last 7 days with the 7 days before, "
+        f"for actions with at least {REGRESSION_MIN_RUNS} timed runs in both weeks.\n\n"
+    )
+    return section
+
+
 def main() -> int:
     """Main entry point."""
     # Get environment variable overrides
@@ -307,24 +544,42 @@ def main() -> int:
         default=default_output,
         help="Output report path (default: docs/telemetry_report.md)"
     )
+    parser.add_argument(
+        "--rollup-file",
+        type=Path,
+        help="Serve --days from hourly/daily rollups persisted here"
+    )
 
     args = parser.parse_args()
 
     # Create output directory if it doesn't exist
     args.output.parent.mkdir(parents=True, exist_ok=True)
 
-    # Load and filter events
-    all_events = load_telemetry_data(args.input)
-    events = filter_events_by_period(all_events, args.days) if args.days > 0 else all_events
+    if args.rollup_file:
+        # Fold events appended since the last run, then query the rollups
+        store = RollupStore.load(str(args.rollup_file), ROLLUP_SCHEMA, rollup_event)
+        store.update([str(args.input)])
+        store.save()
+        metrics = aggregate_metrics_from_rollup(store, args.days)
+        weekly = weekly_latency_from_rollup(store)
+        event_count = sum(m["total_runs"] for m in metrics.values())
+    else:
+        # Load and filter events
+        all_events = load_telemetry_data(args.input, REPORT_FIELDS)
+        events = filter_events_by_period(all_events, args.days) if args.days > 0 else all_events
+
+        # Aggregate
+        metrics = aggregate_metrics(events)
+        weekly = weekly_latency(all_events)
+        event_count = len(events)
 
-    # Aggregate and generate report
-    metrics = aggregate_metrics(events)
-    report = generate_report(metrics, args.days)
+    # Generate report
+    report = generate_report(metrics, args.days, weekly)
 
     # Write report
     args.output.write_text(report)
     print(f"Report generated: {args.output}")
-    print(f"  Events processed: {len(events)}")
+    print(f"  Events processed: {event_count}")
     print(f"  Period: {args.days} days")
 
     return 0
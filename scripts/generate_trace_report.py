@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Generate a per-step trace report from collected span traces.
+
+Runs recorded with span_begin/span_end (see scripts/telemetry_trace.py) are
+logged to telemetry.log with their span tree. This script shows, for each
+action, where the time of a run goes: per-step duration percentiles, each
+step's share of the total run time, and its share of the critical path.
+
+Usage:
+    python scripts/generate_trace_report.py [--days N] [--input PATH] [--output PATH]
+
+Arguments:
+    --days: Number of days to include (default: 7, use 0 for all-time)
+    --input: Path to telemetry.log file (default: metrics/telemetry/telemetry.log)
+    --output: Output report path (default: docs/trace_report.md)
+
+Environment Variables:
+    TELEMETRY_DATA_PATH: Override default input path
+    TRACE_REPORT_PATH: Override default output path
+"""
+import argparse
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from generate_telemetry_report import filter_events_by_period, format_duration, load_telemetry_data
+from latency_sketch import LatencySketch
+from telemetry_trace import critical_path, span_paths
+
+# Label for time inside a run that no step span covers
+OUTSIDE_STEPS = "(outside steps)"
+# Steps on the critical path of at least this fraction of runs are listed in it
+CRITICAL_PATH_MIN_SHARE = 0.5
+
+
+def _new_step() -> dict:
+    return {
+        "runs": 0,
+        "durations": LatencySketch(),
+        "self_ms": 0.0,
+        "critical_ms": 0.0,
+        "critical_runs": 0,
+        "start_ms": 0.0,
+    }
+
+
+def aggregate_traces(events: list[dict]) -> dict[str, dict]:
+    """
+    Aggregate span traces per action and step.
+
+    Events without spans are skipped. Steps are identified by their path
+    below the run's root span, such as "review > claude"; the root's own
+    time is reported as OUTSIDE_STEPS.
+
+    Args:
+        events: List of telemetry events
+
+    Returns:
+        Dictionary mapping action names to {"runs", "durations", "total_ms",
+        "steps"}, where steps maps a step path to {"runs", "durations",
+        "self_ms", "critical_ms", "critical_runs", "start_ms"} (times summed
+        over runs)
+    """
+    traces = defaultdict(lambda: {
+        "runs": 0,
+        "durations": LatencySketch(),
+        "total_ms": 0.0,
+        "steps": defaultdict(_new_step),
+    })
+
+    for event in events:
+        spans = event.get("spans")
+        if not isinstance(spans, list) or not spans:
+            continue
+        try:
+            paths = span_paths(spans)
+            critical = critical_path(spans)
+        except (KeyError, IndexError, TypeError):
+            continue
+
+        trace = traces[event.get("action_name", "unknown")]
+        root_ms = spans[0]["duration_ms"]
+        trace["runs"] += 1
+        trace["durations"].add(root_ms)
+        trace["total_ms"] += root_ms
+
+        child_ms = defaultdict(float)
+        for span in spans[1:]:
+            child_ms[span["parent"]] += span["duration_ms"]
+
+        for index, span in enumerate(spans):
+            step = trace["steps"][paths[index] or OUTSIDE_STEPS]
+            step["runs"] += 1
+            if index:
+                step["durations"].add(span["duration_ms"])
+            step["self_ms"] += max(0.0, span["duration_ms"] - child_ms[index])
+            step["critical_ms"] += critical.get(index, 0.0)
+            step["critical_runs"] += index in critical
+            step["start_ms"] += span["start_ms"]
+
+    return {
+        action_name: {**trace, "steps": dict(trace["steps"])}
+        for action_name, trace in traces.items()
+    }
+
+
+def _share(part: float, total: float) -> str:
+    return f"{part / total * 100:.1f}%" if total > 0 else "n/a"
+
+
+def generate_report(traces: dict[str, dict], period_days: int) -> str:
+    """
+    Generate markdown trace report.
+
+    Args:
+        traces: Aggregated traces by action (from aggregate_traces())
+        period_days: Number of days included in report
+
+    Returns:
+        Markdown formatted report
+    """
+    period_desc = "all time" if period_days == 0 else f"last {period_days} days"
+
+    report = f"""# AI Actions Trace Report
+
+**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+**Period**: {period_desc}
+
+---
+
+"""
+
+    if not traces:
+        report += """## No Traces Available
+
+No traced runs were found for the selected period. Runs are traced when
+their steps call `span_begin`/`span_end` from `scripts/telemetry.sh`; see
+[docs/telemetry.md](../docs/telemetry.md).
+"""
+        return report
+
+    report += """Time share is each step's own time (excluding nested steps) as a share of
+total run time. Critical path share is the time each step spends on the
+critical path, the chain of steps that determined when the run finished.
+
+"""
+
+    for action_name, trace in sorted(traces.items(), key=lambda x: (-x[1]["runs"], x[0])):
+        durations = trace["durations"]
+        report += f"## {action_name}\n\n"
+        report += (
+            f"**Traced runs**: {trace['runs']} | "
+            f"**p50**: {format_duration(durations.quantile(0.5))} | "
+            f"**p90**: {format_duration(durations.quantile(0.9))}\n\n"
+        )
+
+        steps = trace["steps"]
+        on_path = sorted(
+            (
+                (step["start_ms"] / step["runs"], path)
+                for path, step in steps.items()
+                if path != OUTSIDE_STEPS and step["critical_runs"] >= CRITICAL_PATH_MIN_SHARE * trace["runs"]
+            ),
+        )
+        if on_path:
+            report += f"**Critical path**: {' → '.join(path for _, path in on_path)}\n\n"
+
+        report += "| Step | Runs | p50 | p90 | Time Share | Critical Path Share |\n"
+        report += "|------|------|-----|-----|------------|---------------------|\n"
+        for path, step in sorted(steps.items(), key=lambda x: (-x[1]["critical_ms"], x[0])):
+            if step["durations"].count:
+                p50 = format_duration(step["durations"].quantile(0.5))
+                p90 = format_duration(step["durations"].quantile(0.9))
+            else:
+                p50 = p90 = "-"
+            report += (
+                f"| {path} | {step['runs']} | {p50} | {p90} | "
+                f"{_share(step['self_ms'], trace['total_ms'])} | "
+                f"{_share(step['critical_ms'], trace['total_ms'])} |\n"
+            )
+        report += "\n"
+
+    report += """---
+
+## How to Regenerate
+
+```bash
+python scripts/generate_trace_report.py --days 7
+```
+"""
+    return report
+
+
+def main() -> int:
+    """Main entry point."""
+    default_input = Path(os.getenv("TELEMETRY_DATA_PATH", "metrics/telemetry/telemetry.log"))
+    default_output = Path(os.getenv("TRACE_REPORT_PATH", "docs/trace_report.md"))
+
+    parser = argparse.ArgumentParser(
+        description="Generate per-step trace report from collected span traces",
+        epilog=__doc__
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        help="Number of days to include in report (default: 7, use 0 for all-time)"
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=default_input,
+        help="Path to telemetry.log file (default: metrics/telemetry/telemetry.log)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=default_output,
+        help="Output report path (default: docs/trace_report.md)"
+    )
+
+    args = parser.parse_args()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+
+    events = load_telemetry_data(args.input)
+    if args.days > 0:
+        events = filter_events_by_period(events, args.days)
+    traces = aggregate_traces(events)
+
+    args.output.write_text(generate_report(traces, args.days))
+    print(f"Report generated: {args.output}")
+    print(f"  Traced runs: {sum(t['runs'] for t in traces.values())}")
+    print(f"  Period: {args.days} days")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
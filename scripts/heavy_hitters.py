@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Bounded-Memory Heavy Hitters for Rejection Reasons
+
+Rejection reasons are free text from LLM output, so the number of distinct
+strings grows with the number of reviews. SpaceSavingCounter tracks the most
+frequent reasons with the Space-Saving algorithm (Metwally et al., 2005) in
+memory bounded by its capacity, however many distinct reasons it sees.
+
+Guarantees, for a stream of N reasons and capacity k:
+    - while at most k distinct (normalized) reasons have been seen, every
+      count is exact and the error is 0
+    - otherwise each reported count overestimates the true count by at most
+      its error, and every error is at most N / k
+    - every reason occurring more than N / k times is monitored
+
+Reasons are counted by a normalized key (case-folded, whitespace collapsed,
+digit runs replaced by "#"), so "Too verbose" and "too  verbose " are the same
+reason and "Line 12 too long" and "line 3 too long" are too. Reports show
+the first spelling seen for each key, with whitespace and digits normalized.
+
+Usage:
+    counter = SpaceSavingCounter(capacity=1000)
+    counter.update(["Too verbose", "too verbose", "Out of scope"])
+    counter.most_common(5)  # [("Too verbose", 2), ("Out of scope", 1)]
+"""
+
+import re
+from functools import lru_cache
+from heapq import heappop, heappush, heapreplace
+from itertools import count
+
+DEFAULT_CAPACITY = 1000
+
+_WHITESPACE = re.compile(r"\s+")
+_DIGITS = re.compile(r"\d+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_reason(reason) -> tuple[str, str]:
+    """
+    Normalize a rejection reason.
+
+    Args:
+        reason: Reason text (other values are converted with str())
+
+    Returns:
+        (key, label): the counting key and the display form
+    """
+    label = _DIGITS.sub("#", _WHITESPACE.sub(" ", str(reason)).strip())
+    return label.casefold(), label
+
+
+class SpaceSavingCounter:
+    """
+    Counter-like top-k sketch over normalized rejection reasons.
+
+    Supports add(), update(), most_common(), error(), item lookup, `in`,
+    len() and iteration over the monitored labels (in the order they were
+    first monitored), like collections.Counter.
+    """
+
+    __slots__ = ("capacity", "total", "_entries", "_heap", "_sequence")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.total = 0
+        # key -> [count, error, sequence, label]
+        self._entries = {}
+        # (count when pushed, sequence, key); one per monitored key, and an
+        # entry is stale once its key's count has grown past the pushed count
+        self._heap = []
+        self._sequence = count()
+
+    def add(self, reason, weight: int = 1) -> None:
+        """Count `weight` occurrences of a reason."""
+        key, label = normalize_reason(reason)
+        self.total += weight
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[0] += weight
+            return
+
+        sequence = next(self._sequence)
+        if len(self._entries) < self.capacity:
+            self._entries[key] = [weight, 0, sequence, label]
+            heappush(self._heap, (weight, sequence, key))
+            return
+
+        # Replace the least frequent reason; the newcomer inherits its count
+        # as the error bound
+        heap = self._heap
+        while True:
+            pushed, old_sequence, old_key = heap[0]
+            current = self._entries[old_key][0]
+            if current == pushed:
+                break
+            heapreplace(heap, (current, old_sequence, old_key))
+        minimum = self._entries.pop(old_key)[0]
+        heappop(heap)
+        self._entries[key] = [minimum + weight, minimum, sequence, label]
+        heappush(heap, (minimum + weight, sequence, key))
+
+    def update(self, reasons) -> None:
+        """Count each reason in an iterable."""
+        entries = self._entries
+        for reason in reasons:
+            # Inline add() for the common case of an already monitored reason
+            entry = entries.get(normalize_reason(reason)[0])
+            if entry is None:
+                self.add(reason)
+            else:
+                entry[0] += 1
+                self.total += 1
+
+    def most_common(self, n: int | None = None) -> list[tuple[str, int]]:
+        """
+        Most frequent reasons, ties in the order they were first monitored.
+
+        Args:
+            n: Number of reasons (all monitored reasons if None)
+
+        Returns:
+            List of (label, count) pairs
+        """
+        entries = sorted(self._entries.values(), key=lambda e: (-e[0], e[2]))
+        return [(label, count_) for count_, _, _, label in entries[:n]]
+
+    def error(self, reason) -> int:
+        """Maximum overestimate of a monitored reason's count (0 if not monitored)."""
+        entry = self._entries.get(normalize_reason(reason)[0])
+        return entry[1] if entry is not None else 0
+
+    def __getitem__(self, reason) -> int:
+        entry = self._entries.get(normalize_reason(reason)[0])
+        return entry[0] if entry is not None else 0
+
+    def __contains__(self, reason) -> bool:
+        return normalize_reason(reason)[0] in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        entries = sorted(self._entries.values(), key=lambda e: e[2])
+        return (label for _, _, _, label in entries)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SpaceSavingCounter):
+            return NotImplemented
+        return self.total == other.total and self.most_common() == other.most_common()
+
+    def __repr__(self) -> str:
+        return f"SpaceSavingCounter({dict(self.most_common())!r}, capacity={self.capacity})"
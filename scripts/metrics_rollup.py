@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+Hourly and Daily Metric Rollups
+
+Pre-aggregated counters per group (e.g. action, or review outcome) in hourly
+and daily buckets, so windowed queries such as "last 7 days" are answered
+from a few hundred cells instead of re-reading every raw event.
+
+The store is updated incrementally: append-only line logs (.log, .ndjson,
+.jsonl) and JSON arrays are resumed from the byte offset just past the last
+folded line or element, guarded by a fingerprint of the bytes before it, so
+only the new tail is decoded. A JSON array that gains elements keeps its
+earlier bytes (json.dump writes the same prefix), even though it is
+rewritten rather than appended to. If a source was truncated, reformatted,
+replaced or removed, the store is rebuilt.
+
+A query for [start, end) is split into whole days (daily cells), whole
+hours (hourly cells) and the partial hours at the edges. Raw events are
+read only for those partial hours, using the byte ranges recorded for each
+hour.
+
+Usage:
+    store = RollupStore.load(".metrics-cache/telemetry_rollup.json", "telemetry/1", extract)
+    store.update(["metrics/telemetry/telemetry.log"])
+    store.save()
+    cells = store.query(start=datetime.now(UTC) - timedelta(days=7))
+
+The extract callable maps a raw record to (timestamp, group, counters), or
+None to skip it. Counters are summed when cells merge, except "first_seen"
+and "last_seen", which keep the minimum and maximum, and dict-valued
+counters ({label: count}, e.g. rejection reasons), which are merged as
+Misra-Gries summaries of at most TOP_COUNTS_CAPACITY labels so a cell stays
+bounded however many distinct labels it sees. Records without a timestamp
+are kept in an "untimed" cell that every query includes.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import re
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+ROLLUP_VERSION = 2
+HOURLY_RETENTION_DAYS = 90
+FINGERPRINT_WINDOW = 4096
+ARRAY_SUFFIXES = (".json",)
+# Labels kept per dict-valued counter in a cell
+TOP_COUNTS_CAPACITY = 200
+
+_DECODER = json.JSONDecoder()
+_skip_whitespace = re.compile(r"\s*").match
+
+Extracted = tuple[datetime | None, tuple, dict] | None
+
+
+def normalize_timestamp(value: str | datetime) -> datetime:
+    """
+    Parse a timestamp into a naive datetime for bucketing.
+
+    Timezone-aware values are converted to UTC; naive values are kept as is.
+
+    Args:
+        value: ISO 8601 string (a trailing "Z" is accepted) or datetime
+
+    Returns:
+        Naive datetime
+
+    Raises:
+        ValueError: If the string is not a valid ISO 8601 timestamp
+        TypeError: If value is neither a string nor a datetime
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif not isinstance(value, datetime):
+        raise TypeError(f"Unsupported timestamp: {value!r}")
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value
+
+
+def hour_key(when: datetime) -> str:
+    """Bucket key of the hour containing when ("YYYY-MM-DDTHH")."""
+    return when.isoformat()[:13]
+
+
+def merge_cell(target: dict, counters: dict) -> dict:
+    """
+    Merge counters into a cell in place.
+
+    Args:
+        target: Cell to update
+        counters: Counters to add; "first_seen"/"last_seen" keep min/max and
+            dicts are merged with merge_top_counts()
+
+    Returns:
+        target
+    """
+    for field, value in counters.items():
+        if isinstance(value, dict):
+            target[field] = merge_top_counts(target.get(field, {}), value)
+        elif field == "first_seen":
+            if value is not None and (target.get(field) is None or value < target[field]):
+                target[field] = value
+        elif field == "last_seen":
+            if value is not None and (target.get(field) is None or value > target[field]):
+                target[field] = value
+        else:
+            target[field] = target.get(field, 0) + value
+    return target
+
+
+def merge_top_counts(target: dict, counts: dict) -> dict:
+    """
+    Merge {label: count} summaries, keeping at most TOP_COUNTS_CAPACITY labels.
+
+    This is the mergeable Misra-Gries summary (Agarwal et al., 2012): counts
+    are added, and if more labels than the capacity remain, the next-largest
+    count is subtracted from every label and labels left at zero are dropped.
+    Counts are exact until a summary overflows; after that each count
+    underestimates the true one by at most N / (TOP_COUNTS_CAPACITY + 1) for
+    N merged occurrences, and any label more frequent than that is kept.
+
+    Args:
+        target: Summary to update (modified in place unless it overflows)
+        counts: Summary to add
+
+    Returns:
+        The merged summary
+    """
+    for label, count in counts.items():
+        target[label] = target.get(label, 0) + count
+    if len(target) <= TOP_COUNTS_CAPACITY:
+        return target
+    floor = heapq.nlargest(TOP_COUNTS_CAPACITY + 1, target.values())[-1]
+    return {label: count - floor for label, count in target.items() if count > floor}
+
+
+def _floor_hour(when: datetime) -> datetime:
+    return when.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(when: datetime) -> datetime:
+    floor = _floor_hour(when)
+    if floor == when or floor >= datetime.max - timedelta(hours=1):
+        return floor
+    return floor + timedelta(hours=1)
+
+
+def _floor_day(when: datetime) -> datetime:
+    return when.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ceil_day(when: datetime) -> datetime:
+    floor = _floor_day(when)
+    if floor == when or floor >= datetime.max - timedelta(days=1):
+        return floor
+    return floor + timedelta(days=1)
+
+
+class RollupStore:
+    """
+    Hourly and daily counters per group, persisted as one JSON file.
+
+    Attributes:
+        path: State file path
+        schema: Identifies the extract function; a mismatch discards the state
+        extract: Maps a raw record to (timestamp, group, counters) or None
+        hourly: {hour key: {group key: cell}}
+        daily: {day key: {group key: cell}}
+        untimed: {group key: cell} for records without a timestamp
+        sources: {source path: watermark} of data already folded
+        spans: {source path: {hour key: [first, last]}} raw ranges per hour
+        hourly_floor: Oldest hour key still held hourly ("" if none pruned)
+    """
+
+    def __init__(
+        self,
+        path: str | None,
+        schema: str,
+        extract: Callable[[dict], Extracted],
+    ):
+        """
+        Initialize an empty store.
+
+        Args:
+            path: State file path used by save(); None keeps it in memory
+            schema: Identifier of the extract function and counter layout
+            extract: Maps a raw record to (timestamp, group, counters) or None
+        """
+        self.path = path
+        self.schema = schema
+        self.extract = extract
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all cells, watermarks and spans."""
+        self.hourly: dict[str, dict[str, dict]] = {}
+        self.daily: dict[str, dict[str, dict]] = {}
+        self.untimed: dict[str, dict] = {}
+        self.sources: dict[str, dict] = {}
+        self.spans: dict[str, dict[str, list[int]]] = {}
+        self.hourly_floor = ""
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        schema: str,
+        extract: Callable[[dict], Extracted],
+    ) -> "RollupStore":
+        """
+        Load a store from its state file.
+
+        Args:
+            path: State file path
+            schema: Expected schema; other schemas or versions start empty
+            extract: Maps a raw record to (timestamp, group, counters) or None
+
+        Returns:
+            RollupStore, empty if the file is missing or unusable
+        """
+        store = cls(path, schema, extract)
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return store
+
+        if (
+            not isinstance(state, dict)
+            or state.get("version") != ROLLUP_VERSION
+            or state.get("schema") != schema
+        ):
+            return store
+
+        store.hourly = state.get("hourly", {})
+        store.daily = state.get("daily", {})
+        store.untimed = state.get("untimed", {})
+        store.sources = state.get("sources", {})
+        store.spans = state.get("spans", {})
+        store.hourly_floor = state.get("hourly_floor", "")
+        return store
+
+    def save(self) -> None:
+        """Atomically write the state file."""
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "version": ROLLUP_VERSION,
+                "schema": self.schema,
+                "hourly_floor": self.hourly_floor,
+                "sources": self.sources,
+                "spans": self.spans,
+                "untimed": self.untimed,
+                "daily": self.daily,
+                "hourly": self.hourly,
+            }, f)
+        os.replace(tmp_path, path)
+
+    def update(self, source_paths: Iterable[str]) -> int:
+        """
+        Fold records added to the sources since the last update.
+
+        Args:
+            source_paths: Every source the rollup covers; sources no longer
+                listed are treated as removed
+
+        Returns:
+            Number of records read from the sources
+        """
+        source_paths = list(dict.fromkeys(source_paths))
+        if set(self.sources) - set(source_paths) or not all(
+            self._source_is_valid(path) for path in source_paths if path in self.sources
+        ):
+            self.reset()
+
+        folded = 0
+        for path in source_paths:
+            folded += self._fold_source(path)
+        self._prune_hourly()
+        return folded
+
+    def _source_is_valid(self, path: str) -> bool:
+        """Check that the data covered by a source's watermark is unchanged."""
+        source = self.sources[path]
+        if source["kind"] != _source_kind(path):
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return source["offset"] == 0
+        if source["offset"] == 0:
+            return True
+        # JSON arrays are rewritten through a temporary file, so only line
+        # logs are expected to keep their inode
+        if source["kind"] == "lines" and stat.st_ino != source["inode"]:
+            return False
+        if stat.st_size < source["offset"]:
+            return False
+        return _bytes_fingerprint(path, source["offset"]) == source["fingerprint"]
+
+    def _fold_source(self, path: str) -> int:
+        """Fold a source's records past its watermark."""
+        kind = _source_kind(path)
+        offset = self.sources.get(path, {}).get("offset", 0)
+        count = 0
+        try:
+            with open(path, "rb") as f:
+                inode = os.fstat(f.fileno()).st_ino
+                records = _iter_array(f, offset) if kind == "array" else _iter_lines(f, offset)
+                for start, end, record in records:
+                    self._fold_record(record, path, start, end)
+                    count += 1
+                    offset = end
+        except OSError:
+            inode = None
+
+        self.sources[path] = {
+            "kind": kind,
+            "offset": offset,
+            "inode": inode,
+            "fingerprint": _bytes_fingerprint(path, offset) if offset else "",
+        }
+        return count
+
+    def _fold_record(self, record, path: str, start: int, end: int) -> None:
+        """Add one raw record to its hourly, daily (or untimed) cell."""
+        extracted = self.extract(record)
+        if extracted is None:
+            return
+        when, group, counters = extracted
+        group_key = json.dumps(list(group))
+        if when is None:
+            merge_cell(self.untimed.setdefault(group_key, {}), counters)
+            return
+
+        hour = hour_key(when)
+        merge_cell(self.daily.setdefault(hour[:10], {}).setdefault(group_key, {}), counters)
+        if hour < self.hourly_floor:
+            return
+        merge_cell(self.hourly.setdefault(hour, {}).setdefault(group_key, {}), counters)
+        span = self.spans.setdefault(path, {}).get(hour)
+        if span is None:
+            self.spans[path][hour] = [start, end]
+        else:
+            span[0] = min(span[0], start)
+            span[1] = max(span[1], end)
+
+    def _prune_hourly(self) -> None:
+        """Drop hourly cells and spans older than HOURLY_RETENTION_DAYS."""
+        if not self.hourly:
+            return
+        newest = datetime.fromisoformat(max(self.hourly) + ":00")
+        floor = hour_key(newest - timedelta(days=HOURLY_RETENTION_DAYS))
+        if floor <= self.hourly_floor:
+            return
+        self.hourly_floor = floor
+        self.hourly = {hour: cells for hour, cells in self.hourly.items() if hour >= floor}
+        for path, spans in self.spans.items():
+            self.spans[path] = {hour: span for hour, span in spans.items() if hour >= floor}
+
+    def query(
+        self,
+        start: str | datetime | None = None,
+        end: str | datetime | None = None,
+    ) -> dict[tuple, dict]:
+        """
+        Sum cells for records with start <= timestamp < end.
+
+        Untimed records are always included.
+
+        Args:
+            start: Inclusive window start (None for unbounded)
+            end: Exclusive window end (None for unbounded)
+
+        Returns:
+            Mapping of group tuple to merged counters
+        """
+        merged: dict[str, dict] = {}
+        self._merge_cells(merged, [self.untimed])
+
+        start = normalize_timestamp(start) if start is not None else datetime.min
+        end = normalize_timestamp(end) if end is not None else datetime.max
+
+        first_hour, last_hour = _ceil_hour(start), _floor_hour(end)
+        if first_hour > last_hour:
+            # The whole window lies inside one hour
+            self._merge_raw(merged, start, end)
+        else:
+            if start < first_hour:
+                self._merge_raw(merged, start, first_hour)
+            if last_hour < end:
+                self._merge_raw(merged, last_hour, end)
+
+            first_day, last_day = _ceil_day(first_hour), _floor_day(last_hour)
+            if first_day < last_day:
+                self._merge_days(merged, first_day, last_day)
+                self._merge_hours(merged, first_hour, first_day)
+                self._merge_hours(merged, last_day, last_hour)
+            else:
+                self._merge_hours(merged, first_hour, last_hour)
+
+        return {tuple(json.loads(group_key)): cell for group_key, cell in merged.items()}
+
+    @staticmethod
+    def _merge_cells(merged: dict, tables: Iterable[dict]) -> None:
+        for cells in tables:
+            for group_key, cell in cells.items():
+                merge_cell(merged.setdefault(group_key, {}), cell)
+
+    def _merge_days(self, merged: dict, first: datetime, last: datetime) -> None:
+        """Merge daily cells for days in [first, last)."""
+        low, high = first.isoformat()[:10], last.isoformat()[:10]
+        self._merge_cells(merged, (
+            cells for day, cells in self.daily.items() if low <= day < high
+        ))
+
+    def _merge_hours(self, merged: dict, first: datetime, last: datetime) -> None:
+        """Merge hourly cells for hours in [first, last)."""
+        if first >= last:
+            return
+        low, high = hour_key(first), hour_key(last)
+        if low < self.hourly_floor:
+            # Hours before the retention floor are only available raw
+            self._merge_raw(merged, first, last)
+            return
+        self._merge_cells(merged, (
+            cells for hour, cells in self.hourly.items() if low <= hour < high
+        ))
+
+    def _merge_raw(self, merged: dict, first: datetime, last: datetime) -> None:
+        """Merge raw records with first <= timestamp < last."""
+        low = hour_key(first)
+        high = hour_key(last - timedelta(microseconds=1)) if last > first else low
+        indexed = low >= self.hourly_floor
+
+        for path in self.sources:
+            if indexed:
+                ranges = [
+                    span for hour, span in self.spans.get(path, {}).items()
+                    if low <= hour <= high
+                ]
+                if not ranges:
+                    continue
+            else:
+                ranges = [None]
+
+            for record in _read_ranges(path, ranges):
+                extracted = self.extract(record)
+                if extracted is None or extracted[0] is None:
+                    continue
+                when, group, counters = extracted
+                if first <= when < last:
+                    merge_cell(merged.setdefault(json.dumps(list(group)), {}), counters)
+
+
+def _source_kind(path: str) -> str:
+    return "array" if path.endswith(ARRAY_SUFFIXES) else "lines"
+
+
+def _iter_lines(f, offset: int) -> Iterator[tuple[int, int, dict]]:
+    """
+    Yield (start, end, record) for each JSON object line from offset.
+
+    A final line without a newline is yielded only if it parses, so a torn
+    append is picked up once it has been completed.
+    """
+    f.seek(offset)
+    position = offset
+    for raw in f:
+        start, position = position, position + len(raw)
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            if not raw.endswith(b"\n"):
+                return
+            continue
+        if isinstance(record, dict):
+            yield start, position, record
+
+
+def _scan_elements(text: str, position: int = 0) -> Iterator[tuple[int, int, object]]:
+    """
+    Yield (start, end, value) for the JSON-array elements in text from position.
+
+    Separating commas are skipped; the scan stops at the closing bracket,
+    at the end of text or at the first element that does not parse.
+    """
+    decode = _DECODER.raw_decode
+    length = len(text)
+    while True:
+        position = _skip_whitespace(text, position).end()
+        if position < length and text[position] == ",":
+            position = _skip_whitespace(text, position + 1).end()
+        if position >= length or text[position] == "]":
+            return
+        try:
+            value, end = decode(text, position)
+        except ValueError:
+            return
+        yield position, end, value
+        position = end
+
+
+def _iter_array(f, offset: int) -> Iterator[tuple[int, int, object]]:
+    """
+    Yield (start, end, record) for each element of a JSON-array source from offset.
+
+    Only the bytes from offset on are read and decoded. Offset 0 is the
+    start of the file; any other offset is the end of a folded element. A
+    file holding a single JSON object counts as one record.
+    """
+    f.seek(offset)
+    try:
+        text = f.read().decode("utf-8")
+    except UnicodeDecodeError:
+        return
+    position = 0
+    if offset == 0:
+        position = _skip_whitespace(text).end()
+        if text.startswith("{", position):
+            try:
+                value, end = _DECODER.raw_decode(text, position)
+            except ValueError:
+                return
+            yield offset + position, offset + len(text[:end].encode("utf-8")), value
+            return
+        if not text.startswith("[", position):
+            return
+        position += 1
+
+    # Elements are found by character index; track the matching byte offset
+    consumed, consumed_bytes = 0, offset
+    for start, end, value in _scan_elements(text, position):
+        start_bytes = consumed_bytes + len(text[consumed:start].encode("utf-8"))
+        consumed_bytes = start_bytes + len(text[start:end].encode("utf-8"))
+        consumed = end
+        yield start_bytes, consumed_bytes, value
+
+
+def _read_ranges(path: str, ranges: list) -> Iterator[dict]:
+    """Read the records of a source within the given byte spans (None = whole source)."""
+    array = path.endswith(ARRAY_SUFFIXES)
+    try:
+        with open(path, "rb") as f:
+            for span in ranges:
+                if span is None:
+                    records = _iter_array(f, 0) if array else _iter_lines(f, 0)
+                    for _, _, record in records:
+                        yield record
+                    continue
+                f.seek(span[0])
+                chunk = f.read(span[1] - span[0])
+                if array:
+                    try:
+                        text = chunk.decode("utf-8")
+                    except UnicodeDecodeError:
+                        continue
+                    for _, _, record in _scan_elements(text):
+                        yield record
+                    continue
+                for line in chunk.splitlines():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict):
+                        yield record
+    except OSError:
+        return
+
+
+def _bytes_fingerprint(path: str, offset: int) -> str:
+    """Hash of the bytes just before offset."""
+    start = max(0, offset - FINGERPRINT_WINDOW)
+    try:
+        with open(path, "rb") as f:
+            f.seek(start)
+            return hashlib.sha256(f.read(offset - start)).hexdigest()
+    except OSError:
+        return ""
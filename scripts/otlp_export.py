@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Export Telemetry as OTLP/JSON
+
+Converts action runs from telemetry.log into OpenTelemetry Protocol JSON, so
+an OpenTelemetry collector can take them without custom post-processing:
+
+    traces   one trace per run: a root span for the action run and, for runs
+             traced with span_begin/span_end (see telemetry_trace), one child
+             span per step, nested as recorded
+    metrics  per batch, the "actions.runs" counter by action and status and
+             "actions.duration" / "actions.step.duration" histograms (ms)
+
+Runs are grouped by resource, whose attributes are service.name plus the
+event's runner_os, claude_cli_version and repository_anonymous_id. Trace
+and span IDs are derived from the run (its trace_id, or its content for
+untraced runs), so exporting the same log twice yields the same IDs.
+
+Batches of max_batch runs are written as one ExportTraceServiceRequest and
+one ExportMetricsServiceRequest each, either appended as lines to a file
+(the format of the collector's otlpjsonfile receiver) or POSTed to
+<endpoint>/v1/traces and <endpoint>/v1/metrics of an OTLP/HTTP receiver,
+gzip-compressed over one keep-alive connection with retries.
+
+Usage:
+    python scripts/otlp_export.py [--input PATH] [--days N] [--output PATH | --endpoint URL]
+        [--batch-size N]
+
+Environment Variables:
+    TELEMETRY_DATA_PATH: Override default input path
+    OTEL_EXPORTER_OTLP_ENDPOINT: Default for --endpoint
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from env_config import get_otlp_endpoint
+from generate_telemetry_report import filter_events_by_period, load_telemetry_data
+from telemetry_exporter import BACKOFF_SECONDS, RETRIES, SENT, CollectorConnection, post_batch
+
+SERVICE_NAME = "ai-actions"
+SCOPE_NAME = "ai-actions.telemetry"
+TRACES_PATH = "/v1/traces"
+METRICS_PATH = "/v1/metrics"
+MAX_BATCH = 500
+
+RESOURCE_FIELDS = ("runner_os", "claude_cli_version", "repository_anonymous_id")
+DURATION_BOUNDS_MS = (100, 1000, 5000, 10_000, 30_000, 60_000, 120_000, 300_000, 600_000, 1_800_000)
+
+# OTLP enum values
+SPAN_KIND_INTERNAL = 1
+STATUS_CODE_UNSET = 0
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+AGGREGATION_TEMPORALITY_DELTA = 1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+class ExportResult(NamedTuple):
+    """Outcome of one export_otlp() call."""
+
+    runs: int
+    spans: int
+    skipped: int
+    failed_batches: int
+
+
+def _attribute(key: str, value) -> dict:
+    """One OTLP KeyValue (64-bit integers are strings in OTLP/JSON)."""
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def resource_key(event: dict) -> tuple:
+    """The resource fields of an event, as a grouping key."""
+    return tuple(str(event.get(field, "unknown")) for field in RESOURCE_FIELDS)
+
+
+def _resource(key: tuple) -> dict:
+    return {
+        "attributes": [_attribute("service.name", SERVICE_NAME)]
+        + [_attribute(field, value) for field, value in zip(RESOURCE_FIELDS, key, strict=True)]
+    }
+
+
+def _scope() -> dict:
+    return {"name": SCOPE_NAME}
+
+
+def _epoch_ns(timestamp) -> int:
+    """Nanoseconds since the epoch of an ISO 8601 timestamp (naive means UTC)."""
+    when = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return (when - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+def _run_start_ns(event: dict) -> int:
+    """
+    Start of a run in nanoseconds since the epoch.
+
+    collect_metrics stamps a plain run when it finishes, so it started
+    duration_ms before its timestamp; telemetry_trace stamps a traced run
+    with the start of its root span.
+    """
+    timestamp = _epoch_ns(event["timestamp"])
+    duration = event.get("duration_ms")
+    if event.get("spans") or not _is_duration(duration):
+        return timestamp
+    return timestamp - round(duration * 1_000_000)
+
+
+def _status(status: str, message: str | None = None) -> dict:
+    if status == "success":
+        return {"code": STATUS_CODE_OK}
+    if status in ("failure", "error", "incomplete"):
+        return {"code": STATUS_CODE_ERROR, "message": message or status}
+    return {"code": STATUS_CODE_UNSET}
+
+
+def run_spans(event: dict) -> list[dict]:
+    """
+    Convert one run into OTLP spans.
+
+    Args:
+        event: Telemetry event (with "spans" if the run was traced)
+
+    Returns:
+        The run's spans, the root first
+
+    Raises:
+        ValueError, TypeError, KeyError: If the event has no valid
+            timestamp or a malformed span tree
+    """
+    start_ns = _run_start_ns(event)
+    if "trace_id" in event:
+        seed = f"trace:{event['trace_id']}"
+    else:
+        seed = "run:" + json.dumps(event, sort_keys=True)
+    trace_id = hashlib.sha256(seed.encode("utf-8")).hexdigest()[:32]
+
+    def span_id(index: int) -> str:
+        return hashlib.sha256(f"{trace_id}:{index}".encode()).hexdigest()[:16]
+
+    steps = event.get("spans") or [
+        {"name": event.get("action_name", "unknown"), "parent": None, "start_ms": 0,
+         "duration_ms": event.get("duration_ms") or 0, "status": event.get("status")}
+    ]
+
+    spans = []
+    for index, step in enumerate(steps):
+        begin = start_ns + round(step["start_ms"] * 1_000_000)
+        end = begin + round(max(0, step["duration_ms"]) * 1_000_000)
+        span = {
+            "traceId": trace_id,
+            "spanId": span_id(index),
+            "name": step["name"],
+            "kind": SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(begin),
+            "endTimeUnixNano": str(end),
+        }
+        if step["parent"] is None:
+            span["attributes"] = [
+                _attribute("action.name", event.get("action_name", "unknown")),
+                _attribute("action.status", event.get("status", "unknown")),
+            ]
+            if "error_type" in event:
+                span["attributes"].append(_attribute("error.type", event["error_type"]))
+            span["status"] = _status(event.get("status"), event.get("error_type"))
+        else:
+            span["parentSpanId"] = span_id(step["parent"])
+            span["attributes"] = [_attribute("step.status", step.get("status", "unknown"))]
+            span["status"] = _status(step.get("status"))
+        spans.append(span)
+    return spans
+
+
+def traces_request(events: list[dict]) -> dict:
+    """
+    Build an OTLP ExportTraceServiceRequest for a batch of runs.
+
+    Runs without a valid timestamp or span tree are left out.
+    """
+    by_resource = defaultdict(list)
+    for event in events:
+        try:
+            spans = run_spans(event)
+        except (ValueError, TypeError, KeyError, AttributeError):
+            continue
+        by_resource[resource_key(event)].extend(spans)
+
+    return {
+        "resourceSpans": [
+            {"resource": _resource(key), "scopeSpans": [{"scope": _scope(), "spans": spans}]}
+            for key, spans in by_resource.items()
+        ]
+    }
+
+
+def _is_duration(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+
+def _histogram_point(durations: list[float], attributes: list[dict], start: int, end: int) -> dict:
+    counts = [0] * (len(DURATION_BOUNDS_MS) + 1)
+    for duration in durations:
+        counts[sum(duration > bound for bound in DURATION_BOUNDS_MS)] += 1
+    return {
+        "attributes": attributes,
+        "startTimeUnixNano": str(start),
+        "timeUnixNano": str(end),
+        "count": str(len(durations)),
+        "sum": float(sum(durations)),
+        "bucketCounts": [str(count) for count in counts],
+        "explicitBounds": [float(bound) for bound in DURATION_BOUNDS_MS],
+        "min": float(min(durations)),
+        "max": float(max(durations)),
+    }
+
+
+def metrics_request(events: list[dict]) -> dict:
+    """
+    Build an OTLP ExportMetricsServiceRequest for a batch of runs.
+
+    Data points are deltas covering the batch: from the earliest run start
+    to the latest run end of each resource.
+    """
+    groups = defaultdict(lambda: {
+        "runs": defaultdict(int),
+        "durations": defaultdict(list),
+        "steps": defaultdict(list),
+        "start": None,
+        "end": None,
+    })
+
+    for event in events:
+        try:
+            start = _run_start_ns(event)
+        except (ValueError, TypeError, KeyError, AttributeError):
+            continue
+        group = groups[resource_key(event)]
+        action_name = event.get("action_name", "unknown")
+        duration = event.get("duration_ms")
+        valid_duration = _is_duration(duration)
+        end = start + round(duration * 1_000_000) if valid_duration else start
+
+        group["start"] = start if group["start"] is None else min(group["start"], start)
+        group["end"] = end if group["end"] is None else max(group["end"], end)
+        group["runs"][(action_name, event.get("status", "unknown"))] += 1
+        if valid_duration:
+            group["durations"][action_name].append(duration)
+        for step in event.get("spans") or []:
+            if isinstance(step, dict) and step.get("parent") is not None and _is_duration(step.get("duration_ms")):
+                group["steps"][(action_name, step.get("name"))].append(step["duration_ms"])
+
+    resource_metrics = []
+    for key, group in groups.items():
+        start, end = group["start"], group["end"]
+        metrics = [{
+            "name": "actions.runs",
+            "description": "Action runs",
+            "unit": "1",
+            "sum": {
+                "aggregationTemporality": AGGREGATION_TEMPORALITY_DELTA,
+                "isMonotonic": True,
+                "dataPoints": [
+                    {
+                        "attributes": [_attribute("action.name", action), _attribute("action.status", status)],
+                        "startTimeUnixNano": str(start),
+                        "timeUnixNano": str(end),
+                        "asInt": str(count),
+                    }
+                    for (action, status), count in group["runs"].items()
+                ],
+            },
+        }]
+        if group["durations"]:
+            metrics.append({
+                "name": "actions.duration",
+                "description": "Action run duration",
+                "unit": "ms",
+                "histogram": {
+                    "aggregationTemporality": AGGREGATION_TEMPORALITY_DELTA,
+                    "dataPoints": [
+                        _histogram_point(durations, [_attribute("action.name", action)], start, end)
+                        for action, durations in group["durations"].items()
+                    ],
+                },
+            })
+        if group["steps"]:
+            metrics.append({
+                "name": "actions.step.duration",
+                "description": "Traced step duration",
+                "unit": "ms",
+                "histogram": {
+                    "aggregationTemporality": AGGREGATION_TEMPORALITY_DELTA,
+                    "dataPoints": [
+                        _histogram_point(
+                            durations,
+                            [_attribute("action.name", action), _attribute("step.name", step)],
+                            start, end,
+                        )
+                        for (action, step), durations in group["steps"].items()
+                    ],
+                },
+            })
+        resource_metrics.append({
+            "resource": _resource(key),
+            "scopeMetrics": [{"scope": _scope(), "metrics": metrics}],
+        })
+
+    return {"resourceMetrics": resource_metrics}
+
+
+def _encode(request: dict) -> bytes:
+    return (json.dumps(request, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def export_otlp(
+    events: list[dict],
+    output: str | Path | None = None,
+    endpoint: str | None = None,
+    max_batch: int = MAX_BATCH,
+    retries: int = RETRIES,
+    backoff_seconds: float = BACKOFF_SECONDS,
+) -> ExportResult:
+    """
+    Export runs as OTLP/JSON to a file and/or an OTLP/HTTP receiver.
+
+    Args:
+        events: Telemetry events
+        output: File to append export requests to, one per line
+        endpoint: Receiver base URL (e.g. http://localhost:4318)
+        max_batch: Runs per export request
+        retries: Retries per request after the first attempt
+        backoff_seconds: Delay before the first retry; doubled each retry
+
+    Returns:
+        ExportResult(runs, spans, skipped, failed_batches): runs and spans
+        exported, runs left out for lacking a valid timestamp, and batches
+        the receiver did not accept
+    """
+    if max_batch < 1:
+        raise ValueError(f"max_batch must be at least 1, got {max_batch}")
+
+    connection = None
+    base_path = ""
+    if endpoint:
+        connection = CollectorConnection(endpoint, content_type="application/json")
+        base_path = connection.path.split("?", 1)[0].rstrip("/")
+
+    runs = spans = skipped = failed = 0
+    out = open(output, "ab") if output else None
+    try:
+        for start in range(0, len(events), max_batch):
+            batch = events[start:start + max_batch]
+            traces = traces_request(batch)
+            batch_runs = sum(
+                1
+                for resource in traces["resourceSpans"]
+                for span in resource["scopeSpans"][0]["spans"]
+                if "parentSpanId" not in span
+            )
+            batch_spans = sum(len(resource["scopeSpans"][0]["spans"]) for resource in traces["resourceSpans"])
+            skipped += len(batch) - batch_runs
+            if not batch_runs:
+                continue
+            payloads = [
+                (base_path + TRACES_PATH, _encode(traces)),
+                (base_path + METRICS_PATH, _encode(metrics_request(batch))),
+            ]
+
+            if out:
+                for _, payload in payloads:
+                    out.write(payload)
+            if connection:
+                outcomes = [
+                    post_batch(connection, payload, retries, backoff_seconds, path=path)
+                    for path, payload in payloads
+                ]
+                if any(outcome != SENT for outcome in outcomes):
+                    failed += 1
+            runs += batch_runs
+            spans += batch_spans
+    finally:
+        if out:
+            out.close()
+        if connection:
+            connection.close()
+
+    return ExportResult(runs, spans, skipped, failed)
+
+
+def main() -> int:
+    """Main entry point."""
+    default_input = Path(os.getenv("TELEMETRY_DATA_PATH", "metrics/telemetry/telemetry.log"))
+
+    parser = argparse.ArgumentParser(
+        description="Export telemetry runs and step spans as OTLP/JSON",
+        epilog=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=default_input,
+        help="Path to telemetry.log file (default: metrics/telemetry/telemetry.log)",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=0,
+        help="Number of days to export (default: 0, all-time)",
+    )
+    parser.add_argument("--output", type=Path, help="Append OTLP/JSON export requests to this file")
+    parser.add_argument(
+        "--endpoint",
+        default=get_otlp_endpoint(),
+        help="OTLP/HTTP receiver base URL (default: $OTEL_EXPORTER_OTLP_ENDPOINT)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=MAX_BATCH,
+        help=f"Runs per export request (default: {MAX_BATCH})",
+    )
+
+    args = parser.parse_args()
+    if not args.output and not args.endpoint:
+        parser.error("one of --output or --endpoint (or OTEL_EXPORTER_OTLP_ENDPOINT) is required")
+
+    events = load_telemetry_data(args.input)
+    if args.days > 0:
+        events = filter_events_by_period(events, args.days)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+    result = export_otlp(events, args.output, args.endpoint, args.batch_size)
+
+    print(f"Exported {result.runs} runs ({result.spans} spans)")
+    if result.skipped:
+        print(f"  Skipped {result.skipped} runs without a valid timestamp")
+    if result.failed_batches:
+        print(f"Error: {result.failed_batches} batches were not accepted by {args.endpoint}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
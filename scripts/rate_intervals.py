@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Confidence Intervals for Acceptance Rates
+
+An acceptance rate from 12 reviews and one from 1,200 can share a point
+estimate but not a reliability. This module attaches two 95% (by default)
+intervals to each rate:
+
+    wilson     Wilson score interval; well behaved for small samples and
+               rates near 0% or 100%
+    bootstrap  percentile bootstrap interval. Resampling n reviews with
+               replacement from a group with s accepted gives Binomial(n, s/n)
+               accepted reviews, so the interval is taken from that
+               distribution's exact quantiles: the limit of infinitely many
+               resamples, computed in O(sqrt(n)) per group with no sampling
+               noise and no array library
+
+Groups are compared (week over week, variants against the baseline) and a
+change is flagged only when both intervals of the two groups separate.
+
+Usage:
+    wilson_interval(45, 60)                      # (0.6277..., 0.8422...)
+    build_intervals(45, 60, {"week": {...}})     # dict for JSON output
+"""
+
+from itertools import pairwise
+from math import exp, lgamma, log, log1p, sqrt
+from statistics import NormalDist
+
+DEFAULT_CONFIDENCE = 0.95
+BASELINE_VARIANT = "baseline"
+# Binomial mass beyond this many standard deviations from the mean is
+# below 1e-30 and is ignored when computing bootstrap quantiles
+_TAIL_SDS = 12
+
+
+def _z(confidence: float) -> float:
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(
+    successes: int, trials: int, confidence: float = DEFAULT_CONFIDENCE
+) -> tuple[float, float]:
+    """
+    Wilson score interval for a proportion.
+
+    Args:
+        successes: Accepted reviews
+        trials: Total reviews (at least 1)
+        confidence: Confidence level
+
+    Returns:
+        (low, high) as fractions between 0 and 1
+    """
+    z = _z(confidence)
+    p = successes / trials
+    z2n = z * z / trials
+    center = (p + z2n / 2) / (1 + z2n)
+    half = z * sqrt(p * (1 - p) / trials + z2n / (4 * trials)) / (1 + z2n)
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def bootstrap_interval(
+    successes: int, trials: int, confidence: float = DEFAULT_CONFIDENCE
+) -> tuple[float, float]:
+    """
+    Exact percentile bootstrap interval for a proportion.
+
+    Args:
+        successes: Accepted reviews
+        trials: Total reviews (at least 1)
+        confidence: Confidence level
+
+    Returns:
+        (low, high) as fractions between 0 and 1
+    """
+    _z(confidence)
+    p = successes / trials
+    if successes in (0, trials):
+        # Every resample of an all-or-nothing group has the same rate
+        return p, p
+
+    spread = _TAIL_SDS * sqrt(trials * p * (1 - p))
+    first = max(0, int(trials * p - spread) - 1)
+    last = min(trials, int(trials * p + spread) + 2)
+
+    # Binomial(trials, p) probabilities for first..last, by the pmf recurrence
+    log_pmf = (
+        lgamma(trials + 1) - lgamma(first + 1) - lgamma(trials - first + 1)
+        + first * log(p) + (trials - first) * log1p(-p)
+    )
+    log_odds = log(p) - log1p(-p)
+    masses = []
+    for k in range(first, last + 1):
+        masses.append(exp(log_pmf))
+        if k < trials:
+            log_pmf += log((trials - k) / (k + 1)) + log_odds
+
+    total = sum(masses)
+    tail = (1 - confidence) / 2 * total
+    low = high = None
+    cumulative = 0.0
+    for k, mass in enumerate(masses, first):
+        cumulative += mass
+        if low is None and cumulative >= tail:
+            low = k
+        if cumulative >= total - tail:
+            high = k
+            break
+    return low / trials, (high if high is not None else last) / trials
+
+
+def rate_interval(
+    successes: int, trials: int, confidence: float = DEFAULT_CONFIDENCE
+) -> dict:
+    """
+    Acceptance rate with its intervals, as percentages rounded like the rate.
+
+    Args:
+        successes: Accepted reviews
+        trials: Total reviews
+        confidence: Confidence level
+
+    Returns:
+        Dict with reviews, accepted, acceptance_rate, wilson and bootstrap
+        ([low, high], or None without reviews)
+    """
+    if not trials:
+        return {"reviews": 0, "accepted": 0, "acceptance_rate": 0.0, "wilson": None, "bootstrap": None}
+    return {
+        "reviews": trials,
+        "accepted": successes,
+        "acceptance_rate": round(successes / trials * 100, 2),
+        "wilson": [round(bound * 100, 2) for bound in wilson_interval(successes, trials, confidence)],
+        "bootstrap": [round(bound * 100, 2) for bound in bootstrap_interval(successes, trials, confidence)],
+    }
+
+
+def intervals_separate(a: dict, b: dict) -> bool:
+    """Whether two rate_interval() results differ: both intervals must not overlap."""
+    if not a["reviews"] or not b["reviews"]:
+        return False
+    return all(
+        a[method][1] < b[method][0] or b[method][1] < a[method][0]
+        for method in ("wilson", "bootstrap")
+    )
+
+
+def _change(dimension: str, before: str, after: str, groups: dict) -> dict | None:
+    if not intervals_separate(groups[before], groups[after]):
+        return None
+    rising = groups[after]["acceptance_rate"] > groups[before]["acceptance_rate"]
+    return {
+        "dimension": dimension,
+        "from": before,
+        "to": after,
+        "direction": "increase" if rising else "decrease",
+        "from_rate": groups[before]["acceptance_rate"],
+        "to_rate": groups[after]["acceptance_rate"],
+    }
+
+
+def build_intervals(
+    accepted: int,
+    total: int,
+    groups: dict[str, dict[str, list[int]]],
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> dict:
+    """
+    Intervals for the overall rate and each group, and the significant changes.
+
+    Args:
+        accepted: Accepted reviews overall
+        total: Reviews overall
+        groups: {dimension: {group: [accepted, total]}} for the "action",
+            "week" and "variant" dimensions
+        confidence: Confidence level
+
+    Returns:
+        Dict with confidence, overall, by_action, by_week, by_variant and
+        changes (consecutive weeks, and each variant against the baseline,
+        whose intervals separate)
+    """
+    result = {"confidence": confidence, "overall": rate_interval(accepted, total, confidence)}
+    for dimension in ("action", "week", "variant"):
+        result[f"by_{dimension}"] = {
+            group: rate_interval(counts[0], counts[1], confidence)
+            for group, counts in sorted(groups.get(dimension, {}).items())
+        }
+
+    changes = []
+    weeks = result["by_week"]
+    for before, after in pairwise(weeks):
+        changes.append(_change("week", before, after, weeks))
+    variants = result["by_variant"]
+    if variants:
+        baseline = BASELINE_VARIANT if BASELINE_VARIANT in variants else next(iter(variants))
+        for variant in variants:
+            if variant != baseline:
+                changes.append(_change("variant", baseline, variant, variants))
+    result["changes"] = [change for change in changes if change is not None]
+    return result
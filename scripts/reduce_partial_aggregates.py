@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Reduce Partial Aggregates
+
+Merges partial aggregates written by `aggregate_metrics.py --emit-partial`
+(one per workflow run or artifact) into the acceptance-rate output that
+aggregate_metrics.py would produce from the concatenated raw data.
+
+Inputs are merged in a tree: consecutive groups of --fan-in partials are
+merged, then groups of those results, until one remains. Because merging
+is associative the result does not depend on the tree shape, only on the
+input order, which should follow the raw data (e.g. run order).
+--partial-output writes the merged partial instead, so a reduction can
+itself be split across jobs and reduced again.
+
+Usage:
+    python scripts/reduce_partial_aggregates.py partials/*.json --output metrics/acceptance_rate.json
+    python scripts/reduce_partial_aggregates.py partials/shard-1/*.json --partial-output merged/shard-1.json
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from aggregate_metrics import PartialAggregate, calculate_overall_metrics
+
+
+def tree_reduce(partials: list[PartialAggregate], fan_in: int = 2) -> PartialAggregate:
+    """
+    Merge partial aggregates level by level, keeping their order.
+
+    Args:
+        partials: Partial aggregates in raw-data order
+        fan_in: Number of partials merged into each node of the next level
+
+    Returns:
+        Merged PartialAggregate (empty if there are no partials)
+
+    Raises:
+        ValueError: If fan_in is less than 2
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    level = list(partials)
+    if not level:
+        return PartialAggregate()
+    while len(level) > 1:
+        next_level = []
+        for i in range(0, len(level), fan_in):
+            merged = level[i]
+            for partial in level[i + 1:i + fan_in]:
+                merged = merged.merge(partial)
+            next_level.append(merged)
+        level = next_level
+    return level[0]
+
+
+def load_partials(file_paths: list[str]) -> list[PartialAggregate]:
+    """
+    Load partial aggregate files, skipping unreadable or invalid ones.
+
+    Args:
+        file_paths: Partial aggregate file paths, in raw-data order
+
+    Returns:
+        List of PartialAggregate in the same order
+    """
+    partials = []
+    for file_path in file_paths:
+        try:
+            partials.append(PartialAggregate.load(file_path))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load {file_path}: {e}")
+    return partials
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Merge partial aggregates from aggregate_metrics.py --emit-partial"
+    )
+    parser.add_argument(
+        "partials",
+        nargs="+",
+        help="Partial aggregate files, in raw-data order",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="metrics/acceptance_rate.json",
+        help="Output file path for aggregated metrics",
+    )
+    parser.add_argument(
+        "--partial-output",
+        type=str,
+        help="Write the merged partial aggregate here instead of the aggregated metrics",
+    )
+    parser.add_argument(
+        "--action",
+        type=str,
+        help="Filter metrics for a specific action",
+    )
+    parser.add_argument(
+        "--fan-in",
+        type=int,
+        default=8,
+        help="Partials merged per tree node (default: 8)",
+    )
+
+    args = parser.parse_args()
+    if args.fan_in < 2:
+        parser.error("--fan-in must be at least 2")
+
+    partials = load_partials(args.partials)
+    print(f"Loaded {len(partials)} of {len(args.partials)} partial aggregate(s)")
+    merged = tree_reduce(partials, args.fan_in)
+    print(f"Merged {merged.entry_count} metric entries")
+
+    if args.partial_output:
+        if args.action:
+            merged = PartialAggregate.from_partials([merged.actions], args.action)
+        merged.save(args.partial_output)
+        print(f"\nMerged partial aggregate saved to {args.partial_output}")
+        return 0
+
+    aggregated = merged.finalize(args.action)
+    output_data = {
+        "timestamp": datetime.now().isoformat(),
+        "time_range": None,
+        "overall": calculate_overall_metrics(aggregated),
+        "by_action": aggregated,
+        "sources": len(partials),
+    }
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(output_data, f, indent=2)
+
+    print(f"\nAggregated metrics saved to {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
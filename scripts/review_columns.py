@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Columnar Cache for Review Metrics
+
+metrics/review_metrics.json is a JSON array of review dicts, and parsing it
+into dicts dominates every consumer's run time. This module keeps a binary
+columnar copy next to it (review_metrics.json.columns), rebuilt only when
+the JSON's size or modification time changes. Readers mmap the cache and
+cast memoryviews over each column, so loading copies and parses nothing
+per review.
+
+File layout:
+    MAGIC, a 4-byte header length, a JSON header (source size/mtime, byte
+    order, row count, dictionaries, column offsets), then each column as a
+    packed native-endian array aligned to 8 bytes.
+
+Columns (array typecodes):
+    ts_state      B  TS_MISSING, TS_VALID or TS_INVALID
+    ts_us         q  timestamp as epoch microseconds (UTC); UNTIMED_US when
+                     absent and INVALID_US when unparseable, so
+                     `ts_us >= cutoff` is the time filter of the JSON path
+    ts_offset     i  the timestamp's UTC offset in seconds
+    outcome       B  index into the outcome dictionary
+    repo          I  index into the repo_id dictionary
+    confidence    d  confidence_score (0.0 when absent)
+    suggestions   q  suggestions_count (0 when absent)
+    accepted      q  accepted_count (see HAS_ACCEPTED)
+    flags         B  HAS_ACCEPTED, REASON_SCALAR
+    reason_start  I  row i's reasons are reasons[reason_start[i]:reason_start[i + 1]]
+    reasons       I  indices into the reason dictionary
+    reason_row    I  the row each entry of reasons belongs to
+    ts_order      I  row indices sorted by ts_us (stable), for bisecting
+                     time windows
+
+Reviews the columns cannot represent exactly (naive timestamps, non-integer
+counts, non-string outcomes, ...) make encode_reviews() raise ValueError;
+load_review_columns() then returns None and callers use the JSON path.
+
+Usage:
+    columns = load_review_columns("metrics/review_metrics.json")
+    if columns is not None:
+        approved = columns.outcomes.index("approved")
+        total = sum(1 for code in columns.outcome if code == approved)
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import UTC, datetime, timedelta
+
+MAGIC = b"RVCOLS01"
+COLUMNS_VERSION = 2
+CACHE_SUFFIX = ".columns"
+
+TS_MISSING = 0
+TS_VALID = 1
+TS_INVALID = 2
+UNTIMED_US = 2 ** 63 - 1
+INVALID_US = -2 ** 63
+
+HAS_ACCEPTED = 1
+REASON_SCALAR = 2
+
+COLUMN_TYPES = {
+    "ts_state": "B",
+    "ts_us": "q",
+    "ts_offset": "i",
+    "outcome": "B",
+    "repo": "I",
+    "confidence": "d",
+    "suggestions": "q",
+    "accepted": "q",
+    "flags": "B",
+    "reason_start": "I",
+    "reasons": "I",
+    "reason_row": "I",
+    "ts_order": "I",
+}
+DICTIONARIES = ("outcome", "repo_id", "reason")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+_SECOND = timedelta(seconds=1)
+_ALIGN = 8
+
+
+def cache_path(json_path: str) -> str:
+    """Get the columnar cache path for a review metrics JSON file."""
+    return json_path + CACHE_SUFFIX
+
+
+def epoch_us(dt: datetime) -> int:
+    """Convert an aware datetime to epoch microseconds."""
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def window_rows(columns: "ReviewColumns", start_us: int) -> memoryview:
+    """
+    Get the rows whose ts_us is at or after start_us (including untimed rows).
+
+    Args:
+        columns: Review columns
+        start_us: Window start in epoch microseconds
+
+    Returns:
+        Slice of ts_order holding the row indices, in timestamp order
+    """
+    order = columns.ts_order
+    return order[bisect_left(order, start_us, key=columns.ts_us.__getitem__):]
+
+
+def local_datetime(ts_us: int, ts_offset: int) -> datetime:
+    """Rebuild the wall-clock (naive) datetime a timestamp was written in."""
+    return datetime(1970, 1, 1) + timedelta(microseconds=ts_us, seconds=ts_offset)
+
+
+def _parse_timestamp(value) -> tuple[int, int, int]:
+    """Encode a review timestamp as (ts_state, ts_us, ts_offset)."""
+    if not value:
+        return TS_MISSING, UNTIMED_US, 0
+    if not isinstance(value, str):
+        raise ValueError(f"Unsupported timestamp: {value!r}")
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return TS_INVALID, INVALID_US, 0
+    offset = dt.utcoffset()
+    if offset is None or offset % _SECOND:
+        raise ValueError(f"Unsupported timestamp: {value!r}")
+    return TS_VALID, epoch_us(dt), offset // _SECOND
+
+
+def encode_reviews(reviews: list) -> tuple[dict[str, array], dict[str, list]]:
+    """
+    Encode review dicts as columns.
+
+    Args:
+        reviews: Review metric dicts, as stored in review_metrics.json
+
+    Returns:
+        Tuple of (columns by name, dictionaries by name)
+
+    Raises:
+        ValueError: If a review cannot be represented exactly
+    """
+    columns = {name: array(code) for name, code in COLUMN_TYPES.items()}
+    dictionaries = {name: [] for name in DICTIONARIES}
+    codes = {name: {} for name in DICTIONARIES}
+
+    def code_for(name, value):
+        table = codes[name]
+        code = table.get(value)
+        if code is None:
+            code = table[value] = len(dictionaries[name])
+            dictionaries[name].append(value)
+        return code
+
+    columns["reason_start"].append(0)
+    try:
+        for review in reviews:
+            if not isinstance(review, dict):
+                raise ValueError(f"Unsupported review: {review!r}")
+
+            state, ts_us, ts_offset = _parse_timestamp(review.get("timestamp"))
+            columns["ts_state"].append(state)
+            columns["ts_us"].append(ts_us)
+            columns["ts_offset"].append(ts_offset)
+
+            outcome = review.get("outcome", "unknown")
+            repo_id = review.get("repo_id")
+            if not isinstance(outcome, str) or not (repo_id is None or isinstance(repo_id, str)):
+                raise ValueError(f"Unsupported outcome or repo_id: {review!r}")
+            columns["outcome"].append(code_for("outcome", outcome))
+            columns["repo"].append(code_for("repo_id", repo_id))
+
+            confidence = review.get("confidence_score", 0)
+            if not isinstance(confidence, (int, float)):
+                raise ValueError(f"Unsupported confidence_score: {confidence!r}")
+            columns["confidence"].append(confidence)
+
+            suggestions = review.get("suggestions_count") or 0
+            accepted = review.get("accepted_count")
+            if not isinstance(suggestions, int) or not (accepted is None or isinstance(accepted, int)):
+                raise ValueError(f"Unsupported counts: {review!r}")
+            columns["suggestions"].append(suggestions)
+            columns["accepted"].append(accepted or 0)
+
+            flags = 0 if accepted is None else HAS_ACCEPTED
+            reasons = review.get("rejection_reasons", [])
+            if isinstance(reasons, str):
+                if reasons:
+                    flags |= REASON_SCALAR
+                reasons = [reasons] if reasons else []
+            elif not isinstance(reasons, list) or not all(isinstance(r, str) for r in reasons):
+                raise ValueError(f"Unsupported rejection_reasons: {reasons!r}")
+            columns["flags"].append(flags)
+            columns["reasons"].extend(code_for("reason", reason) for reason in reasons)
+            columns["reason_row"].extend([len(columns["flags"]) - 1] * len(reasons))
+            columns["reason_start"].append(len(columns["reasons"]))
+    except OverflowError as e:
+        # Also raised for more than 256 distinct outcomes
+        raise ValueError(f"Value out of range: {e}") from e
+
+    ts_us = columns["ts_us"]
+    columns["ts_order"] = array("I", sorted(range(len(ts_us)), key=ts_us.__getitem__))
+    return columns, dictionaries
+
+
+def write_columns(
+    path: str, columns: dict[str, array], dictionaries: dict[str, list], source: dict
+) -> None:
+    """
+    Write encoded columns to path atomically.
+
+    Args:
+        path: Cache file path
+        columns: Columns from encode_reviews()
+        dictionaries: Dictionaries from encode_reviews()
+        source: Size and mtime_ns of the JSON file the columns were built from
+    """
+    layout = {}
+    offset = 0
+    for name, values in columns.items():
+        offset += -offset % _ALIGN
+        layout[name] = [values.typecode, offset, len(values)]
+        offset += len(values) * values.itemsize
+    header = json.dumps({
+        "version": COLUMNS_VERSION,
+        "byteorder": sys.byteorder,
+        "source": source,
+        "rows": len(columns["ts_state"]),
+        "dictionaries": dictionaries,
+        "columns": layout,
+    }).encode("utf-8")
+    prefix = MAGIC + struct.pack("<I", len(header)) + header
+    prefix += b"\0" * (-len(prefix) % _ALIGN)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(prefix)
+        for name, values in columns.items():
+            f.write(b"\0" * (len(prefix) + layout[name][1] - f.tell()))
+            values.tofile(f)
+    os.replace(tmp_path, path)
+
+
+class ReviewColumns:
+    """
+    Review metrics as read-only columns.
+
+    Each name in COLUMN_TYPES is an attribute holding a memoryview of that
+    column (reason_start has rows + 1 entries).
+
+    Attributes:
+        rows: Number of reviews
+        outcomes: Outcome dictionary ("unknown" when absent)
+        repo_ids: repo_id dictionary (None when absent)
+        reasons_text: Rejection reason dictionary
+        source: Size and mtime_ns of the JSON file, if built from one
+    """
+
+    __slots__ = ("rows", "outcomes", "repo_ids", "reasons_text", "source", *COLUMN_TYPES)
+
+    def __init__(self, rows: int, dictionaries: dict, views: dict, source: dict | None = None):
+        self.rows = rows
+        self.outcomes = dictionaries["outcome"]
+        self.repo_ids = dictionaries["repo_id"]
+        self.reasons_text = dictionaries["reason"]
+        self.source = source
+        for name in COLUMN_TYPES:
+            setattr(self, name, views[name])
+
+    @classmethod
+    def from_reviews(cls, reviews: list, source: dict | None = None) -> "ReviewColumns":
+        """
+        Encode reviews in memory.
+
+        Args:
+            reviews: Review metric dicts
+            source: Optional size and mtime_ns of their JSON file
+
+        Returns:
+            ReviewColumns backed by arrays
+
+        Raises:
+            ValueError: If a review cannot be represented exactly
+        """
+        return cls._from_encoded(*encode_reviews(reviews), source)
+
+    @classmethod
+    def _from_encoded(
+        cls, columns: dict[str, array], dictionaries: dict, source: dict | None
+    ) -> "ReviewColumns":
+        """Wrap the output of encode_reviews() without copying it."""
+        views = {name: memoryview(values) for name, values in columns.items()}
+        return cls(len(columns["ts_state"]), dictionaries, views, source)
+
+    @classmethod
+    def open(cls, path: str) -> "ReviewColumns":
+        """
+        Map a cache file written by write_columns().
+
+        Args:
+            path: Cache file path
+
+        Returns:
+            ReviewColumns whose columns are views into the mapped file
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid cache of this version
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if mapped[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Not a review columns file: {path}")
+            start = len(MAGIC) + 4
+            (header_size,) = struct.unpack("<I", mapped[len(MAGIC):start])
+            header = json.loads(mapped[start:start + header_size])
+            if (
+                header.get("version") != COLUMNS_VERSION
+                or header.get("byteorder") != sys.byteorder
+            ):
+                raise ValueError(f"Incompatible review columns file: {path}")
+            data_start = start + header_size
+            data_start += -data_start % _ALIGN
+
+            buffer = memoryview(mapped)
+            views = {}
+            for name, typecode in COLUMN_TYPES.items():
+                stored_type, offset, length = header["columns"][name]
+                size = length * array(typecode).itemsize
+                begin = data_start + offset
+                if stored_type != typecode or begin + size > len(mapped):
+                    raise ValueError(f"Corrupt review columns file: {path}")
+                views[name] = buffer[begin:begin + size].cast(typecode)
+        except (KeyError, TypeError, struct.error) as e:
+            raise ValueError(f"Corrupt review columns file: {path}") from e
+        return cls(header["rows"], header["dictionaries"], views, header["source"])
+
+
+def load_review_columns(json_path: str) -> ReviewColumns | None:
+    """
+    Load the columnar cache for a review metrics file, rebuilding it if stale.
+
+    Args:
+        json_path: Path to review_metrics.json
+
+    Returns:
+        ReviewColumns, or None if the JSON file is missing, invalid, not a
+        list, or holds reviews the columns cannot represent
+    """
+    try:
+        stat = os.stat(json_path)
+    except OSError:
+        return None
+    source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    path = cache_path(json_path)
+    try:
+        columns = ReviewColumns.open(path)
+        if columns.source == source:
+            return columns
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open(json_path, encoding='utf-8') as f:
+            reviews = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(reviews, list):
+        return None
+
+    try:
+        encoded = encode_reviews(reviews)
+    except ValueError:
+        return None
+    try:
+        write_columns(path, *encoded, source)
+        return ReviewColumns.open(path)
+    except OSError:
+        # Read-only checkout: serve this run from memory
+        return ReviewColumns._from_encoded(*encoded, source)
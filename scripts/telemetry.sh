@@ -0,0 +1,100 @@
+# Record telemetry from bash steps without starting Python.
+#
+# Usage:
+#   source scripts/telemetry.sh
+#   record_telemetry <action_name> <status> <duration_ms> [error_type]
+#
+#   span_begin <name>                       # the first span is the run itself
+#   span_end <name> [status] [error_type]   # ending the first span ends the run
+#
+# record_telemetry writes one event into the spool directory (see
+# telemetry_line_protocol.py for the format). span_begin and span_end append
+# markers to the run's trace file in the spool (see telemetry_trace.py), which
+# is logged as one event once the first span ends. collect_metrics.py imports
+# spooled events into telemetry.log on its next flush, or run
+# `python scripts/collect_metrics.py --flush` at the end of the job. Never
+# fails the calling step.
+#
+# Environment Variables:
+#   DISABLE_TELEMETRY: Set to "true" to disable metrics collection
+#   TELEMETRY_SPOOL_DIR: Spool directory (default: metrics/telemetry/spool)
+#   TELEMETRY_TRACE_ID, TELEMETRY_TRACE_ROOT: Set by span_begin for the open
+#     trace; also written to GITHUB_ENV so later steps of the job add to it
+
+record_telemetry() {
+  case "${DISABLE_TELEMETRY:-}" in
+    [Tt][Rr][Uu][Ee]) return 0 ;;
+  esac
+
+  local spool_dir="${TELEMETRY_SPOOL_DIR:-metrics/telemetry/spool}"
+  # EPOCHREALTIME (bash 5) avoids forking date; it may use a decimal comma
+  local now="${EPOCHREALTIME/[.,]/}"
+  [[ -n "$now" ]] || now="$(date +%s)000000"
+  local strip=$'\t\r\n'
+  local action="${1//[$strip]/ }" status="${2//[$strip]/ }" duration="${3//[$strip]/ }"
+  local error="${4:-}"
+  error="${error:0:200}"
+  error="${error//[$strip]/ }"
+  local repository="${GITHUB_REPOSITORY:-unknown}" runner_os="${RUNNER_OS:-unknown}"
+  local cli_version="${CLAUDE_CLI_VERSION:-unknown}"
+
+  [[ -d "$spool_dir" ]] || mkdir -p "$spool_dir" 2>/dev/null || return 0
+  printf 'ct1\t%s\t%s\t%s\t%s\t%s\t%s\t%s\t%s\n' \
+    "$now" "$action" "$status" "$duration" \
+    "${repository//[$strip]/ }" "${runner_os//[$strip]/ }" "${cli_version//[$strip]/ }" "$error" \
+    > "$spool_dir/0${now}000-$$-${RANDOM}.evt" 2>/dev/null || true
+  return 0
+}
+
+span_begin() {
+  case "${DISABLE_TELEMETRY:-}" in
+    [Tt][Rr][Uu][Ee]) return 0 ;;
+  esac
+
+  local spool_dir="${TELEMETRY_SPOOL_DIR:-metrics/telemetry/spool}"
+  local now="${EPOCHREALTIME/[.,]/}"
+  [[ -n "$now" ]] || now="$(date +%s)000000"
+  local strip=$'\t\r\n'
+  local name="${1//[$strip]/ }"
+
+  [[ -d "$spool_dir" ]] || mkdir -p "$spool_dir" 2>/dev/null || return 0
+  if [[ -z "${TELEMETRY_TRACE_ID:-}" ]]; then
+    local repository="${GITHUB_REPOSITORY:-unknown}" runner_os="${RUNNER_OS:-unknown}"
+    local cli_version="${CLAUDE_CLI_VERSION:-unknown}"
+    export TELEMETRY_TRACE_ID="0${now}000-$$-${RANDOM}" TELEMETRY_TRACE_ROOT="$name"
+    if [[ -n "${GITHUB_ENV:-}" ]]; then
+      printf 'TELEMETRY_TRACE_ID=%s\nTELEMETRY_TRACE_ROOT=%s\n' \
+        "$TELEMETRY_TRACE_ID" "$TELEMETRY_TRACE_ROOT" >> "$GITHUB_ENV" 2>/dev/null || true
+    fi
+    printf 'cs1\tB\t%s\t%s\t%s\t%s\t%s\n' "$now" "$name" \
+      "${repository//[$strip]/ }" "${runner_os//[$strip]/ }" "${cli_version//[$strip]/ }" \
+      >> "$spool_dir/$TELEMETRY_TRACE_ID.trace" 2>/dev/null || true
+  else
+    printf 'cs1\tB\t%s\t%s\n' "$now" "$name" \
+      >> "$spool_dir/$TELEMETRY_TRACE_ID.trace" 2>/dev/null || true
+  fi
+  return 0
+}
+
+span_end() {
+  [[ -n "${TELEMETRY_TRACE_ID:-}" ]] || return 0
+
+  local spool_dir="${TELEMETRY_SPOOL_DIR:-metrics/telemetry/spool}"
+  local now="${EPOCHREALTIME/[.,]/}"
+  [[ -n "$now" ]] || now="$(date +%s)000000"
+  local strip=$'\t\r\n'
+  local name="${1//[$strip]/ }" status="${2:-}"
+  local error="${3:-}"
+  error="${error:0:200}"
+
+  printf 'cs1\tE\t%s\t%s\t%s\t%s\n' "$now" "$name" "${status//[$strip]/ }" "${error//[$strip]/ }" \
+    >> "$spool_dir/$TELEMETRY_TRACE_ID.trace" 2>/dev/null || true
+
+  if [[ "$name" == "${TELEMETRY_TRACE_ROOT:-}" ]]; then
+    unset TELEMETRY_TRACE_ID TELEMETRY_TRACE_ROOT
+    if [[ -n "${GITHUB_ENV:-}" ]]; then
+      printf 'TELEMETRY_TRACE_ID=\nTELEMETRY_TRACE_ROOT=\n' >> "$GITHUB_ENV" 2>/dev/null || true
+    fi
+  fi
+  return 0
+}
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Reference Telemetry Collector
+
+A small HTTP server that accepts the NDJSON batches sent by
+telemetry_exporter (gzip-compressed or not) and appends them to a
+telemetry.log in the same format collect_metrics.py writes locally, so the
+existing reports work unchanged on collected data. Each accepted request is
+appended with one write and one fsync (telemetry_spool.append_batch).
+
+Responses:
+    200  batch appended; body is {"accepted": <events>}
+    400  body is not valid (gzip-compressed) NDJSON, the gzip stream is
+         truncated, or Content-Length is not a non-negative integer;
+         nothing is appended
+    411  missing Content-Length
+    413  body larger than MAX_BODY_BYTES (after decompression)
+
+It speaks HTTP/1.1 with keep-alive and serves each connection on its own
+thread. It is meant for local load testing and small deployments; it has
+no authentication. The default port is not OTLP/HTTP's 4318, so it can run
+next to a local OpenTelemetry collector (see otlp_export.py).
+
+Usage:
+    python scripts/telemetry_collector.py --port 4380 --log-file metrics/telemetry/telemetry.log
+"""
+
+import argparse
+import json
+import sys
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from telemetry_spool import append_batch
+
+DEFAULT_PORT = 4380
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    """Append POSTed NDJSON batches to the collector's log."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY every
+    # keep-alive response waits out the client's delayed ACK
+    disable_nagle_algorithm = True
+    server: "TelemetryCollector"
+
+    def do_POST(self):
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self._reply(411, {"error": "Content-Length required"})
+            return
+        try:
+            length = int(length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The body cannot be framed, so the connection cannot be reused
+            self.close_connection = True
+            self._reply(400, {"error": "Invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._reply(413, {"error": "Batch too large"})
+            return
+        body = self.rfile.read(length)
+
+        if self.headers.get("Content-Encoding", "").lower() == "gzip":
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            try:
+                body = decompressor.decompress(body, MAX_BODY_BYTES)
+            except zlib.error:
+                self._reply(400, {"error": "Invalid gzip body"})
+                return
+            if decompressor.unconsumed_tail:
+                self._reply(413, {"error": "Batch too large"})
+                return
+            if not decompressor.eof:
+                # A truncated upload decompresses to a prefix of the batch
+                self._reply(400, {"error": "Truncated gzip body"})
+                return
+
+        lines = [line for line in body.splitlines() if line.strip()]
+        try:
+            for line in lines:
+                json.loads(line)
+        except ValueError:
+            self._reply(400, {"error": "Invalid NDJSON body"})
+            return
+
+        if lines:
+            self.server.append(b"\n".join(lines) + b"\n", len(lines))
+        self._reply(200, {"accepted": len(lines)})
+
+    def _reply(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class TelemetryCollector(ThreadingHTTPServer):
+    """HTTP server appending received telemetry batches to one log file."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], log_file: str | Path, verbose: bool = False):
+        super().__init__(address, CollectorHandler)
+        self.log_file = Path(log_file)
+        self.verbose = verbose
+        self.received = 0
+        self._append_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/events"
+
+    def append(self, payload: bytes, count: int) -> None:
+        """Append a validated batch of `count` events to the log."""
+        with self._append_lock:
+            append_batch(self.log_file, payload)
+            self.received += count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the reference telemetry collector")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})"
+    )
+    parser.add_argument(
+        "--log-file",
+        default="metrics/telemetry/telemetry.log",
+        help="Telemetry log to append to (default: metrics/telemetry/telemetry.log)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+    args = parser.parse_args()
+    with TelemetryCollector((args.host, args.port), args.log_file, args.verbose) as server:
+        print(f"Collecting telemetry at {server.url} into {args.log_file}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    print(f"Received {server.received} events")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+HTTP Telemetry Exporter
+
+Pushes telemetry events to a central collector (see telemetry_collector.py
+for a reference implementation) as gzip-compressed NDJSON batches.
+
+    CollectorConnection  one keep-alive http.client connection to the
+                         collector, reopened transparently when the server
+                         closes an idle connection
+    post_batch()         POST one batch with retries and exponential backoff
+                         (used by telemetry_spool.flush_spool())
+    TelemetryExporter    in-process buffer for long-running producers; a
+                         batch is sent once it holds max_batch events or its
+                         oldest event is max_latency seconds old
+
+TelemetryExporter does not persist events: batches that still fail after
+all retries are dropped and counted. Action steps should keep using
+collect_metrics.send_metrics(), whose spool survives collector outages.
+
+Usage:
+    with TelemetryExporter("http://localhost:4380/events") as exporter:
+        exporter.export({"action_name": "review-and-merge", ...})
+"""
+
+import json
+import sys
+import threading
+import time
+
+MAX_BATCH = 500
+MAX_LATENCY_SECONDS = 1.0
+RETRIES = 3
+BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 8.0
+TIMEOUT_SECONDS = 5.0
+GZIP_LEVEL = 6
+
+# Delivery outcomes of post_batch()
+SENT = "sent"
+RETRY = "retry"
+REJECTED = "rejected"
+
+
+class CollectorConnection:
+    """Keep-alive connection to a collector endpoint."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        timeout: float = TIMEOUT_SECONDS,
+        compress: bool = True,
+        content_type: str = "application/x-ndjson",
+    ):
+        # Imported here so that importing telemetry_spool (and through it this
+        # module) stays cheap for collect_metrics.py when no endpoint is set
+        from http.client import HTTPConnection, HTTPSConnection
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(endpoint)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported collector endpoint: {endpoint!r}")
+        self._connection_class = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.timeout = timeout
+        self.compress = compress
+        self.content_type = content_type
+        self.requests = 0
+        self.connections = 0
+        self._connection = None
+
+    def post(self, payload: bytes, path: str | None = None) -> int:
+        """
+        POST a payload (NDJSON unless another content_type was given).
+
+        Args:
+            payload: Request body (compressed here if enabled)
+            path: Request path on the same host (default: the endpoint's)
+
+        Returns:
+            HTTP status code
+
+        Raises:
+            OSError, HTTPException: If the collector cannot be reached
+        """
+        import gzip
+        from http.client import HTTPException
+
+        headers = {"Content-Type": self.content_type}
+        if self.compress:
+            payload = gzip.compress(payload, compresslevel=GZIP_LEVEL)
+            headers["Content-Encoding"] = "gzip"
+
+        while True:
+            reused = self._connection is not None
+            if not reused:
+                self._connection = self._connection_class(self.host, self.port, timeout=self.timeout)
+                self.connections += 1
+            try:
+                self._connection.request("POST", path or self.path, payload, headers)
+                response = self._connection.getresponse()
+                response.read()
+            except (OSError, HTTPException):
+                self.close()
+                if reused:
+                    # The server closed the idle connection; retry on a new one
+                    continue
+                raise
+            self.requests += 1
+            if response.will_close:
+                self.close()
+            return response.status
+
+    def close(self) -> None:
+        """Close the underlying connection (the next post() reopens it)."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def post_batch(
+    connection: CollectorConnection,
+    payload: bytes,
+    retries: int = RETRIES,
+    backoff_seconds: float = BACKOFF_SECONDS,
+    path: str | None = None,
+) -> str:
+    """
+    POST an NDJSON batch to the collector, retrying with exponential backoff.
+
+    Args:
+        connection: Collector connection
+        payload: NDJSON body
+        retries: Retries after the first attempt
+        backoff_seconds: Delay before the first retry; doubled each retry
+            (capped at MAX_BACKOFF_SECONDS)
+        path: Request path (default: the connection's endpoint path)
+
+    Returns:
+        SENT, RETRY (still failing after all retries) or REJECTED (the
+        collector refused the batch; retrying would not help)
+    """
+    from http.client import HTTPException
+
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(min(backoff_seconds * 2 ** (attempt - 1), MAX_BACKOFF_SECONDS))
+        try:
+            status = connection.post(payload, path)
+        except (OSError, HTTPException):
+            continue
+        if status < 300:
+            return SENT
+        if status < 500 and status not in (408, 429):
+            print(f"Warning: Telemetry collector rejected a batch: HTTP {status}", file=sys.stderr)
+            return REJECTED
+    return RETRY
+
+
+class TelemetryExporter:
+    """
+    Buffered exporter bounded by batch size and latency.
+
+    export() is thread-safe. The producer that fills a batch sends it,
+    which throttles producers to the collector's pace; a background thread
+    sends partial batches once they reach max_latency.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        max_batch: int = MAX_BATCH,
+        max_latency: float = MAX_LATENCY_SECONDS,
+        retries: int = RETRIES,
+        backoff_seconds: float = BACKOFF_SECONDS,
+        timeout: float = TIMEOUT_SECONDS,
+        compress: bool = True,
+    ):
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be at least 1, got {max_batch}")
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.connection = CollectorConnection(endpoint, timeout, compress)
+        self.exported = 0
+        self.dropped = 0
+        self._buffer = []
+        self._oldest = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="telemetry-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, event: dict) -> None:
+        """Queue one event, sending the batch if it is full."""
+        line = json.dumps(event) + "\n"
+        with self._condition:
+            if self._closed:
+                raise ValueError("TelemetryExporter is closed")
+            if not self._buffer:
+                self._oldest = time.monotonic()
+                self._condition.notify()
+            self._buffer.append(line)
+            batch = self._take() if len(self._buffer) >= self.max_batch else None
+        if batch:
+            self._send(batch)
+
+    def flush(self) -> None:
+        """Send every queued event."""
+        while True:
+            with self._condition:
+                batch = self._take()
+            if not batch:
+                return
+            self._send(batch)
+
+    def close(self) -> None:
+        """Send queued events, stop the background thread and close the connection."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _take(self) -> list[str]:
+        # Caller holds self._condition
+        batch = self._buffer[:self.max_batch]
+        del self._buffer[:self.max_batch]
+        self._oldest = time.monotonic() if self._buffer else None
+        return batch
+
+    def _send(self, batch: list[str]) -> None:
+        payload = "".join(batch).encode("utf-8")
+        with self._send_lock:
+            outcome = post_batch(self.connection, payload, self.retries, self.backoff_seconds)
+            if outcome == SENT:
+                self.exported += len(batch)
+            else:
+                self.dropped += len(batch)
+                print(f"Warning: Dropped {len(batch)} telemetry events", file=sys.stderr)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if not self._buffer:
+                        self._condition.wait()
+                        continue
+                    remaining = self._oldest + self.max_latency - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._closed:
+                    return
+                batch = self._take()
+            self._send(batch)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Spool Line Protocol for Shell Steps
+
+Composite action steps are bash; starting Python to record one event costs
+more than the step's own bookkeeping. Instead, a bash step can source
+scripts/telemetry.sh and call
+
+    record_telemetry <action_name> <status> <duration_ms> [error_type]
+
+which writes the event into the spool directory with a single printf and
+no new process. The spool flusher (telemetry_spool.flush_spool(), run by
+collect_metrics.py or `collect_metrics.py --flush`) imports these files in
+bulk: it validates them, anonymizes the repository and appends them to
+telemetry.log with the spooled JSON events, in arrival order.
+
+Protocol (version "ct1"): one file per event, named
+
+    <epoch nanoseconds, 20 digits>-<pid>-<random>.evt
+
+holding one tab-separated line terminated by a newline:
+
+    ct1  epoch_us  action_name  status  duration_ms  repository  runner_os  claude_cli_version  error_type
+
+Fields must not contain tabs or newlines (telemetry.sh replaces them with
+spaces); error_type may be empty. The repository is the raw GITHUB_REPOSITORY
+value and is hashed on import. A file without its trailing newline is still
+being written and is left for the next flush, unless it is older than
+INCOMPLETE_GRACE_SECONDS, when it is set aside as invalid.
+
+Usage:
+    format_line("review-and-merge", "success", 1234, "owner/repo", "Linux", "1.0")
+    parse_line(text)  # event dict, as collect_metrics.collect_metrics() builds it
+"""
+
+import time
+
+from collect_metrics import VALID_STATUSES, build_event
+
+PROTOCOL = "ct1"
+LINE_SUFFIX = ".evt"
+FIELDS = 9
+INCOMPLETE_GRACE_SECONDS = 60
+
+_SEPARATORS = str.maketrans("\t\r\n", "   ")
+
+
+def format_line(
+    action_name: str,
+    status: str,
+    duration_ms: int,
+    repository: str,
+    runner_os: str,
+    claude_cli_version: str,
+    error_type: str = "",
+    epoch_us: int | None = None,
+) -> str:
+    """
+    Format an event the way telemetry.sh writes it (for tests and tools).
+
+    Returns:
+        One protocol line, newline-terminated
+    """
+    if epoch_us is None:
+        epoch_us = time.time_ns() // 1000
+    fields = [action_name, status, str(duration_ms), repository, runner_os, claude_cli_version, error_type or ""]
+    return "\t".join([PROTOCOL, str(epoch_us), *(f.translate(_SEPARATORS) for f in fields)]) + "\n"
+
+
+def parse_line(text: str) -> dict:
+    """
+    Parse one protocol line into a telemetry event.
+
+    Args:
+        text: File contents (one newline-terminated line)
+
+    Returns:
+        Event dictionary with the repository anonymized
+
+    Raises:
+        ValueError: If the line is incomplete or malformed
+    """
+    if not text.endswith("\n") or text.count("\n") != 1:
+        raise ValueError("expected exactly one newline-terminated line")
+    fields = text[:-1].split("\t")
+    if len(fields) != FIELDS or fields[0] != PROTOCOL:
+        raise ValueError(f"expected {FIELDS} tab-separated fields starting with {PROTOCOL!r}")
+
+    _, epoch_us, action_name, status, duration_ms, repository, runner_os, cli_version, error_type = fields
+    if not action_name:
+        raise ValueError("missing action_name")
+    if status not in VALID_STATUSES:
+        status = "error"
+
+    return build_event(
+        action_name,
+        status,
+        int(duration_ms),
+        error_type or None,
+        repository=repository or "unknown",
+        runner_os=runner_os or "unknown",
+        claude_cli_version=cli_version or "unknown",
+        epoch_ns=int(epoch_us) * 1000,
+    )
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Fast Line Reader for telemetry.log
+
+telemetry.log grows to several GB, and the report loaders read it as text:
+decode every line, strip() it, json.loads() it and keep the full event dict.
+
+When orjson is installed, read_events() instead maps the file into memory,
+splits it on newlines over a memoryview, parses each slice in place and
+keeps only the fields the caller asks for. Repeated string values (action
+names, statuses, repository IDs) are shared, so millions of retained events
+hold a few distinct strings. Files that cannot be mapped (empty files,
+pipes) are read line by line.
+
+Without orjson, read_events() keeps the text loader: json.loads() has no
+field-selective mode, and slicing the mapping and projecting each event
+made the stdlib path slower than reading whole events. Events are then
+returned whole and fields only filters out lines that are not objects.
+
+Usage:
+    for event in read_events("metrics/telemetry/telemetry.log", fields=("action_name", "status")):
+        ...
+"""
+
+import json
+import mmap
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+_WHITESPACE = b" \t\r\n"
+# Fields whose values rarely repeat, so sharing their strings would not pay
+_UNIQUE_FIELDS = frozenset({"timestamp", "trace_id", "duration_ms"})
+_MISSING = object()
+
+
+def _read_text_events(
+    path: str | Path,
+    objects_only: bool,
+    on_error: Callable[[int, ValueError], None] | None,
+) -> Iterator:
+    """The text loader the reports used before this module, for the json fallback."""
+    loads = json.loads
+    # Invalid UTF-8 fails that line's parse instead of the whole read
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = loads(line)
+            except ValueError as e:
+                if on_error is not None:
+                    on_error(line_number, e)
+                continue
+            if objects_only and not isinstance(event, dict):
+                if on_error is not None:
+                    on_error(line_number, ValueError(f"expected a JSON object, got {type(event).__name__}"))
+                continue
+            yield event
+
+
+def _lines(path: str | Path) -> Iterator[memoryview | bytes]:
+    """Yield the lines of a file without their newline."""
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty or unmappable file
+            for line in f:
+                yield line.rstrip(b"\n")
+            return
+
+        with mapped:
+            view = memoryview(mapped)
+            try:
+                start = 0
+                size = len(mapped)
+                find = mapped.find
+                while start < size:
+                    end = find(b"\n", start)
+                    if end < 0:
+                        end = size
+                    yield view[start:end]
+                    start = end + 1
+            finally:
+                view.release()
+
+
+def read_events(
+    path: str | Path,
+    fields: Iterable[str] | None = None,
+    on_error: Callable[[int, ValueError], None] | None = None,
+) -> Iterator:
+    """
+    Parse newline-delimited JSON events from a telemetry log.
+
+    Args:
+        path: Path to telemetry.log
+        fields: Keep only these fields of each event (default: all); without
+            orjson, events are returned whole. Lines that are not JSON
+            objects are then reported as errors.
+        on_error: Called with the line number and error of each line that
+            is not valid JSON (default: skip silently)
+
+    Yields:
+        One event per non-blank line, in file order
+
+    Raises:
+        OSError: If the file cannot be opened
+    """
+    if orjson is None:
+        yield from _read_text_events(path, fields is not None, on_error)
+        return
+
+    # (field, share its string values) for each projected field
+    plan = tuple((field, field not in _UNIQUE_FIELDS) for field in fields) if fields is not None else None
+    share = {}.setdefault
+
+    for line_number, line in enumerate(_lines(path), 1):
+        try:
+            event = orjson.loads(line) if line else None
+        except ValueError as e:
+            if bytes(line).strip(_WHITESPACE) and on_error is not None:
+                on_error(line_number, e)
+            event = None
+        finally:
+            if isinstance(line, memoryview):
+                # The mapping can only be closed once no slice of it is alive
+                line.release()
+        if event is None:
+            continue
+
+        if plan is None:
+            yield event
+            continue
+        if not isinstance(event, dict):
+            if on_error is not None:
+                on_error(line_number, ValueError(f"expected a JSON object, got {type(event).__name__}"))
+            continue
+
+        projected = {}
+        for field, shared in plan:
+            value = event.get(field, _MISSING)
+            if value is not _MISSING:
+                projected[field] = share(value, value) if shared and type(value) is str else value
+        yield projected
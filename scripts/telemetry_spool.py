@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Spooled, Batched Telemetry Delivery
+
+Action steps used to append each telemetry event to
+metrics/telemetry/telemetry.log directly. Instead, send_metrics() now drops
+every event into a spool directory as a small file written atomically
+(a ".tmp" file renamed to ".json"), and a flusher moves spooled events into
+the log in batches: one write() and one fsync() per batch.
+
+When a collector endpoint is configured (TELEMETRY_ENDPOINT), each batch is
+also POSTed to it as gzip-compressed NDJSON over one keep-alive connection
+(see telemetry_exporter). Failed deliveries are retried with exponential
+backoff; batches that still fail are kept in the spool's "outbox"
+directory and retried first by the next flush. Batches the collector
+rejects outright (4xx other than 408/429) are dropped with a warning; they
+are still in the local log.
+
+Shell steps can also spool events without Python, as ".evt" files in the
+line protocol of telemetry_line_protocol; the flusher validates them,
+anonymizes the repository and logs them with the JSON events, in arrival
+order. Span traces (".trace" files, see telemetry_trace) are logged as one
+event each once their root span has ended.
+
+Only one flusher runs at a time per spool (a non-blocking flock on POSIX;
+a second flusher simply returns). Spool files that are not valid events
+are renamed to ".bad" and skipped.
+
+Usage:
+    spool_event(event, "metrics/telemetry/spool")
+    flush_spool("metrics/telemetry/spool", "metrics/telemetry/telemetry.log",
+                endpoint="http://localhost:4380/events")
+"""
+
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple
+
+from telemetry_exporter import (
+    BACKOFF_SECONDS,
+    RETRIES,
+    RETRY,
+    SENT,
+    TIMEOUT_SECONDS,
+    CollectorConnection,
+    post_batch,
+)
+from telemetry_line_protocol import INCOMPLETE_GRACE_SECONDS, LINE_SUFFIX, parse_line
+from telemetry_trace import TRACE_GRACE_SECONDS, TRACE_SUFFIX, parse_trace
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows runners have no fcntl
+    fcntl = None
+
+SPOOL_SUFFIX = ".json"
+TMP_SUFFIX = ".tmp"
+BAD_SUFFIX = ".bad"
+OUTBOX_DIR = "outbox"
+LOCK_NAME = ".flush.lock"
+
+MAX_BATCH = 1000
+FLUSH_MAX_AGE_SECONDS = 300
+
+
+class FlushResult(NamedTuple):
+    """Outcome of one flush_spool() call."""
+
+    logged: int
+    shipped: int
+    pending: int
+
+
+def spool_event(event: dict, spool_dir: str | Path) -> Path:
+    """
+    Write one event to the spool atomically.
+
+    File names start with a zero-padded nanosecond timestamp, so sorting
+    them gives arrival order.
+
+    Args:
+        event: JSON-serializable telemetry event
+        spool_dir: Spool directory (created if missing)
+
+    Returns:
+        Path of the spooled event
+    """
+    spool_dir = Path(spool_dir)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    name = f"{time.time_ns():020d}-{os.getpid()}-{os.urandom(4).hex()}"
+    tmp_path = spool_dir / (name + TMP_SUFFIX)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(event) + "\n")
+    final_path = spool_dir / (name + SPOOL_SUFFIX)
+    os.replace(tmp_path, final_path)
+    return final_path
+
+
+def spooled_events(spool_dir: str | Path) -> list[Path]:
+    """List spooled event files (JSON, line protocol and traces) in arrival order."""
+    try:
+        with os.scandir(spool_dir) as entries:
+            names = [
+                entry.name for entry in entries
+                if entry.name.endswith((SPOOL_SUFFIX, LINE_SUFFIX, TRACE_SUFFIX))
+            ]
+    except FileNotFoundError:
+        return []
+    return [Path(spool_dir) / name for name in sorted(names)]
+
+
+def _age_seconds(path: Path) -> float | None:
+    """Age of a spooled event from the timestamp in its name (None if unnamed)."""
+    try:
+        return (time.time_ns() - int(path.name.split("-", 1)[0])) / 1e9
+    except ValueError:
+        return None
+
+
+def _read_event(path: Path) -> str | None:
+    """
+    One spooled event as a JSON line.
+
+    Returns:
+        The line, or None for a line-protocol file still being written or
+        a trace whose root span has not ended
+
+    Raises:
+        OSError, ValueError: If the file is unreadable or not a valid event
+    """
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == TRACE_SUFFIX:
+        event = parse_trace(text, path.stem)
+        if event is None:
+            age = _age_seconds(path)
+            if age is not None and age < TRACE_GRACE_SECONDS:
+                return None
+            raise ValueError("root span never ended")
+        return json.dumps(event) + "\n"
+    if path.suffix == LINE_SUFFIX:
+        if not text.endswith("\n"):
+            age = _age_seconds(path)
+            if age is not None and age < INCOMPLETE_GRACE_SECONDS:
+                return None
+        return json.dumps(parse_line(text)) + "\n"
+    json.loads(text)
+    return text if text.endswith("\n") else text + "\n"
+
+
+def should_flush(
+    spool_dir: str | Path, threshold: int, max_age_seconds: float = FLUSH_MAX_AGE_SECONDS
+) -> bool:
+    """
+    Whether the spool holds enough events, or an old enough one, to flush.
+
+    Args:
+        spool_dir: Spool directory
+        threshold: Number of spooled events that triggers a flush
+        max_age_seconds: Age of the oldest spooled event that triggers a flush
+
+    Returns:
+        True if flush_spool() should run
+    """
+    events = spooled_events(spool_dir)
+    if len(events) >= threshold:
+        return True
+    if not events:
+        return False
+    age = _age_seconds(events[0])
+    return age is None or age >= max_age_seconds
+
+
+@contextmanager
+def _flush_lock(spool_dir: Path) -> Iterator[bool]:
+    """Try to become the spool's only flusher; yields whether it succeeded."""
+    if fcntl is None:
+        yield True
+        return
+
+    fd = os.open(spool_dir / LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+    finally:
+        os.close(fd)
+
+
+def append_batch(log_file: str | Path, payload: bytes) -> None:
+    """Append a batch of NDJSON lines with one write() and one fsync()."""
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_outbox(outbox: Path, name: str, payload: bytes) -> None:
+    outbox.mkdir(parents=True, exist_ok=True)
+    tmp_path = outbox / (name + TMP_SUFFIX)
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, outbox / (name + ".ndjson"))
+
+
+def _outbox_batches(outbox: Path) -> list[Path]:
+    if not outbox.is_dir():
+        return []
+    return sorted(outbox.glob("*.ndjson"))
+
+
+def _count_lines(path: Path) -> int:
+    return path.read_bytes().count(b"\n")
+
+
+def flush_spool(
+    spool_dir: str | Path,
+    log_file: str | Path,
+    endpoint: str | None = None,
+    max_batch: int = MAX_BATCH,
+    retries: int = RETRIES,
+    backoff_seconds: float = BACKOFF_SECONDS,
+    timeout: float = TIMEOUT_SECONDS,
+) -> FlushResult:
+    """
+    Move spooled events into the log, and ship them if an endpoint is set.
+
+    Args:
+        spool_dir: Spool directory
+        log_file: NDJSON telemetry log to append to
+        endpoint: Optional collector URL
+        max_batch: Maximum events per batch (one log write per batch)
+        retries: Delivery retries per batch
+        backoff_seconds: Initial retry delay
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        FlushResult(logged, shipped, pending): events appended to the log,
+        events delivered to the endpoint, and events still waiting in the
+        spool or the outbox
+    """
+    spool_dir = Path(spool_dir)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    outbox = spool_dir / OUTBOX_DIR
+
+    with _flush_lock(spool_dir) as acquired:
+        if not acquired:
+            pending = len(spooled_events(spool_dir))
+            return FlushResult(0, 0, pending + sum(map(_count_lines, _outbox_batches(outbox))))
+
+        connection = CollectorConnection(endpoint, timeout) if endpoint else None
+        try:
+            return _flush_locked(
+                spool_dir, outbox, log_file, connection, max_batch, retries, backoff_seconds
+            )
+        finally:
+            if connection is not None:
+                connection.close()
+
+
+def _flush_locked(
+    spool_dir: Path,
+    outbox: Path,
+    log_file: str | Path,
+    connection: CollectorConnection | None,
+    max_batch: int,
+    retries: int,
+    backoff_seconds: float,
+) -> FlushResult:
+    logged = shipped = 0
+
+    # Earlier batches first; stop at the first one that still fails
+    endpoint_down = False
+    if connection:
+        for path in _outbox_batches(outbox):
+            payload = path.read_bytes()
+            outcome = post_batch(connection, payload, retries, backoff_seconds)
+            if outcome == RETRY:
+                endpoint_down = True
+                break
+            if outcome == SENT:
+                shipped += payload.count(b"\n")
+            path.unlink()
+
+    # Events spooled while this flush runs are left for the next one
+    events = spooled_events(spool_dir)
+    waiting = 0
+    for start in range(0, len(events), max_batch):
+        batch = events[start:start + max_batch]
+        lines = []
+        consumed = []
+        for path in batch:
+            try:
+                line = _read_event(path)
+            except (OSError, ValueError):
+                print(f"Warning: Skipping unreadable telemetry event {path.name}", file=sys.stderr)
+                os.replace(path, path.with_suffix(BAD_SUFFIX))
+                continue
+            if line is None:
+                waiting += 1
+                continue
+            lines.append(line)
+            consumed.append(path)
+
+        payload = "".join(lines).encode("utf-8")
+        if payload:
+            append_batch(log_file, payload)
+            logged += len(lines)
+            if connection:
+                outcome = RETRY if endpoint_down else post_batch(
+                    connection, payload, retries, backoff_seconds
+                )
+                if outcome == SENT:
+                    shipped += len(lines)
+                elif outcome == RETRY:
+                    endpoint_down = True
+                    _write_outbox(outbox, consumed[0].stem, payload)
+        for path in consumed:
+            path.unlink()
+
+    pending = waiting + sum(map(_count_lines, _outbox_batches(outbox)))
+    return FlushResult(logged, shipped, pending)
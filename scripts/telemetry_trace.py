@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Per-Step Span Traces from Shell Steps
+
+One duration_ms per action run does not say which step was slow. Composite
+action steps can therefore mark steps as spans with the bash helpers in
+scripts/telemetry.sh:
+
+    span_begin review-and-merge          # first span: the run itself (root)
+    span_begin claude
+    claude ...
+    span_end claude success
+    span_end review-and-merge success    # closes the trace
+
+span_begin and span_end append one line each to a trace file in the spool
+directory, shared by all steps of the run (the root span_begin exports
+TELEMETRY_TRACE_ID, also to later steps through GITHUB_ENV). When the root
+span ends, the spool flusher (telemetry_spool) assembles the lines into a
+span tree and logs the run as one telemetry event: the usual fields for the
+root span, so reports count it like any other run, plus "trace_id" and
+"spans". A run recorded as a trace should not also call record_telemetry.
+
+Protocol (version "cs1"): a trace file named like a spooled event,
+
+    <epoch nanoseconds of the root span_begin, 20 digits>-<pid>-<random>.trace
+
+holding one newline-terminated, tab-separated line per marker:
+
+    cs1  B  epoch_us  name  [repository  runner_os  claude_cli_version]
+    cs1  E  epoch_us  name  status  error_type
+
+Only the root B line carries the run fields. Spans nest by marker order, so
+the tree does not depend on the clock; bash has no monotonic clock without
+forking, so times come from EPOCHREALTIME and negative durations from clock
+steps are clamped to zero. An E line closes the innermost open span of that
+name; spans still open inside it are closed at the same time with status
+"incomplete" (e.g. after `set -e` ended a step early). E lines without an
+open span of that name are ignored. A trace whose root is still open after
+TRACE_GRACE_SECONDS (a job's maximum run time) is set aside as invalid.
+
+Usage:
+    event = parse_trace(path.read_text())     # None while the root is open
+    critical_path(event["spans"])             # {span index: ms on the critical path}
+"""
+
+from collect_metrics import VALID_STATUSES, build_event
+
+PROTOCOL = "cs1"
+TRACE_SUFFIX = ".trace"
+TRACE_GRACE_SECONDS = 6 * 60 * 60
+INCOMPLETE = "incomplete"
+
+_BEGIN_FIELDS = (4, 7)
+_END_FIELDS = 6
+
+
+def parse_trace(text: str, trace_id: str = "") -> dict | None:
+    """
+    Assemble a trace file into a telemetry event with its span tree.
+
+    Args:
+        text: Trace file contents
+        trace_id: Identifier recorded with the event (the file's stem)
+
+    Returns:
+        Event dictionary, as collect_metrics.build_event() makes it plus
+        "trace_id" and "spans", or None if the root span is still open.
+        Spans are listed in begin order (the root first), each with name,
+        parent (index into the list, None for the root), start_ms (offset
+        from the root's start), duration_ms and status.
+
+    Raises:
+        ValueError: If the trace is malformed
+    """
+    lines = text.split("\n")
+    # A trailing partial line is still being written
+    complete_lines = lines[:-1]
+
+    spans = []
+    open_spans = []
+    root_fields = None
+    root_end = None
+
+    for line in complete_lines:
+        fields = line.split("\t")
+        if fields[0] != PROTOCOL or len(fields) < 4 or fields[1] not in ("B", "E"):
+            raise ValueError(f"expected a {PROTOCOL!r} begin or end marker, got {line[:80]!r}")
+        kind, epoch_us, name = fields[1], int(fields[2]), fields[3]
+        if not name:
+            raise ValueError("missing span name")
+        if root_end is not None:
+            raise ValueError("marker after the root span ended")
+
+        if kind == "B":
+            if len(fields) not in _BEGIN_FIELDS:
+                raise ValueError(f"expected {' or '.join(map(str, _BEGIN_FIELDS))} fields in a begin marker")
+            if not spans:
+                root_fields = fields[4:]
+            spans.append({
+                "name": name,
+                "parent": open_spans[-1] if open_spans else None,
+                "start_us": epoch_us,
+                "end_us": None,
+                "status": INCOMPLETE,
+            })
+            open_spans.append(len(spans) - 1)
+            continue
+
+        if len(fields) != _END_FIELDS:
+            raise ValueError(f"expected {_END_FIELDS} fields in an end marker")
+        matching = [i for i in open_spans if spans[i]["name"] == name]
+        if not matching:
+            continue
+        while open_spans:
+            index = open_spans.pop()
+            spans[index]["end_us"] = epoch_us
+            if index == matching[-1]:
+                spans[index]["status"] = fields[4] or "success"
+                spans[index]["error_type"] = fields[5]
+                break
+        if not open_spans:
+            root_end = epoch_us
+
+    if root_end is None:
+        return None
+
+    root = spans[0]
+    root_start = root["start_us"]
+    status = root["status"] if root["status"] in VALID_STATUSES else "error"
+    repository, runner_os, cli_version = root_fields or ("", "", "")
+
+    event = build_event(
+        root["name"],
+        status,
+        round(_duration_ms(root_start, root_end)),
+        root.get("error_type") or None,
+        repository=repository or "unknown",
+        runner_os=runner_os or "unknown",
+        claude_cli_version=cli_version or "unknown",
+        epoch_ns=root_start * 1000,
+    )
+    event["trace_id"] = trace_id
+    event["spans"] = [
+        {
+            "name": span["name"],
+            "parent": span["parent"],
+            "start_ms": _duration_ms(root_start, span["start_us"]),
+            "duration_ms": _duration_ms(span["start_us"], span["end_us"]),
+            "status": span["status"],
+        }
+        for span in spans
+    ]
+    return event
+
+
+def _duration_ms(start_us: int, end_us: int) -> float:
+    return round(max(0, end_us - start_us) / 1000, 3)
+
+
+def critical_path(spans: list[dict]) -> dict[int, float]:
+    """
+    Find the critical path of a span tree.
+
+    Walking back from the end of each span, the critical path follows the
+    child that finished last before the current point, then the child that
+    finished before that one started, and so on; time not covered by any
+    such child is the span's own. For sequential steps every step is on the
+    critical path; of steps run in parallel, only the one that finished last.
+
+    Args:
+        spans: Span list of a trace event (the root first)
+
+    Returns:
+        Mapping of span index to milliseconds on the critical path, summing
+        to the root's duration (spans off the path are omitted)
+    """
+    if not spans:
+        return {}
+
+    children = {index: [] for index in range(len(spans))}
+    for index, span in enumerate(spans):
+        if span["parent"] is not None:
+            children[span["parent"]].append(index)
+
+    path: dict[int, float] = {}
+
+    def walk(index: int, end: float) -> None:
+        start = spans[index]["start_ms"]
+        cursor = end
+        for child in sorted(children[index], key=lambda i: _end_ms(spans[i]), reverse=True):
+            child_start = spans[child]["start_ms"]
+            if child_start >= cursor:
+                continue
+            child_end = min(_end_ms(spans[child]), cursor)
+            path[index] = path.get(index, 0) + (cursor - child_end)
+            walk(child, child_end)
+            cursor = child_start
+        path[index] = path.get(index, 0) + max(0, cursor - start)
+
+    walk(0, _end_ms(spans[0]))
+    return {index: round(ms, 3) for index, ms in path.items() if ms > 0}
+
+
+def _end_ms(span: dict) -> float:
+    return span["start_ms"] + span["duration_ms"]
+
+
+def span_paths(spans: list[dict]) -> list[str]:
+    """
+    Name each span by its path below the root ("" for the root itself).
+
+    Returns:
+        One path per span, such as "review > claude"
+    """
+    paths = []
+    for span in spans:
+        parent = span["parent"]
+        if parent is None:
+            paths.append("")
+        elif paths[parent]:
+            paths.append(f"{paths[parent]} > {span['name']}")
+        else:
+            paths.append(span["name"])
+    return paths
@@ -4,15 +4,27 @@ Tests for acceptance rate tracking functionality
 
 import json
 import os
+import sys
 import tempfile
+from datetime import datetime
+from pathlib import Path
 
 import pytest
 
 from actions.lib.acceptance_tracker import (
+    CHECKPOINT_SUFFIX,
     AcceptanceTracker,
     aggregate_metrics_by_action,
+    load_action_totals,
+    migrate_json_to_ndjson,
+    partition_path,
+    read_metrics_entries,
 )
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+import benchmark_concurrent_writers
+import benchmark_record_suggestion
+
 
 class TestAcceptanceTracker:
     """Test AcceptanceTracker class functionality"""
@@ -226,6 +238,353 @@ class TestAcceptanceTracker:
             assert tracker2.metrics["suggestions_accepted"] == 1
 
 
+class TestBatchedRecording:
+    """Test bulk and buffered recording"""
+
+    def test_record_many(self):
+        """Test recording a batch of outcomes"""
+        tracker = AcceptanceTracker("test-action")
+        tracker.record_many(["made", "accepted", "made", "rejected", "made"])
+
+        assert tracker.metrics["suggestions_made"] == 3
+        assert tracker.metrics["suggestions_accepted"] == 1
+        assert tracker.metrics["suggestions_rejected"] == 1
+
+    def test_record_many_accepts_generator(self):
+        """Test that any iterable can be recorded"""
+        tracker = AcceptanceTracker("test-action")
+        tracker.record_many("made" for _ in range(5))
+        assert tracker.metrics["suggestions_made"] == 5
+
+    def test_record_many_invalid_is_atomic(self):
+        """Test that an invalid outcome leaves metrics untouched"""
+        tracker = AcceptanceTracker("test-action")
+        with pytest.raises(ValueError, match="Invalid outcome"):
+            tracker.record_many(["made", "accepted", "bogus"])
+        assert tracker.metrics["suggestions_made"] == 0
+
+    def test_slots_prevent_stray_attributes(self):
+        """Test that the tracker uses a fixed attribute layout"""
+        tracker = AcceptanceTracker("test-action")
+        with pytest.raises(AttributeError):
+            tracker.unexpected = 1
+
+    def test_buffered_flushes_once(self):
+        """Test that a buffered block writes a single entry on exit"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            tracker = AcceptanceTracker("test-action")
+
+            with tracker.buffered(filepath) as buffered:
+                for _ in range(100):
+                    buffered.record_suggestion("made")
+                    buffered.record_suggestion("accepted")
+                assert not os.path.exists(filepath)
+
+            entries = read_metrics_entries(filepath)
+            assert len(entries) == 1
+            assert entries[0]["metrics"]["suggestions_made"] == 100
+            assert tracker.metrics["suggestions_made"] == 0
+
+    def test_buffered_flushes_on_exception(self):
+        """Test that recorded outcomes survive an exception in the block"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            tracker = AcceptanceTracker("test-action")
+
+            with pytest.raises(RuntimeError):
+                with tracker.buffered(filepath):
+                    tracker.record_suggestion("made")
+                    raise RuntimeError("boom")
+
+            assert len(read_metrics_entries(filepath)) == 1
+
+    def test_flush_skips_empty(self):
+        """Test that flushing with nothing recorded writes nothing"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            assert AcceptanceTracker("test-action").flush(filepath) is False
+            assert not os.path.exists(filepath)
+
+    def test_benchmark_paths_agree(self):
+        """Test the microbenchmark on a small outcome stream"""
+        result = benchmark_record_suggestion.run_benchmark(1001)
+        assert result["outcomes"] == 1001
+        assert result["record_many_seconds"] >= 0
+
+
+class TestNdjsonStorage:
+    """Test append-only NDJSON storage"""
+
+    def test_save_appends_one_line_per_record(self):
+        """Test that NDJSON saves append a line without rewriting"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+
+            for outcome in ("accepted", "rejected"):
+                tracker = AcceptanceTracker("test-action")
+                tracker.record_suggestion("made")
+                tracker.record_suggestion(outcome)
+                tracker.save_to_file(filepath)
+
+            with open(filepath) as f:
+                lines = f.read().splitlines()
+
+            assert len(lines) == 2
+            assert json.loads(lines[1])["metrics"]["suggestions_rejected"] == 1
+
+    def test_from_file_reads_ndjson(self):
+        """Test from_file sums entries from an NDJSON file"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.jsonl")
+
+            for _ in range(3):
+                tracker = AcceptanceTracker("test-action")
+                tracker.record_suggestion("made")
+                tracker.record_suggestion("accepted")
+                tracker.save_to_file(filepath)
+            AcceptanceTracker("other-action").save_to_file(filepath)
+
+            loaded = AcceptanceTracker.from_file("test-action", filepath)
+
+            assert loaded.metrics["suggestions_made"] == 3
+            assert loaded.metrics["suggestions_accepted"] == 3
+
+    def test_read_skips_torn_line(self):
+        """Test that a partially written final line is ignored"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            AcceptanceTracker("test-action").save_to_file(filepath)
+            with open(filepath, "a") as f:
+                f.write('{"action": "test-')
+
+            assert len(read_metrics_entries(filepath)) == 1
+
+    def test_aggregate_accepts_path(self):
+        """Test aggregate_metrics_by_action reading directly from a file"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            tracker = AcceptanceTracker("test-action")
+            tracker.record_suggestion("made")
+            tracker.record_suggestion("accepted")
+            tracker.save_to_file(filepath)
+
+            result = aggregate_metrics_by_action(filepath)
+
+            assert result["test-action"]["acceptance_rate"] == 100.0
+
+    def test_migrate_json_array(self):
+        """Test one-shot migration of a JSON-array file"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = os.path.join(tmpdir, "metrics.json")
+            for _ in range(2):
+                tracker = AcceptanceTracker("test-action")
+                tracker.record_suggestion("made")
+                tracker.save_to_file(src)
+
+            count = migrate_json_to_ndjson(src)
+            dest = os.path.join(tmpdir, "metrics.ndjson")
+
+            assert count == 2
+            assert read_metrics_entries(dest) == read_metrics_entries(src)
+            with pytest.raises(FileExistsError):
+                migrate_json_to_ndjson(src)
+
+
+def _save_outcomes(filepath, action, outcomes):
+    """Save one entry per outcome for the given action"""
+    for outcome in outcomes:
+        tracker = AcceptanceTracker(action)
+        tracker.record_suggestion("made")
+        tracker.record_suggestion(outcome)
+        tracker.save_to_file(filepath)
+
+
+class TestCheckpoints:
+    """Test checkpoint-resumed loading of NDJSON files"""
+
+    def test_load_writes_checkpoint_covering_file(self):
+        """Test that loading records totals and the covered offset"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            _save_outcomes(filepath, "test-action", ["accepted", "rejected"])
+
+            AcceptanceTracker.from_file("test-action", filepath)
+
+            with open(filepath + CHECKPOINT_SUFFIX) as f:
+                checkpoint = json.load(f)
+            assert checkpoint["offset"] == os.path.getsize(filepath)
+            assert checkpoint["entries"] == 2
+            assert checkpoint["totals"]["test-action"]["suggestions_made"] == 2
+
+    def test_load_folds_entries_after_checkpoint(self):
+        """Test that appended entries are added to checkpointed totals"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            _save_outcomes(filepath, "test-action", ["accepted"])
+            AcceptanceTracker.from_file("test-action", filepath)
+
+            _save_outcomes(filepath, "test-action", ["accepted", "modified"])
+            tracker = AcceptanceTracker.from_file("test-action", filepath)
+
+            assert tracker.metrics["suggestions_made"] == 3
+            assert tracker.metrics["suggestions_accepted"] == 2
+            assert tracker.metrics["suggestions_modified"] == 1
+
+    def test_checkpoint_is_trusted_for_covered_range(self):
+        """Test that covered entries are not re-parsed"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            _save_outcomes(filepath, "test-action", ["accepted"])
+            load_action_totals(filepath)
+
+            checkpoint_path = filepath + CHECKPOINT_SUFFIX
+            with open(checkpoint_path) as f:
+                checkpoint = json.load(f)
+            checkpoint["totals"]["test-action"]["suggestions_made"] = 41
+            with open(checkpoint_path, "w") as f:
+                json.dump(checkpoint, f)
+
+            _save_outcomes(filepath, "test-action", ["accepted"])
+
+            assert load_action_totals(filepath)["test-action"]["suggestions_made"] == 42
+
+    def test_truncated_file_invalidates_checkpoint(self):
+        """Test that truncation forces a full rescan"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            _save_outcomes(filepath, "test-action", ["accepted"] * 3)
+            load_action_totals(filepath)
+
+            with open(filepath, "r+") as f:
+                first_line = f.readline()
+                f.truncate(len(first_line))
+
+            assert load_action_totals(filepath)["test-action"]["suggestions_made"] == 1
+
+    def test_rewritten_file_invalidates_checkpoint(self):
+        """Test that a replaced file of the same size is rescanned"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            _save_outcomes(filepath, "test-action", ["accepted"])
+            load_action_totals(filepath)
+
+            with open(filepath) as f:
+                content = f.read()
+            tmp_path = filepath + ".new"
+            with open(tmp_path, "w") as f:
+                f.write(content.replace("test-action", "next-action"))
+            os.replace(tmp_path, filepath)
+
+            totals = load_action_totals(filepath)
+            assert "test-action" not in totals
+            assert totals["next-action"]["suggestions_made"] == 1
+
+    def test_in_place_rewrite_invalidates_checkpoint(self):
+        """Test that rewriting covered bytes in place is detected"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            _save_outcomes(filepath, "test-action", ["accepted"])
+            load_action_totals(filepath)
+
+            with open(filepath, "r+") as f:
+                content = f.read()
+                f.seek(0)
+                f.write(content.replace("test-action", "tset-action"))
+
+            assert "tset-action" in load_action_totals(filepath)
+
+    def test_corrupt_checkpoint_is_ignored(self):
+        """Test that an unreadable checkpoint falls back to a full scan"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            _save_outcomes(filepath, "test-action", ["accepted"] * 2)
+            with open(filepath + CHECKPOINT_SUFFIX, "w") as f:
+                f.write("{not json")
+
+            assert load_action_totals(filepath)["test-action"]["suggestions_made"] == 2
+
+    def test_torn_line_not_covered(self):
+        """Test that a partial final line is picked up once completed"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "metrics.ndjson")
+            _save_outcomes(filepath, "test-action", ["accepted"])
+            with open(filepath) as f:
+                line = f.read()
+            with open(filepath, "a") as f:
+                f.write(line[:10])
+
+            assert load_action_totals(filepath)["test-action"]["suggestions_made"] == 1
+
+            with open(filepath, "a") as f:
+                f.write(line[10:])
+
+            assert load_action_totals(filepath)["test-action"]["suggestions_made"] == 2
+
+
+class TestConcurrentWriters:
+    """Test that concurrent processes do not lose saved records"""
+
+    @pytest.mark.parametrize("suffix", ["ndjson", "json"])
+    def test_no_lost_records(self, suffix):
+        """Test several processes saving to one file at once"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, f"metrics.{suffix}")
+
+            result = benchmark_concurrent_writers.run_benchmark(
+                filepath, processes=8, records=25
+            )
+
+            assert result["lost_records"] == 0
+            assert result["short_writers"] == {}
+            assert result["actual_records"] == 200
+            assert result["writes_per_second"] > 0
+
+
+class TestPartitionedLayout:
+    """Test the default date-partitioned storage layout"""
+
+    def test_partition_path(self):
+        """Test the YYYY/MM/DD path for an action"""
+        path = partition_path("review-and-merge", datetime(2026, 3, 5, 23, 59))
+        assert path == os.path.join(
+            "metrics", "acceptance", "2026", "03", "05", "review-and-merge.ndjson"
+        )
+        assert partition_path("a", datetime(2026, 1, 2), root="x").startswith(
+            os.path.join("x", "2026", "01", "02")
+        )
+
+    def test_save_without_path_uses_entry_partition(self, monkeypatch):
+        """Test that writers default to the partition of the entry's timestamp"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monkeypatch.chdir(tmpdir)
+            tracker = AcceptanceTracker("test-action")
+            tracker.record_suggestion("made")
+            tracker.save_to_file()
+
+            files = list(Path("metrics", "acceptance").rglob("*.ndjson"))
+            assert len(files) == 1
+            entry = read_metrics_entries(str(files[0]))[0]
+            assert str(files[0]) == partition_path(
+                "test-action", datetime.fromisoformat(entry["timestamp"])
+            )
+
+    def test_flush_without_path_appends_to_partition(self, monkeypatch):
+        """Test that repeated default flushes append to one daily file"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monkeypatch.chdir(tmpdir)
+            tracker = AcceptanceTracker("test-action")
+            with tracker.buffered() as t:
+                t.record_many(["made", "accepted"])
+            tracker.record_suggestion("made")
+            assert tracker.flush() is True
+
+            path = partition_path("test-action")
+            totals = load_action_totals(path)
+            assert totals["test-action"]["suggestions_made"] == 2
+            assert totals["test-action"]["suggestions_accepted"] == 1
+
+
 class TestAggregateMetricsByAction:
     """Test aggregate_metrics_by_action function"""
 
@@ -0,0 +1,187 @@
+"""
+Tests for the multi-dimensional metric cube and dimension-tagged tracking
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from actions.lib.acceptance_tracker import (
+    AcceptanceTracker,
+    aggregate_metrics_by_action,
+)
+from actions.lib.metric_cube import ALL, UNKNOWN, MetricCube, hash_prompt_template
+
+
+class TestMetricCube:
+    """Test MetricCube cells, group-by and roll-ups"""
+
+    def _cube(self):
+        cube = MetricCube(width=2)
+        cube.add({"action": "a", "model": "opus", "variant": "baseline"}, [10, 6])
+        cube.add({"action": "a", "model": "opus", "variant": "treatment"}, [10, 9])
+        cube.add({"action": "b", "model": "haiku", "variant": "treatment"}, [5, 1])
+        return cube
+
+    def test_missing_dimensions_are_unknown(self):
+        """Test that unspecified dimensions are stored as UNKNOWN"""
+        key = MetricCube.key_for({"action": "a"})
+        assert key == ("a", UNKNOWN, UNKNOWN, UNKNOWN, UNKNOWN)
+
+    def test_group_by_single_dimension(self):
+        """Test summing cells by one dimension"""
+        grouped = self._cube().group_by(["variant"])
+        assert grouped == {("baseline",): [10, 6], ("treatment",): [15, 10]}
+
+    def test_group_by_multiple_dimensions_with_filter(self):
+        """Test grouping by several dimensions restricted by a filter"""
+        grouped = self._cube().group_by(["model", "variant"], {"action": "a"})
+        assert grouped == {
+            ("opus", "baseline"): [10, 6],
+            ("opus", "treatment"): [10, 9],
+        }
+
+    def test_group_by_nothing_is_grand_total(self):
+        """Test that an empty group-by sums the whole cube"""
+        assert self._cube().group_by([]) == {(): [25, 16]}
+
+    def test_unknown_dimension_rejected(self):
+        """Test that unknown dimension names raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown dimension"):
+            self._cube().group_by(["branch"])
+
+    def test_rollup(self):
+        """Test collapsing other dimensions to ALL"""
+        rolled = self._cube().rollup(["model"])
+        assert len(rolled) == 2
+        assert rolled.group_by(["model", "variant"]) == {
+            ("opus", ALL): [20, 15],
+            ("haiku", ALL): [5, 1],
+        }
+
+    def test_rows_round_trip(self):
+        """Test exporting and merging rows"""
+        cube = self._cube()
+        restored = MetricCube(width=2)
+        restored.merge_rows(cube.to_rows())
+        restored.merge(cube)
+        assert restored.group_by(["action"]) == {("a",): [40, 30], ("b",): [10, 2]}
+
+    def test_hash_prompt_template(self):
+        """Test that template hashes are short and stable"""
+        assert hash_prompt_template("review") == hash_prompt_template("review")
+        assert len(hash_prompt_template("review")) == 16
+
+
+class TestTrackerDimensions:
+    """Test dimension tags on AcceptanceTracker"""
+
+    def test_default_dimensions(self):
+        """Test that tracker-level tags apply to every outcome"""
+        tracker = AcceptanceTracker("review-and-merge", {"model": "opus"})
+        tracker.record_suggestion("made")
+        tracker.record_suggestion("accepted")
+
+        assert tracker.cube.group_by(["action", "model"]) == {
+            ("review-and-merge", "opus"): [1, 1, 0, 0]
+        }
+
+    def test_per_call_dimensions(self):
+        """Test that per-call tags override the defaults"""
+        tracker = AcceptanceTracker("review-and-merge", {"variant": "baseline"})
+        tracker.record_suggestion("made")
+        tracker.record_suggestion("made", {"variant": "treatment"})
+        tracker.record_many(["accepted", "rejected"], {"variant": "treatment"})
+
+        assert tracker.cube.group_by(["variant"]) == {
+            ("baseline",): [1, 0, 0, 0],
+            ("treatment",): [1, 1, 1, 0],
+        }
+        assert tracker.metrics["suggestions_made"] == 2
+
+    def test_unknown_dimension_rejected(self):
+        """Test that unknown tag names raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown dimension"):
+            AcceptanceTracker("review-and-merge", {"branch": "main"})
+
+    def test_reset_clears_cube(self):
+        """Test that reset_metrics clears cube cells"""
+        tracker = AcceptanceTracker("review-and-merge", {"model": "opus"})
+        tracker.record_suggestion("made")
+        tracker.reset_metrics()
+        tracker.record_suggestion("made")
+
+        assert tracker.cube.group_by(["model"]) == {("opus",): [1, 0, 0, 0]}
+
+    @pytest.mark.parametrize("suffix", ["json", "ndjson"])
+    def test_load_save_load_round_trip(self, suffix):
+        """Test that re-saving a loaded tracker keeps totals, cube and windows in step"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, f"metrics.{suffix}")
+            tracker = AcceptanceTracker("review-and-merge", {"model": "opus"})
+            tracker.record_many(["made", "made", "accepted"])
+            tracker.save_to_file(filepath)
+
+            loaded = AcceptanceTracker.from_file("review-and-merge", filepath, {"model": "opus"})
+            exported = loaded.export_metrics()
+            assert exported["total_suggestions"] == 0
+            assert exported["cube"] == []
+            assert exported["windows"]["buckets"] == []
+            loaded.record_suggestion("made")
+            loaded.save_to_file(filepath)
+
+            reloaded = AcceptanceTracker.from_file("review-and-merge", filepath, {"model": "opus"})
+            assert reloaded.metrics["suggestions_made"] == 3
+            assert reloaded.cube.group_by(["model"]) == {("opus",): [3, 1, 0, 0]}
+            assert reloaded.get_window_rates(1440)["suggestions_made"] == 3
+
+            totals = aggregate_metrics_by_action(filepath)["review-and-merge"]
+            by_action = aggregate_metrics_by_action(filepath, group_by=["action"])
+            assert totals["suggestions_made"] == 3
+            assert totals["suggestions_accepted"] == 1
+            assert by_action[("review-and-merge",)]["suggestions_made"] == 3
+            assert by_action[("review-and-merge",)]["suggestions_accepted"] == 1
+
+    @pytest.mark.parametrize("suffix", ["json", "ndjson"])
+    def test_group_by_from_file(self, suffix):
+        """Test slicing persisted entries by dimension"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, f"metrics.{suffix}")
+            for variant, outcome in [
+                ("baseline", "rejected"),
+                ("treatment", "accepted"),
+                ("treatment", "accepted"),
+            ]:
+                tracker = AcceptanceTracker("review-and-merge", {"variant": variant})
+                tracker.record_suggestion("made")
+                tracker.record_suggestion(outcome)
+                tracker.save_to_file(filepath)
+
+            for _ in range(2):  # second pass resumes from the NDJSON checkpoint
+                result = aggregate_metrics_by_action(filepath, group_by=["variant"])
+                assert result[("treatment",)]["acceptance_rate"] == 100.0
+                assert result[("baseline",)]["rejection_rate"] == 100.0
+
+    def test_group_by_legacy_entries(self):
+        """Test that entries without a cube fall into one cell per action"""
+        entries = [
+            {
+                "action": "old-action",
+                "metrics": {"suggestions_made": 4, "suggestions_accepted": 3},
+            }
+        ]
+        result = aggregate_metrics_by_action(entries, group_by=["action", "model"])
+        assert result[("old-action", UNKNOWN)]["acceptance_rate"] == 75.0
+
+    def test_group_by_with_action_filter(self):
+        """Test that action_name filters group-by results"""
+        entries = []
+        for action, model in [("a", "opus"), ("b", "haiku")]:
+            tracker = AcceptanceTracker(action, {"model": model})
+            tracker.record_many(["made", "made", "accepted"])
+            entries.append(tracker.export_metrics())
+
+        result = aggregate_metrics_by_action(entries, action_name="a", group_by=["model"])
+        assert list(result) == [("opus",)]
+        assert result[("opus",)]["acceptance_rate"] == 50.0
@@ -0,0 +1,216 @@
+"""
+Tests for sliding-window counters and windowed acceptance rates
+"""
+
+import os
+import random
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from actions.lib.acceptance_tracker import AcceptanceTracker
+from actions.lib.sliding_window import SlidingWindowCounter
+
+MINUTE = 60
+T0 = 1_700_000_000 - (1_700_000_000 % MINUTE)
+
+
+class TestSlidingWindowCounter:
+    """Test SlidingWindowCounter ring buffer behaviour"""
+
+    def test_counts_within_window(self):
+        """Test that recent buckets are included in every window"""
+        counter = SlidingWindowCounter(width=2, windows=(2, 5))
+        counter.increment(0, timestamp=T0)
+        counter.increment(1, amount=3, timestamp=T0 + MINUTE)
+
+        assert counter.totals(2, T0 + MINUTE) == [1, 3]
+        assert counter.totals(5, T0 + MINUTE) == [1, 3]
+
+    def test_buckets_expire(self):
+        """Test that buckets leave each window as time advances"""
+        counter = SlidingWindowCounter(width=1, windows=(2, 5))
+        counter.increment(0, timestamp=T0)
+
+        assert counter.totals(2, T0 + MINUTE) == [1]
+        assert counter.totals(2, T0 + 2 * MINUTE) == [0]
+        assert counter.totals(5, T0 + 4 * MINUTE) == [1]
+        assert counter.totals(5, T0 + 5 * MINUTE) == [0]
+
+    def test_long_gap_resets(self):
+        """Test that a gap longer than the ring drops everything"""
+        counter = SlidingWindowCounter(width=1, windows=(3,))
+        counter.increment(0, timestamp=T0)
+        counter.increment(0, timestamp=T0 + 100 * MINUTE)
+
+        assert counter.totals(3, T0 + 100 * MINUTE) == [1]
+
+    def test_late_bucket_within_ring(self):
+        """Test that late data is added only to windows that still cover it"""
+        counter = SlidingWindowCounter(width=1, windows=(2, 5))
+        counter.increment(0, timestamp=T0 + 4 * MINUTE)
+
+        assert counter.add([1], timestamp=T0 + MINUTE) is True
+        assert counter.totals(2, T0 + 4 * MINUTE) == [1]
+        assert counter.totals(5, T0 + 4 * MINUTE) == [2]
+
+    def test_too_old_bucket_dropped(self):
+        """Test that data older than the ring is rejected"""
+        counter = SlidingWindowCounter(width=1, windows=(3,))
+        counter.increment(0, timestamp=T0 + 10 * MINUTE)
+
+        assert counter.add([1], timestamp=T0) is False
+        assert counter.totals(3, T0 + 10 * MINUTE) == [1]
+
+    def test_unconfigured_window_scans_ring(self):
+        """Test windows other than the configured ones"""
+        counter = SlidingWindowCounter(width=1, windows=(10,))
+        for minute in range(10):
+            counter.increment(0, timestamp=T0 + minute * MINUTE)
+
+        assert counter.totals(3, T0 + 9 * MINUTE) == [3]
+
+    def test_invalid_window(self):
+        """Test that windows outside the ring are rejected"""
+        counter = SlidingWindowCounter(width=1, windows=(10,))
+        with pytest.raises(ValueError, match="Window must be between"):
+            counter.totals(11)
+
+    def test_round_trip_buckets(self):
+        """Test exporting and merging persisted buckets"""
+        counter = SlidingWindowCounter(width=2, windows=(5,))
+        counter.add([1, 2], timestamp=T0)
+        counter.add([3, 0], timestamp=T0 + 2 * MINUTE)
+
+        restored = SlidingWindowCounter(width=2, windows=(5,))
+        restored.merge_buckets(counter.to_buckets())
+
+        assert restored.to_buckets() == counter.to_buckets()
+        assert restored.totals(5, T0 + 2 * MINUTE) == [4, 2]
+
+    def test_matches_brute_force(self):
+        """Test running totals against a direct sum over random events"""
+        rng = random.Random(1234)
+        windows = (1, 3, 7)
+        counter = SlidingWindowCounter(width=2, windows=windows)
+        events = []
+        now = T0
+
+        for _ in range(500):
+            now += rng.choice([0, 0, 0, 1, 1, 2, 9]) * MINUTE
+            index = rng.randrange(2)
+            counter.increment(index, timestamp=now)
+            events.append((now // MINUTE, index))
+
+            head = now // MINUTE
+            for window in windows:
+                expected = [0, 0]
+                for bucket, event_index in events:
+                    if head - window < bucket <= head:
+                        expected[event_index] += 1
+                assert counter.totals(window, now) == expected
+
+    def test_queries_before_recording_match_brute_force(self):
+        """Test that a head moved by a query still keeps what is recorded into it"""
+        rng = random.Random(4321)
+        windows = (3, 7)
+        counter = SlidingWindowCounter(width=2, windows=windows)
+        events = []
+        now = T0
+
+        for _ in range(500):
+            now += rng.choice([0, 1, 1, 2, 9, 30]) * MINUTE + rng.randrange(MINUTE)
+            head = now // MINUTE
+            # Querying first moves the head before anything is recorded into it
+            counter.totals(rng.choice(windows), now)
+            index = rng.randrange(2)
+            counter.increment(index, timestamp=now)
+            events.append((head, index))
+
+            for window in (1, 2, 3, 5, 7):
+                expected = [0, 0]
+                for bucket, event_index in events:
+                    if head - window < bucket <= head:
+                        expected[event_index] += 1
+                assert counter.totals(window, now) == expected
+
+            restored = SlidingWindowCounter(width=2, windows=windows)
+            restored.merge_buckets(counter.to_buckets())
+            assert restored.totals(7, now) == counter.totals(7, now)
+
+
+class TestTrackerWindows:
+    """Test windowed rates on AcceptanceTracker"""
+
+    def test_window_rates(self):
+        """Test rates over 15 minutes versus 24 hours"""
+        tracker = AcceptanceTracker("test-action")
+        tracker.windows.add([10, 9, 1, 0], timestamp=T0)
+        tracker.windows.add([10, 2, 8, 0], timestamp=T0 + 60 * MINUTE)
+
+        now = T0 + 60 * MINUTE
+        assert tracker.get_window_acceptance_rate(15, now) == 20.0
+        assert tracker.get_window_acceptance_rate(1440, now) == pytest.approx(55.0)
+
+        rates = tracker.get_window_rates(60, now)
+        assert rates["window_minutes"] == 60
+        assert rates["suggestions_made"] == 10
+        assert rates["rejection_rate"] == 80.0
+
+    def test_recording_updates_windows(self):
+        """Test that record_suggestion and record_many feed the windows"""
+        tracker = AcceptanceTracker("test-action")
+        tracker.record_suggestion("made")
+        tracker.record_suggestion("accepted")
+        tracker.record_many(["made", "rejected"])
+
+        rates = tracker.get_window_rates(15)
+        assert rates["suggestions_made"] == 2
+        assert rates["acceptance_rate"] == 50.0
+
+    def test_outcomes_bucketed_when_recorded(self):
+        """Test that outcomes count toward the minute they were recorded in, not read in"""
+        tracker = AcceptanceTracker("test-action")
+        with patch("actions.lib.sliding_window.time.time", return_value=T0):
+            for _ in range(5):
+                tracker.record_suggestion("made")
+            tracker.record_suggestion("accepted", {"model": "opus"})
+
+        later = T0 + 60 * MINUTE
+        with patch("actions.lib.sliding_window.time.time", return_value=later):
+            assert tracker.get_window_rates(15)["suggestions_made"] == 0
+            assert tracker.get_window_rates(1440)["suggestions_made"] == 5
+            assert tracker.get_window_rates(1440)["suggestions_accepted"] == 1
+        assert tracker.windows.to_buckets() == [[T0 // MINUTE, 5, 1, 0, 0]]
+        assert tracker.cube.group_by(["model"]) == {
+            ("unknown",): [5, 0, 0, 0],
+            ("opus",): [0, 1, 0, 0],
+        }
+
+    def test_empty_window(self):
+        """Test that an empty window reports 0.0"""
+        assert AcceptanceTracker("test-action").get_window_acceptance_rate(60) == 0.0
+
+    @pytest.mark.parametrize("suffix", ["json", "ndjson"])
+    def test_windows_persist(self, suffix):
+        """Test that buckets are saved with the entry and restored on load"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, f"metrics.{suffix}")
+
+            for _ in range(2):
+                tracker = AcceptanceTracker("test-action")
+                tracker.record_suggestion("made")
+                tracker.record_suggestion("accepted")
+                tracker.save_to_file(filepath)
+
+            exported = tracker.export_metrics()
+            assert exported["windows"]["bucket_seconds"] == 60
+            assert exported["windows"]["buckets"]
+
+            loaded = AcceptanceTracker.from_file("test-action", filepath)
+            assert loaded.get_window_rates(15)["suggestions_made"] == 2
+
+            # A second load resumes from the NDJSON checkpoint
+            reloaded = AcceptanceTracker.from_file("test-action", filepath)
+            assert reloaded.get_window_rates(15)["suggestions_accepted"] == 2
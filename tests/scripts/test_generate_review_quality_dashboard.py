@@ -16,7 +16,11 @@ from scripts.generate_review_quality_dashboard import (
     generate_markdown_dashboard,
     group_by_week,
     load_metrics,
+    main,
+    summarize_columns,
+    summarize_metrics,
 )
+from scripts.review_columns import ReviewColumns
 
 
 class TestLoadMetrics:
@@ -193,6 +197,20 @@ class TestExtractRejectionReasons:
         assert reasons["Valid reason"] == 1
         assert len(reasons) == 1
 
+    def test_variants_and_capacity(self):
+        """Test normalized counting within a bounded number of reasons."""
+        data = [
+            {"outcome": "rejected", "rejection_reasons": ["Low quality", "low   QUALITY"]},
+            {"outcome": "rejected", "rejection_reasons": [f"Typo on line {n}" for n in range(50)]},
+            {"outcome": "rejected", "rejection_reasons": [f"one-off {chr(97 + n)}" for n in range(26)]},
+        ]
+        reasons = extract_rejection_reasons(data, capacity=3)
+
+        assert len(reasons) == 3
+        assert reasons.most_common(2)[0] == ("Typo on line #", 50)
+        # Seen before any eviction, so its count is exact
+        assert reasons.error("Typo on line 7") == 0
+
 
 class TestCategorizeSuggestions:
     """Test suggestion categorization."""
@@ -359,3 +377,50 @@ class TestGenerateMarkdownDashboard:
         dashboard = generate_markdown_dashboard(data)
         assert "Improve prompt template" in dashboard
         assert "Analyze rejection reasons" in dashboard
+
+
+class TestColumnarCache:
+    """Test computing the dashboard from the columnar cache."""
+
+    DATA = [
+        {"outcome": "approved", "timestamp": "2026-02-08T23:30:00Z", "confidence_score": 0.85},
+        # Sunday evening in UTC-5 is Monday in UTC; the week follows the local date
+        {"outcome": "rejected", "timestamp": "2026-02-08T22:00:00-05:00", "confidence_score": 0.6,
+         "rejection_reasons": ["Low quality", "Too verbose"]},
+        {"outcome": "modified", "timestamp": "2026-02-16T09:00:00+09:00",
+         "rejection_reasons": "Style"},
+        {"outcome": "approved", "timestamp": "bad", "confidence_score": 1},
+        {"outcome": "rejected", "rejection_reasons": ["Low quality"]},
+        {"timestamp": "2026-01-01T00:00:00Z"},
+    ]
+
+    def test_summary_matches_metrics(self):
+        """Test that column statistics equal the dict-based statistics."""
+        for data in (self.DATA, self.DATA[:1], []):
+            expected = summarize_metrics(data)
+            result = summarize_columns(ReviewColumns.from_reviews(data))
+            assert result == expected
+            assert list(result["rejection_reasons"]) == list(expected["rejection_reasons"])
+
+    def test_main_with_columnar_cache(self, tmp_path):
+        """Test --columnar-cache writes the same dashboard."""
+        metrics_file = tmp_path / "review_metrics.json"
+        metrics_file.write_text(json.dumps(self.DATA))
+
+        dashboards = []
+        for extra in ([], ["--columnar-cache"]):
+            output = tmp_path / "dashboard.md"
+            with patch("sys.argv", [
+                "generate_review_quality_dashboard.py",
+                "--metrics", str(metrics_file),
+                "--output", str(output),
+                *extra,
+            ]):
+                assert main() == 0
+            dashboards.append([
+                line for line in output.read_text().splitlines()
+                if not line.startswith("**Generated:**")
+            ])
+
+        assert dashboards[0] == dashboards[1]
+        assert (tmp_path / "review_metrics.json.columns").exists()
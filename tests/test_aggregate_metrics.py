@@ -21,6 +21,10 @@ import pytest
 # Add scripts directory to path for testing
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 import aggregate_metrics
+import benchmark_parallel_aggregation
+import benchmark_streaming_aggregation
+
+from actions.lib.acceptance_tracker import read_metrics_entries
 
 
 class TestFindMetricsFiles:
@@ -135,6 +139,17 @@ class TestFindMetricsFiles:
         assert len(files) == 1
         assert files[0].endswith("data.json")
 
+    def test_finds_ndjson_files(self, temp_dir):
+        """Test that append-only NDJSON files are discovered."""
+        metrics_dir = Path(temp_dir) / "metrics"
+        metrics_dir.mkdir()
+        (metrics_dir / "a.ndjson").write_text('{}\n')
+        (metrics_dir / "b.jsonl").write_text('{}\n')
+
+        files = aggregate_metrics.find_metrics_files(temp_dir)
+
+        assert sorted(Path(f).name for f in files) == ["a.ndjson", "b.jsonl"]
+
 
 class TestLoadMetricsData:
     """Test the load_metrics_data function."""
@@ -229,6 +244,20 @@ class TestLoadMetricsData:
         assert len(result) == 1
         assert result[0]["action"] == "valid"
 
+    def test_loads_ndjson_file(self, temp_dir):
+        """Test loading one entry per line, skipping a torn final line."""
+        ndjson_file = Path(temp_dir) / "metrics.ndjson"
+        ndjson_file.write_text(
+            json.dumps({"action": "action1"}) + "\n"
+            + "\n"
+            + json.dumps({"action": "action2"}) + "\n"
+            + '{"action": "tor'
+        )
+
+        result = aggregate_metrics.load_metrics_data([str(ndjson_file)])
+
+        assert [entry["action"] for entry in result] == ["action1", "action2"]
+
 
 class TestAggregateMetrics:
     """Test the aggregate_metrics function."""
@@ -544,6 +573,628 @@ class TestCalculateOverallMetrics:
         assert result["actions_tracked"] == 3
 
 
+class TestAggregateByDimensions:
+    """Test slicing metrics files by dimension."""
+
+    def test_groups_across_files(self, temp_dir):
+        """Test that cubes from several files are merged before grouping."""
+        rows = [
+            ["review-and-merge", "unknown", "opus", "baseline", "unknown", 10, 5, 5, 0],
+            ["review-and-merge", "unknown", "opus", "treatment", "unknown", 10, 8, 2, 0],
+        ]
+        file1 = Path(temp_dir) / "a.json"
+        file1.write_text(json.dumps([{"action": "review-and-merge", "metrics": {}, "cube": rows[:1]}]))
+        file2 = Path(temp_dir) / "b.ndjson"
+        file2.write_text(json.dumps({"action": "review-and-merge", "metrics": {}, "cube": rows}) + "\n")
+
+        result = aggregate_metrics.aggregate_by_dimensions(
+            [str(file1), str(file2)], ["variant"]
+        )
+
+        assert [row["variant"] for row in result] == ["baseline", "treatment"]
+        assert result[0]["suggestions_made"] == 20
+        assert result[0]["acceptance_rate"] == 50.0
+        assert result[1]["acceptance_rate"] == 80.0
+
+    def test_main_group_by_option(self, temp_dir):
+        """Test the --group-by CLI option."""
+        metrics_dir = Path(temp_dir) / "metrics"
+        metrics_dir.mkdir()
+        (metrics_dir / "m.json").write_text(json.dumps([{
+            "action": "test-action",
+            "metrics": {"suggestions_made": 4, "suggestions_accepted": 1},
+        }]))
+        output_path = Path(temp_dir) / "output.json"
+
+        with patch("sys.argv", [
+            "aggregate_metrics.py",
+            "--root-dir", temp_dir,
+            "--output", str(output_path),
+            "--group-by", "action,model",
+        ]):
+            aggregate_metrics.main()
+
+        output_data = json.loads(output_path.read_text())
+        assert output_data["group_by"] == ["action", "model"]
+        assert output_data["by_group"][0]["action"] == "test-action"
+        assert output_data["by_group"][0]["model"] == "unknown"
+        assert output_data["by_group"][0]["acceptance_rate"] == 25.0
+
+    def test_main_rejects_unknown_dimension(self, temp_dir):
+        """Test that an unknown --group-by dimension is a usage error."""
+        with patch("sys.argv", [
+            "aggregate_metrics.py", "--root-dir", temp_dir, "--group-by", "branch"
+        ]):
+            with pytest.raises(SystemExit):
+                aggregate_metrics.main()
+
+
+class TestIncrementalAggregation:
+    """Test incremental aggregation with a processed-file manifest."""
+
+    def _entry(self, action, made, accepted, timestamp):
+        return {
+            "action": action,
+            "metrics": {"suggestions_made": made, "suggestions_accepted": accepted},
+            "timestamp": timestamp,
+        }
+
+    def _run(self, temp_dir, *extra):
+        output_path = Path(temp_dir) / "out" / "output.json"
+        with patch("sys.argv", [
+            "aggregate_metrics.py",
+            "--root-dir", temp_dir,
+            "--output", str(output_path),
+            *extra,
+        ]):
+            aggregate_metrics.main()
+        data = json.loads(output_path.read_text())
+        data.pop("timestamp")
+        return data
+
+    def test_merge_partials_matches_full_recompute(self):
+        """Test that merging per-file partials equals aggregating all entries."""
+        files = [
+            [self._entry("a", 5, 3, ""), self._entry("a", 1, 1, "2024-01-03T00:00:00")],
+            [self._entry("b", 2, 1, "2024-01-02T00:00:00")],
+            [self._entry("a", 4, 0, "2024-01-01T00:00:00"), self._entry("b", 1, 1, "")],
+        ]
+        concatenated = [entry for entries in files for entry in entries]
+        partials = [aggregate_metrics.build_partial_aggregate(entries) for entries in files]
+
+        for action_name in (None, "a"):
+            expected = aggregate_metrics.aggregate_metrics(concatenated, action_name)
+            merged = aggregate_metrics.merge_partial_aggregates(partials, action_name)
+            assert merged == expected
+            assert list(merged) == list(expected)
+
+    def test_incremental_runs_match_full_rebuild(self, temp_dir, capsys):
+        """Test output equality across added, changed and removed files."""
+        metrics_dir = Path(temp_dir) / "metrics"
+        metrics_dir.mkdir()
+        state_file = str(Path(temp_dir) / "cache" / "state.json")
+        (metrics_dir / "one.json").write_text(json.dumps([self._entry("a", 2, 1, "2024-01-01T00:00:00")]))
+        (metrics_dir / "two.ndjson").write_text(json.dumps(self._entry("b", 3, 3, "2024-01-02T00:00:00")) + "\n")
+
+        first = self._run(temp_dir, "--state-file", state_file)
+        assert first == self._run(temp_dir)
+        assert "Parsed 2 new/changed file(s), reused 0" in capsys.readouterr().out
+
+        # Unchanged files are reused without parsing
+        assert self._run(temp_dir, "--state-file", state_file) == first
+        assert "Parsed 0 new/changed file(s), reused 2" in capsys.readouterr().out
+
+        # Append to one file, add another, remove a third
+        with open(metrics_dir / "two.ndjson", "a") as f:
+            f.write(json.dumps(self._entry("b", 1, 0, "2024-01-05T00:00:00")) + "\n")
+        (metrics_dir / "three.json").write_text(json.dumps([self._entry("c", 1, 1, "2024-01-03T00:00:00")]))
+        (metrics_dir / "one.json").unlink()
+
+        incremental = self._run(temp_dir, "--state-file", state_file)
+        assert "Parsed 2 new/changed file(s), reused 0" in capsys.readouterr().out
+        assert incremental == self._run(temp_dir)
+        assert incremental["by_action"]["b"]["suggestions_made"] == 4
+        assert "a" not in incremental["by_action"]
+
+        state = json.loads(Path(state_file).read_text())
+        assert sorted(Path(path).name for path in state["files"]) == ["three.json", "two.ndjson"]
+
+    def test_touched_but_unchanged_file_is_reused(self, temp_dir, capsys):
+        """Test that a new mtime with identical content skips parsing."""
+        metrics_dir = Path(temp_dir) / "metrics"
+        metrics_dir.mkdir()
+        state_file = str(Path(temp_dir) / "state.json")
+        metrics_file = metrics_dir / "one.json"
+        metrics_file.write_text(json.dumps([self._entry("a", 2, 1, "2024-01-01T00:00:00")]))
+        self._run(temp_dir, "--state-file", state_file)
+        capsys.readouterr()
+
+        os.utime(metrics_file, (1, 1))
+
+        self._run(temp_dir, "--state-file", state_file)
+        assert "Parsed 0 new/changed file(s), reused 1" in capsys.readouterr().out
+
+    def test_full_rebuild_ignores_state(self, temp_dir, capsys):
+        """Test that --full-rebuild reparses every file."""
+        metrics_dir = Path(temp_dir) / "metrics"
+        metrics_dir.mkdir()
+        state_file = str(Path(temp_dir) / "state.json")
+        (metrics_dir / "one.json").write_text(json.dumps([self._entry("a", 2, 1, "2024-01-01T00:00:00")]))
+        self._run(temp_dir, "--state-file", state_file)
+        capsys.readouterr()
+
+        self._run(temp_dir, "--state-file", state_file, "--full-rebuild")
+        assert "Parsed 1 new/changed file(s), reused 0" in capsys.readouterr().out
+
+    def test_corrupt_state_is_rebuilt(self, temp_dir):
+        """Test that an unreadable state file is treated as empty."""
+        state_path = Path(temp_dir) / "state.json"
+        state_path.write_text("{broken")
+        assert aggregate_metrics.load_aggregate_state(str(state_path))["files"] == {}
+
+
+class TestParallelLoading:
+    """Test process-pool loading of metrics files."""
+
+    def test_parallel_matches_sequential(self, temp_dir):
+        """Test that worker partials merge to the sequential aggregate."""
+        benchmark_parallel_aggregation.write_synthetic_files(temp_dir, 40)
+        files = aggregate_metrics.find_metrics_files(temp_dir)
+        expected = aggregate_metrics.aggregate_metrics(aggregate_metrics.load_metrics_data(files))
+
+        for workers in (1, 3):
+            partials, entry_count = aggregate_metrics.load_partial_aggregates(files, workers)
+            assert entry_count == 200
+            merged = aggregate_metrics.merge_partial_aggregates(partials)
+            assert merged == expected
+            assert list(merged) == list(expected)
+
+    def test_incremental_state_with_workers(self, temp_dir):
+        """Test that changed files can be parsed in a pool."""
+        benchmark_parallel_aggregation.write_synthetic_files(temp_dir, 10)
+        files = aggregate_metrics.find_metrics_files(temp_dir)
+
+        state = {"files": {}}
+        update = aggregate_metrics.update_aggregate_state(state, files, workers=2)
+
+        assert update["parsed"] == 10
+        assert list(state["files"]) == files
+        assert (
+            aggregate_metrics.merge_partial_aggregates(update["partials"])
+            == aggregate_metrics.aggregate_metrics(aggregate_metrics.load_metrics_data(files))
+        )
+
+    def test_scan_skips_symlinked_directories(self, temp_dir):
+        """Test that the scandir walk does not follow directory symlinks."""
+        metrics_dir = Path(temp_dir) / "metrics"
+        (metrics_dir / "real").mkdir(parents=True)
+        (metrics_dir / "real" / "a.json").write_text("[]")
+        os.symlink(metrics_dir / "real", metrics_dir / "link")
+
+        files = aggregate_metrics.find_metrics_files(temp_dir)
+
+        assert [Path(f).name for f in files] == ["a.json"]
+
+    def test_main_with_workers(self, temp_dir, capsys):
+        """Test the --workers CLI option."""
+        benchmark_parallel_aggregation.write_synthetic_files(temp_dir, 12)
+        output_path = Path(temp_dir) / "output.json"
+
+        outputs = []
+        for workers in ("1", "2"):
+            with patch("sys.argv", [
+                "aggregate_metrics.py",
+                "--root-dir", temp_dir,
+                "--output", str(output_path),
+                "--workers", workers,
+            ]):
+                aggregate_metrics.main()
+            data = json.loads(output_path.read_text())
+            data.pop("timestamp")
+            outputs.append(data)
+            output_path.unlink()
+
+        assert outputs[0] == outputs[1]
+        assert "with 2 workers" in capsys.readouterr().out
+
+    def test_benchmark_runs(self, temp_dir):
+        """Test the scaling benchmark on a small input."""
+        benchmark_parallel_aggregation.write_synthetic_files(temp_dir, 8)
+        results = benchmark_parallel_aggregation.run_benchmark(temp_dir, [1, 2])
+        assert [r["workers"] for r in results] == [1, 2]
+        assert results[0]["files"] == 8
+
+
+class TestStreamingAggregation:
+    """Test the constant-memory file -> record -> filter -> fold pipeline."""
+
+    def test_json_array_decoded_across_chunks(self, temp_dir, monkeypatch):
+        """Test that JSON arrays stream element by element across read chunks."""
+        entries = [
+            {"action": "a", "metrics": {"suggestions_made": 12345}},
+            7,
+            {"action": "b", "text": "[1, 2], {x}"},
+            [1, 2],
+        ]
+        path = Path(temp_dir) / "metrics.json"
+        path.write_text("  " + json.dumps(entries, indent=2) + "\n")
+        monkeypatch.setattr(aggregate_metrics, "JSON_READ_CHUNK", 5)
+
+        assert list(aggregate_metrics.iter_file_entries(str(path))) == entries
+
+    @pytest.mark.parametrize(
+        "content",
+        ["[1, 2", "[1 2]", "[1,]", "[1] x", "", "   "],
+    )
+    def test_malformed_json_array_rejected(self, temp_dir, monkeypatch, content):
+        """Test that malformed JSON files raise like json.loads would."""
+        path = Path(temp_dir) / "metrics.json"
+        path.write_text(content)
+        monkeypatch.setattr(aggregate_metrics, "JSON_READ_CHUNK", 2)
+
+        with pytest.raises(json.JSONDecodeError):
+            list(aggregate_metrics.iter_file_entries(str(path)))
+
+    def test_ndjson_matches_tracker_reader(self, temp_dir):
+        """Test that NDJSON files parse exactly like read_metrics_entries()."""
+        path = Path(temp_dir) / "metrics.ndjson"
+        path.write_text(
+            '{"action": "a"}\n\n   \nnot json\n[1, 2]\n  {"action": "b"}  \n{"action": "c", "tor'
+        )
+
+        entries = list(aggregate_metrics.iter_file_entries(str(path)))
+
+        assert entries == [{"action": "a"}, {"action": "b"}]
+        assert entries == read_metrics_entries(str(path))
+
+    def test_stream_aggregate_matches_aggregate_metrics(self, temp_dir, capsys):
+        """Test that streaming equals aggregating the loaded entries."""
+        metrics_dir = Path(temp_dir) / "metrics"
+        metrics_dir.mkdir()
+        (metrics_dir / "a.json").write_text(json.dumps([
+            {"action": "a", "timestamp": "2026-01-02", "metrics": {"suggestions_made": 3}},
+            {"action": "b", "metrics": {"suggestions_made": 1}},
+        ]))
+        (metrics_dir / "b.ndjson").write_text(
+            json.dumps({"action": "a", "timestamp": "2026-01-01", "metrics": {"suggestions_made": 2}})
+            + "\n{torn"
+        )
+        # Valid prefix followed by garbage: the whole file is skipped
+        (metrics_dir / "c.json").write_text(
+            '[{"action": "a", "metrics": {"suggestions_made": 100}}, oops]'
+        )
+        (metrics_dir / "d.json").write_text(json.dumps({"action": "b", "metrics": {}}))
+        files = sorted(aggregate_metrics.find_metrics_files(temp_dir))
+
+        for action_name in (None, "a"):
+            data = aggregate_metrics.load_metrics_data(files)
+            expected = aggregate_metrics.aggregate_metrics(data, action_name)
+            aggregated, entry_count = aggregate_metrics.stream_aggregate(
+                iter(files), action_name
+            )
+            assert aggregated == expected
+            assert entry_count == len(data) == 4
+
+        assert aggregated["a"]["suggestions_made"] == 5
+        assert "Could not load" in capsys.readouterr().out
+
+    def test_peak_memory_is_bounded(self, temp_dir):
+        """Test that peak memory does not grow with the number of entries."""
+        path = str(Path(temp_dir) / "metrics.ndjson")
+        benchmark_streaming_aggregation.write_synthetic_ndjson(path, 2000)
+
+        small = benchmark_streaming_aggregation.run_benchmark(path, 1)
+        large = benchmark_streaming_aggregation.run_benchmark(path, 25)
+
+        assert large["entries"] == 50000
+        assert large["aggregated"]["spec-to-code"]["entries"] == 12500
+        assert large["peak_bytes"] < small["peak_bytes"] + 16 * 1024
+        assert large["peak_bytes"] < 256 * 1024
+
+
+class TestPartitionPruning:
+    """Test --since selection over the YYYY/MM/DD partitioned layout."""
+
+    @staticmethod
+    def _write_partition(root, day, entries, name="a.ndjson"):
+        path = Path(root) / "metrics" / "acceptance" / day / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(json.dumps(entry) + "\n" for entry in entries))
+        return str(path)
+
+    @staticmethod
+    def _entry(timestamp, made=1, action="a"):
+        return {
+            "action": action,
+            "timestamp": timestamp,
+            "metrics": {"suggestions_made": made, "suggestions_accepted": made},
+        }
+
+    def test_partitions_selected_by_path_not_mtime(self, temp_dir):
+        """Test that restored partitions with fresh mtimes are still pruned."""
+        self._write_partition(temp_dir, "2025/12/31", [self._entry("2025-12-31T10:00:00")])
+        self._write_partition(temp_dir, "2026/01/05", [self._entry("2026-01-05T10:00:00")])
+        self._write_partition(temp_dir, "2026/02/01", [self._entry("2026-02-01T10:00:00")])
+        legacy_old = Path(temp_dir) / "metrics" / "old.json"
+        legacy_old.write_text("[]")
+        os.utime(legacy_old, (0, 0))
+        (Path(temp_dir) / "metrics" / "new.json").write_text("[]")
+
+        files = aggregate_metrics.find_metrics_files(temp_dir, datetime(2026, 1, 5, 12))
+
+        names = sorted(str(Path(f).relative_to(temp_dir)) for f in files)
+        assert names == [
+            os.path.join("metrics", "acceptance", "2026", "01", "05", "a.ndjson"),
+            os.path.join("metrics", "acceptance", "2026", "02", "01", "a.ndjson"),
+            os.path.join("metrics", "new.json"),
+        ]
+
+    def test_pruned_partitions_are_not_listed(self, temp_dir):
+        """Test that the scan never descends into partitions before --since."""
+        for day in ("2025/06/01", "2026/01/04", "2026/01/05"):
+            self._write_partition(temp_dir, day, [])
+        scanned = []
+        real_scandir = os.scandir
+
+        def recording_scandir(path):
+            scanned.append(os.path.relpath(path, temp_dir))
+            return real_scandir(path)
+
+        with patch.object(aggregate_metrics.os, "scandir", recording_scandir):
+            aggregate_metrics.find_metrics_files(temp_dir, datetime(2026, 1, 5))
+
+        assert os.path.join("metrics", "acceptance", "2025") not in scanned
+        assert os.path.join("metrics", "acceptance", "2026", "01", "04") not in scanned
+        assert os.path.join("metrics", "acceptance", "2026", "01", "05") in scanned
+
+    def test_boundary_partition_filtered_per_entry(self, temp_dir):
+        """Test that only the --since day is filtered by entry timestamp."""
+        self._write_partition(temp_dir, "2026/01/05", [
+            self._entry("2026-01-05T10:00:00", made=1),
+            self._entry("2026-01-05T13:00:00", made=2),
+            {"action": "a", "metrics": {"suggestions_made": 4}},
+        ])
+        self._write_partition(temp_dir, "2026/01/06", [self._entry("2026-01-06T01:00:00", made=8)])
+        since = datetime(2026, 1, 5, 12)
+        files = aggregate_metrics.find_metrics_files(temp_dir, since)
+
+        aggregated, entry_count = aggregate_metrics.stream_aggregate(files, since=since)
+        assert entry_count == 3
+        assert aggregated["a"]["suggestions_made"] == 14
+        assert aggregated["a"]["first_seen"] == "2026-01-05T13:00:00"
+
+        partials, _ = aggregate_metrics.load_partial_aggregates(files, 2, since)
+        assert aggregate_metrics.merge_partial_aggregates(partials) == aggregated
+
+        state = {"files": {}}
+        update = aggregate_metrics.update_aggregate_state(state, files, since=since)
+        assert aggregate_metrics.merge_partial_aggregates(update["partials"]) == aggregated
+        assert [Path(f).parent.name for f in state["files"]] == ["06"]
+
+        rows = aggregate_metrics.aggregate_by_dimensions(files, ["action"], since=since)
+        assert rows[0]["suggestions_made"] == 14
+
+    def test_main_since_with_partitions(self, temp_dir):
+        """Test --since end to end over partitions written by the tracker layout."""
+        since = datetime.now() - timedelta(days=3)
+        for timestamp, made in (
+            (since - timedelta(days=7), 100),
+            (since - timedelta(hours=1), 10),
+            (since + timedelta(hours=1), 1),
+        ):
+            self._write_partition(
+                temp_dir,
+                timestamp.strftime("%Y/%m/%d"),
+                [self._entry(timestamp.isoformat(), made=made)],
+                name=f"a-{made}.ndjson",
+            )
+        output_path = Path(temp_dir) / "output.json"
+
+        with patch("sys.argv", [
+            "aggregate_metrics.py",
+            "--root-dir", temp_dir,
+            "--output", str(output_path),
+            "--since", "3 days ago",
+        ]):
+            aggregate_metrics.main()
+
+        data = json.loads(output_path.read_text())
+        assert data["overall"]["suggestions_made"] == 1
+
+
+class TestRollups:
+    """Test serving --since from hourly/daily rollups."""
+
+    def test_rollup_matches_per_entry_window(self, temp_dir):
+        """Test rollup aggregates against filtering entries by timestamp."""
+        now = datetime.now()
+        entries = [
+            {
+                "action": action,
+                "timestamp": (now - timedelta(hours=hours)).isoformat(),
+                "metrics": {"suggestions_made": made, "suggestions_accepted": made // 2},
+            }
+            for hours, action, made in [
+                (1, "a", 4), (26, "b", 6), (70, "a", 2), (75, "b", 10), (300, "a", 100),
+            ]
+        ]
+        metrics_dir = Path(temp_dir) / "metrics"
+        metrics_dir.mkdir()
+        (metrics_dir / "a.ndjson").write_text("".join(json.dumps(e) + "\n" for e in entries[:3]))
+        (metrics_dir / "b.json").write_text(json.dumps(entries[3:]))
+        files = aggregate_metrics.find_metrics_files(temp_dir)
+
+        store = aggregate_metrics.RollupStore(
+            None, aggregate_metrics.ROLLUP_SCHEMA, aggregate_metrics.rollup_entry
+        )
+        assert store.update(files) == 5
+
+        for since, action_name in [(None, None), (now - timedelta(days=3), None), (now - timedelta(days=3), "a")]:
+            window = [
+                e for e in entries
+                if since is None or datetime.fromisoformat(e["timestamp"]) >= since
+            ]
+            expected = aggregate_metrics.aggregate_metrics(window, action_name)
+            aggregated, entry_count = aggregate_metrics.aggregate_from_rollup(store, since, action_name)
+            assert aggregated == expected
+            assert entry_count == sum(a["entries"] for a in expected.values())
+
+    def test_main_with_rollup_file(self, temp_dir, capsys):
+        """Test --rollup-file across runs, folding only new entries."""
+        metrics_dir = Path(temp_dir) / "metrics"
+        metrics_dir.mkdir()
+        log = metrics_dir / "a.ndjson"
+        old = {"action": "a", "timestamp": (datetime.now() - timedelta(days=9)).isoformat(),
+               "metrics": {"suggestions_made": 50}}
+        new = {"action": "a", "timestamp": datetime.now().isoformat(),
+               "metrics": {"suggestions_made": 3, "suggestions_accepted": 3}}
+        log.write_text(json.dumps(old) + "\n" + json.dumps(new) + "\n")
+        output_path = Path(temp_dir) / "output.json"
+        rollup_file = Path(temp_dir) / "cache" / "rollup.json"
+
+        def run():
+            with patch("sys.argv", [
+                "aggregate_metrics.py",
+                "--root-dir", temp_dir,
+                "--output", str(output_path),
+                "--since", "7 days ago",
+                "--rollup-file", str(rollup_file),
+            ]):
+                aggregate_metrics.main()
+            return json.loads(output_path.read_text())
+
+        data = run()
+        assert data["overall"]["suggestions_made"] == 3
+        assert data["by_action"]["a"]["acceptance_rate"] == 100.0
+        assert "Folded 2 new" in capsys.readouterr().out
+
+        with open(log, "a") as f:
+            f.write(json.dumps(new) + "\n")
+        data = run()
+        assert data["overall"]["suggestions_made"] == 6
+        assert "Folded 1 new" in capsys.readouterr().out
+
+    def test_main_default_output_not_folded(self, temp_dir, capsys, monkeypatch):
+        """Test that the default --output under the searched root is not read back."""
+        monkeypatch.chdir(temp_dir)
+        metrics_dir = Path("metrics")
+        metrics_dir.mkdir()
+        entry = {"action": "a", "timestamp": datetime.now().isoformat(),
+                 "metrics": {"suggestions_made": 4, "suggestions_accepted": 2}}
+        (metrics_dir / "a.ndjson").write_text(json.dumps(entry) + "\n")
+
+        for folded in (1, 0, 0):
+            with patch("sys.argv", [
+                "aggregate_metrics.py",
+                "--since", "7 days ago",
+                "--rollup-file", "rollup.json",
+            ]):
+                aggregate_metrics.main()
+            assert f"Folded {folded} new" in capsys.readouterr().out
+
+        data = json.loads((metrics_dir / "acceptance_rate.json").read_text())
+        assert list(data["by_action"]) == ["a"]
+        assert data["overall"]["suggestions_made"] == 4
+
+
+class TestPartialAggregate:
+    """Test the serializable, mergeable partial aggregate."""
+
+    RUNS = [
+        [
+            {"action": "a", "metrics": {"suggestions_made": 5, "suggestions_accepted": 3}, "timestamp": ""},
+            {"action": "a", "metrics": {"suggestions_made": 1, "suggestions_modified": 1}, "timestamp": "2024-01-03T00:00:00"},
+        ],
+        [],
+        [{"action": "b", "metrics": {"suggestions_made": 2, "suggestions_rejected": 1}, "timestamp": "2024-01-02T00:00:00"}],
+        [
+            {"action": "a", "metrics": {"suggestions_made": 4}, "timestamp": "2024-01-01T00:00:00"},
+            {"action": "b", "metrics": {"suggestions_made": 1, "suggestions_accepted": 1}, "timestamp": ""},
+        ],
+        [{"action": "c", "metrics": {}, "timestamp": "2024-01-05T00:00:00"}],
+    ]
+
+    def _partials(self):
+        return [aggregate_metrics.PartialAggregate.from_entries(run) for run in self.RUNS]
+
+    def test_merge_is_associative(self):
+        """Test that grouping does not change the merged result."""
+        a, _, b, c, _ = self._partials()
+        left = a.merge(b).merge(c)
+        right = a.merge(b.merge(c))
+        assert left == right
+        assert list(left.actions) == list(right.actions)
+
+    def test_merge_does_not_modify_operands(self):
+        """Test that merge() returns a new partial aggregate."""
+        first, second = self._partials()[0], self._partials()[3]
+        before = json.dumps(first.to_dict())
+        first.merge(second)
+        assert json.dumps(first.to_dict()) == before
+
+    def test_serialized_merge_matches_concatenated_entries(self):
+        """Test that merging serialized partials equals aggregating the raw data."""
+        concatenated = [entry for run in self.RUNS for entry in run]
+        partials = [
+            aggregate_metrics.PartialAggregate.from_dict(json.loads(json.dumps(p.to_dict())))
+            for p in self._partials()
+        ]
+        merged = aggregate_metrics.PartialAggregate()
+        for partial in partials:
+            merged = merged.merge(partial)
+
+        assert merged.entry_count == len(concatenated)
+        for action_name in (None, "a"):
+            expected = aggregate_metrics.aggregate_metrics(concatenated, action_name)
+            assert merged.finalize(action_name) == expected
+        # finalize() leaves the partial mergeable
+        assert "min_timestamp" in merged.actions["a"]
+
+    @pytest.mark.parametrize("data", [
+        None,
+        {"version": 99, "actions": {}},
+        {"version": aggregate_metrics.PARTIAL_VERSION, "actions": []},
+        {"version": aggregate_metrics.PARTIAL_VERSION, "actions": {"a": {"entries": 1}}},
+    ])
+    def test_from_dict_rejects_invalid_data(self, data):
+        """Test that invalid serialized data raises ValueError."""
+        with pytest.raises(ValueError):
+            aggregate_metrics.PartialAggregate.from_dict(data)
+
+    def test_main_emit_partial(self, temp_dir):
+        """Test --emit-partial writes the partial behind the output."""
+        metrics_dir = Path(temp_dir) / "metrics"
+        metrics_dir.mkdir()
+        (metrics_dir / "a.json").write_text(json.dumps(self.RUNS[0] + self.RUNS[2]))
+        output_path = Path(temp_dir) / "output.json"
+        partial_path = metrics_dir / "partial.json"
+
+        for _ in range(2):
+            with patch("sys.argv", [
+                "aggregate_metrics.py",
+                "--root-dir", temp_dir,
+                "--output", str(output_path),
+                "--emit-partial", str(partial_path),
+            ]):
+                aggregate_metrics.main()
+
+        partial = aggregate_metrics.PartialAggregate.load(str(partial_path))
+        # The emitted partial is not picked up as a metrics file on rerun
+        assert partial.entry_count == 3
+        assert partial.finalize() == json.loads(output_path.read_text())["by_action"]
+
+    def test_main_rejects_emit_partial_with_rollups(self, temp_dir):
+        """Test that --emit-partial and --rollup-file are exclusive."""
+        with patch("sys.argv", [
+            "aggregate_metrics.py",
+            "--root-dir", temp_dir,
+            "--emit-partial", "p.json",
+            "--rollup-file", "r.json",
+        ]):
+            with pytest.raises(SystemExit):
+                aggregate_metrics.main()
+
+
 class TestMainFunction:
     """Test the main function and CLI interface."""
 
@@ -1,16 +1,22 @@
 """Tests for the acceptance rate calculator."""
 
 import json
+import operator
 
 # Import the module to test
 import sys
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime, timedelta, timezone
+from functools import reduce
 from pathlib import Path
 
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import benchmark_acceptance_stats
 import calculate_acceptance_rate
+import metrics_rollup
+from metrics_rollup import RollupStore
+from review_columns import ReviewColumns
 
 
 class TestCalculateAcceptanceRate:
@@ -90,6 +96,28 @@ class TestCalculateAcceptanceRate:
         assert reasons[1]["count"] == 2
 
 
+    def test_rejection_reasons_normalized(self):
+        """Test that reason variants are counted together under the first spelling."""
+        metrics = [
+            {"outcome": "rejected", "rejection_reasons": ["Too aggressive", "Missing context"]},
+            {"outcome": "needs_work", "rejection_reasons": ["too  AGGRESSIVE"]},
+        ]
+
+        reasons = calculate_acceptance_rate.calculate_acceptance_rate(metrics)["common_rejection_reasons"]
+
+        assert reasons[0] == {"reason": "Too aggressive", "count": 2, "percentage": 66.7}
+
+    def test_common_items_bounded(self):
+        """Test that overestimated counts report their error bound."""
+        items = ["a"] * 5 + ["b", "c", "d"] + ["e"] * 2
+
+        common = calculate_acceptance_rate.get_common_items(items, top_n=2, capacity=2)
+
+        assert common[0] == {"reason": "a", "count": 5, "percentage": 50.0}
+        assert common[1]["reason"] == "e"
+        assert common[1]["count"] - common[1]["max_overcount"] <= 2 <= common[1]["count"]
+
+
 class TestFilterMetricsByTime:
     """Test time-based filtering."""
 
@@ -246,6 +274,383 @@ class TestLoadAndSave:
         assert loaded == []
 
 
+class TestRollups:
+    """Test serving the time period from hourly/daily rollups."""
+
+    @staticmethod
+    def _sample_metrics():
+        now = datetime.now(UTC)
+        metrics = []
+        for hours, outcome, reasons in [
+            (1, "approved", []),
+            (30, "modified", []),
+            (100, "rejected", ["style", "scope"]),
+            (150, "needs_work", ["style"]),
+            (170, "rejected", ["style", "tests", "scope"]),
+            (200, "approved", []),
+            (400, "rejected", ["old"]),
+        ]:
+            metrics.append({
+                "outcome": outcome,
+                "timestamp": (now - timedelta(hours=hours)).isoformat().replace("+00:00", "Z"),
+                "suggestions_count": hours % 7,
+                "accepted_count": hours % 3,
+                "rejection_reasons": reasons,
+            })
+        metrics.append({"outcome": "approved", "suggestions_count": 4})
+        metrics.append({"outcome": "rejected", "timestamp": "not-a-date"})
+        return metrics
+
+    @pytest.mark.parametrize("time_period", ["24h", "7d", "2w"])
+    def test_rollup_matches_raw(self, tmp_path, time_period):
+        """Test that rollup statistics equal filtering and counting raw reviews."""
+        metrics = self._sample_metrics()
+        metrics_file = tmp_path / "metrics.json"
+        metrics_file.write_text(json.dumps(metrics))
+
+        store = RollupStore(
+            None, calculate_acceptance_rate.ROLLUP_SCHEMA, calculate_acceptance_rate.rollup_review
+        )
+        store.update([str(metrics_file)])
+
+        expected = calculate_acceptance_rate.calculate_acceptance_rate(
+            calculate_acceptance_rate.filter_metrics_by_time(metrics, time_period)
+        )
+        result = calculate_acceptance_rate.calculate_acceptance_rate_from_rollup(store, time_period)
+        assert result == expected
+
+    def test_rollup_cells_bounded_in_distinct_reasons(self, tmp_path, monkeypatch):
+        """Test that unique reasons do not grow the cells past their capacity."""
+        monkeypatch.setattr(metrics_rollup, "TOP_COUNTS_CAPACITY", 20)
+        timestamp = datetime.now(UTC).isoformat()
+        # Digits normalize away, so spell the unique part in letters
+        metrics = [
+            {"outcome": "rejected", "timestamp": timestamp,
+             "rejection_reasons": [
+                 "Too verbose" if i % 3 == 0
+                 else "unique " + "".join(chr(97 + int(d)) for d in str(i))
+             ]}
+            for i in range(3000)
+        ]
+        metrics_file = tmp_path / "metrics.json"
+        metrics_file.write_text(json.dumps(metrics))
+        store = RollupStore(
+            None, calculate_acceptance_rate.ROLLUP_SCHEMA, calculate_acceptance_rate.rollup_review
+        )
+        store.update([str(metrics_file)])
+
+        for table in (store.daily, store.hourly):
+            for cells in table.values():
+                assert all(len(cell["reasons"]) <= 20 for cell in cells.values())
+        result = calculate_acceptance_rate.calculate_acceptance_rate_from_rollup(store, "24h")
+        assert result["common_rejection_reasons"][0]["reason"] == "Too verbose"
+
+    def test_main_with_rollup_file(self, tmp_path, capsys):
+        """Test --rollup-file output matches the raw computation across runs."""
+        metrics_file = tmp_path / "metrics.json"
+        metrics_file.write_text(json.dumps(self._sample_metrics()))
+        rollup_file = tmp_path / "cache" / "reviews_rollup.json"
+
+        outputs = []
+        for extra in ([], ["--rollup-file", str(rollup_file)], ["--rollup-file", str(rollup_file)]):
+            old_argv = sys.argv
+            sys.argv = [
+                "calculate_acceptance_rate.py",
+                "--metrics-file", str(metrics_file),
+                "--output", "json",
+                *extra,
+            ]
+            try:
+                calculate_acceptance_rate.main()
+            finally:
+                sys.argv = old_argv
+            outputs.append(json.loads(capsys.readouterr().out))
+
+        assert outputs[0] == outputs[1] == outputs[2]
+        assert rollup_file.exists()
+
+
+class TestSinglePass:
+    """Test the fused single-pass statistics kernel."""
+
+    @pytest.mark.parametrize("time_period", ["24h", "7d", "2w"])
+    def test_matches_filter_then_calculate(self, time_period):
+        """Test that one pass equals filtering and then calculating."""
+        metrics = TestColumnarCache._metrics()
+        expected = calculate_acceptance_rate.calculate_acceptance_rate(
+            calculate_acceptance_rate.filter_metrics_by_time(metrics, time_period)
+        )
+        result = calculate_acceptance_rate.calculate_acceptance_rate_for_period(metrics, time_period)
+        assert json.dumps(result) == json.dumps(expected)
+
+    def test_float_counts_summed_in_input_order(self):
+        """Test that mixed int/float counts are added left to right, as before the fused pass."""
+        counts = [1, 2, 0.1, True, 0.2, 3, 1e16, 0.3, -1e16, 2.5]
+        metrics = [{"outcome": "approved", "suggestions_count": c, "accepted_count": c} for c in counts]
+        result = calculate_acceptance_rate.calculate_acceptance_rate(metrics)
+        expected = round(reduce(operator.add, counts, 0) / len(counts), 2)
+        assert result["average_suggestions"] == expected
+        assert result["average_accepted_suggestions"] == expected
+
+    def test_accepts_iterators(self):
+        """Test that metrics are consumed in a single pass."""
+        metrics = TestColumnarCache._metrics()
+        expected = calculate_acceptance_rate.calculate_acceptance_rate_for_period(metrics, "7d")
+        assert calculate_acceptance_rate.calculate_acceptance_rate_for_period(iter(metrics), "7d") == expected
+
+    def test_benchmark_runs(self):
+        """Test that the kernel benchmark reports identical statistics."""
+        result = benchmark_acceptance_stats.run_benchmark(500, repeats=1)
+        assert result["reviews"] == 500
+        assert result["identical"]
+
+
+class TestColumnarCache:
+    """Test computing statistics from the columnar cache."""
+
+    @staticmethod
+    def _metrics():
+        metrics = TestRollups._sample_metrics()
+        now = datetime.now(UTC)
+        metrics.append({
+            "outcome": "rejected",
+            "timestamp": (now - timedelta(hours=5)).astimezone(timezone(timedelta(hours=-5))).isoformat(),
+            "rejection_reasons": "scope",
+            "accepted_count": 0,
+        })
+        return metrics
+
+    @pytest.mark.parametrize("time_period", ["24h", "7d", "2w"])
+    def test_columns_match_raw(self, time_period):
+        """Test that column statistics equal filtering and counting raw reviews."""
+        metrics = self._metrics()
+        columns = ReviewColumns.from_reviews(metrics)
+
+        expected = calculate_acceptance_rate.calculate_acceptance_rate(
+            calculate_acceptance_rate.filter_metrics_by_time(metrics, time_period)
+        )
+        result = calculate_acceptance_rate.calculate_acceptance_rate_from_columns(columns, time_period)
+        assert result == expected
+        assert json.dumps(result) == json.dumps(expected)
+
+    @pytest.mark.parametrize("metrics", [
+        None,
+        [{"outcome": "approved", "timestamp": datetime.now(UTC).isoformat()}],
+    ])
+    def test_main_with_columnar_cache(self, tmp_path, capsys, metrics):
+        """Test --columnar-cache output matches the JSON path, with and without a cache."""
+        metrics_file = tmp_path / "metrics.json"
+        metrics_file.write_text(json.dumps(metrics if metrics is not None else self._metrics()))
+
+        outputs = []
+        for extra in ([], ["--columnar-cache"], ["--columnar-cache"]):
+            old_argv = sys.argv
+            sys.argv = [
+                "calculate_acceptance_rate.py",
+                "--metrics-file", str(metrics_file),
+                "--output", "json",
+                *extra,
+            ]
+            try:
+                calculate_acceptance_rate.main()
+            finally:
+                sys.argv = old_argv
+            outputs.append(json.loads(capsys.readouterr().out))
+
+        assert outputs[0] == outputs[1] == outputs[2]
+        assert (tmp_path / "metrics.json.columns").exists()
+
+    def test_unrepresentable_reviews_use_json(self, tmp_path, capsys):
+        """Test that reviews the cache cannot hold fall back to the JSON path."""
+        metrics_file = tmp_path / "metrics.json"
+        metrics_file.write_text(json.dumps([{"outcome": "approved", "suggestions_count": 1.5}]))
+        old_argv = sys.argv
+        sys.argv = [
+            "calculate_acceptance_rate.py",
+            "--metrics-file", str(metrics_file),
+            "--output", "json",
+            "--columnar-cache",
+        ]
+        try:
+            calculate_acceptance_rate.main()
+        finally:
+            sys.argv = old_argv
+
+        assert json.loads(capsys.readouterr().out)["average_suggestions"] == 1.5
+        assert not (tmp_path / "metrics.json.columns").exists()
+
+
+class TestMultiPeriod:
+    """Test computing several time periods in one scan."""
+
+    def test_periods_match_single_period(self):
+        """Test that each period equals its own single-period calculation."""
+        metrics = TestColumnarCache._metrics() + [{"outcome": "approved", "timestamp": "bad"}]
+        periods = ["7d", "24h", "2w", "1h"]
+
+        result = calculate_acceptance_rate.calculate_acceptance_rate_for_periods(iter(metrics), periods)
+
+        assert list(result) == periods
+        for period in periods:
+            expected = calculate_acceptance_rate.calculate_acceptance_rate(
+                calculate_acceptance_rate.filter_metrics_by_time(metrics, period)
+            )
+            assert json.dumps(result[period]) == json.dumps(expected), period
+
+    def test_unfiltered_window_keeps_invalid_timestamps(self):
+        """Test that a None cutoff counts every review, as calculate_acceptance_rate() does."""
+        metrics = [{"outcome": "approved", "timestamp": "bad"}, {"outcome": "rejected"}]
+        unfiltered, filtered = calculate_acceptance_rate.accumulate_windows(
+            metrics, [None, datetime.now(UTC)]
+        )
+        assert unfiltered == calculate_acceptance_rate.calculate_acceptance_rate(metrics)
+        assert filtered["total_reviews"] == 1
+
+    @pytest.mark.parametrize("value,expected", [
+        ("7d", ["7d"]),
+        ("24h, 7d,30d", ["24h", "7d", "30d"]),
+        ("7d,7d,24h,", ["7d", "24h"]),
+        (",", ["7d"]),
+    ])
+    def test_parse_time_periods(self, value, expected):
+        """Test splitting --time-period values."""
+        assert calculate_acceptance_rate.parse_time_periods(value) == expected
+
+    @pytest.mark.parametrize("extra", [[], ["--columnar-cache"]])
+    def test_main_json_combines_periods(self, tmp_path, capsys, extra):
+        """Test the combined JSON output for a list of periods."""
+        metrics = TestColumnarCache._metrics()
+        metrics_file = tmp_path / "metrics.json"
+        metrics_file.write_text(json.dumps(metrics))
+
+        old_argv = sys.argv
+        sys.argv = [
+            "calculate_acceptance_rate.py",
+            "--metrics-file", str(metrics_file),
+            "--time-period", "24h,2w",
+            "--output", "json",
+            "--target-rate", "0",
+            *extra,
+        ]
+        try:
+            result = calculate_acceptance_rate.main()
+        finally:
+            sys.argv = old_argv
+
+        output = json.loads(capsys.readouterr().out)
+        assert result == 0
+        assert output["time_periods"] == ["24h", "2w"]
+        for period in ["24h", "2w"]:
+            expected = calculate_acceptance_rate.calculate_acceptance_rate_for_period(metrics, period)
+            expected.update(target_acceptance_rate=0.0, meets_target=True)
+            assert output["periods"][period] == expected
+
+    def test_main_report_and_summary(self, tmp_path, capsys):
+        """Test the combined report and summary outputs."""
+        metrics_file = tmp_path / "metrics.json"
+        metrics_file.write_text(json.dumps(TestColumnarCache._metrics()))
+
+        outputs = []
+        for output in ["report", "summary"]:
+            old_argv = sys.argv
+            sys.argv = [
+                "calculate_acceptance_rate.py",
+                "--metrics-file", str(metrics_file),
+                "--time-period", "24h,2w",
+                "--output", output,
+            ]
+            try:
+                calculate_acceptance_rate.main()
+            finally:
+                sys.argv = old_argv
+            outputs.append(capsys.readouterr().out)
+
+        report, summary = outputs
+        assert "# AI Review Quality Report (Last 24h, 2w)" in report
+        assert "| Period | Acceptance Rate |" in report
+        assert "## Last 24h" in report and "## Last 2w" in report
+        assert "### Outcome Breakdown" in report
+        assert "Last 24h:" in summary and "Last 2w:" in summary
+
+
+class TestIntervals:
+    """Test confidence intervals computed in the statistics scan."""
+
+    METRICS = [
+        {"outcome": "approved", "timestamp": "2026-02-02T10:00:00Z", "variant": "baseline"},
+        {"outcome": "rejected", "timestamp": "2026-02-03T10:00:00Z", "variant": "baseline"},
+        {"outcome": "modified", "timestamp": "2026-02-10T10:00:00Z", "variant": "treatment",
+         "action": "pr-review-enqueuer"},
+        {"outcome": "approved", "timestamp": "2026-02-11T10:00:00Z", "variant": "treatment"},
+        {"outcome": "needs_work", "timestamp": "bad"},
+        {"outcome": "approved"},
+    ]
+
+    def test_groups_counted_per_dimension(self):
+        """Test accepted/total counts per action, week and variant."""
+        stats = calculate_acceptance_rate.accumulate_windows(self.METRICS, [None], interval_confidence=0.9)[0]
+        intervals = stats["intervals"]
+
+        assert intervals["confidence"] == 0.9
+        assert intervals["overall"]["reviews"] == 6
+        assert intervals["overall"]["accepted"] == 4
+        assert {k: v["reviews"] for k, v in intervals["by_action"].items()} == {
+            "pr-review-enqueuer": 1, "review-and-merge": 5,
+        }
+        assert {k: (v["accepted"], v["reviews"]) for k, v in intervals["by_week"].items()} == {
+            "2026-05": (1, 2), "2026-06": (2, 2),
+        }
+        assert {k: v["accepted"] for k, v in intervals["by_variant"].items()} == {"baseline": 1, "treatment": 2}
+        # Two reviews per group never separate
+        assert intervals["changes"] == []
+
+    def test_statistics_unchanged(self):
+        """Test that adding intervals leaves the other statistics as they were."""
+        stats = calculate_acceptance_rate.accumulate_windows(self.METRICS, [None], interval_confidence=0.95)[0]
+        del stats["intervals"]
+        assert stats == calculate_acceptance_rate.calculate_acceptance_rate(self.METRICS)
+
+    def _run(self, tmp_path, *extra):
+        metrics_file = tmp_path / "metrics.json"
+        now = datetime.now(UTC)
+        metrics = [
+            {"outcome": "approved" if i % 10 < (9 if i % 2 else 4) else "rejected",
+             "variant": "treatment" if i % 2 else "baseline",
+             "timestamp": (now - timedelta(hours=i % 48)).isoformat()}
+            for i in range(400)
+        ]
+        metrics_file.write_text(json.dumps(metrics))
+        old_argv = sys.argv
+        sys.argv = ["calculate_acceptance_rate.py", "--metrics-file", str(metrics_file), *extra]
+        try:
+            return calculate_acceptance_rate.main()
+        finally:
+            sys.argv = old_argv
+
+    def test_main_json_and_report(self, tmp_path, capsys):
+        """Test --intervals in the JSON output and the report."""
+        self._run(tmp_path, "--intervals", "--output", "json")
+        intervals = json.loads(capsys.readouterr().out)["intervals"]
+        assert intervals["overall"]["reviews"] == 400
+        assert [c["to"] for c in intervals["changes"]] == ["treatment"]
+
+        self._run(tmp_path, "--intervals", "--output", "report", "--confidence", "0.99")
+        report = capsys.readouterr().out
+        assert "## Confidence Intervals (99%)" in report
+        assert "| Variant treatment | 200 | 80.0% |" in report
+        assert "Variant baseline → treatment: increase from 40.0% to 80.0%" in report
+
+    @pytest.mark.parametrize("extra", [
+        ["--intervals", "--columnar-cache"],
+        ["--intervals", "--rollup-file", "rollups.json"],
+        ["--confidence", "1"],
+    ])
+    def test_main_rejects_invalid_options(self, tmp_path, extra):
+        """Test option combinations that cannot produce intervals."""
+        with pytest.raises(SystemExit):
+            self._run(tmp_path, *extra)
+
+
 class TestCliInterface:
     """Test CLI interface."""
 
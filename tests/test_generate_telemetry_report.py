@@ -4,11 +4,16 @@
 import json
 import sys
 import tempfile
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 import generate_telemetry_report
+from metrics_rollup import RollupStore
 
 
 class TestLoadTelemetryData:
@@ -255,3 +260,161 @@ class TestIntegration:
             assert "**Overall Success Rate** | 50.0%" in report
             assert "Common Errors" in report
             assert "Test error" in report
+
+
+class TestRollups:
+    """Test serving --days from hourly/daily rollups."""
+
+    @staticmethod
+    def _write_events(data_path):
+        now = datetime.now(UTC)
+        events = []
+        for hours, action, status, error, duration in [
+            (2, "review-and-merge", "success", None, 1200),
+            (20, "review-and-merge", "failure", "timeout", 90_000),
+            (50, "auto-refactor", "error", "timeout", None),
+            (90, "auto-refactor", "failure", "rate limit", 0),
+            (200, "review-and-merge", "failure", "old error", 800),
+        ]:
+            event = {
+                "action_name": action,
+                "status": status,
+                "timestamp": (now - timedelta(hours=hours)).isoformat().replace("+00:00", "Z"),
+            }
+            if error:
+                event["error_type"] = error
+            if duration is not None:
+                event["duration_ms"] = duration
+            events.append(event)
+        events.append({"action_name": "spec-to-code", "status": "success", "timestamp": "bogus", "duration_ms": 5})
+
+        with open(data_path, "w") as f:
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+
+    def test_rollup_matches_raw(self, tmp_path):
+        """Test that rollup aggregates equal filtering and aggregating raw events."""
+        data_path = tmp_path / "telemetry.log"
+        self._write_events(data_path)
+        store = RollupStore(
+            None, generate_telemetry_report.ROLLUP_SCHEMA, generate_telemetry_report.rollup_event
+        )
+        store.update([str(data_path)])
+
+        events = generate_telemetry_report.load_telemetry_data(data_path)
+        for days in (1, 3, 7, 0):
+            filtered = generate_telemetry_report.filter_events_by_period(events, days) if days else events
+            expected = generate_telemetry_report.aggregate_metrics(filtered)
+            result = generate_telemetry_report.aggregate_metrics_from_rollup(store, days)
+            assert result == expected, days
+
+        assert generate_telemetry_report.weekly_latency_from_rollup(store) == \
+            generate_telemetry_report.weekly_latency(events)
+
+    def test_main_with_rollup_file(self, tmp_path):
+        """Test that --rollup-file produces the same report and folds appends only."""
+        data_path = tmp_path / "telemetry.log"
+        self._write_events(data_path)
+        rollup_file = tmp_path / "cache" / "telemetry_rollup.json"
+
+        reports = []
+        for extra in ([], ["--rollup-file", str(rollup_file)], ["--rollup-file", str(rollup_file)]):
+            output = tmp_path / "report.md"
+            with patch("sys.argv", [
+                "generate_telemetry_report.py",
+                "--input", str(data_path),
+                "--output", str(output),
+                "--days", "7",
+                *extra,
+            ]):
+                assert generate_telemetry_report.main() == 0
+            # Drop the "Generated" timestamp line
+            reports.append(output.read_text().split("\n", 3)[3])
+
+        assert reports[0] == reports[1] == reports[2]
+        state = json.loads(rollup_file.read_text())
+        assert state["sources"][str(data_path)]["offset"] == data_path.stat().st_size
+
+
+class TestLatency:
+    """Test latency percentiles and week-over-week regression flags."""
+
+    @staticmethod
+    def _events(now, days_ago, action, durations):
+        timestamp = (now - timedelta(days=days_ago)).isoformat().replace("+00:00", "Z")
+        return [
+            {"action_name": action, "status": "success", "timestamp": timestamp, "duration_ms": d}
+            for d in durations
+        ]
+
+    def test_aggregate_durations(self):
+        """Test that valid durations are sketched and invalid ones skipped."""
+        events = [
+            {"action_name": "a", "status": "success", "duration_ms": duration}
+            for duration in (100, 200, 300, -5, "slow", True, None, float("nan"))
+        ]
+
+        sketch = generate_telemetry_report.aggregate_metrics(events)["a"]["durations"]
+
+        assert sketch.count == 3
+        assert sketch.quantile(0.5) == pytest.approx(200, rel=0.01)
+
+    def test_weekly_latency_windows(self):
+        """Test that events land in this week or the previous week by timestamp."""
+        now = datetime.now(UTC)
+        events = (
+            self._events(now, 1, "a", [100, 100])
+            + self._events(now, 10, "a", [50])
+            + self._events(now, 30, "a", [999])
+            + [{"action_name": "a", "timestamp": "bogus", "duration_ms": 7}]
+        )
+
+        this_week, previous_week = generate_telemetry_report.weekly_latency(events, now)["a"]
+
+        assert this_week.count == 3
+        assert previous_week.count == 2
+
+    def test_regression_flag(self):
+        """Test that a p90 increase beyond the threshold is flagged in the report."""
+        now = datetime.now(UTC)
+        runs = generate_telemetry_report.REGRESSION_MIN_RUNS
+        events = (
+            self._events(now, 1, "slow-action", [2000] * runs)
+            + self._events(now, 8, "slow-action", [1000] * runs)
+            + self._events(now, 1, "steady-action", [500] * runs)
+            + self._events(now, 8, "steady-action", [480] * runs)
+            + self._events(now, 1, "new-action", [100])
+        )
+        metrics = generate_telemetry_report.aggregate_metrics(
+            generate_telemetry_report.filter_events_by_period(events, 7)
+        )
+
+        report = generate_telemetry_report.generate_report(
+            metrics, 7, generate_telemetry_report.weekly_latency(events, now)
+        )
+
+        rows = {line.split(" | ")[0][2:]: line for line in report.splitlines() if line.startswith("| ")}
+        assert "## Latency" in report
+        assert rows["slow-action"].startswith("| slow-action | 20 | 2.0 s | 2.0 s | 2.0 s | +10")
+        assert rows["slow-action"].endswith("% 🔴 |")
+        assert rows["steady-action"].endswith(" | +4% |")
+        assert rows["new-action"].endswith(" | n/a |")
+        assert "**Latency regressions** (p90 up more than 20% week over week): slow-action" in report
+
+    def test_no_latency_section_without_durations(self):
+        """Test that reports without any duration_ms omit the latency table."""
+        metrics = {"test": {"total_runs": 1, "successes": 1, "failures": 0, "errors": []}}
+
+        report = generate_telemetry_report.generate_report(metrics, 7)
+
+        assert "## Latency" not in report
+
+    @pytest.mark.parametrize("duration_ms,expected", [
+        (0, "0 ms"),
+        (999.4, "999 ms"),
+        (1500, "1.5 s"),
+        (90_000, "1.5 min"),
+    ])
+    def test_format_duration(self, duration_ms, expected):
+        """Test duration formatting in the latency table."""
+        assert generate_telemetry_report.format_duration(duration_ms) == expected
@@ -0,0 +1,102 @@
+"""Tests for the bounded-memory rejection reason sketch."""
+
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import heavy_hitters
+from heavy_hitters import SpaceSavingCounter
+
+
+def zipf_stream(length, distinct, seed=7):
+    """Reasons with a skewed frequency distribution, as free text tends to have."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return [f"reason {chr(65 + rank % 26)}{rank // 26 * 'x'}" for rank in
+            rng.choices(range(distinct), weights, k=length)]
+
+
+class TestNormalization:
+    """Test the counting key and display label of reasons."""
+
+    @pytest.mark.parametrize("reason,expected", [
+        ("Too verbose", ("too verbose", "Too verbose")),
+        ("  Too \t verbose\n", ("too verbose", "Too verbose")),
+        ("Line 120 exceeds 80 chars", ("line # exceeds # chars", "Line # exceeds # chars")),
+        (42, ("#", "#")),
+    ])
+    def test_normalize_reason(self, reason, expected):
+        """Test case, whitespace and digit normalization."""
+        assert heavy_hitters.normalize_reason(reason) == expected
+
+    def test_variants_counted_together(self):
+        """Test that spelling variants share one count under the first label seen."""
+        counter = SpaceSavingCounter()
+        counter.update(["Too verbose", "too  VERBOSE", "Out of scope", "TOO VERBOSE "])
+
+        assert counter.most_common() == [("Too verbose", 3), ("Out of scope", 1)]
+        assert counter["too verbose"] == 3
+        assert "OUT OF SCOPE" in counter
+        assert counter.total == 4
+
+
+class TestSpaceSaving:
+    """Test the Space-Saving guarantees."""
+
+    def test_exact_within_capacity(self):
+        """Test that counts and tie order match Counter while distinct reasons fit."""
+        stream = zipf_stream(2000, 20)
+        counter = SpaceSavingCounter(capacity=20)
+        counter.update(stream)
+
+        expected = Counter(heavy_hitters.normalize_reason(r)[1] for r in stream)
+        assert counter.most_common() == expected.most_common()
+        assert all(counter.error(label) == 0 for label in counter)
+
+    @pytest.mark.parametrize("capacity", [5, 16, 50])
+    def test_error_bounds_beyond_capacity(self, capacity):
+        """Test memory and error bounds when distinct reasons exceed the capacity."""
+        stream = zipf_stream(5000, 300)
+        counter = SpaceSavingCounter(capacity)
+        for reason in stream:
+            counter.add(reason)
+        true_counts = Counter(stream)
+
+        assert len(counter) == capacity
+        assert counter.total == len(stream)
+        for label, estimate in counter.most_common():
+            error = counter.error(label)
+            assert estimate - error <= true_counts[label] <= estimate
+            assert error <= len(stream) / capacity
+        for reason, true_count in true_counts.items():
+            if true_count > len(stream) / capacity:
+                assert reason in counter
+
+    def test_weighted_add(self):
+        """Test that a weight counts as that many occurrences."""
+        counter = SpaceSavingCounter(capacity=2)
+        counter.add("a", 5)
+        counter.add("b", 2)
+        counter.add("c", 3)
+
+        assert counter.most_common() == [("a", 5), ("c", 5)]
+        assert counter.error("c") == 2
+        assert counter["b"] == 0
+
+    def test_equality_and_empty(self):
+        """Test comparing sketches, and an empty sketch."""
+        assert SpaceSavingCounter() == SpaceSavingCounter(capacity=3)
+        assert not SpaceSavingCounter()
+        a, b = SpaceSavingCounter(), SpaceSavingCounter()
+        a.update(["x", "y"])
+        b.update(["y", "x"])
+        assert a != b
+
+    def test_invalid_capacity(self):
+        """Test that a capacity below 1 is rejected."""
+        with pytest.raises(ValueError):
+            SpaceSavingCounter(capacity=0)
@@ -0,0 +1,98 @@
+"""Tests for the mergeable latency quantile sketch."""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from latency_sketch import LatencySketch
+
+
+def durations(length, seed=7):
+    """Long-tailed durations in milliseconds, as action runs tend to have."""
+    rng = random.Random(seed)
+    return [rng.lognormvariate(9, 1.2) for _ in range(length)]
+
+
+def exact_quantile(values, q):
+    """The value of rank q * (n - 1), as LatencySketch.quantile() targets."""
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+class TestQuantiles:
+    """Test quantile estimates against exact order statistics."""
+
+    @pytest.mark.parametrize("q", [0, 0.5, 0.9, 0.99, 1])
+    def test_relative_accuracy(self, q):
+        """Test that estimates are within the sketch's relative accuracy."""
+        values = durations(20_000)
+        sketch = LatencySketch()
+        sketch.update(values)
+
+        expected = exact_quantile(values, q)
+        assert sketch.quantile(q) == pytest.approx(expected, rel=sketch.relative_accuracy)
+
+    def test_zero_durations(self):
+        """Test that zero durations are counted in their own bucket."""
+        sketch = LatencySketch()
+        sketch.update([0, 0, 0, 100])
+
+        assert sketch.quantile(0.5) == 0
+        assert sketch.quantile(1) == pytest.approx(100, rel=0.01)
+        assert len(sketch) == 4
+
+    def test_empty(self):
+        """Test that an empty sketch has no quantiles."""
+        assert LatencySketch().quantile(0.5) is None
+
+    @pytest.mark.parametrize("call", [
+        lambda s: s.add(-1),
+        lambda s: s.quantile(1.5),
+        lambda s: LatencySketch(relative_accuracy=0),
+    ])
+    def test_invalid_arguments(self, call):
+        """Test that invalid durations, quantiles and accuracies are rejected."""
+        with pytest.raises(ValueError):
+            call(LatencySketch())
+
+    def test_bounded_buckets(self):
+        """Test that bucket count depends on the value range, not the stream length."""
+        sketch = LatencySketch()
+        sketch.update(durations(50_000))
+        assert len(sketch.buckets) < 1000
+
+
+class TestMerging:
+    """Test merging sketches and storing them as rollup counters."""
+
+    def test_merge_is_exact(self):
+        """Test that merging partial sketches equals one sketch over everything."""
+        values = durations(5000)
+        whole, merged = LatencySketch(), LatencySketch()
+        whole.update(values)
+        for start in range(0, len(values), 1000):
+            part = LatencySketch()
+            part.update(values[start:start + 1000])
+            merged.merge(part)
+
+        assert merged == whole
+        assert merged.count == whole.count == 5000
+
+    def test_merge_rejects_other_accuracy(self):
+        """Test that sketches with different bucket widths do not merge."""
+        with pytest.raises(ValueError):
+            LatencySketch().merge(LatencySketch(relative_accuracy=0.02))
+
+    def test_counters_round_trip(self):
+        """Test that to_counters() and from_counters() preserve the sketch."""
+        sketch = LatencySketch()
+        sketch.update([0, 0.5, 1, 850, 1200, 15000])
+        counters = {**sketch.to_counters(), "total_runs": 6, "error:timeout": 1}
+
+        rebuilt = LatencySketch.from_counters(counters)
+
+        assert rebuilt == sketch
+        assert rebuilt.count == 6
+        assert rebuilt.quantile(0.9) == sketch.quantile(0.9)
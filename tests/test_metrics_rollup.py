@@ -0,0 +1,298 @@
+"""Tests for the hourly/daily metric rollups."""
+
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import metrics_rollup
+
+
+def extract(record):
+    """Count events per action; skip records marked as such."""
+    if record.get("skip"):
+        return None
+    timestamp = record.get("timestamp")
+    when = metrics_rollup.normalize_timestamp(timestamp) if timestamp else None
+    counters = {"runs": 1, "value": record.get("value", 0)}
+    if timestamp:
+        counters["first_seen"] = counters["last_seen"] = timestamp
+    return when, (record.get("action", "unknown"),), counters
+
+
+def brute_force(records, start=None, end=None):
+    """Aggregate records directly, for comparison with queries."""
+    expected = {}
+    for record in records:
+        extracted = extract(record)
+        if extracted is None:
+            continue
+        when, group, counters = extracted
+        if when is not None:
+            if start is not None and when < start:
+                continue
+            if end is not None and when >= end:
+                continue
+        metrics_rollup.merge_cell(expected.setdefault(group, {}), counters)
+    return expected
+
+
+def make_records(count, seed=1, base=datetime(2026, 3, 1)):
+    """Random records over 10 days, plus one untimed and one skipped record."""
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        when = base + timedelta(seconds=rng.randrange(10 * 86400))
+        records.append({
+            "action": rng.choice(["a", "b", "c"]),
+            "timestamp": when.isoformat(),
+            "value": rng.randint(1, 5),
+        })
+    records.append({"action": "a", "value": 7})
+    records.append({"action": "b", "skip": True, "timestamp": base.isoformat()})
+    return records
+
+
+def write_lines(path, records, mode="w"):
+    """Write records as NDJSON lines."""
+    with open(path, mode) as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+class TestNormalizeTimestamp:
+    """Test timestamp normalization."""
+
+    def test_aware_converted_to_utc(self):
+        """Test that aware timestamps become naive UTC."""
+        assert metrics_rollup.normalize_timestamp("2026-01-01T02:00:00+02:00") == datetime(2026, 1, 1)
+        assert metrics_rollup.normalize_timestamp("2026-01-01T00:00:00Z") == datetime(2026, 1, 1)
+
+    def test_naive_kept(self):
+        """Test that naive datetimes are kept as is."""
+        assert metrics_rollup.normalize_timestamp(datetime(2026, 1, 1, 5)) == datetime(2026, 1, 1, 5)
+
+    def test_invalid(self):
+        """Test errors for unparseable timestamps."""
+        with pytest.raises(ValueError):
+            metrics_rollup.normalize_timestamp("yesterday")
+        with pytest.raises(TypeError):
+            metrics_rollup.normalize_timestamp(5)
+
+
+class TestMergeTopCounts:
+    """Test the bounded dict-valued counters kept in cells."""
+
+    def test_exact_within_capacity(self):
+        """Test that summaries are summed exactly while they fit."""
+        assert metrics_rollup.merge_top_counts({"a": 2}, {"a": 1, "b": 4}) == {"a": 3, "b": 4}
+
+    def test_bounded_and_keeps_heavy_labels(self, monkeypatch):
+        """Test that a cell never exceeds the capacity and frequent labels survive."""
+        monkeypatch.setattr(metrics_rollup, "TOP_COUNTS_CAPACITY", 10)
+        rng = random.Random(3)
+        cell = {}
+        occurrences = 0
+        for i in range(5000):
+            label = "heavy" if i % 4 == 0 else f"rare-{rng.randrange(100_000)}"
+            metrics_rollup.merge_cell(cell, {"reasons": {label: 1}})
+            occurrences += 1
+            assert len(cell["reasons"]) <= 10
+
+        assert cell["reasons"]["heavy"] >= 1250 - occurrences / 11
+
+
+class TestQuery:
+    """Test that windowed queries equal aggregating the raw records."""
+
+    @pytest.mark.parametrize("suffix", ["log", "json"])
+    def test_random_windows_match_raw(self, tmp_path, suffix):
+        """Test random [start, end) windows against a direct aggregation."""
+        records = make_records(600)
+        path = tmp_path / f"events.{suffix}"
+        if suffix == "json":
+            path.write_text(json.dumps(records))
+        else:
+            write_lines(path, records)
+
+        store = metrics_rollup.RollupStore(None, "test/1", extract)
+        assert store.update([str(path)]) == len(records)
+
+        rng = random.Random(7)
+        base = datetime(2026, 3, 1)
+        windows = [(None, None), (base + timedelta(days=3), None), (None, base + timedelta(days=2))]
+        for _ in range(40):
+            start = base + timedelta(seconds=rng.randrange(-86400, 11 * 86400))
+            end = start + timedelta(seconds=rng.randrange(1, 5 * 86400))
+            windows.append((start, end))
+        windows.append((base + timedelta(hours=5, minutes=10), base + timedelta(hours=5, minutes=50)))
+
+        for start, end in windows:
+            assert store.query(start, end) == brute_force(records, start, end), (start, end)
+
+    def test_raw_reads_limited_to_edge_hours(self, tmp_path):
+        """Test that only the partial start hour is read from the raw log."""
+        # Logs are appended in time order, so an hour's span is a small slice
+        records = sorted(make_records(300), key=lambda r: r.get("timestamp", ""))
+        path = tmp_path / "events.log"
+        write_lines(path, records)
+        store = metrics_rollup.RollupStore(None, "test/1", extract)
+        store.update([str(path)])
+
+        read = []
+        real_read_ranges = metrics_rollup._read_ranges
+
+        def recording(path, ranges):
+            read.extend(ranges)
+            return real_read_ranges(path, ranges)
+
+        start = datetime(2026, 3, 2, 7, 30)
+        with patch.object(metrics_rollup, "_read_ranges", recording):
+            result = store.query(start)
+
+        assert result == brute_force(records, start)
+        assert read == [store.spans[str(path)]["2026-03-02T07"]]
+        size = path.stat().st_size
+        assert sum(high - low for low, high in read) < size / 20
+
+    def test_retention_falls_back_to_raw(self, tmp_path, monkeypatch):
+        """Test queries reaching past the hourly retention stay exact."""
+        monkeypatch.setattr(metrics_rollup, "HOURLY_RETENTION_DAYS", 2)
+        records = make_records(300)
+        path = tmp_path / "events.log"
+        write_lines(path, records)
+        store = metrics_rollup.RollupStore(None, "test/1", extract)
+        store.update([str(path)])
+
+        assert store.hourly_floor
+        assert min(store.hourly) >= store.hourly_floor
+        for start in (datetime(2026, 3, 1, 3, 15), datetime(2026, 3, 9, 3, 15)):
+            assert store.query(start) == brute_force(records, start)
+
+
+class TestIncrementalUpdate:
+    """Test that updates fold only new data, and rebuild when needed."""
+
+    def test_appended_lines_folded_once(self, tmp_path):
+        """Test that a reloaded store folds only appended lines."""
+        records = make_records(100)
+        path = tmp_path / "events.log"
+        write_lines(path, records[:60])
+        state = tmp_path / "cache" / "rollup.json"
+
+        store = metrics_rollup.RollupStore.load(str(state), "test/1", extract)
+        assert store.update([str(path)]) == 60
+        store.save()
+
+        write_lines(path, records[60:], mode="a")
+        store = metrics_rollup.RollupStore.load(str(state), "test/1", extract)
+        assert store.update([str(path)]) == len(records) - 60
+        assert store.update([str(path)]) == 0
+        assert store.query() == brute_force(records)
+
+    def test_torn_tail_waits_for_completion(self, tmp_path):
+        """Test that a torn final line is folded once completed."""
+        path = tmp_path / "events.log"
+        write_lines(path, [{"action": "a", "timestamp": "2026-03-01T00:00:00"}])
+        with open(path, "a") as f:
+            f.write('{"action": "b", "timest')
+
+        store = metrics_rollup.RollupStore(None, "test/1", extract)
+        assert store.update([str(path)]) == 1
+
+        with open(path, "a") as f:
+            f.write('amp": "2026-03-01T01:00:00"}\n')
+        assert store.update([str(path)]) == 1
+        assert store.query()[("b",)]["runs"] == 1
+
+    def test_json_array_appends(self, tmp_path):
+        """Test that appended JSON-array elements are folded incrementally."""
+        records = make_records(50)
+        path = tmp_path / "events.json"
+        path.write_text(json.dumps(records[:20]))
+        store = metrics_rollup.RollupStore(None, "test/1", extract)
+        store.update([str(path)])
+
+        path.write_text(json.dumps(records))
+        assert store.update([str(path)]) == len(records) - 20
+        assert store.query() == brute_force(records)
+
+    def test_json_array_decodes_only_tail(self, tmp_path):
+        """Test that elements already folded are not decoded again."""
+        records = make_records(300)
+        path = tmp_path / "events.json"
+        path.write_text(json.dumps(records[:200], indent=2))
+        store = metrics_rollup.RollupStore(None, "test/1", extract)
+        store.update([str(path)])
+
+        # Break the first element, outside the fingerprinted bytes: a full
+        # parse of the file would fail, a tail decode never sees it
+        text = json.dumps(records, indent=2)
+        path.write_text("[ #" + text[3:])
+        assert store.update([str(path)]) == len(records) - 200
+        assert store.query() == brute_force(records)
+
+    def test_json_array_reformatted_rebuilds(self, tmp_path):
+        """Test that a JSON array written with different formatting is rebuilt."""
+        records = make_records(50)
+        path = tmp_path / "events.json"
+        path.write_text(json.dumps(records[:20], indent=2))
+        store = metrics_rollup.RollupStore(None, "test/1", extract)
+        store.update([str(path)])
+
+        path.write_text(json.dumps(records[5:]))
+        assert store.update([str(path)]) == len(records) - 5
+        assert store.query() == brute_force(records[5:])
+
+    def test_single_object_source(self, tmp_path):
+        """Test that a .json file holding one object counts as one record."""
+        path = tmp_path / "event.json"
+        path.write_text(json.dumps({"action": "a", "timestamp": "2026-03-01T00:00:00"}))
+        store = metrics_rollup.RollupStore(None, "test/1", extract)
+
+        assert store.update([str(path)]) == 1
+        assert store.update([str(path)]) == 0
+        assert store.query()[("a",)]["runs"] == 1
+
+    @pytest.mark.parametrize("change", ["truncate", "rewrite", "remove"])
+    def test_changed_sources_rebuild(self, tmp_path, change):
+        """Test that truncated, rewritten or removed sources trigger a rebuild."""
+        records = make_records(80)
+        path = tmp_path / "events.log"
+        other = tmp_path / "other.log"
+        write_lines(path, records[:40])
+        write_lines(other, records[40:])
+        store = metrics_rollup.RollupStore(None, "test/1", extract)
+        store.update([str(path), str(other)])
+
+        sources = [str(path), str(other)]
+        expected = records
+        if change == "truncate":
+            write_lines(path, records[:10])
+            expected = records[:10] + records[40:]
+        elif change == "rewrite":
+            write_lines(path, records[1:41])
+            expected = records[1:41] + records[40:]
+        else:
+            sources = [str(other)]
+            expected = records[40:]
+
+        store.update(sources)
+        assert store.query() == brute_force(expected)
+
+    def test_schema_mismatch_starts_empty(self, tmp_path):
+        """Test that a state file from another schema is ignored."""
+        path = tmp_path / "events.log"
+        write_lines(path, make_records(10))
+        state = tmp_path / "rollup.json"
+        store = metrics_rollup.RollupStore(str(state), "test/1", extract)
+        store.update([str(path)])
+        store.save()
+
+        assert metrics_rollup.RollupStore.load(str(state), "test/1", extract).sources
+        assert not metrics_rollup.RollupStore.load(str(state), "test/2", extract).sources
@@ -0,0 +1,206 @@
+"""Tests for the OTLP/JSON exporter."""
+
+import gzip
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import otlp_export
+from otlp_export import export_otlp, metrics_request, run_spans, traces_request
+
+TRACED_RUN = {
+    "action_name": "review-and-merge",
+    "timestamp": "2026-01-01T00:00:00Z",
+    "status": "failure",
+    "duration_ms": 32000,
+    "repository_anonymous_id": "a1b2c3d4e5f6a7b8",
+    "runner_os": "Linux",
+    "claude_cli_version": "1.2.3",
+    "error_type": "review failed",
+    "trace_id": "01767225600000000000-1-1",
+    "spans": [
+        {"name": "review-and-merge", "parent": None, "start_ms": 0, "duration_ms": 32000, "status": "failure"},
+        {"name": "gh-pr-diff", "parent": 0, "start_ms": 10, "duration_ms": 1000, "status": "success"},
+        {"name": "claude", "parent": 0, "start_ms": 1010, "duration_ms": 30000.5, "status": "incomplete"},
+    ],
+}
+PLAIN_RUN = {
+    "action_name": "auto-refactor",
+    "timestamp": "2026-01-01T01:00:00.000001Z",
+    "status": "success",
+    "duration_ms": 1500,
+    "repository_anonymous_id": "a1b2c3d4e5f6a7b8",
+    "runner_os": "macOS",
+    "claude_cli_version": "1.2.3",
+}
+
+
+class StandInReceiver(ThreadingHTTPServer):
+    """Minimal OTLP/HTTP receiver that keeps the JSON requests it accepts."""
+
+    def __init__(self, status=200):
+        super().__init__(("127.0.0.1", 0), _ReceiverHandler)
+        self.status = status
+        self.requests = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _ReceiverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        if self.path in ("/v1/traces", "/v1/metrics") and self.headers["Content-Type"] == "application/json":
+            self.server.requests.append((self.path, json.loads(body)))
+            status = self.server.status
+        else:
+            status = 404
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def receiver():
+    """Stand-in receiver on a free local port."""
+    server = StandInReceiver()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def attributes(item):
+    """OTLP KeyValue list as a plain dict."""
+    return {a["key"]: next(iter(a["value"].values())) for a in item["attributes"]}
+
+
+class TestConversion:
+    """Test converting runs into OTLP/JSON."""
+
+    def test_traced_run_spans(self):
+        """Test that step spans nest under the run's root span with OTLP encodings."""
+        root, diff, claude = run_spans(TRACED_RUN)
+
+        assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+        assert diff["traceId"] == claude["traceId"] == root["traceId"]
+        assert "parentSpanId" not in root
+        assert diff["parentSpanId"] == claude["parentSpanId"] == root["spanId"]
+        assert root["startTimeUnixNano"] == "1767225600000000000"
+        assert root["endTimeUnixNano"] == "1767225632000000000"
+        assert claude["startTimeUnixNano"] == "1767225601010000000"
+        assert claude["endTimeUnixNano"] == "1767225631010500000"
+        assert root["status"] == {"code": otlp_export.STATUS_CODE_ERROR, "message": "review failed"}
+        assert diff["status"] == {"code": otlp_export.STATUS_CODE_OK}
+        assert claude["status"]["code"] == otlp_export.STATUS_CODE_ERROR
+        assert attributes(root) == {
+            "action.name": "review-and-merge", "action.status": "failure", "error.type": "review failed",
+        }
+
+    def test_plain_run_ends_at_timestamp(self):
+        """Test that an untraced run, stamped when it finished, starts duration_ms earlier."""
+        (root,) = run_spans(PLAIN_RUN)
+
+        assert root["startTimeUnixNano"] == "1767229198500001000"
+        assert root["endTimeUnixNano"] == "1767229200000001000"
+
+        (resource,) = metrics_request([PLAIN_RUN])["resourceMetrics"]
+        (runs,) = resource["scopeMetrics"][0]["metrics"][0]["sum"]["dataPoints"]
+        assert (runs["startTimeUnixNano"], runs["timeUnixNano"]) == (
+            root["startTimeUnixNano"], root["endTimeUnixNano"],
+        )
+
+    def test_ids_are_stable(self):
+        """Test that exporting the same run twice gives the same IDs."""
+        assert run_spans(PLAIN_RUN) == run_spans(dict(PLAIN_RUN))
+        assert run_spans(PLAIN_RUN)[0]["traceId"] != run_spans({**PLAIN_RUN, "duration_ms": 1})[0]["traceId"]
+
+    def test_resources(self):
+        """Test that runs are grouped by runner OS, CLI version and anonymized repository."""
+        request = traces_request([TRACED_RUN, PLAIN_RUN, {"action_name": "x", "timestamp": "bogus"}])
+
+        resources = [attributes(r["resource"]) for r in request["resourceSpans"]]
+        assert resources == [
+            {"service.name": "ai-actions", "runner_os": "Linux", "claude_cli_version": "1.2.3",
+             "repository_anonymous_id": "a1b2c3d4e5f6a7b8"},
+            {"service.name": "ai-actions", "runner_os": "macOS", "claude_cli_version": "1.2.3",
+             "repository_anonymous_id": "a1b2c3d4e5f6a7b8"},
+        ]
+        assert [len(r["scopeSpans"][0]["spans"]) for r in request["resourceSpans"]] == [3, 1]
+
+    def test_metrics(self):
+        """Test run counters and duration histograms."""
+        request = metrics_request([TRACED_RUN, TRACED_RUN])
+
+        (resource,) = request["resourceMetrics"]
+        metrics = {m["name"]: m for m in resource["scopeMetrics"][0]["metrics"]}
+        (runs,) = metrics["actions.runs"]["sum"]["dataPoints"]
+        assert runs["asInt"] == "2"
+        assert attributes(runs) == {"action.name": "review-and-merge", "action.status": "failure"}
+        (duration,) = metrics["actions.duration"]["histogram"]["dataPoints"]
+        assert duration["count"] == "2" and duration["sum"] == 64000.0
+        assert sum(map(int, duration["bucketCounts"])) == 2
+        assert len(duration["bucketCounts"]) == len(duration["explicitBounds"]) + 1
+        steps = metrics["actions.step.duration"]["histogram"]["dataPoints"]
+        assert sorted(attributes(p)["step.name"] for p in steps) == ["claude", "gh-pr-diff"]
+
+
+class TestExport:
+    """Test batching runs to a file and to a receiver."""
+
+    def test_export_to_receiver(self, receiver):
+        """Test that batches are POSTed to /v1/traces and /v1/metrics."""
+        result = export_otlp([TRACED_RUN, PLAIN_RUN, PLAIN_RUN], endpoint=receiver.url, max_batch=2)
+
+        assert result == (3, 5, 0, 0)
+        assert [path for path, _ in receiver.requests] == ["/v1/traces", "/v1/metrics"] * 2
+        spans = [
+            span
+            for path, request in receiver.requests if path == "/v1/traces"
+            for resource in request["resourceSpans"]
+            for span in resource["scopeSpans"][0]["spans"]
+        ]
+        assert len(spans) == 5
+
+    def test_rejected_batches_are_counted(self, receiver):
+        """Test that batches the receiver refuses are reported as failed."""
+        receiver.status = 400
+        result = export_otlp([PLAIN_RUN], endpoint=receiver.url, backoff_seconds=0)
+        assert result.failed_batches == 1
+
+    def test_export_to_file(self, tmp_path):
+        """Test that each batch appends one trace and one metrics request line."""
+        output = tmp_path / "otlp.jsonl"
+
+        result = export_otlp([TRACED_RUN, PLAIN_RUN, {"action_name": "x"}], output=output)
+
+        assert result == (2, 4, 1, 0)
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        assert list(lines[0]) == ["resourceSpans"] and list(lines[1]) == ["resourceMetrics"]
+
+    def test_main(self, tmp_path, receiver):
+        """Test the command line against the stand-in receiver."""
+        data_path = tmp_path / "telemetry.log"
+        data_path.write_text(json.dumps(TRACED_RUN) + "\n" + json.dumps(PLAIN_RUN) + "\n")
+
+        with patch("sys.argv", ["otlp_export.py", "--input", str(data_path), "--endpoint", receiver.url]):
+            assert otlp_export.main() == 0
+
+        assert len(receiver.requests) == 2
@@ -0,0 +1,99 @@
+"""Tests for acceptance rate confidence intervals."""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import rate_intervals
+
+
+class TestWilsonInterval:
+    """Test the Wilson score interval."""
+
+    def test_known_values(self):
+        """Test against published 95% Wilson intervals."""
+        low, high = rate_intervals.wilson_interval(8, 10)
+        assert low == pytest.approx(0.4902, abs=1e-4)
+        assert high == pytest.approx(0.9433, abs=1e-4)
+
+    def test_extremes_stay_in_range(self):
+        """Test that 0% and 100% rates give non-degenerate intervals within [0, 1]."""
+        low, high = rate_intervals.wilson_interval(0, 5)
+        assert low == pytest.approx(0.0) and 0 < high < 1
+        low, high = rate_intervals.wilson_interval(5, 5)
+        assert 0 < low < 1 and high == pytest.approx(1.0)
+
+    def test_narrows_with_confidence_and_sample_size(self):
+        """Test that lower confidence and more reviews give narrower intervals."""
+        def width(interval):
+            return interval[1] - interval[0]
+
+        assert width(rate_intervals.wilson_interval(7, 10, 0.8)) < width(rate_intervals.wilson_interval(7, 10))
+        assert width(rate_intervals.wilson_interval(700, 1000)) < width(rate_intervals.wilson_interval(7, 10))
+
+    @pytest.mark.parametrize("confidence", [0, 1, 1.5])
+    def test_invalid_confidence(self, confidence):
+        """Test that confidence levels outside (0, 1) are rejected."""
+        with pytest.raises(ValueError):
+            rate_intervals.wilson_interval(1, 2, confidence)
+
+
+class TestBootstrapInterval:
+    """Test the exact percentile bootstrap interval."""
+
+    @pytest.mark.parametrize("successes,trials", [(8, 10), (45, 60), (1, 30), (700, 1000)])
+    def test_matches_resampling(self, successes, trials):
+        """Test that the exact quantiles agree with resampling the reviews."""
+        rng = random.Random(5)
+        reviews = [1] * successes + [0] * (trials - successes)
+        resamples = sorted(sum(rng.choices(reviews, k=trials)) for _ in range(4000))
+        expected_low = resamples[int(0.025 * len(resamples))] / trials
+        expected_high = resamples[int(0.975 * len(resamples)) - 1] / trials
+
+        low, high = rate_intervals.bootstrap_interval(successes, trials)
+        assert low == pytest.approx(expected_low, abs=2 / trials + 0.005)
+        assert high == pytest.approx(expected_high, abs=2 / trials + 0.005)
+
+    def test_all_or_nothing_groups(self):
+        """Test that groups without variation have a zero-width interval."""
+        assert rate_intervals.bootstrap_interval(0, 7) == (0.0, 0.0)
+        assert rate_intervals.bootstrap_interval(7, 7) == (1.0, 1.0)
+
+    def test_large_group(self):
+        """Test a million-review group stays close to the normal approximation."""
+        low, high = rate_intervals.bootstrap_interval(700_000, 1_000_000)
+        half = 1.96 * (0.7 * 0.3 / 1_000_000) ** 0.5
+        assert low == pytest.approx(0.7 - half, abs=2e-5)
+        assert high == pytest.approx(0.7 + half, abs=2e-5)
+
+
+class TestBuildIntervals:
+    """Test grouped intervals and change detection."""
+
+    def test_groups_and_changes(self):
+        """Test that only changes whose intervals separate are flagged."""
+        groups = {
+            "action": {"review-and-merge": [170, 260]},
+            "week": {"2026-06": [30, 60], "2026-05": [12, 20], "2026-07": [54, 60]},
+            "variant": {"treatment": [90, 100], "baseline": [50, 100], "other": [55, 100]},
+        }
+
+        result = rate_intervals.build_intervals(170, 260, groups)
+
+        assert result["confidence"] == 0.95
+        assert result["overall"]["acceptance_rate"] == 65.38
+        assert list(result["by_week"]) == ["2026-05", "2026-06", "2026-07"]
+        assert result["by_action"]["review-and-merge"]["reviews"] == 260
+        assert [(c["dimension"], c["from"], c["to"], c["direction"]) for c in result["changes"]] == [
+            ("week", "2026-06", "2026-07", "increase"),
+            ("variant", "baseline", "treatment", "increase"),
+        ]
+
+    def test_empty(self):
+        """Test intervals without reviews."""
+        result = rate_intervals.build_intervals(0, 0, {})
+        assert result["overall"]["wilson"] is None
+        assert result["by_week"] == {} and result["changes"] == []
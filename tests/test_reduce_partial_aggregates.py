@@ -0,0 +1,134 @@
+"""Tests for reduce_partial_aggregates.py."""
+
+import json
+import random
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import aggregate_metrics
+import reduce_partial_aggregates
+
+
+def make_runs(count, seed=3):
+    """Random metric entries for `count` runs; some runs empty, some untimed entries."""
+    rng = random.Random(seed)
+    runs = []
+    for _ in range(count):
+        run = []
+        for _ in range(rng.randrange(0, 6)):
+            made = rng.randint(0, 10)
+            run.append({
+                "action": rng.choice(["a", "b", "c"]),
+                "timestamp": rng.choice(["", f"2026-02-{rng.randint(1, 28):02d}T00:00:00"]),
+                "metrics": {
+                    "suggestions_made": made,
+                    "suggestions_accepted": rng.randint(0, made),
+                    "suggestions_rejected": rng.randint(0, 2),
+                },
+            })
+        runs.append(run)
+    return runs
+
+
+class TestTreeReduce:
+    """Test merging partial aggregates in a tree."""
+
+    @pytest.mark.parametrize("fan_in", [2, 3, 8, 100])
+    def test_matches_concatenated_raw_data(self, fan_in):
+        """Test that any fan-in gives the aggregate of the concatenated entries."""
+        runs = make_runs(57)
+        partials = [aggregate_metrics.PartialAggregate.from_entries(run) for run in runs]
+        concatenated = [entry for run in runs for entry in run]
+
+        merged = reduce_partial_aggregates.tree_reduce(partials, fan_in)
+        assert merged.finalize() == aggregate_metrics.aggregate_metrics(concatenated)
+
+    def test_empty_and_invalid_fan_in(self):
+        """Test reducing nothing, and rejecting a fan-in below 2."""
+        assert reduce_partial_aggregates.tree_reduce([]) == aggregate_metrics.PartialAggregate()
+        with pytest.raises(ValueError):
+            reduce_partial_aggregates.tree_reduce([], fan_in=1)
+
+
+class TestMainFunction:
+    """Test the reducer CLI end to end."""
+
+    def _emit(self, root, entries, partial_path):
+        metrics_dir = Path(root) / "metrics"
+        metrics_dir.mkdir(parents=True)
+        (metrics_dir / "run.ndjson").write_text("".join(json.dumps(e) + "\n" for e in entries))
+        with patch("sys.argv", [
+            "aggregate_metrics.py",
+            "--root-dir", str(root),
+            "--output", str(Path(root) / "output.json"),
+            "--emit-partial", str(partial_path),
+        ]):
+            aggregate_metrics.main()
+
+    def _reduce(self, *argv):
+        with patch("sys.argv", ["reduce_partial_aggregates.py", *argv]):
+            return reduce_partial_aggregates.main()
+
+    def test_hierarchical_reduce_matches_single_run(self, temp_dir, capsys):
+        """Test runner partials reduced in two stages equal one run over all data."""
+        runs = make_runs(9)
+        partial_paths = []
+        for i, run in enumerate(runs):
+            partial_paths.append(str(Path(temp_dir) / "partials" / f"run-{i}.json"))
+            self._emit(Path(temp_dir) / f"run-{i}", run, partial_paths[-1])
+
+        shard_paths = []
+        for shard, start in enumerate(range(0, len(runs), 4)):
+            shard_paths.append(str(Path(temp_dir) / "shards" / f"{shard}.json"))
+            self._reduce(*partial_paths[start:start + 4], "--partial-output", shard_paths[-1])
+        output_path = Path(temp_dir) / "reduced.json"
+        assert self._reduce(*shard_paths, "--output", str(output_path), "--fan-in", "2") == 0
+
+        self._emit(Path(temp_dir) / "all", [e for run in runs for e in run], Path(temp_dir) / "all.json")
+        expected = json.loads((Path(temp_dir) / "all" / "output.json").read_text())
+        reduced = json.loads(output_path.read_text())
+        assert reduced["by_action"] == expected["by_action"]
+        assert reduced["overall"] == expected["overall"]
+        assert reduced["sources"] == len(shard_paths)
+
+    def test_invalid_partial_skipped(self, temp_dir, capsys):
+        """Test that unreadable partials are reported and skipped."""
+        good = Path(temp_dir) / "good.json"
+        aggregate_metrics.PartialAggregate.from_entries([{"action": "a"}]).save(str(good))
+        bad = Path(temp_dir) / "bad.json"
+        bad.write_text("{not json")
+        output_path = Path(temp_dir) / "out" / "reduced.json"
+
+        self._reduce(str(good), str(bad), str(Path(temp_dir) / "missing.json"), "--output", str(output_path))
+
+        out = capsys.readouterr().out
+        assert "Loaded 1 of 3 partial aggregate(s)" in out
+        assert out.count("Warning: Could not load") == 2
+        assert json.loads(output_path.read_text())["sources"] == 1
+
+    def test_action_filter(self, temp_dir):
+        """Test --action for both output kinds."""
+        runs = make_runs(4)
+        partials = []
+        for i, run in enumerate(runs):
+            partials.append(str(Path(temp_dir) / f"p{i}.json"))
+            aggregate_metrics.PartialAggregate.from_entries(run).save(partials[-1])
+        concatenated = [entry for run in runs for entry in run]
+        expected = aggregate_metrics.aggregate_metrics(concatenated, "a")
+
+        output_path = Path(temp_dir) / "reduced.json"
+        self._reduce(*partials, "--action", "a", "--output", str(output_path))
+        assert json.loads(output_path.read_text())["by_action"] == expected
+
+        merged_path = Path(temp_dir) / "merged.json"
+        self._reduce(*partials, "--action", "a", "--partial-output", str(merged_path))
+        assert aggregate_metrics.PartialAggregate.load(str(merged_path)).finalize() == expected
+
+    def test_rejects_small_fan_in(self, temp_dir):
+        """Test that --fan-in below 2 is an error."""
+        with pytest.raises(SystemExit):
+            self._reduce("p.json", "--fan-in", "1")
@@ -0,0 +1,164 @@
+"""Tests for the review metrics columnar cache."""
+
+import json
+import os
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import benchmark_review_columns
+import review_columns
+
+REVIEWS = [
+    {"outcome": "approved", "repo_id": "r1", "timestamp": "2026-02-07T12:00:00Z",
+     "suggestions_count": 3, "accepted_count": 2, "confidence_score": 0.85},
+    {"outcome": "rejected", "timestamp": "2026-02-06T23:30:00-05:00",
+     "rejection_reasons": ["Too verbose", "Out of scope"], "confidence_score": 1},
+    {"outcome": "needs_work", "repo_id": "r2", "timestamp": "not-a-date",
+     "rejection_reasons": "Missing tests"},
+    {"repo_id": "r1", "timestamp": "", "suggestions_count": None, "accepted_count": 0},
+]
+
+
+def write_reviews(path, reviews):
+    """Write reviews as a JSON array."""
+    path.write_text(json.dumps(reviews))
+
+
+class TestEncoding:
+    """Test how reviews map to columns."""
+
+    def test_columns_and_dictionaries(self):
+        """Test column values for each kind of field."""
+        columns = review_columns.ReviewColumns.from_reviews(REVIEWS)
+
+        assert columns.rows == 4
+        assert columns.outcomes == ["approved", "rejected", "needs_work", "unknown"]
+        assert columns.repo_ids == ["r1", None, "r2"]
+        assert list(columns.outcome) == [0, 1, 2, 3]
+        assert list(columns.repo) == [0, 1, 2, 0]
+        assert list(columns.ts_state) == [
+            review_columns.TS_VALID, review_columns.TS_VALID,
+            review_columns.TS_INVALID, review_columns.TS_MISSING,
+        ]
+        assert columns.ts_offset[1] == -5 * 3600
+        assert review_columns.local_datetime(columns.ts_us[1], columns.ts_offset[1]).hour == 23
+        assert list(columns.suggestions) == [3, 0, 0, 0]
+        assert [flag & review_columns.HAS_ACCEPTED for flag in columns.flags] == [1, 0, 0, 1]
+        assert list(columns.confidence) == [0.85, 1.0, 0.0, 0.0]
+        assert list(columns.reason_start) == [0, 0, 2, 3, 3]
+        assert [columns.reasons_text[code] for code in columns.reasons] == [
+            "Too verbose", "Out of scope", "Missing tests",
+        ]
+        assert columns.flags[2] & review_columns.REASON_SCALAR
+        assert list(columns.reason_row) == [1, 1, 2]
+        assert columns.ts_us[2] == review_columns.INVALID_US
+        assert columns.ts_us[3] == review_columns.UNTIMED_US
+        assert list(columns.ts_order) == [2, 1, 0, 3]
+
+    def test_window_rows(self):
+        """Test bisecting the timestamp order for a window start."""
+        columns = review_columns.ReviewColumns.from_reviews(REVIEWS)
+        start = review_columns.epoch_us(datetime(2026, 2, 7, tzinfo=UTC))
+        # The -05:00 review is 2026-02-07T04:30Z; the untimed review is always included
+        assert list(review_columns.window_rows(columns, start)) == [1, 0, 3]
+        assert list(review_columns.window_rows(columns, start + 5 * 3600 * 10 ** 6)) == [0, 3]
+
+    @pytest.mark.parametrize("review", [
+        "not a dict",
+        {"timestamp": "2026-02-07T12:00:00"},
+        {"outcome": None},
+        {"repo_id": 7},
+        {"suggestions_count": 2.5},
+        {"confidence_score": None},
+        {"rejection_reasons": None},
+        {"rejection_reasons": [1]},
+        {"accepted_count": 2 ** 70},
+    ])
+    def test_unrepresentable_reviews_rejected(self, review):
+        """Test that reviews the columns cannot reproduce exactly raise ValueError."""
+        with pytest.raises(ValueError):
+            review_columns.encode_reviews([review])
+
+
+class TestCacheFile:
+    """Test writing, mapping and invalidating the cache file."""
+
+    def test_mapped_columns_match_encoded(self, tmp_path):
+        """Test that the mapped file holds the same columns as the in-memory encoding."""
+        json_path = tmp_path / "review_metrics.json"
+        write_reviews(json_path, REVIEWS)
+
+        mapped = review_columns.load_review_columns(str(json_path))
+        encoded = review_columns.ReviewColumns.from_reviews(REVIEWS)
+
+        assert Path(review_columns.cache_path(str(json_path))).exists()
+        assert mapped.source["size"] == json_path.stat().st_size
+        for name in review_columns.COLUMN_TYPES:
+            assert getattr(mapped, name).tolist() == getattr(encoded, name).tolist(), name
+            assert isinstance(getattr(mapped, name), memoryview)
+        assert mapped.outcomes == encoded.outcomes
+        assert mapped.reasons_text == encoded.reasons_text
+
+    def test_rebuilt_only_when_json_changes(self, tmp_path, monkeypatch):
+        """Test that a fresh cache is reused and a stale one rebuilt."""
+        json_path = tmp_path / "review_metrics.json"
+        write_reviews(json_path, REVIEWS)
+        review_columns.load_review_columns(str(json_path))
+
+        builds = []
+        real_encode = review_columns.encode_reviews
+        monkeypatch.setattr(
+            review_columns, "encode_reviews", lambda reviews: builds.append(1) or real_encode(reviews)
+        )
+        assert review_columns.load_review_columns(str(json_path)).rows == 4
+        assert builds == []
+
+        write_reviews(json_path, REVIEWS + [{"outcome": "approved"}])
+        assert review_columns.load_review_columns(str(json_path)).rows == 5
+        assert builds == [1]
+
+    def test_corrupt_cache_rebuilt(self, tmp_path):
+        """Test that an unreadable cache file is replaced."""
+        json_path = tmp_path / "review_metrics.json"
+        write_reviews(json_path, REVIEWS)
+        Path(review_columns.cache_path(str(json_path))).write_bytes(b"RVCOLS01garbage")
+
+        assert review_columns.load_review_columns(str(json_path)).rows == 4
+        assert review_columns.ReviewColumns.open(review_columns.cache_path(str(json_path))).rows == 4
+
+    def test_unwritable_directory_served_from_memory(self, tmp_path, monkeypatch):
+        """Test that a cache that cannot be written still yields columns."""
+        json_path = tmp_path / "review_metrics.json"
+        write_reviews(json_path, REVIEWS)
+
+        def fail(*args):
+            raise PermissionError("read-only")
+
+        monkeypatch.setattr(review_columns, "write_columns", fail)
+        assert review_columns.load_review_columns(str(json_path)).rows == 4
+
+    @pytest.mark.parametrize("content", [None, "{not json", '{"reviews": []}', '[{"outcome": 1}]'])
+    def test_unusable_json_returns_none(self, tmp_path, content):
+        """Test that missing, invalid or unrepresentable JSON gives None and no cache."""
+        json_path = tmp_path / "review_metrics.json"
+        if content is not None:
+            json_path.write_text(content)
+
+        assert review_columns.load_review_columns(str(json_path)) is None
+        assert not os.path.exists(review_columns.cache_path(str(json_path)))
+
+
+class TestBenchmark:
+    """Test the load-time benchmark at a small scale."""
+
+    def test_benchmark_runs(self, tmp_path):
+        """Test that the benchmark reports identical statistics."""
+        filepath = str(tmp_path / "review_metrics.json")
+        benchmark_review_columns.write_synthetic_reviews(filepath, 300)
+        result = benchmark_review_columns.run_benchmark(filepath, repeats=1)
+        assert result["reviews"] == 300
+        assert result["identical"]
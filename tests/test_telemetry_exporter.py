@@ -0,0 +1,172 @@
+"""Tests for the HTTP telemetry exporter and the reference collector."""
+
+import gzip
+import http.client
+import json
+import sys
+import threading
+import time
+import urllib.request
+import zlib
+from pathlib import Path
+from urllib.error import HTTPError
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import benchmark_telemetry_exporter
+import telemetry_exporter
+from telemetry_collector import TelemetryCollector
+from telemetry_exporter import CollectorConnection, TelemetryExporter
+
+
+@pytest.fixture
+def collector(tmp_path):
+    """Reference collector on a free local port."""
+    server = TelemetryCollector(("127.0.0.1", 0), tmp_path / "telemetry.log")
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def read_log(path):
+    return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+
+def truncated_gzip(lines):
+    """A gzip stream cut off after complete lines, so what it holds is valid NDJSON."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    return compressor.compress(lines) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def post(url, body, headers):
+    request = urllib.request.Request(url, data=body, method="POST", headers=headers)
+    with urllib.request.urlopen(request) as response:
+        return response.status, json.loads(response.read())
+
+
+class TestCollector:
+    """Test the reference collector."""
+
+    def test_appends_gzip_and_plain_batches(self, collector):
+        """Test that both encodings are appended in the telemetry.log format."""
+        body = b'{"seq": 0}\n{"seq": 1}\n'
+
+        assert post(collector.url, gzip.compress(body), {"Content-Encoding": "gzip"}) == (200, {"accepted": 2})
+        assert post(collector.url, b'{"seq": 2}', {}) == (200, {"accepted": 1})
+
+        assert [e["seq"] for e in read_log(collector.log_file)] == [0, 1, 2]
+        assert collector.received == 3
+
+    @pytest.mark.parametrize("body,headers", [
+        (b'{"seq": 0}\n{truncated\n', {}),
+        (b"not gzip", {"Content-Encoding": "gzip"}),
+        (truncated_gzip(b'{"seq": 0}\n'), {"Content-Encoding": "gzip"}),
+    ])
+    def test_rejects_invalid_batches(self, collector, body, headers):
+        """Test that invalid batches get a 400 and nothing is appended."""
+        with pytest.raises(HTTPError) as exc_info:
+            post(collector.url, body, headers)
+
+        assert exc_info.value.code == 400
+        assert not collector.log_file.exists()
+
+    @pytest.mark.parametrize("length", [None, "lots", "-1"])
+    def test_rejects_bad_content_length(self, collector, length):
+        """Test that a missing or malformed Content-Length gets an error response."""
+        connection = http.client.HTTPConnection(*collector.server_address, timeout=5)
+        try:
+            connection.putrequest("POST", "/events")
+            if length is not None:
+                connection.putheader("Content-Length", length)
+            connection.endheaders(b'{"seq": 0}\n')
+            response = connection.getresponse()
+            status = response.status
+        finally:
+            connection.close()
+
+        assert status == (411 if length is None else 400)
+        assert not collector.log_file.exists()
+
+
+class TestCollectorConnection:
+    """Test the keep-alive collector connection."""
+
+    def test_reuses_connection(self, collector):
+        """Test that consecutive posts share one connection."""
+        connection = CollectorConnection(collector.url)
+        for i in range(5):
+            assert connection.post(json.dumps({"seq": i}).encode() + b"\n") == 200
+        connection.close()
+
+        assert (connection.requests, connection.connections) == (5, 1)
+        assert [e["seq"] for e in read_log(collector.log_file)] == list(range(5))
+
+    def test_reconnects_after_closed_connection(self, collector):
+        """Test that a dropped keep-alive connection is replaced transparently."""
+        connection = CollectorConnection(collector.url)
+        assert connection.post(b'{"seq": 0}\n') == 200
+        connection._connection.sock.close()
+
+        assert connection.post(b'{"seq": 1}\n') == 200
+        assert connection.connections == 2
+
+    def test_invalid_endpoint(self):
+        """Test that non-HTTP endpoints are rejected."""
+        with pytest.raises(ValueError):
+            CollectorConnection("ftp://collector.example/events")
+
+
+class TestExporter:
+    """Test batching by size and latency."""
+
+    def test_batches_by_size(self, collector):
+        """Test that full batches are sent as one request each."""
+        with TelemetryExporter(collector.url, max_batch=4, max_latency=60) as exporter:
+            for i in range(10):
+                exporter.export({"seq": i})
+            assert exporter.connection.requests == 2
+
+        assert exporter.connection.requests == 3
+        assert exporter.exported == 10
+        assert [e["seq"] for e in read_log(collector.log_file)] == list(range(10))
+
+    def test_partial_batch_sent_after_max_latency(self, collector):
+        """Test that a partial batch is sent once its oldest event is max_latency old."""
+        with TelemetryExporter(collector.url, max_batch=100, max_latency=0.05) as exporter:
+            exporter.export({"seq": 0})
+            deadline = time.monotonic() + 5
+            while exporter.exported == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert exporter.exported == 1
+            assert collector.received == 1
+
+    def test_unreachable_collector_drops_batch(self, monkeypatch, capsys):
+        """Test that batches are dropped and counted when the collector stays down."""
+        monkeypatch.setattr(telemetry_exporter.time, "sleep", lambda _: None)
+        exporter = TelemetryExporter("http://127.0.0.1:9/events", max_batch=2, retries=1, timeout=1)
+        exporter.export({"seq": 0})
+        exporter.close()
+
+        assert (exporter.exported, exporter.dropped) == (0, 1)
+        assert "Dropped 1 telemetry events" in capsys.readouterr().err
+        with pytest.raises(ValueError):
+            exporter.export({"seq": 1})
+
+
+class TestLoadBenchmark:
+    """Test the local load test."""
+
+    def test_no_events_lost(self, tmp_path):
+        """Test a small load run end to end."""
+        result = benchmark_telemetry_exporter.run_benchmark(
+            str(tmp_path / "telemetry.log"), events=2000, max_batch=250
+        )
+
+        assert result["lost"] == 0
+        assert result["logged"] == 2000
+        assert result["requests"] == 8
+        assert result["connections"] == 1
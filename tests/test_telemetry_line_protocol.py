@@ -0,0 +1,153 @@
+"""Tests for the spool line protocol written by bash steps."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import benchmark_spool_ingestion
+import collect_metrics
+from telemetry_line_protocol import format_line, parse_line
+from telemetry_spool import flush_spool, spool_event
+
+TELEMETRY_SH = Path(__file__).parent.parent / "scripts" / "telemetry.sh"
+requires_bash = pytest.mark.skipif(shutil.which("bash") is None, reason="requires bash")
+
+
+def read_log(path):
+    return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+
+def record(spool_dir, *args, env=None):
+    """Call record_telemetry from telemetry.sh in a bash process."""
+    command = f'source "{TELEMETRY_SH}"; record_telemetry "$@"'
+    subprocess.run(
+        ["bash", "-c", command, "bash", *args],
+        env={"PATH": os.environ["PATH"], "TELEMETRY_SPOOL_DIR": str(spool_dir), **(env or {})},
+        check=True,
+    )
+
+
+class TestParseLine:
+    """Test parsing protocol lines into events."""
+
+    def test_round_trip(self):
+        """Test that a formatted line parses into a collect_metrics-style event."""
+        line = format_line("review-and-merge", "failure", 1234, "acme/repo", "Linux", "1.2.3",
+                           "Timeout\twhile\nwaiting", epoch_us=1_767_225_600_000_001)
+
+        event = parse_line(line)
+
+        assert event == {
+            "action_name": "review-and-merge",
+            "timestamp": "2026-01-01T00:00:00.000001Z",
+            "status": "failure",
+            "duration_ms": 1234,
+            "repository_anonymous_id": collect_metrics.anonymize_repository("acme/repo"),
+            "runner_os": "Linux",
+            "claude_cli_version": "1.2.3",
+            "error_type": "Timeout while waiting",
+        }
+
+    def test_defaults_and_invalid_status(self):
+        """Test empty optional fields and an unknown status."""
+        event = parse_line("ct1\t1767225600000000\ta\tbogus\t5\t\t\t\t\n")
+
+        assert event["status"] == "error"
+        assert event["repository_anonymous_id"] == "unknown"
+        assert event["timestamp"] == "2026-01-01T00:00:00Z"
+        assert "error_type" not in event
+
+    @pytest.mark.parametrize("text", [
+        "ct1\t1\ta\tsuccess\t5\tr\tLinux\t1.0\t",          # no trailing newline
+        "ct2\t1\ta\tsuccess\t5\tr\tLinux\t1.0\t\n",        # unknown protocol
+        "ct1\t1\ta\tsuccess\t5\tr\tLinux\n",               # missing fields
+        "ct1\t1\ta\tsuccess\tfast\tr\tLinux\t1.0\t\n",     # duration not an integer
+        "ct1\t1\t\tsuccess\t5\tr\tLinux\t1.0\t\n",         # no action
+        "ct1\t1\ta\tsuccess\t5\tr\tLinux\t1.0\t\nct1\n",   # two lines
+    ])
+    def test_invalid_lines(self, text):
+        """Test that malformed lines are rejected."""
+        with pytest.raises(ValueError):
+            parse_line(text)
+
+
+class TestImport:
+    """Test importing line-protocol files with the spool flusher."""
+
+    def test_mixed_spool_in_arrival_order(self, tmp_path):
+        """Test that JSON and line-protocol events are logged together in order."""
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        spool_event({"action_name": "first"}, spool)
+        (spool / "09000000000000000000-1-1.evt").write_text(format_line("second", "success", 1, "o/r", "Linux", "1"))
+        (spool / "09000000000000000001-1-2.evt").write_text(format_line("third", "success", 2, "o/r", "Linux", "1"))
+
+        assert flush_spool(spool, log) == (3, 0, 0)
+        assert [e["action_name"] for e in read_log(log)] == ["first", "second", "third"]
+        assert list(spool.glob("*.evt")) == []
+
+    def test_incomplete_file_waits_then_set_aside(self, tmp_path, monkeypatch):
+        """Test that a file still being written is left alone until it is too old."""
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        spool.mkdir()
+        partial = spool / f"{time.time_ns():020d}-1-1.evt"
+        partial.write_text("ct1\t1\treview")
+
+        assert flush_spool(spool, log) == (0, 0, 1)
+        assert partial.exists()
+
+        monkeypatch.setattr("telemetry_spool.INCOMPLETE_GRACE_SECONDS", 0)
+        assert flush_spool(spool, log) == (0, 0, 0)
+        assert partial.with_suffix(".bad").exists()
+
+
+@requires_bash
+class TestTelemetrySh:
+    """Test the bash writer."""
+
+    def test_record_and_import(self, tmp_path):
+        """Test that events written by bash are anonymized and logged."""
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        record(spool, "review-and-merge", "success", "1500",
+               env={"GITHUB_REPOSITORY": "acme/repo", "RUNNER_OS": "Linux"})
+        record(spool, "auto-refactor", "failure", "700", "Bad\tinput\nhere")
+
+        files = sorted(spool.glob("*.evt"))
+        assert len(files) == 2 and all(len(f.name.split("-")[0]) == 20 for f in files)
+
+        assert flush_spool(spool, log).logged == 2
+        first, second = read_log(log)
+        assert first["repository_anonymous_id"] == collect_metrics.anonymize_repository("acme/repo")
+        assert "acme" not in log.read_text()
+        assert second["error_type"] == "Bad input here"
+        assert second["repository_anonymous_id"] == "unknown"
+
+    def test_disabled(self, tmp_path):
+        """Test that DISABLE_TELEMETRY stops bash from spooling."""
+        record(tmp_path / "spool", "a", "success", "1", env={"DISABLE_TELEMETRY": "TRUE"})
+        assert not (tmp_path / "spool").exists()
+
+    def test_collect_metrics_keeps_order_behind_spooled_events(self, tmp_path, monkeypatch):
+        """Test that the direct append path is skipped while bash events wait in the spool."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("TELEMETRY_ENDPOINT", raising=False)
+        monkeypatch.delenv("TELEMETRY_FLUSH_THRESHOLD", raising=False)
+        record(tmp_path / "metrics" / "telemetry" / "spool", "from-bash", "success", "1")
+
+        collect_metrics.send_metrics({"action_name": "from-python", "status": "success"})
+
+        log = tmp_path / "metrics" / "telemetry" / "telemetry.log"
+        assert [e["action_name"] for e in read_log(log)] == ["from-bash", "from-python"]
+
+    def test_benchmark(self):
+        """Test the per-event cost comparison on a few events."""
+        result = benchmark_spool_ingestion.run_benchmark(3)
+
+        assert result["python_logged"] == result["spool_logged"] == 3
+        assert result["spool_us"] < result["python_us"]
@@ -0,0 +1,111 @@
+"""Tests for the mmap-backed telemetry.log reader."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import benchmark_telemetry_reader
+import telemetry_reader
+from telemetry_reader import read_events
+
+EVENTS = [
+    {"action_name": "review-and-merge", "status": "success", "duration_ms": 1200,
+     "timestamp": "2026-01-01T00:00:00Z", "runner_os": "Linux"},
+    {"action_name": "review-and-merge", "status": "failure", "error_type": "timeout",
+     "timestamp": "2026-01-01T00:01:00Z", "spans": [{"name": "claude"}]},
+]
+
+
+@pytest.fixture(params=["json", "orjson"])
+def parser(request, monkeypatch):
+    """Run each test with the json fallback and, when installed, with orjson."""
+    if request.param == "json":
+        monkeypatch.setattr(telemetry_reader, "orjson", None)
+    else:
+        pytest.importorskip("orjson")
+    return request.param
+
+
+def write_log(path, text):
+    path.write_text(text)
+    return path
+
+
+class TestReadEvents:
+    """Test parsing telemetry.log lines into events."""
+
+    def test_full_events(self, tmp_path, parser):
+        """Test that events are returned whole, in file order."""
+        log = write_log(tmp_path / "telemetry.log", "".join(json.dumps(e) + "\n" for e in EVENTS))
+        assert list(read_events(log)) == EVENTS
+
+    def test_projection(self, tmp_path):
+        """Test that with orjson only the requested fields are kept and repeated strings are shared."""
+        pytest.importorskip("orjson")
+        log = write_log(tmp_path / "telemetry.log", "".join(json.dumps(e) + "\n" for e in EVENTS))
+
+        first, second = read_events(log, fields=("action_name", "status", "error_type", "duration_ms"))
+
+        assert first == {"action_name": "review-and-merge", "status": "success", "duration_ms": 1200}
+        assert second == {"action_name": "review-and-merge", "status": "failure", "error_type": "timeout"}
+        assert first["action_name"] is second["action_name"]
+
+    def test_json_fallback_keeps_whole_events(self, tmp_path, monkeypatch):
+        """Test that without orjson events are read whole, as the text loader did."""
+        monkeypatch.setattr(telemetry_reader, "orjson", None)
+        log = write_log(tmp_path / "telemetry.log", "".join(json.dumps(e) + "\n" for e in EVENTS))
+
+        assert list(read_events(log, fields=("action_name", "status"))) == EVENTS
+
+    def test_blank_and_invalid_lines(self, tmp_path, parser):
+        """Test that blank lines are skipped and invalid lines are reported by line number."""
+        log = write_log(
+            tmp_path / "telemetry.log",
+            '{"a": 1}\n\n   \r\n{"a": 2\n[1, 2]\n\xe9\n  {"a": 3}  \r\n{"a": 4}',
+        )
+        errors = []
+
+        events = list(read_events(log, fields=("a",), on_error=lambda n, e: errors.append(n)))
+
+        assert events == [{"a": 1}, {"a": 3}, {"a": 4}]
+        assert errors == [4, 5, 6]
+
+    def test_invalid_lines_skipped_silently(self, tmp_path, parser):
+        """Test that without on_error invalid lines are skipped."""
+        log = write_log(tmp_path / "telemetry.log", 'not json\n{"a": 1}\n')
+        assert list(read_events(log)) == [{"a": 1}]
+
+    def test_empty_file(self, tmp_path, parser):
+        """Test that an empty file, which cannot be mapped, yields nothing."""
+        assert list(read_events(write_log(tmp_path / "telemetry.log", ""))) == []
+
+    def test_stop_early(self, tmp_path, parser):
+        """Test that abandoning the iterator releases the mapping."""
+        log = write_log(tmp_path / "telemetry.log", '{"a": 1}\n{"a": 2}\n')
+
+        events = read_events(log)
+        assert next(events) == {"a": 1}
+        events.close()
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing file raises OSError."""
+        with pytest.raises(OSError):
+            list(read_events(tmp_path / "missing.log"))
+
+
+class TestBenchmark:
+    """Test the reader benchmark on a small log."""
+
+    def test_loaders_agree(self, tmp_path):
+        """Test that every loader reads all synthetic events."""
+        log = str(tmp_path / "telemetry.log")
+        events = benchmark_telemetry_reader.write_synthetic_log(log, 1)
+
+        results = benchmark_telemetry_reader.run_benchmark(log, ["legacy", "reader (json)"])
+
+        assert events == benchmark_telemetry_reader.BLOCK_EVENTS
+        assert [r["events"] for r in results.values()] == [events, events]
+        assert all(r["max_rss_kib"] > 0 for r in results.values())
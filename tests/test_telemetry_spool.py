@@ -0,0 +1,211 @@
+"""Tests for the telemetry spool and batch flusher."""
+
+import gzip
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import telemetry_spool
+from telemetry_spool import flush_spool, should_flush, spool_event
+
+
+class StandInCollector:
+    """Local HTTP collector that fails the first `failures` requests with `status`."""
+
+    def __init__(self, failures=0, status=503):
+        self.failures = failures
+        self.status = status
+        self.requests = 0
+        self.batches = []
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                collector.requests += 1
+                if collector.failures:
+                    collector.failures -= 1
+                    self.send_response(collector.status)
+                else:
+                    collector.batches.append([json.loads(line) for line in body.splitlines()])
+                    self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/events"
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def read_log(path):
+    return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+
+class TestSpool:
+    """Test writing events to the spool."""
+
+    def test_spool_event_is_atomic_file(self, tmp_path):
+        """Test that each event becomes one complete file and no temp file remains."""
+        spool = tmp_path / "spool"
+        path = spool_event({"action_name": "a", "duration_ms": 5}, spool)
+
+        assert path.suffix == ".json"
+        assert json.loads(path.read_text()) == {"action_name": "a", "duration_ms": 5}
+        assert list(spool.glob("*.tmp")) == []
+
+    def test_spooled_events_in_arrival_order(self, tmp_path):
+        """Test that spooled files sort in the order events were written."""
+        for i in range(20):
+            spool_event({"seq": i}, tmp_path)
+
+        events = telemetry_spool.spooled_events(tmp_path)
+        assert [json.loads(p.read_text())["seq"] for p in events] == list(range(20))
+
+    def test_should_flush(self, tmp_path):
+        """Test the count and age flush triggers."""
+        assert not should_flush(tmp_path, threshold=1)
+        spool_event({"seq": 0}, tmp_path)
+        assert should_flush(tmp_path, threshold=1)
+        assert not should_flush(tmp_path, threshold=2)
+        assert should_flush(tmp_path, threshold=2, max_age_seconds=0)
+
+
+class TestFlush:
+    """Test flushing the spool into the log."""
+
+    def test_batches_appended_in_order(self, tmp_path, monkeypatch):
+        """Test that events are appended in order with one write per batch."""
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        log.write_text(json.dumps({"seq": -1}) + "\n")
+        for i in range(10):
+            spool_event({"seq": i}, spool)
+
+        writes = []
+        append_batch = telemetry_spool.append_batch
+
+        def recording_append(log_file, payload):
+            writes.append(payload)
+            append_batch(log_file, payload)
+
+        monkeypatch.setattr(telemetry_spool, "append_batch", recording_append)
+
+        result = flush_spool(spool, log, max_batch=4)
+
+        assert result == (10, 0, 0)
+        assert [e["seq"] for e in read_log(log)] == list(range(-1, 10))
+        assert [payload.count(b"\n") for payload in writes] == [4, 4, 2]
+        assert telemetry_spool.spooled_events(spool) == []
+
+    def test_invalid_event_set_aside(self, tmp_path):
+        """Test that an unreadable spool file is renamed instead of blocking the flush."""
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        spool_event({"seq": 0}, spool)
+        (spool / "00000000000000000001-1-bad.json").write_text("{truncated")
+
+        assert flush_spool(spool, log).logged == 1
+        assert [p.suffix for p in spool.iterdir() if p.name != telemetry_spool.LOCK_NAME] == [".bad"]
+
+    @pytest.mark.skipif(telemetry_spool.fcntl is None, reason="requires fcntl")
+    def test_concurrent_flush_skipped(self, tmp_path):
+        """Test that a second flusher leaves the spool to the one holding the lock."""
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        spool_event({"seq": 0}, spool)
+
+        with telemetry_spool._flush_lock(spool) as acquired:
+            assert acquired
+            assert flush_spool(spool, log) == (0, 0, 1)
+        assert flush_spool(spool, log) == (1, 0, 0)
+
+
+class TestDelivery:
+    """Test shipping batches to a collector endpoint."""
+
+    def test_ships_batches(self, tmp_path):
+        """Test that each batch is POSTed as NDJSON."""
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        for i in range(5):
+            spool_event({"seq": i}, spool)
+
+        with StandInCollector() as collector:
+            result = flush_spool(spool, log, collector.url, max_batch=3)
+
+        assert result == (5, 5, 0)
+        assert [[e["seq"] for e in batch] for batch in collector.batches] == [[0, 1, 2], [3, 4]]
+
+    def test_retries_with_backoff(self, tmp_path, monkeypatch):
+        """Test that transient failures are retried with growing delays."""
+        delays = []
+        monkeypatch.setattr(telemetry_spool.time, "sleep", delays.append)
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        spool_event({"seq": 0}, spool)
+
+        with StandInCollector(failures=2) as collector:
+            result = flush_spool(spool, log, collector.url, backoff_seconds=0.1)
+
+        assert result == (1, 1, 0)
+        assert collector.requests == 3
+        assert delays == [0.1, 0.2]
+
+    def test_outbox_retried_on_next_flush(self, tmp_path, monkeypatch):
+        """Test that batches that keep failing are kept and shipped by a later flush."""
+        monkeypatch.setattr(telemetry_spool.time, "sleep", lambda _: None)
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        for i in range(3):
+            spool_event({"seq": i}, spool)
+
+        with StandInCollector(failures=100) as collector:
+            result = flush_spool(spool, log, collector.url, max_batch=2, retries=1)
+            # The endpoint is treated as down after the first batch fails
+            assert collector.requests == 2
+        assert result == (3, 0, 3)
+        assert [e["seq"] for e in read_log(log)] == [0, 1, 2]
+
+        spool_event({"seq": 3}, spool)
+        with StandInCollector() as collector:
+            result = flush_spool(spool, log, collector.url)
+
+        assert result == (1, 4, 0)
+        assert [[e["seq"] for e in batch] for batch in collector.batches] == [[0, 1], [2], [3]]
+        assert [e["seq"] for e in read_log(log)] == [0, 1, 2, 3]
+
+    def test_rejected_batch_dropped(self, tmp_path, capsys):
+        """Test that a batch refused with a 4xx is not retried."""
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        spool_event({"seq": 0}, spool)
+
+        with StandInCollector(failures=1, status=400) as collector:
+            result = flush_spool(spool, log, collector.url)
+
+        assert result == (1, 0, 0)
+        assert collector.requests == 1
+        assert "HTTP 400" in capsys.readouterr().err
+
+    def test_unreachable_endpoint(self, tmp_path, monkeypatch):
+        """Test that connection errors keep the batch in the outbox."""
+        monkeypatch.setattr(telemetry_spool.time, "sleep", lambda _: None)
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        spool_event({"seq": 0}, spool)
+
+        with StandInCollector() as collector:
+            url = collector.url
+        result = flush_spool(spool, log, url, retries=1, timeout=1)
+
+        assert result == (1, 0, 1)
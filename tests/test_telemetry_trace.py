@@ -0,0 +1,273 @@
+"""Tests for per-step span traces and the trace report."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import collect_metrics
+import generate_trace_report
+from telemetry_spool import flush_spool
+from telemetry_trace import INCOMPLETE, critical_path, parse_trace, span_paths
+
+TELEMETRY_SH = Path(__file__).parent.parent / "scripts" / "telemetry.sh"
+requires_bash = pytest.mark.skipif(shutil.which("bash") is None, reason="requires bash")
+
+T0 = 1_767_225_600_000_000  # 2026-01-01T00:00:00Z in microseconds
+
+
+def markers(*lines):
+    """Trace file text from (kind, offset_ms, name, *fields) tuples."""
+    return "".join(
+        "\t".join(["cs1", kind, str(T0 + offset_ms * 1000), name, *fields]) + "\n"
+        for kind, offset_ms, name, *fields in lines
+    )
+
+
+def span(name, parent, start_ms, duration_ms):
+    return {"name": name, "parent": parent, "start_ms": start_ms, "duration_ms": duration_ms, "status": "success"}
+
+
+class TestParseTrace:
+    """Test assembling marker lines into a span tree."""
+
+    def test_nested_spans(self):
+        """Test that markers nest into a tree and the root becomes the run event."""
+        text = markers(
+            ("B", 0, "review-and-merge", "acme/repo", "Linux", "1.2.3"),
+            ("B", 10, "checkout"),
+            ("E", 1010, "checkout", "success", ""),
+            ("B", 1010, "review"),
+            ("B", 1020, "claude"),
+            ("E", 31020, "claude", "failure", "exit code 1"),
+            ("E", 31500, "review", "", ""),
+            ("E", 32000, "review-and-merge", "failure", "review failed"),
+        )
+
+        event = parse_trace(text, "trace-1")
+
+        assert event["action_name"] == "review-and-merge"
+        assert event["status"] == "failure"
+        assert event["duration_ms"] == 32000
+        assert event["error_type"] == "review failed"
+        assert event["timestamp"] == "2026-01-01T00:00:00Z"
+        assert event["repository_anonymous_id"] == collect_metrics.anonymize_repository("acme/repo")
+        assert event["trace_id"] == "trace-1"
+        assert [(s["name"], s["parent"], s["start_ms"], s["duration_ms"], s["status"]) for s in event["spans"]] == [
+            ("review-and-merge", None, 0, 32000, "failure"),
+            ("checkout", 0, 10, 1000, "success"),
+            ("review", 0, 1010, 30490, "success"),
+            ("claude", 2, 1020, 30000, "failure"),
+        ]
+        assert span_paths(event["spans"]) == ["", "checkout", "review", "review > claude"]
+
+    def test_open_root_is_pending(self):
+        """Test that a trace is not complete until its root span ends."""
+        text = markers(("B", 0, "run", "", "", ""), ("B", 5, "step"), ("E", 9, "step", "success", ""))
+
+        assert parse_trace(text) is None
+        # A partial last line is still being written
+        assert parse_trace(text + "cs1\tE\t") is None
+
+    def test_unclosed_children_are_incomplete(self):
+        """Test that ending a span closes the spans still open inside it."""
+        text = markers(
+            ("B", 0, "run", "", "", ""),
+            ("B", 5, "step"),
+            ("E", 7, "unknown-step", "success", ""),
+            ("E", 20, "run", "bogus", ""),
+        )
+
+        event = parse_trace(text)
+
+        assert event["status"] == "error"
+        assert event["repository_anonymous_id"] == "unknown"
+        assert event["spans"][1]["status"] == INCOMPLETE
+        assert event["spans"][1]["duration_ms"] == 15
+
+    def test_clock_steps_are_clamped(self):
+        """Test that a wall clock stepping back yields zero, not negative, durations."""
+        event = parse_trace(markers(("B", 100, "run", "", "", ""), ("E", 40, "run", "success", "")))
+        assert event["duration_ms"] == 0
+
+    @pytest.mark.parametrize("text", [
+        "cs2\tB\t1\trun\t\t\t\n",                                  # unknown protocol
+        "cs1\tX\t1\trun\t\t\t\n",                                  # unknown marker
+        "cs1\tB\tnow\trun\t\t\t\n",                                # time not an integer
+        "cs1\tB\t1\t\t\t\t\n",                                     # no name
+        "cs1\tB\t1\trun\t\t\t\ncs1\tE\t2\trun\tsuccess\n",          # end marker too short
+        "cs1\tB\t1\trun\t\t\t\ncs1\tE\t2\trun\t\t\ncs1\tB\t3\tx\n",  # marker after the root ended
+    ])
+    def test_invalid_traces(self, text):
+        """Test that malformed traces are rejected."""
+        with pytest.raises(ValueError):
+            parse_trace(text)
+
+
+class TestCriticalPath:
+    """Test critical path extraction from span trees."""
+
+    def test_sequential_steps(self):
+        """Test that every sequential step is on the path, plus the gaps between them."""
+        spans = [span("run", None, 0, 100), span("a", 0, 5, 20), span("b", 0, 30, 60)]
+
+        assert critical_path(spans) == {0: 20, 1: 20, 2: 60}
+
+    def test_parallel_steps(self):
+        """Test that of overlapping steps only the one finishing last is on the path."""
+        spans = [
+            span("run", None, 0, 100),
+            span("fast", 0, 10, 30),
+            span("slow", 0, 10, 85),
+            span("nested", 2, 20, 50),
+        ]
+
+        path = critical_path(spans)
+
+        assert 1 not in path
+        assert path == {0: 15, 2: 35, 3: 50}
+        assert sum(path.values()) == 100
+
+
+class TestSpooledTraces:
+    """Test logging finished traces through the spool flusher."""
+
+    def test_trace_logged_once_root_ends(self, tmp_path):
+        """Test that an open trace stays pending and is logged when it ends."""
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        spool.mkdir()
+        trace = spool / "01767225600000000000-1-1.trace"
+        trace.write_text(markers(("B", 0, "run", "o/r", "Linux", "1"), ("B", 1, "step")))
+
+        with patch("telemetry_spool.time.time_ns", return_value=(T0 + 60_000_000) * 1000):
+            assert flush_spool(spool, log) == (0, 0, 1)
+            with open(trace, "a") as f:
+                f.write(markers(("E", 50, "step", "success", ""), ("E", 60, "run", "success", "")))
+            assert flush_spool(spool, log) == (1, 0, 0)
+
+        (event,) = [json.loads(line) for line in log.read_text().splitlines()]
+        assert event["trace_id"] == trace.stem
+        assert [s["name"] for s in event["spans"]] == ["run", "step"]
+        assert not trace.exists()
+
+    def test_abandoned_trace_set_aside(self, tmp_path):
+        """Test that a trace whose root never ends is eventually set aside."""
+        spool, log = tmp_path / "spool", tmp_path / "telemetry.log"
+        spool.mkdir()
+        trace = spool / "01767225600000000000-1-1.trace"
+        trace.write_text(markers(("B", 0, "run", "", "", "")))
+
+        assert flush_spool(spool, log) == (0, 0, 0)
+        assert trace.with_suffix(".bad").exists()
+
+
+@requires_bash
+class TestSpanHelpers:
+    """Test the bash span helpers end to end."""
+
+    def test_spans_across_steps(self, tmp_path):
+        """Test that spans from separate bash processes form one trace via GITHUB_ENV."""
+        spool, log, github_env = tmp_path / "spool", tmp_path / "telemetry.log", tmp_path / "github_env"
+        github_env.touch()
+        steps = [
+            "span_begin review-and-merge",
+            "span_begin gh-pr-diff; span_end gh-pr-diff success",
+            "span_begin claude; span_end claude failure 'exit code 2'",
+            'span_end review-and-merge failure "review failed"; echo "${TELEMETRY_TRACE_ID:-closed}"',
+        ]
+        env = {
+            "PATH": os.environ["PATH"],
+            "TELEMETRY_SPOOL_DIR": str(spool),
+            "GITHUB_ENV": str(github_env),
+            "GITHUB_REPOSITORY": "acme/repo",
+        }
+        for step in steps:
+            # Like the runner, export what earlier steps wrote to GITHUB_ENV
+            exported = dict(line.split("=", 1) for line in github_env.read_text().splitlines())
+            output = subprocess.run(
+                ["bash", "-c", f'set -euo pipefail; source "{TELEMETRY_SH}"; {step}'],
+                env={**env, **exported}, check=True, capture_output=True, text=True,
+            ).stdout
+
+        assert output.strip() == "closed"
+        assert flush_spool(spool, log).logged == 1
+        event = json.loads(log.read_text())
+        assert event["action_name"] == "review-and-merge"
+        assert event["status"] == "failure"
+        assert [(s["name"], s["parent"], s["status"]) for s in event["spans"]] == [
+            ("review-and-merge", None, "failure"),
+            ("gh-pr-diff", 0, "success"),
+            ("claude", 0, "failure"),
+        ]
+        assert "acme" not in log.read_text()
+
+    def test_disabled(self, tmp_path):
+        """Test that DISABLE_TELEMETRY stops span tracing."""
+        subprocess.run(
+            ["bash", "-c", f'source "{TELEMETRY_SH}"; span_begin run; span_end run success'],
+            env={"PATH": os.environ["PATH"], "TELEMETRY_SPOOL_DIR": str(tmp_path / "spool"),
+                 "DISABLE_TELEMETRY": "true"},
+            check=True,
+        )
+        assert not (tmp_path / "spool").exists()
+
+
+class TestTraceReport:
+    """Test the per-step trace report."""
+
+    @staticmethod
+    def _event(action, spans):
+        return {"action_name": action, "status": "success", "duration_ms": spans[0]["duration_ms"], "spans": spans}
+
+    def test_aggregate_traces(self):
+        """Test time share and critical path share per step."""
+        events = [
+            self._event("review", [span("review", None, 0, 100), span("diff", 0, 0, 10), span("claude", 0, 10, 80)]),
+            self._event("review", [span("review", None, 0, 300), span("diff", 0, 0, 10), span("claude", 0, 10, 280)]),
+            {"action_name": "review", "status": "success", "duration_ms": 5},
+        ]
+
+        trace = generate_trace_report.aggregate_traces(events)["review"]
+
+        assert trace["runs"] == 2
+        assert trace["total_ms"] == 400
+        claude = trace["steps"]["claude"]
+        assert claude["runs"] == 2
+        assert claude["self_ms"] == claude["critical_ms"] == 360
+        assert trace["steps"][generate_trace_report.OUTSIDE_STEPS]["self_ms"] == 20
+
+    def test_generate_report(self):
+        """Test that the report lists steps by critical path share."""
+        events = [
+            self._event("review", [span("review", None, 0, 100), span("diff", 0, 0, 10), span("claude", 0, 10, 80)]),
+        ]
+
+        report = generate_trace_report.generate_report(generate_trace_report.aggregate_traces(events), 7)
+
+        assert "**Critical path**: diff → claude" in report
+        rows = [line for line in report.splitlines() if line.startswith("| ") and "Step" not in line]
+        assert rows[0].startswith("| claude | 1 | 8") and rows[0].endswith(" ms | 80.0% | 80.0% |")
+        assert "| (outside steps) | 1 | - | - | 10.0% | 10.0% |" in rows
+
+    def test_generate_report_without_traces(self):
+        """Test the report when no run was traced."""
+        assert "No Traces Available" in generate_trace_report.generate_report({}, 7)
+
+    def test_main(self, tmp_path):
+        """Test generating the report from a telemetry log."""
+        data_path, output = tmp_path / "telemetry.log", tmp_path / "trace_report.md"
+        event = parse_trace(markers(("B", 0, "run", "", "", ""), ("B", 1, "step"),
+                                    ("E", 9, "step", "", ""), ("E", 10, "run", "success", "")))
+        data_path.write_text(json.dumps(event) + "\n")
+
+        with patch("sys.argv", ["generate_trace_report.py", "--input", str(data_path),
+                                "--output", str(output), "--days", "0"]):
+            assert generate_trace_report.main() == 0
+
+        assert "| step | 1 | 8 ms | 8 ms | 80.0% | 80.0% |" in output.read_text()